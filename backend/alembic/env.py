@@ -13,6 +13,7 @@ from src.infrastructure.database.models import (
     Project,
     Molecule,
     GlimpsModel,
+    GlimpsModelVersion,
     Job,
     ProjectCollaborator,
 )
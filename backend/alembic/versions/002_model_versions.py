@@ -0,0 +1,61 @@
+"""Model version history
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "glimps_models",
+        sa.Column("version", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.execute(
+        "UPDATE glimps_models SET version = 1 WHERE is_trained AND model_path IS NOT NULL"
+    )
+
+    op.create_table(
+        "glimps_model_versions",
+        sa.Column("id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column("model_id", postgresql.UUID(as_uuid=False), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column("model_path", sa.String(length=500), nullable=False),
+        sa.Column("update_mode", sa.String(length=20), nullable=False),
+        sa.Column("training_config", postgresql.JSONB(), nullable=True),
+        sa.Column("training_metrics", postgresql.JSONB(), nullable=True),
+        sa.Column("training_pairs", postgresql.JSONB(), nullable=True),
+        sa.Column("n_training_frames", sa.Integer(), nullable=False),
+        sa.Column("job_id", postgresql.UUID(as_uuid=False), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["model_id"], ["glimps_models.id"]),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("model_id", "version", name="uq_model_version"),
+    )
+    op.create_index(
+        op.f("ix_glimps_model_versions_model_id"),
+        "glimps_model_versions",
+        ["model_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_glimps_model_versions_model_id"),
+        table_name="glimps_model_versions",
+    )
+    op.drop_table("glimps_model_versions")
+    op.drop_column("glimps_models", "version")
@@ -0,0 +1,93 @@
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from arq import create_pool
+
+from src.infrastructure.queue.arq_pool import (
+    close_arq_pool,
+    get_arq_pool,
+    redis_settings,
+)
+
+QUEUE_NAME = "benchmark:submission"
+
+
+async def _submit_with_new_pool(job_id: str) -> None:
+    redis_pool = await create_pool(redis_settings)
+    await redis_pool.enqueue_job("noop", job_id, _job_id=job_id, _queue_name=QUEUE_NAME)
+    await redis_pool.close()
+
+
+async def _submit_with_shared_pool(job_id: str) -> None:
+    redis_pool = await get_arq_pool()
+    await redis_pool.enqueue_job("noop", job_id, _job_id=job_id, _queue_name=QUEUE_NAME)
+
+
+async def _run(submit, n_jobs: int, concurrency: int) -> dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures = 0
+
+    async def one() -> None:
+        nonlocal failures
+        async with semaphore:
+            start_time = time.perf_counter()
+            try:
+                await submit(f"benchmark-{uuid4()}")
+                latencies.append(time.perf_counter() - start_time)
+            except Exception:
+                failures += 1
+
+    start_time = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n_jobs)))
+    elapsed = time.perf_counter() - start_time
+
+    latencies.sort()
+    return {
+        "submissions_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": 1000 * latencies[len(latencies) // 2] if latencies else 0.0,
+        "p99_ms": 1000 * latencies[int(len(latencies) * 0.99)] if latencies else 0.0,
+        "failures": failures,
+    }
+
+
+async def _cleanup() -> None:
+    redis_pool = await get_arq_pool()
+    job_keys = [
+        f"arq:job:{job_id.decode()}"
+        for job_id in await redis_pool.zrange(QUEUE_NAME, 0, -1)
+    ]
+    if job_keys:
+        await redis_pool.delete(*job_keys)
+    await redis_pool.delete(QUEUE_NAME)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare job submission throughput of per-request and shared arq pools"
+    )
+    parser.add_argument("--jobs", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    modes = {
+        "per-request pool": _submit_with_new_pool,
+        "shared pool": _submit_with_shared_pool,
+    }
+    try:
+        for name, submit in modes.items():
+            result = await _run(submit, args.jobs, args.concurrency)
+            print(
+                f"{name:>16}: {result['submissions_per_second']:8.1f} jobs/s  "
+                f"p50 {result['p50_ms']:7.2f} ms  p99 {result['p99_ms']:7.2f} ms  "
+                f"failures {result['failures']}"
+            )
+            await _cleanup()
+    finally:
+        await close_arq_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
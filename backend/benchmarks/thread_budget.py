@@ -0,0 +1,55 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+from src.glimps.adapter import GlimpsAdapter
+from src.glimps.benchmark import (
+    DEFAULT_CONCURRENCY_LEVELS,
+    benchmark_concurrency,
+)
+from src.glimps.model_serializer import ModelSerializer
+
+EXAMPLES_DIR = Path(__file__).resolve().parent.parent / "tests" / "examples"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare aggregate backmapping throughput across concurrent jobs "
+        "and BLAS thread limits"
+    )
+    parser.add_argument("--cg", default=str(EXAMPLES_DIR / "test_ca.npy"))
+    parser.add_argument("--atomistic", default=str(EXAMPLES_DIR / "test.npy"))
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=list(DEFAULT_CONCURRENCY_LEVELS)
+    )
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--batches-per-job", type=int, default=8)
+    args = parser.parse_args()
+
+    cg_coords = np.load(args.cg)
+    adapter = GlimpsAdapter.create_with_options(refine=False)
+    adapter.fit(cg_coords, np.load(args.atomistic))
+
+    profile = benchmark_concurrency(
+        ModelSerializer.serialize(adapter),
+        cg_coords,
+        concurrency_levels=args.concurrency,
+        thread_counts=args.threads,
+        batch_size=args.batch_size,
+        batches_per_job=args.batches_per_job,
+    )
+
+    print(f"{profile['cpu_count']} CPUs, batch size {profile['batch_size']}")
+    for result in profile["results"]:
+        marker = "  <- best" if result is profile["best"] else ""
+        print(
+            f"{result['concurrency']:>3} jobs x {result['threads']:>2} threads "
+            f"({result['total_threads']:>3} total): "
+            f"{result['frames_per_second'] or 0.0:10.1f} frames/s{marker}"
+        )
+
+
+if __name__ == "__main__":
+    main()
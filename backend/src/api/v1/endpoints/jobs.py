@@ -1,18 +1,41 @@
-from fastapi import APIRouter, HTTPException, Query, status
-from fastapi.responses import Response
+import contextlib
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from arq.jobs import Job as ArqJob
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
-from src.dependencies import CurrentUser, DbSession
+from src.dependencies import ArqPool, CurrentUser, DbSession, authenticate_stream_token
+from src.glimps.sharding import shard_output_path
+from src.infrastructure.cache.job_events import get_job_event_broker, stream_job_events
+from src.infrastructure.cache.job_progress import read_live_progress, request_job_cancel
+from src.infrastructure.cache.model_affinity import routing_stats
 from src.infrastructure.database.models.job import Job, JobStatus, JobType
 from src.infrastructure.database.models.molecule import FileFormat, Molecule, MoleculeType
+from src.infrastructure.database.session import async_session_maker
+from src.infrastructure.queue.fair_scheduler import get_fair_scheduler
+from src.infrastructure.queue.queues import get_queue_stats, queue_for_job_type
+from src.infrastructure.queue.worker_registry import list_workers
 from src.infrastructure.repositories.project_repository import ProjectRepository
-from src.infrastructure.storage.file_storage import get_file_storage
-from src.schemas.responses.job import JobListResponse, JobResponse
+from src.infrastructure.storage.file_storage import discard_files, get_file_storage
+from src.schemas.responses.job import (
+    JobListResponse,
+    JobResponse,
+    QueueStatsListResponse,
+    QueueStatsResponse,
+    WorkerListResponse,
+    WorkerResponse,
+)
 from src.schemas.responses.molecule import MoleculeResponse
 
 router = APIRouter()
 
+TERMINAL_STATUSES = (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+
 
 @router.get("/", response_model=JobListResponse)
 async def list_jobs(
@@ -57,12 +80,99 @@ async def list_jobs(
     count_result = await db.execute(count_stmt)
     total = len(list(count_result.scalars().all()))
 
+    live_progress = await read_live_progress(jobs)
+
     return JobListResponse(
-        jobs=[JobResponse.model_validate(j) for j in jobs],
+        jobs=[
+            JobResponse.model_validate(j).model_copy(update=live_progress.get(j.id, {}))
+            for j in jobs
+        ],
         total=total,
     )
 
 
+@router.get("/queues", response_model=QueueStatsListResponse)
+async def get_queues(
+    current_user: CurrentUser,
+    arq_pool: ArqPool,
+) -> QueueStatsListResponse:
+    stats = await get_queue_stats(arq_pool)
+    scheduler = get_fair_scheduler()
+    return QueueStatsListResponse(
+        queues=[
+            QueueStatsResponse(
+                **queue,
+                **await scheduler.queue_stats(queue["queue_name"]),
+                **await routing_stats(arq_pool, queue["queue_name"]),
+            )
+            for queue in stats
+        ]
+    )
+
+
+@router.get("/workers", response_model=WorkerListResponse)
+async def get_workers(
+    current_user: CurrentUser,
+    arq_pool: ArqPool,
+) -> WorkerListResponse:
+    workers = await list_workers(arq_pool)
+    return WorkerListResponse(
+        workers=[WorkerResponse(**worker) for worker in workers]
+    )
+
+
+@router.get("/events")
+async def job_events(
+    request: Request,
+    project_id: str | None = Query(None),
+    token: str | None = Query(None),
+    last_event_id: str | None = Query(None),
+) -> StreamingResponse:
+    authorization = request.headers.get("Authorization", "")
+    if not token and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+
+    user = await authenticate_stream_token(token)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if project_id:
+        async with async_session_maker() as db:
+            has_access = await ProjectRepository(db).user_has_access(project_id, user.id)
+        if not has_access:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found",
+            )
+
+    last_event_id = last_event_id or request.headers.get("Last-Event-ID")
+
+    async def event_source() -> AsyncIterator[str]:
+        events = stream_job_events(
+            get_job_event_broker(), user.id, project_id, last_event_id
+        )
+        try:
+            async for event in events:
+                if await request.is_disconnected():
+                    break
+                if event is None:
+                    yield ": ping\n\n"
+                    continue
+                yield f"id: {event['id']}\nevent: job\ndata: {json.dumps(event)}\n\n"
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{job_id}", response_model=JobResponse)
 async def get_job(
     job_id: str,
@@ -87,7 +197,10 @@ async def get_job(
                 detail="Job not found",
             )
 
-    return JobResponse.model_validate(job)
+    live_progress = await read_live_progress([job])
+    return JobResponse.model_validate(job).model_copy(
+        update=live_progress.get(job.id, {})
+    )
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -95,6 +208,7 @@ async def cancel_job(
     job_id: str,
     db: DbSession,
     current_user: CurrentUser,
+    arq_pool: ArqPool,
 ) -> None:
     stmt = select(Job).where(Job.id == job_id)
     result = await db.execute(stmt)
@@ -112,15 +226,61 @@ async def cancel_job(
             detail="Not authorized to cancel this job",
         )
 
-    if job.status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
+    if job.status in TERMINAL_STATUSES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot cancel job with status: {job.status.value}",
         )
 
-    job.status = JobStatus.CANCELLED
+    cancelled = [job]
+    params = job.input_params or {}
+    if params.get("pipeline_inference_job_id"):
+        inference_job = await db.get(Job, params["pipeline_inference_job_id"])
+        if inference_job is not None and inference_job.status not in TERMINAL_STATUSES:
+            cancelled.append(inference_job)
+
+    for cancelled_job in cancelled:
+        cancelled_job.status = JobStatus.CANCELLED
+        cancelled_job.completed_at = datetime.utcnow()
     await db.flush()
 
+    for cancelled_job in cancelled:
+        await request_job_cancel(cancelled_job)
+
+    scheduler = get_fair_scheduler()
+    queue_name = queue_for_job_type(job.job_type)
+    if not await scheduler.remove(job.id):
+        for arq_job_id in _arq_job_ids(job):
+            with contextlib.suppress(TimeoutError):
+                await ArqJob(arq_job_id, arq_pool, _queue_name=queue_name).abort(
+                    timeout=0, poll_delay=0.1
+                )
+
+        await scheduler.release(job.id)
+        await scheduler.dispatch(arq_pool, queue_name)
+
+    n_shards = params.get("n_shards") or 1
+    if n_shards > 1:
+        await discard_files(
+            get_file_storage(),
+            [
+                shard_output_path(params["output_file_path"], index)
+                for index in range(n_shards)
+            ],
+        )
+
+
+def _arq_job_ids(job: Job) -> list[str]:
+    n_shards = (job.input_params or {}).get("n_shards") or 1
+    if n_shards <= 1:
+        return [job.id]
+
+    return [
+        job.id,
+        *(f"{job.id}:shard:{index}" for index in range(n_shards)),
+        f"{job.id}:assemble",
+    ]
+
 
 @router.get("/{job_id}/download")
 async def download_job_result(
@@ -1,18 +1,60 @@
+import asyncio
+from datetime import datetime
 from uuid import uuid4
 
-from arq import create_pool
-from fastapi import APIRouter, Form, HTTPException, Query, UploadFile, status
+import numpy as np
+from fastapi import APIRouter, Form, Header, HTTPException, Query, UploadFile, status
 from sqlalchemy import select
 
-from src.dependencies import CurrentUser, DbSession
+from src.config import settings
+from src.core.exceptions import (
+    JobSubmissionInProgressError,
+    TransformCapacityError,
+    TransformTimeoutError,
+)
+from src.dependencies import ArqPool, CurrentUser, DbSession
+from src.domain.services.cost_service import get_cost_model_service
+from src.domain.services.transform_service import get_transform_service
+from src.glimps.cost_model import CostFeatures
+from src.glimps.pdb import create_pdb_from_template
+from src.glimps.sharding import shard_frame_ranges, shard_output_path
+from src.glimps.sweep import expand_option_grid
+from src.infrastructure.cache.inference_cache import (
+    LOOKUP_ERRORS,
+    get_inference_cache,
+    inference_cache_options,
+    invalidate_inference_cache,
+    is_result_available,
+)
+from src.infrastructure.cache.job_dedup import JobSubmission, submission_fingerprint
+from src.infrastructure.cache.model_cache import get_model_cache
 from src.infrastructure.database.models.glimps_model import GlimpsModel
 from src.infrastructure.database.models.job import Job, JobStatus, JobType
-from src.infrastructure.database.models.molecule import Molecule
+from src.infrastructure.database.models.model_version import GlimpsModelVersion
+from src.infrastructure.database.models.molecule import Molecule, MoleculeType
+from src.infrastructure.queue.fair_scheduler import QueuedCall, get_fair_scheduler
 from src.infrastructure.repositories.project_repository import ProjectRepository
 from src.infrastructure.storage.file_storage import get_file_storage
-from src.schemas.requests.model import CreateModelRequest, GlimpsOptionsRequest
-from src.schemas.responses.model import ModelListResponse, ModelResponse, TrainingJobResponse
-from src.workers.settings import WorkerSettings
+from src.schemas.requests.model import (
+    BatchInferenceRequest,
+    BenchmarkModelRequest,
+    CreateModelRequest,
+    EstimateRequest,
+    GlimpsOptionsRequest,
+    PipelineRequest,
+    SweepModelRequest,
+    TransformRequest,
+)
+from src.schemas.responses.model import (
+    CostEstimateResponse,
+    ModelListResponse,
+    ModelResponse,
+    ModelVersionListResponse,
+    ModelVersionResponse,
+    PipelineJobResponse,
+    TrainingJobResponse,
+    TransformResponse,
+)
 
 router = APIRouter()
 
@@ -104,12 +146,15 @@ async def train_model(
     model_id: str,
     db: DbSession,
     current_user: CurrentUser,
+    arq_pool: ArqPool,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
     cg_molecule_id: str = Form(...),
     atomistic_molecule_id: str = Form(...),
     pca: bool = Form(False),
     refine: bool = Form(True),
     shave: bool = Form(True),
     triangulate: bool = Form(False),
+    benchmark: bool = Form(False),
 ) -> TrainingJobResponse:
     stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
     result = await db.execute(stmt)
@@ -131,91 +176,936 @@ async def train_model(
     if model.is_trained:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Model is already trained",
+            detail="Model is already trained, use retrain to add frames",
         )
 
-    cg_stmt = select(Molecule).where(Molecule.id == cg_molecule_id)
-    cg_result = await db.execute(cg_stmt)
-    cg_molecule = cg_result.scalar_one_or_none()
+    cg_molecule = await _get_project_molecule(
+        db, cg_molecule_id, model.project_id, "CG molecule"
+    )
+    atomistic_molecule = await _get_project_molecule(
+        db, atomistic_molecule_id, model.project_id, "Atomistic molecule"
+    )
+
+    glimps_options = {
+        "pca": pca,
+        "refine": refine,
+        "shave": shave,
+        "triangulate": triangulate,
+    }
+
+    submission, duplicate = await _claim_job_submission(
+        db,
+        current_user.id,
+        JobType.TRAINING,
+        model_id,
+        {
+            "cg_molecule_id": cg_molecule_id,
+            "atomistic_molecule_id": atomistic_molecule_id,
+            "glimps_options": glimps_options,
+            "benchmark": benchmark,
+        },
+        idempotency_key,
+    )
+    if duplicate:
+        return TrainingJobResponse(
+            job_id=duplicate.id,
+            model_id=model_id,
+            status=duplicate.status.value,
+        )
+
+    try:
+        features = [_training_features(cg_molecule, atomistic_molecule, glimps_options)]
+        estimate = await get_cost_model_service().estimate(
+            db, JobType.TRAINING, features
+        )
+
+        model.cg_molecule_id = cg_molecule_id
+        model.atomistic_molecule_id = atomistic_molecule_id
+        model.training_config = glimps_options
+        await db.flush()
+
+        job = Job(
+            job_type=JobType.TRAINING,
+            status=JobStatus.PENDING,
+            user_id=current_user.id,
+            project_id=model.project_id,
+            model_id=model_id,
+            input_params={
+                "cg_molecule_id": cg_molecule_id,
+                "atomistic_molecule_id": atomistic_molecule_id,
+                "glimps_options": glimps_options,
+                "benchmark": benchmark,
+                **estimate.input_params(features),
+            },
+        )
+        db.add(job)
+        await db.flush()
+        await db.refresh(job)
+
+        job.status = JobStatus.QUEUED
+        await db.commit()
+
+        await get_fair_scheduler().submit(
+            arq_pool,
+            job,
+            "train_glimps_model",
+            job.id,
+            cg_molecule.coordinates_path,
+            atomistic_molecule.coordinates_path,
+            model_id,
+            glimps_options,
+            benchmark,
+            priority=estimate.priority,
+        )
+
+        await submission.bind(job.id)
+    except BaseException:
+        await submission.release()
+        raise
+
+    return TrainingJobResponse(
+        job_id=job.id,
+        model_id=model_id,
+        status=job.status.value,
+    )
+
+
+@router.post("/{model_id}/retrain", response_model=TrainingJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def retrain_model(
+    model_id: str,
+    db: DbSession,
+    current_user: CurrentUser,
+    arq_pool: ArqPool,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+    cg_molecule_id: str = Form(...),
+    atomistic_molecule_id: str = Form(...),
+) -> TrainingJobResponse:
+    stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+    result = await db.execute(stmt)
+    model = result.scalar_one_or_none()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    project_repo = ProjectRepository(db)
+    if not await project_repo.user_has_access(model.project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    if not model.is_trained or not model.model_path:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Model is not trained yet",
+        )
+
+    cg_molecule = await _get_project_molecule(
+        db, cg_molecule_id, model.project_id, "CG molecule"
+    )
+    atomistic_molecule = await _get_project_molecule(
+        db, atomistic_molecule_id, model.project_id, "Atomistic molecule"
+    )
+
+    version_stmt = (
+        select(GlimpsModelVersion)
+        .where(GlimpsModelVersion.model_id == model_id)
+        .order_by(GlimpsModelVersion.version.desc())
+        .limit(1)
+    )
+    version_result = await db.execute(version_stmt)
+    latest_version = version_result.scalar_one_or_none()
+
+    if latest_version and latest_version.training_pairs:
+        base_pairs = latest_version.training_pairs
+    else:
+        base_pairs = [
+            {
+                "cg_molecule_id": model.cg_molecule_id,
+                "atomistic_molecule_id": model.atomistic_molecule_id,
+            }
+        ]
+
+    base_molecule_ids = {
+        molecule_id for pair in base_pairs for molecule_id in pair.values() if molecule_id
+    }
+    base_stmt = select(Molecule).where(Molecule.id.in_(base_molecule_ids))
+    base_result = await db.execute(base_stmt)
+    base_molecules = {m.id: m for m in base_result.scalars().all()}
+    coordinates_paths = {m.id: m.coordinates_path for m in base_molecules.values()}
+    n_base_frames = sum(
+        base_molecules[pair["cg_molecule_id"]].n_frames or 0
+        for pair in base_pairs
+        if pair.get("cg_molecule_id") in base_molecules
+    )
+
+    base_file_paths = [
+        [
+            coordinates_paths.get(pair["cg_molecule_id"]),
+            coordinates_paths.get(pair["atomistic_molecule_id"]),
+        ]
+        for pair in base_pairs
+    ]
+    base_file_paths = [paths for paths in base_file_paths if all(paths)]
+
+    training_pairs = [
+        *base_pairs,
+        {
+            "cg_molecule_id": cg_molecule_id,
+            "atomistic_molecule_id": atomistic_molecule_id,
+        },
+    ]
+
+    submission, duplicate = await _claim_job_submission(
+        db,
+        current_user.id,
+        JobType.TRAINING,
+        model_id,
+        {
+            "cg_molecule_id": cg_molecule_id,
+            "atomistic_molecule_id": atomistic_molecule_id,
+            "version": model.version,
+        },
+        idempotency_key,
+    )
+    if duplicate:
+        return TrainingJobResponse(
+            job_id=duplicate.id,
+            model_id=model_id,
+            status=duplicate.status.value,
+        )
+
+    try:
+        features = [
+            _training_features(
+                cg_molecule,
+                atomistic_molecule,
+                model.training_config,
+                n_frames=n_base_frames + (cg_molecule.n_frames or 0),
+            )
+        ]
+        estimate = await get_cost_model_service().estimate(
+            db, JobType.TRAINING, features
+        )
+
+        job = Job(
+            job_type=JobType.TRAINING,
+            status=JobStatus.PENDING,
+            user_id=current_user.id,
+            project_id=model.project_id,
+            model_id=model_id,
+            input_params={
+                "mode": "retrain",
+                "cg_molecule_id": cg_molecule_id,
+                "atomistic_molecule_id": atomistic_molecule_id,
+                "base_version": model.version,
+                "glimps_options": model.training_config,
+                **estimate.input_params(features),
+            },
+        )
+        db.add(job)
+        await db.flush()
+        await db.refresh(job)
+
+        job.status = JobStatus.QUEUED
+        await db.commit()
+
+        await get_fair_scheduler().submit(
+            arq_pool,
+            job,
+            "retrain_glimps_model",
+            job.id,
+            model_id,
+            model.model_path,
+            cg_molecule.coordinates_path,
+            atomistic_molecule.coordinates_path,
+            base_file_paths,
+            training_pairs,
+            model.training_config,
+            priority=estimate.priority,
+        )
+
+        await submission.bind(job.id)
+    except BaseException:
+        await submission.release()
+        raise
+
+    return TrainingJobResponse(
+        job_id=job.id,
+        model_id=model_id,
+        status=job.status.value,
+    )
+
+
+@router.post("/{model_id}/sweep", response_model=TrainingJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def sweep_model_options(
+    model_id: str,
+    request: SweepModelRequest,
+    db: DbSession,
+    current_user: CurrentUser,
+    arq_pool: ArqPool,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+) -> TrainingJobResponse:
+    stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+    result = await db.execute(stmt)
+    model = result.scalar_one_or_none()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    project_repo = ProjectRepository(db)
+    if not await project_repo.user_has_access(model.project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    cg_molecule = await _get_project_molecule(
+        db, request.cg_molecule_id, model.project_id, "CG molecule"
+    )
+    atomistic_molecule = await _get_project_molecule(
+        db, request.atomistic_molecule_id, model.project_id, "Atomistic molecule"
+    )
+
+    option_grid = {
+        "pca": request.pca,
+        "refine": request.refine,
+        "shave": request.shave,
+        "triangulate": request.triangulate,
+    }
+
+    submission, duplicate = await _claim_job_submission(
+        db,
+        current_user.id,
+        JobType.SWEEP,
+        model_id,
+        {
+            "cg_molecule_id": request.cg_molecule_id,
+            "atomistic_molecule_id": request.atomistic_molecule_id,
+            "option_grid": option_grid,
+            "holdout_fraction": request.holdout_fraction,
+        },
+        idempotency_key,
+    )
+    if duplicate:
+        return TrainingJobResponse(
+            job_id=duplicate.id,
+            model_id=model_id,
+            status=duplicate.status.value,
+        )
+
+    try:
+        combinations = expand_option_grid(option_grid)
+        features = [
+            _training_features(cg_molecule, atomistic_molecule, options)
+            for options in combinations
+        ]
+        estimate = await get_cost_model_service().estimate(
+            db,
+            JobType.SWEEP,
+            features,
+            parallel=settings.sweep_max_workers or len(combinations),
+        )
+
+        if not model.is_trained:
+            model.cg_molecule_id = request.cg_molecule_id
+            model.atomistic_molecule_id = request.atomistic_molecule_id
+            await db.flush()
+
+        job = Job(
+            job_type=JobType.SWEEP,
+            status=JobStatus.PENDING,
+            user_id=current_user.id,
+            project_id=model.project_id,
+            model_id=model_id,
+            input_params={
+                "cg_molecule_id": request.cg_molecule_id,
+                "atomistic_molecule_id": request.atomistic_molecule_id,
+                "option_grid": option_grid,
+                "holdout_fraction": request.holdout_fraction,
+                **estimate.input_params(features),
+            },
+        )
+        db.add(job)
+        await db.flush()
+        await db.refresh(job)
+
+        job.status = JobStatus.QUEUED
+        await db.commit()
+
+        await get_fair_scheduler().submit(
+            arq_pool,
+            job,
+            "sweep_glimps_options",
+            job.id,
+            model_id,
+            cg_molecule.coordinates_path,
+            atomistic_molecule.coordinates_path,
+            option_grid,
+            request.holdout_fraction,
+            [
+                {
+                    "cg_molecule_id": request.cg_molecule_id,
+                    "atomistic_molecule_id": request.atomistic_molecule_id,
+                }
+            ],
+            priority=estimate.priority,
+        )
+
+        await submission.bind(job.id)
+    except BaseException:
+        await submission.release()
+        raise
+
+    return TrainingJobResponse(
+        job_id=job.id,
+        model_id=model_id,
+        status=job.status.value,
+    )
+
+
+@router.post("/{model_id}/benchmark", response_model=TrainingJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def benchmark_model(
+    model_id: str,
+    request: BenchmarkModelRequest,
+    db: DbSession,
+    current_user: CurrentUser,
+    arq_pool: ArqPool,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+) -> TrainingJobResponse:
+    stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+    result = await db.execute(stmt)
+    model = result.scalar_one_or_none()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    project_repo = ProjectRepository(db)
+    if not await project_repo.user_has_access(model.project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    if not model.is_trained or not model.model_path:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Model is not trained yet",
+        )
+
+    input_molecule_id = request.input_molecule_id or model.cg_molecule_id
+    if not input_molecule_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Input molecule is required",
+        )
+    input_molecule = await _get_project_molecule(
+        db, input_molecule_id, model.project_id, "Input molecule"
+    )
+
+    submission, duplicate = await _claim_job_submission(
+        db,
+        current_user.id,
+        JobType.BENCHMARK,
+        model_id,
+        {
+            "input_molecule_id": input_molecule_id,
+            "version": model.version,
+            "batch_sizes": request.batch_sizes,
+            "thread_counts": request.thread_counts,
+        },
+        idempotency_key,
+    )
+    if duplicate:
+        return TrainingJobResponse(
+            job_id=duplicate.id,
+            model_id=model_id,
+            status=duplicate.status.value,
+        )
+
+    try:
+        features = _inference_features(model, [input_molecule])
+        estimate = await get_cost_model_service().estimate(
+            db, JobType.BENCHMARK, features
+        )
+
+        job = Job(
+            job_type=JobType.BENCHMARK,
+            status=JobStatus.PENDING,
+            user_id=current_user.id,
+            project_id=model.project_id,
+            model_id=model_id,
+            input_params={
+                "input_molecule_id": input_molecule_id,
+                "version": model.version,
+                "batch_sizes": request.batch_sizes,
+                "thread_counts": request.thread_counts,
+                **estimate.input_params(features),
+            },
+        )
+        db.add(job)
+        await db.flush()
+        await db.refresh(job)
+
+        job.status = JobStatus.QUEUED
+        await db.commit()
+
+        await get_fair_scheduler().submit(
+            arq_pool,
+            job,
+            "benchmark_glimps_model",
+            job.id,
+            model_id,
+            model.model_path,
+            input_molecule.coordinates_path,
+            request.batch_sizes,
+            request.thread_counts,
+            priority=estimate.priority,
+        )
+
+        await submission.bind(job.id)
+    except BaseException:
+        await submission.release()
+        raise
+
+    return TrainingJobResponse(
+        job_id=job.id,
+        model_id=model_id,
+        status=job.status.value,
+    )
+
+
+@router.post("/{model_id}/pipeline", response_model=PipelineJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def train_and_infer(
+    model_id: str,
+    request: PipelineRequest,
+    db: DbSession,
+    current_user: CurrentUser,
+    arq_pool: ArqPool,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+) -> PipelineJobResponse:
+    stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+    result = await db.execute(stmt)
+    model = result.scalar_one_or_none()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    project_repo = ProjectRepository(db)
+    if not await project_repo.user_has_access(model.project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    if model.is_trained:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Model is already trained, use retrain to add frames",
+        )
+
+    if request.infer_all_coarse_grained == bool(request.inference_molecule_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either inference_molecule_ids or infer_all_coarse_grained",
+        )
+
+    cg_molecule = await _get_project_molecule(
+        db, request.cg_molecule_id, model.project_id, "CG molecule"
+    )
+    atomistic_molecule = await _get_project_molecule(
+        db, request.atomistic_molecule_id, model.project_id, "Atomistic molecule"
+    )
+    molecules = await _get_batch_molecules(
+        db,
+        model.project_id,
+        request.inference_molecule_ids,
+        request.infer_all_coarse_grained,
+    )
+
+    submission, duplicate = await _claim_job_submission(
+        db,
+        current_user.id,
+        JobType.TRAINING,
+        model_id,
+        {
+            "cg_molecule_id": cg_molecule.id,
+            "atomistic_molecule_id": atomistic_molecule.id,
+            "glimps_options": request.glimps_options.model_dump(),
+            "inference_molecule_ids": [molecule.id for molecule in molecules],
+        },
+        idempotency_key,
+    )
+    if duplicate:
+        return PipelineJobResponse(
+            model_id=model_id,
+            training_job_id=duplicate.id,
+            inference_job_id=duplicate.input_params["pipeline_inference_job_id"],
+            status=duplicate.status.value,
+        )
+
+    try:
+        glimps_options = request.glimps_options.model_dump()
+
+        features = [_training_features(cg_molecule, atomistic_molecule, glimps_options)]
+        inference_features = _inference_features(
+            model, molecules, atomistic_molecule, glimps_options
+        )
+        cost_service = get_cost_model_service()
+        inference_estimate = await cost_service.estimate(
+            db, JobType.BATCH_INFERENCE, inference_features
+        )
+        estimate = cost_service.combine(
+            JobType.TRAINING,
+            [
+                await cost_service.estimate(db, JobType.TRAINING, features),
+                inference_estimate,
+            ],
+        )
+
+        model.cg_molecule_id = cg_molecule.id
+        model.atomistic_molecule_id = atomistic_molecule.id
+        model.training_config = glimps_options
+        await db.flush()
+
+        training_job = Job(
+            job_type=JobType.TRAINING,
+            status=JobStatus.PENDING,
+            user_id=current_user.id,
+            project_id=model.project_id,
+            model_id=model_id,
+            input_params={
+                "cg_molecule_id": cg_molecule.id,
+                "atomistic_molecule_id": atomistic_molecule.id,
+                "glimps_options": glimps_options,
+                "benchmark": False,
+                **estimate.input_params(features),
+            },
+        )
+        db.add(training_job)
+        await db.flush()
+        await db.refresh(training_job)
+
+        inference_job = Job(
+            job_type=JobType.BATCH_INFERENCE,
+            status=JobStatus.PENDING,
+            user_id=current_user.id,
+            project_id=model.project_id,
+            model_id=model_id,
+            input_params={
+                "molecule_ids": [molecule.id for molecule in molecules],
+                "all_coarse_grained": request.infer_all_coarse_grained,
+                "pipeline_job_id": training_job.id,
+                "estimate": inference_estimate.to_dict(),
+            },
+        )
+        db.add(inference_job)
+        await db.flush()
+        await db.refresh(inference_job)
+
+        training_job.input_params = {
+            **training_job.input_params,
+            "pipeline_inference_job_id": inference_job.id,
+        }
+
+        training_job.status = JobStatus.QUEUED
+        inference_job.status = JobStatus.QUEUED
+        await db.commit()
+
+        await get_fair_scheduler().submit(
+            arq_pool,
+            training_job,
+            "train_and_backmap",
+            training_job.id,
+            inference_job.id,
+            cg_molecule.coordinates_path,
+            atomistic_molecule.coordinates_path,
+            model_id,
+            glimps_options,
+            _batch_inference_inputs(molecules),
+            model.project_id,
+            atomistic_molecule.file_path,
+            priority=estimate.priority,
+        )
+
+        await submission.bind(training_job.id)
+    except BaseException:
+        await submission.release()
+        raise
+
+    return PipelineJobResponse(
+        model_id=model_id,
+        training_job_id=training_job.id,
+        inference_job_id=inference_job.id,
+        status=training_job.status.value,
+    )
+
+
+@router.post("/{model_id}/estimate", response_model=CostEstimateResponse)
+async def estimate_job_cost(
+    model_id: str,
+    request: EstimateRequest,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> CostEstimateResponse:
+    stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+    result = await db.execute(stmt)
+    model = result.scalar_one_or_none()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    project_repo = ProjectRepository(db)
+    if not await project_repo.user_has_access(model.project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    job_type = JobType(request.job_type)
+    cg_molecule_id = request.cg_molecule_id or model.cg_molecule_id
+    atomistic_molecule_id = request.atomistic_molecule_id or model.atomistic_molecule_id
+
+    atomistic_molecule = None
+    if atomistic_molecule_id:
+        atomistic_molecule = await _get_project_molecule(
+            db, atomistic_molecule_id, model.project_id, "Atomistic molecule"
+        )
+
+    if job_type == JobType.TRAINING:
+        if not cg_molecule_id or atomistic_molecule is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Training estimates need CG and atomistic molecules",
+            )
+        cg_molecule = await _get_project_molecule(
+            db, cg_molecule_id, model.project_id, "CG molecule"
+        )
+        features = [
+            _training_features(
+                cg_molecule, atomistic_molecule, request.glimps_options.model_dump()
+            )
+        ]
+    else:
+        if not request.molecule_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Inference estimates need molecule_ids",
+            )
+        if not model.is_trained and atomistic_molecule is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Model is not trained yet",
+            )
+        molecules = await _get_batch_molecules(
+            db, model.project_id, request.molecule_ids, False
+        )
+        if job_type == JobType.INFERENCE and len(molecules) > 1:
+            job_type = JobType.BATCH_INFERENCE
+        features = _inference_features(
+            model,
+            molecules,
+            atomistic_molecule,
+            None if model.is_trained else request.glimps_options.model_dump(),
+        )
+
+    estimate = await get_cost_model_service().estimate(db, job_type, features)
+
+    return CostEstimateResponse(
+        model_id=model_id,
+        job_type=estimate.job_type.value,
+        **estimate.to_dict(),
+    )
+
+
+@router.get("/{model_id}/versions", response_model=ModelVersionListResponse)
+async def list_model_versions(
+    model_id: str,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> ModelVersionListResponse:
+    stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+    result = await db.execute(stmt)
+    model = result.scalar_one_or_none()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    project_repo = ProjectRepository(db)
+    if not await project_repo.user_has_access(model.project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    versions_stmt = (
+        select(GlimpsModelVersion)
+        .where(GlimpsModelVersion.model_id == model_id)
+        .order_by(GlimpsModelVersion.version.desc())
+    )
+    versions_result = await db.execute(versions_stmt)
+    versions = list(versions_result.scalars().all())
+
+    return ModelVersionListResponse(
+        versions=[ModelVersionResponse.model_validate(v) for v in versions],
+        total=len(versions),
+    )
+
 
-    if not cg_molecule or cg_molecule.project_id != model.project_id:
+@router.post("/{model_id}/transform", response_model=TransformResponse)
+async def transform_coordinates(
+    model_id: str,
+    request: TransformRequest,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> TransformResponse:
+    stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+    result = await db.execute(stmt)
+    model = result.scalar_one_or_none()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    project_repo = ProjectRepository(db)
+    if not await project_repo.user_has_access(model.project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    if not model.is_trained or not model.model_path:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="CG molecule not found in this project",
+            detail="Model is not trained yet",
         )
 
-    if not cg_molecule.coordinates_path:
+    if (request.molecule_id is None) == (request.coordinates is None):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="CG molecule has no coordinates",
+            detail="Provide exactly one of molecule_id or coordinates",
         )
 
-    atomistic_stmt = select(Molecule).where(Molecule.id == atomistic_molecule_id)
-    atomistic_result = await db.execute(atomistic_stmt)
-    atomistic_molecule = atomistic_result.scalar_one_or_none()
+    limit_detail = (
+        f"Synchronous transform is limited to {settings.transform_max_frames} frames "
+        f"of {settings.transform_max_atoms} atoms, submit an inference job instead"
+    )
 
-    if not atomistic_molecule or atomistic_molecule.project_id != model.project_id:
+    if request.molecule_id is not None:
+        molecule = await _get_project_molecule(
+            db, request.molecule_id, model.project_id, "Input molecule"
+        )
+        if (
+            molecule.n_frames > settings.transform_max_frames
+            or molecule.n_atoms > settings.transform_max_atoms
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=limit_detail,
+            )
+        cg_coords = await get_file_storage().load_numpy(molecule.coordinates_path)
+    else:
+        cg_coords = np.asarray(request.coordinates, dtype=np.float32)
+
+    if cg_coords.ndim == 2:
+        cg_coords = cg_coords[np.newaxis]
+
+    if cg_coords.ndim != 3 or cg_coords.shape[2] != 3 or cg_coords.shape[1] == 0:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Atomistic molecule not found in this project",
+            detail="Coordinates must be shaped (n_frames, n_atoms, 3)",
         )
 
-    if not atomistic_molecule.coordinates_path:
+    if (
+        cg_coords.shape[0] > settings.transform_max_frames
+        or cg_coords.shape[1] > settings.transform_max_atoms
+    ):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Atomistic molecule has no coordinates",
+            detail=limit_detail,
         )
 
-    glimps_options = {
-        "pca": pca,
-        "refine": refine,
-        "shave": shave,
-        "triangulate": triangulate,
-    }
+    cg_shape = (model.training_metrics or {}).get("cg_shape")
+    if cg_shape and cg_coords.shape[1] != cg_shape[1]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Model expects {cg_shape[1]} CG atoms, got {cg_coords.shape[1]}",
+        )
 
-    model.cg_molecule_id = cg_molecule_id
-    model.atomistic_molecule_id = atomistic_molecule_id
-    model.training_config = glimps_options
-    await db.flush()
+    model_cache = get_model_cache()
+    model_cache_hit = model_cache.is_warm(model.model_path, model.version)
+    adapter = await model_cache.get_adapter(model.model_path, model.version)
 
-    job = Job(
-        job_type=JobType.TRAINING,
-        status=JobStatus.PENDING,
-        user_id=current_user.id,
-        project_id=model.project_id,
-        model_id=model_id,
-        input_params={
-            "cg_molecule_id": cg_molecule_id,
-            "atomistic_molecule_id": atomistic_molecule_id,
-            "glimps_options": glimps_options,
-        },
-    )
-    db.add(job)
-    await db.flush()
-    await db.refresh(job)
-
-    redis_pool = await create_pool(WorkerSettings.redis_settings)
-    await redis_pool.enqueue_job(
-        "train_glimps_model",
-        job.id,
-        cg_molecule.coordinates_path,
-        atomistic_molecule.coordinates_path,
-        model_id,
-        glimps_options,
-    )
-    await redis_pool.close()
+    try:
+        atomistic_coords, transform_seconds = await get_transform_service().transform(
+            adapter, cg_coords
+        )
+    except TransformCapacityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        ) from e
+    except TransformTimeoutError as e:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail=str(e),
+        ) from e
 
-    stmt = select(Job).where(Job.id == job.id)
-    result = await db.execute(stmt)
-    job = result.scalar_one()
+    n_frames = int(atomistic_coords.shape[0])
+    n_atoms = int(atomistic_coords.shape[1])
 
-    job.status = JobStatus.QUEUED
-    await db.flush()
+    if request.output_format == "pdb":
+        template = None
+        if model.atomistic_molecule_id:
+            atomistic_molecule_stmt = select(Molecule).where(
+                Molecule.id == model.atomistic_molecule_id
+            )
+            atomistic_result = await db.execute(atomistic_molecule_stmt)
+            atomistic_molecule = atomistic_result.scalar_one_or_none()
+            if atomistic_molecule:
+                template = await model_cache.get_template(atomistic_molecule.file_path)
 
-    return TrainingJobResponse(
-        job_id=job.id,
+        pdb_content = await asyncio.to_thread(
+            create_pdb_from_template, template, atomistic_coords, n_atoms
+        )
+        return TransformResponse(
+            model_id=model_id,
+            version=model.version,
+            n_frames=n_frames,
+            n_atoms=n_atoms,
+            pdb=pdb_content,
+            transform_seconds=transform_seconds,
+            model_cache_hit=model_cache_hit,
+        )
+
+    return TransformResponse(
         model_id=model_id,
-        status=job.status.value,
+        version=model.version,
+        n_frames=n_frames,
+        n_atoms=n_atoms,
+        coordinates=atomistic_coords.tolist(),
+        transform_seconds=transform_seconds,
+        model_cache_hit=model_cache_hit,
     )
 
 
@@ -224,7 +1114,10 @@ async def run_inference(
     model_id: str,
     db: DbSession,
     current_user: CurrentUser,
+    arq_pool: ArqPool,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
     input_molecule_id: str = Form(...),
+    reference_molecule_id: str | None = Form(None),
 ) -> dict:
     stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
     result = await db.execute(stmt)
@@ -265,22 +1158,18 @@ async def run_inference(
             detail="Input molecule has no coordinates",
         )
 
-    output_file_path = f"inference/{model.project_id}/{model_id}/{str(uuid4())}/output.npy"
+    if input_molecule.n_frames == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Input molecule has no frames",
+        )
 
-    job = Job(
-        job_type=JobType.INFERENCE,
-        status=JobStatus.PENDING,
-        user_id=current_user.id,
-        project_id=model.project_id,
-        model_id=model_id,
-        input_params={
-            "input_molecule_id": input_molecule_id,
-            "output_file_path": output_file_path,
-        },
-    )
-    db.add(job)
-    await db.flush()
-    await db.refresh(job)
+    reference_file_path = None
+    if reference_molecule_id:
+        reference_molecule = await _get_project_molecule(
+            db, reference_molecule_id, model.project_id, "Reference molecule"
+        )
+        reference_file_path = reference_molecule.coordinates_path
 
     atomistic_molecule_stmt = select(Molecule).where(
         Molecule.id == model.atomistic_molecule_id
@@ -290,21 +1179,158 @@ async def run_inference(
 
     atomistic_file_path = atomistic_molecule.file_path if atomistic_molecule else None
 
-    redis_pool = await create_pool(WorkerSettings.redis_settings)
-    await redis_pool.enqueue_job(
-        "run_inference",
-        job.id,
-        model.model_path,
-        input_molecule.coordinates_path,
-        output_file_path,
-        input_molecule_id,
-        model.project_id,
-        atomistic_file_path,
+    submission, duplicate = await _claim_job_submission(
+        db,
+        current_user.id,
+        JobType.INFERENCE,
+        model_id,
+        {
+            "model_path": model.model_path,
+            "input_molecule_id": input_molecule_id,
+            "reference_molecule_id": reference_molecule_id,
+        },
+        idempotency_key,
     )
-    await redis_pool.close()
+    if duplicate:
+        return {
+            "job_id": duplicate.id,
+            "model_id": model_id,
+            "status": duplicate.status.value,
+        }
 
-    job.status = JobStatus.QUEUED
-    await db.flush()
+    try:
+        cached = await _lookup_cached_inference(
+            db,
+            model.project_id,
+            model.model_path,
+            input_molecule.coordinates_path,
+            inference_cache_options(atomistic_file_path, reference_file_path),
+        )
+        if cached is not None:
+            completed_at = datetime.utcnow()
+            job = Job(
+                job_type=JobType.INFERENCE,
+                status=JobStatus.COMPLETED,
+                user_id=current_user.id,
+                project_id=model.project_id,
+                model_id=model_id,
+                input_params={
+                    "input_molecule_id": input_molecule_id,
+                    "reference_molecule_id": reference_molecule_id,
+                    "output_file_path": cached["output_path"],
+                },
+                output_params={**cached, "cache_hit": True},
+                progress_percent=100.0,
+                progress_message="Inference complete (cached result)",
+                started_at=completed_at,
+                completed_at=completed_at,
+            )
+            db.add(job)
+            await db.flush()
+            await db.refresh(job)
+            await db.commit()
+
+            await submission.bind(job.id)
+            return {
+                "job_id": job.id,
+                "model_id": model_id,
+                "status": job.status.value,
+            }
+
+        output_dir = f"inference/{model.project_id}/{model_id}/{str(uuid4())}"
+        output_file_path = f"{output_dir}/output.npy"
+        shard_ranges = shard_frame_ranges(
+            input_molecule.n_frames or 0,
+            settings.inference_shard_frames,
+            settings.inference_max_shards,
+        )
+
+        features = _inference_features(
+            model,
+            [input_molecule],
+            atomistic_molecule,
+            n_frames=max(stop - start for start, stop in shard_ranges),
+        )
+        estimate = await get_cost_model_service().estimate(
+            db, JobType.INFERENCE, features
+        )
+
+        job = Job(
+            job_type=JobType.INFERENCE,
+            status=JobStatus.PENDING,
+            user_id=current_user.id,
+            project_id=model.project_id,
+            model_id=model_id,
+            input_params={
+                "input_molecule_id": input_molecule_id,
+                "reference_molecule_id": reference_molecule_id,
+                "output_file_path": output_file_path,
+                "n_shards": len(shard_ranges),
+                "model_path": model.model_path,
+                "version": model.version,
+                **estimate.input_params(features),
+            },
+        )
+        db.add(job)
+        await db.flush()
+        await db.refresh(job)
+
+        job.status = JobStatus.QUEUED
+        await db.commit()
+
+        if len(shard_ranges) > 1:
+            plan = {
+                "model_path": model.model_path,
+                "input_file_path": input_molecule.coordinates_path,
+                "output_file_path": output_file_path,
+                "input_molecule_id": input_molecule_id,
+                "project_id": model.project_id,
+                "atomistic_file_path": atomistic_file_path,
+                "reference_file_path": reference_file_path,
+                "n_frames": input_molecule.n_frames,
+                "shards": [
+                    {
+                        "start": start,
+                        "stop": stop,
+                        "output_path": shard_output_path(output_file_path, index),
+                    }
+                    for index, (start, stop) in enumerate(shard_ranges)
+                ],
+            }
+            await get_fair_scheduler().submit_calls(
+                arq_pool,
+                job,
+                [
+                    QueuedCall(
+                        "run_inference_shard",
+                        [job.id, index, plan],
+                        job_id=f"{job.id}:shard:{index}",
+                    )
+                    for index in range(len(shard_ranges))
+                ],
+                estimate.priority,
+            )
+        else:
+            await get_fair_scheduler().submit(
+                arq_pool,
+                job,
+                "run_inference",
+                job.id,
+                model.model_path,
+                input_molecule.coordinates_path,
+                output_file_path,
+                input_molecule_id,
+                model.project_id,
+                atomistic_file_path,
+                reference_file_path,
+                model_id,
+                priority=estimate.priority,
+            )
+
+        await submission.bind(job.id)
+    except BaseException:
+        await submission.release()
+        raise
 
     return {
         "job_id": job.id,
@@ -313,6 +1339,125 @@ async def run_inference(
     }
 
 
+@router.post("/{model_id}/inference/batch", response_model=TrainingJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def run_batch_inference(
+    model_id: str,
+    request: BatchInferenceRequest,
+    db: DbSession,
+    current_user: CurrentUser,
+    arq_pool: ArqPool,
+    idempotency_key: str | None = Header(None, alias="Idempotency-Key"),
+) -> TrainingJobResponse:
+    stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+    result = await db.execute(stmt)
+    model = result.scalar_one_or_none()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    project_repo = ProjectRepository(db)
+    if not await project_repo.user_has_access(model.project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    if not model.is_trained or not model.model_path:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Model is not trained yet",
+        )
+
+    if request.all_coarse_grained == bool(request.molecule_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide either molecule_ids or all_coarse_grained",
+        )
+
+    molecules = await _get_batch_molecules(
+        db, model.project_id, request.molecule_ids, request.all_coarse_grained
+    )
+
+    atomistic_molecule_stmt = select(Molecule).where(
+        Molecule.id == model.atomistic_molecule_id
+    )
+    atomistic_result = await db.execute(atomistic_molecule_stmt)
+    atomistic_molecule = atomistic_result.scalar_one_or_none()
+
+    atomistic_file_path = atomistic_molecule.file_path if atomistic_molecule else None
+
+    submission, duplicate = await _claim_job_submission(
+        db,
+        current_user.id,
+        JobType.BATCH_INFERENCE,
+        model_id,
+        {
+            "model_path": model.model_path,
+            "molecule_ids": [molecule.id for molecule in molecules],
+        },
+        idempotency_key,
+    )
+    if duplicate:
+        return TrainingJobResponse(
+            job_id=duplicate.id,
+            model_id=model_id,
+            status=duplicate.status.value,
+        )
+
+    try:
+        features = _inference_features(model, molecules, atomistic_molecule)
+        estimate = await get_cost_model_service().estimate(
+            db, JobType.BATCH_INFERENCE, features
+        )
+
+        job = Job(
+            job_type=JobType.BATCH_INFERENCE,
+            status=JobStatus.PENDING,
+            user_id=current_user.id,
+            project_id=model.project_id,
+            model_id=model_id,
+            input_params={
+                "molecule_ids": [molecule.id for molecule in molecules],
+                "all_coarse_grained": request.all_coarse_grained,
+                "model_path": model.model_path,
+                "version": model.version,
+                **estimate.input_params(features),
+            },
+        )
+        db.add(job)
+        await db.flush()
+        await db.refresh(job)
+
+        job.status = JobStatus.QUEUED
+        await db.commit()
+
+        await get_fair_scheduler().submit(
+            arq_pool,
+            job,
+            "run_batch_inference",
+            job.id,
+            model.model_path,
+            _batch_inference_inputs(molecules),
+            model.project_id,
+            atomistic_file_path,
+            priority=estimate.priority,
+        )
+
+        await submission.bind(job.id)
+    except BaseException:
+        await submission.release()
+        raise
+
+    return TrainingJobResponse(
+        job_id=job.id,
+        model_id=model_id,
+        status=job.status.value,
+    )
+
+
 @router.delete("/{model_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_model(
     model_id: str,
@@ -336,12 +1481,229 @@ async def delete_model(
             detail="Model not found",
         )
 
+    versions_stmt = select(GlimpsModelVersion.model_path).where(
+        GlimpsModelVersion.model_id == model_id
+    )
+    versions_result = await db.execute(versions_stmt)
+    artifact_paths = set(versions_result.scalars().all())
     if model.model_path:
-        storage = get_file_storage()
+        artifact_paths.add(model.model_path)
+
+    storage = get_file_storage()
+    model_cache = get_model_cache()
+    for artifact_path in artifact_paths:
+        model_cache.evict(artifact_path)
         try:
-            await storage.delete(model.model_path)
+            await storage.delete(artifact_path)
         except Exception:
             pass
 
+    await invalidate_inference_cache(model_id)
+
     await db.delete(model)
     await db.flush()
+
+
+@router.delete("/{model_id}/inference-cache")
+async def clear_inference_cache(
+    model_id: str,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> dict:
+    stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+    result = await db.execute(stmt)
+    model = result.scalar_one_or_none()
+
+    if not model:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    project_repo = ProjectRepository(db)
+    if not await project_repo.user_has_access(model.project_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Model not found",
+        )
+
+    invalidated = await invalidate_inference_cache(model_id)
+    return {"model_id": model_id, "invalidated": invalidated}
+
+
+async def _claim_job_submission(
+    db: DbSession,
+    user_id: str,
+    job_type: JobType,
+    model_id: str,
+    params: dict,
+    idempotency_key: str | None,
+) -> tuple[JobSubmission, Job | None]:
+    submission = JobSubmission(
+        user_id, submission_fingerprint(job_type, model_id, params), idempotency_key
+    )
+
+    async def is_active(job_id: str) -> bool:
+        job = await db.get(Job, job_id)
+        return job is not None and job.status in (
+            JobStatus.PENDING,
+            JobStatus.QUEUED,
+            JobStatus.RUNNING,
+        )
+
+    try:
+        existing_id = await submission.claim(is_active)
+    except JobSubmissionInProgressError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        ) from e
+
+    if existing_id is None:
+        return submission, None
+
+    return submission, await db.get(Job, existing_id)
+
+
+async def _get_project_molecule(
+    db: DbSession, molecule_id: str, project_id: str, label: str
+) -> Molecule:
+    stmt = select(Molecule).where(Molecule.id == molecule_id)
+    result = await db.execute(stmt)
+    molecule = result.scalar_one_or_none()
+
+    if not molecule or molecule.project_id != project_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{label} not found in this project",
+        )
+
+    if not molecule.coordinates_path:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{label} has no coordinates",
+        )
+
+    return molecule
+
+
+async def _get_batch_molecules(
+    db: DbSession,
+    project_id: str,
+    molecule_ids: list[str] | None,
+    all_coarse_grained: bool,
+) -> list[Molecule]:
+    molecules_stmt = select(Molecule).where(Molecule.project_id == project_id)
+    if all_coarse_grained:
+        molecules_stmt = molecules_stmt.where(
+            Molecule.molecule_type == MoleculeType.COARSE_GRAINED,
+            Molecule.coordinates_path.is_not(None),
+        ).order_by(Molecule.created_at)
+    else:
+        molecules_stmt = molecules_stmt.where(Molecule.id.in_(molecule_ids))
+    molecules_result = await db.execute(molecules_stmt)
+    molecules = list(molecules_result.scalars().all())
+
+    if not all_coarse_grained:
+        found = {molecule.id: molecule for molecule in molecules}
+        missing = [mid for mid in dict.fromkeys(molecule_ids) if mid not in found]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Molecules not found in this project: {', '.join(missing)}",
+            )
+        molecules = [found[mid] for mid in dict.fromkeys(molecule_ids)]
+
+    without_coordinates = [m.id for m in molecules if not m.coordinates_path]
+    if without_coordinates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Molecules have no coordinates: {', '.join(without_coordinates)}",
+        )
+
+    if not molecules:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No coarse-grained molecules with coordinates in this project",
+        )
+
+    if len(molecules) > settings.batch_inference_max_inputs:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Batch inference is limited to {settings.batch_inference_max_inputs} "
+                "molecules per job"
+            ),
+        )
+
+    return molecules
+
+
+def _batch_inference_inputs(molecules: list[Molecule]) -> list[dict[str, str]]:
+    return [
+        {
+            "molecule_id": molecule.id,
+            "name": molecule.name,
+            "coordinates_path": molecule.coordinates_path,
+        }
+        for molecule in molecules
+    ]
+
+
+def _training_features(
+    cg_molecule: Molecule,
+    atomistic_molecule: Molecule,
+    glimps_options: dict[str, bool] | None,
+    n_frames: int | None = None,
+) -> CostFeatures:
+    return CostFeatures(
+        n_frames=n_frames or cg_molecule.n_frames or 1,
+        n_cg_atoms=cg_molecule.n_atoms,
+        n_atoms=atomistic_molecule.n_atoms,
+        options=glimps_options or {},
+    )
+
+
+def _inference_features(
+    model: GlimpsModel,
+    molecules: list[Molecule],
+    atomistic_molecule: Molecule | None = None,
+    glimps_options: dict[str, bool] | None = None,
+    n_frames: int | None = None,
+) -> list[CostFeatures]:
+    atomistic_shape = (model.training_metrics or {}).get("atomistic_shape")
+    if atomistic_shape:
+        n_atoms = int(atomistic_shape[1])
+    else:
+        n_atoms = atomistic_molecule.n_atoms if atomistic_molecule else 0
+
+    return [
+        CostFeatures(
+            n_frames=n_frames or molecule.n_frames or 1,
+            n_cg_atoms=molecule.n_atoms,
+            n_atoms=n_atoms,
+            options=glimps_options or model.training_config or {},
+        )
+        for molecule in molecules
+    ]
+
+
+async def _lookup_cached_inference(
+    db: DbSession,
+    project_id: str,
+    model_path: str,
+    input_path: str,
+    options: dict,
+) -> dict | None:
+    cache = get_inference_cache()
+    if cache is None:
+        return None
+
+    try:
+        cached = await cache.lookup_paths(project_id, model_path, input_path, options)
+        if cached and await is_result_available(db, get_file_storage(), cached):
+            return cached
+    except LOOKUP_ERRORS:
+        pass
+
+    return None
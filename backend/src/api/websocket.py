@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Query, WebSocket, WebSocketDisconnect, status
+
+from src.dependencies import authenticate_stream_token
+from src.infrastructure.cache.job_events import get_job_event_broker, stream_job_events
+from src.infrastructure.database.session import async_session_maker
+from src.infrastructure.repositories.project_repository import ProjectRepository
+
+router = APIRouter()
+
+
+@router.websocket("/jobs")
+async def job_events_socket(
+    websocket: WebSocket,
+    token: str | None = Query(None),
+    project_id: str | None = Query(None),
+    last_event_id: str | None = Query(None),
+) -> None:
+    user = await authenticate_stream_token(token)
+    if user is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    if project_id:
+        async with async_session_maker() as db:
+            has_access = await ProjectRepository(db).user_has_access(
+                project_id, user.id
+            )
+        if not has_access:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+
+    await websocket.accept()
+
+    events = stream_job_events(
+        get_job_event_broker(), user.id, project_id, last_event_id
+    )
+    try:
+        async for event in events:
+            await websocket.send_json(event if event is not None else {"type": "ping"})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        await events.aclose()
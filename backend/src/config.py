@@ -18,6 +18,84 @@ class Settings(BaseSettings):
     s3_bucket: str | None = None
     s3_region: str | None = None
 
+    queue_max_connections: int = 50
+    training_worker_max_jobs: int = 2
+    training_worker_job_timeout: int = 12 * 3600
+    training_max_tries: int = 4
+    training_retry_backoff_seconds: float = 30.0
+    training_retry_max_backoff_seconds: float = 900.0
+    training_timeout_margin_seconds: float = 300.0
+    inference_worker_max_jobs: int = 8
+    inference_worker_job_timeout: int = 900
+    training_dispatch_slots: int = 4
+    inference_dispatch_slots: int = 16
+    fair_scheduling_enabled: bool = True
+    fair_user_max_in_flight: int = 4
+    fair_project_max_in_flight: int = 8
+    fair_user_weights: dict[str, float] = {}
+    fair_interactive_weight: float = 4.0
+    fair_bulk_weight: float = 1.0
+    fair_dispatch_interval_seconds: int = 5
+    training_worker_thread_budget: int | None = None
+    inference_worker_thread_budget: int | None = None
+    job_max_threads: dict[str, int] = {"inference": 2, "batch_inference": 2}
+    training_worker_memory_bytes: int | None = None
+    inference_worker_memory_bytes: int | None = None
+    worker_memory_fraction: float = 0.8
+    job_memory_overhead_bytes: int = 256 * 1024 * 1024
+    job_memory_sample_seconds: float = 0.5
+    job_memory_calibration_weight: float = 0.2
+    job_memory_retry_seconds: float = 5.0
+    job_memory_max_deferrals: int = 10
+    cost_model_min_samples: int = 10
+    cost_model_history_limit: int = 500
+    cost_model_refresh_seconds: float = 600.0
+    cost_timeout_multiplier: float = 4.0
+    cost_timeout_min_seconds: int = 900
+    cost_timeout_grace_seconds: int = 30
+    cost_bulk_runtime_seconds: float = 600.0
+    worker_warm_start: bool = True
+    worker_report_ttl_seconds: int = 24 * 3600
+    worker_prefetch_enabled: bool = True
+    worker_prefetch_lookahead: int = 4
+    worker_prefetch_concurrency: int = 2
+    worker_prefetch_interval_seconds: float = 1.0
+    worker_scratch_path: str | None = None
+    worker_scratch_bytes: int = 20 * 1024**3
+    job_heartbeat_interval_seconds: float = 15.0
+    job_heartbeat_timeout_seconds: float = 300.0
+    job_reaper_max_requeues: int = 2
+    job_progress_flush_seconds: float = 5.0
+    job_progress_ttl_seconds: int = 24 * 3600
+    job_events_stream_length: int = 1000
+    job_events_heartbeat_seconds: float = 15.0
+    job_dedup_ttl_seconds: int = 24 * 3600
+    job_idempotency_ttl_seconds: int = 24 * 3600
+    job_submission_claim_seconds: int = 30
+    job_submission_wait_seconds: float = 10.0
+
+    sweep_max_workers: int | None = None
+    inference_chunk_frames: int = 32
+    inference_pipeline_depth: int = 2
+    inference_shard_frames: int = 10000
+    inference_max_shards: int = 8
+    batch_inference_max_inputs: int = 500
+    inference_cache_enabled: bool = True
+    inference_cache_ttl_seconds: int = 7 * 24 * 3600
+    cache_affinity_enabled: bool = True
+    cache_affinity_wait_seconds: float = 2.0
+    cache_affinity_retry_seconds: float = 0.25
+    cache_affinity_max_deferrals: int = 3
+    cache_affinity_advertise_seconds: float = 1.0
+    cache_affinity_ttl_seconds: float = 5.0
+
+    transform_max_frames: int = 16
+    transform_max_atoms: int = 10000
+    transform_timeout_seconds: float = 10.0
+    transform_max_workers: int = 2
+    transform_max_pending: int = 8
+    transform_model_cache_size: int = 4
+
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
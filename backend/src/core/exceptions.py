@@ -22,6 +22,14 @@ class StorageError(DomainError):
     pass
 
 
+class JobCancelledError(DomainError):
+    pass
+
+
+class JobSubmissionInProgressError(DomainError):
+    pass
+
+
 class GlimpsError(DomainError):
     pass
 
@@ -34,5 +42,17 @@ class TrainingError(GlimpsError):
     pass
 
 
+class TrainingInterruptedError(TrainingError):
+    pass
+
+
 class InferenceError(GlimpsError):
     pass
+
+
+class TransformCapacityError(InferenceError):
+    pass
+
+
+class TransformTimeoutError(InferenceError):
+    pass
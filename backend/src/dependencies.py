@@ -1,5 +1,6 @@
 from typing import Annotated, AsyncGenerator
 
+from arq.connections import ArqRedis
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from src.core.security import decode_access_token
 from src.domain.entities.user import User
 from src.infrastructure.database.session import async_session_maker
+from src.infrastructure.queue.arq_pool import get_arq_pool
 from src.infrastructure.repositories.user_repository import UserRepository
 
 security = HTTPBearer()
@@ -26,7 +28,10 @@ async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> User:
-    token = credentials.credentials
+    return await authenticate_token(credentials.credentials, db)
+
+
+async def authenticate_token(token: str, db: AsyncSession) -> User:
     payload = decode_access_token(token)
     if payload is None:
         raise HTTPException(
@@ -59,5 +64,17 @@ async def get_current_user(
     return user
 
 
+async def authenticate_stream_token(token: str | None) -> User | None:
+    if not token:
+        return None
+
+    async with async_session_maker() as db:
+        try:
+            return await authenticate_token(token, db)
+        except HTTPException:
+            return None
+
+
 DbSession = Annotated[AsyncSession, Depends(get_db)]
 CurrentUser = Annotated[User, Depends(get_current_user)]
+ArqPool = Annotated[ArqRedis, Depends(get_arq_pool)]
@@ -0,0 +1,258 @@
+import asyncio
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.glimps.adapter import FIT_STAGES
+from src.glimps.cost_model import (
+    INFERENCE_COST,
+    TRAINING_COST,
+    CostFeatures,
+    RuntimeModel,
+    prior_runtime_seconds,
+)
+from src.infrastructure.cache.memory_calibration import calibration_factor
+from src.infrastructure.cache.redis_client import get_redis
+from src.infrastructure.database.models.job import Job, JobStatus, JobType
+from src.infrastructure.database.models.model_version import GlimpsModelVersion
+from src.infrastructure.queue.queues import (
+    BULK,
+    priority_for_job_type,
+    queue_for_job_type,
+    queue_limits,
+)
+
+JOB_TYPE_COSTS = {
+    JobType.TRAINING: TRAINING_COST,
+    JobType.SWEEP: TRAINING_COST,
+    JobType.BENCHMARK: INFERENCE_COST,
+    JobType.INFERENCE: INFERENCE_COST,
+    JobType.BATCH_INFERENCE: INFERENCE_COST,
+    JobType.FILE_PROCESSING: INFERENCE_COST,
+}
+
+
+@dataclass
+class CostEstimate:
+    job_type: JobType
+    runtime_seconds: float
+    memory_estimate_bytes: int
+    memory_bytes: int
+    source: str
+    n_samples: int
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def queue_name(self) -> str:
+        return queue_for_job_type(self.job_type)
+
+    @property
+    def timeout_seconds(self) -> int:
+        return int(
+            min(
+                queue_limits()[self.queue_name]["job_timeout"],
+                max(
+                    settings.cost_timeout_min_seconds,
+                    self.runtime_seconds * settings.cost_timeout_multiplier,
+                ),
+            )
+        )
+
+    @property
+    def priority(self) -> str:
+        if self.runtime_seconds > settings.cost_bulk_runtime_seconds:
+            return BULK
+        return priority_for_job_type(self.job_type)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "runtime_seconds": round(self.runtime_seconds, 1),
+            "memory_bytes": self.memory_bytes,
+            "timeout_seconds": self.timeout_seconds,
+            "queue_name": self.queue_name,
+            "priority": self.priority,
+            "source": self.source,
+            "n_samples": self.n_samples,
+            "stage_seconds": self.stage_seconds,
+        }
+
+    def input_params(self, features: list[CostFeatures]) -> dict[str, Any]:
+        return {
+            "memory_estimate_bytes": self.memory_estimate_bytes,
+            "estimate": self.to_dict(),
+            "cost_features": [asdict(f) for f in features],
+        }
+
+
+def _training_sample(
+    metrics: dict[str, Any], options: dict[str, bool] | None
+) -> CostFeatures | None:
+    cg_shape = metrics.get("cg_shape")
+    atomistic_shape = metrics.get("atomistic_shape")
+    if not cg_shape or not atomistic_shape or len(cg_shape) < 2:
+        return None
+
+    return CostFeatures(
+        n_frames=int(metrics.get("n_training_frames") or cg_shape[0]),
+        n_cg_atoms=int(cg_shape[1]),
+        n_atoms=int(atomistic_shape[1]),
+        options=options or {},
+    )
+
+
+class CostModelService:
+    def __init__(self, refresh_seconds: float):
+        self._refresh_seconds = refresh_seconds
+        self._models: dict[str, RuntimeModel] = {}
+        self._fitted_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self, db: AsyncSession, force: bool = False) -> None:
+        async with self._lock:
+            if (
+                not force
+                and self._fitted_at is not None
+                and time.monotonic() - self._fitted_at < self._refresh_seconds
+            ):
+                return
+
+            samples = await self._load_history(db)
+            self._models = {
+                name: RuntimeModel.fit(history)
+                for name, history in samples.items()
+                if len(history) >= settings.cost_model_min_samples
+            }
+            self._fitted_at = time.monotonic()
+
+    async def estimate(
+        self,
+        db: AsyncSession,
+        job_type: JobType,
+        features: list[CostFeatures],
+        parallel: int = 1,
+    ) -> CostEstimate:
+        try:
+            await self.refresh(db)
+        except SQLAlchemyError:
+            await db.rollback()
+        except ValueError:
+            pass
+
+        kind = JOB_TYPE_COSTS[job_type]
+        model = self._models.get(kind)
+        runtimes = [
+            model.predict(f) if model else prior_runtime_seconds(kind, f)
+            for f in features
+        ]
+        parallel = max(1, min(parallel, len(features)))
+
+        stage_seconds = {}
+        if kind == TRAINING_COST and len(features) == 1:
+            stage_models = [self._models.get(f"stage:{stage}") for stage in FIT_STAGES]
+            if all(stage_models):
+                stage_seconds = {
+                    stage: round(stage_model.predict(features[0]), 1)
+                    for stage, stage_model in zip(FIT_STAGES, stage_models, strict=True)
+                }
+
+        memory_estimate = max((f.memory_bytes(kind) for f in features), default=0)
+        memory_estimate *= parallel
+
+        return CostEstimate(
+            job_type=job_type,
+            runtime_seconds=sum(runtimes) / parallel,
+            memory_estimate_bytes=memory_estimate,
+            memory_bytes=int(
+                memory_estimate * await calibration_factor(get_redis(), job_type)
+            ),
+            source="history" if model else "default",
+            n_samples=model.n_samples if model else 0,
+            stage_seconds=stage_seconds,
+        )
+
+    def combine(self, job_type: JobType, estimates: list[CostEstimate]) -> CostEstimate:
+        return CostEstimate(
+            job_type=job_type,
+            runtime_seconds=sum(e.runtime_seconds for e in estimates),
+            memory_estimate_bytes=max(e.memory_estimate_bytes for e in estimates),
+            memory_bytes=max(e.memory_bytes for e in estimates),
+            source=(
+                "history"
+                if all(e.source == "history" for e in estimates)
+                else "default"
+            ),
+            n_samples=min(e.n_samples for e in estimates),
+            stage_seconds=estimates[0].stage_seconds,
+        )
+
+    async def _load_history(
+        self, db: AsyncSession
+    ) -> dict[str, list[tuple[CostFeatures, float]]]:
+        samples: dict[str, list[tuple[CostFeatures, float]]] = {
+            TRAINING_COST: [],
+            INFERENCE_COST: [],
+            **{f"stage:{stage}": [] for stage in FIT_STAGES},
+        }
+
+        versions = await db.execute(
+            select(
+                GlimpsModelVersion.training_config, GlimpsModelVersion.training_metrics
+            )
+            .where(GlimpsModelVersion.update_mode.in_(("full", "sweep")))
+            .order_by(GlimpsModelVersion.created_at.desc())
+            .limit(settings.cost_model_history_limit)
+        )
+        for options, metrics in versions.all():
+            metrics = metrics or {}
+            features = _training_sample(metrics, options)
+            duration = metrics.get("training_duration_seconds")
+            if features is None or not duration:
+                continue
+
+            samples[TRAINING_COST].append((features, float(duration)))
+            for stage, seconds in (metrics.get("stage_seconds") or {}).items():
+                if f"stage:{stage}" in samples:
+                    samples[f"stage:{stage}"].append((features, float(seconds)))
+
+        jobs = await db.execute(
+            select(Job.input_params, Job.started_at, Job.completed_at)
+            .where(
+                Job.job_type == JobType.INFERENCE,
+                Job.status == JobStatus.COMPLETED,
+                Job.started_at.is_not(None),
+                Job.completed_at.is_not(None),
+            )
+            .order_by(Job.completed_at.desc())
+            .limit(settings.cost_model_history_limit)
+        )
+        for params, started_at, completed_at in jobs.all():
+            cost_features = (params or {}).get("cost_features") or []
+            if len(cost_features) != 1 or (params or {}).get("n_shards", 1) > 1:
+                continue
+
+            runtime = (completed_at - started_at).total_seconds()
+            if runtime > 0:
+                samples[INFERENCE_COST].append(
+                    (CostFeatures(**cost_features[0]), runtime)
+                )
+
+        return samples
+
+
+_cost_model_service_instance: CostModelService | None = None
+
+
+def get_cost_model_service() -> CostModelService:
+    global _cost_model_service_instance
+
+    if _cost_model_service_instance is None:
+        _cost_model_service_instance = CostModelService(
+            refresh_seconds=settings.cost_model_refresh_seconds
+        )
+
+    return _cost_model_service_instance
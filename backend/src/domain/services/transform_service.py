@@ -0,0 +1,80 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.config import settings
+from src.core.exceptions import TransformCapacityError, TransformTimeoutError
+from src.glimps.adapter import GlimpsAdapter
+
+
+def _timed_transform(
+    adapter: GlimpsAdapter, coords: NDArray[np.floating]
+) -> tuple[NDArray[np.floating], float]:
+    start_time = time.perf_counter()
+    result = adapter.transform(coords)
+    return result, time.perf_counter() - start_time
+
+
+class TransformService:
+    def __init__(self, max_workers: int, max_pending: int, timeout_seconds: float):
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="glimps-transform"
+        )
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._timeout_seconds = timeout_seconds
+
+    async def transform(
+        self, adapter: GlimpsAdapter, coords: NDArray[np.floating]
+    ) -> tuple[NDArray[np.floating], float]:
+        if not self._slots.acquire(blocking=False):
+            raise TransformCapacityError(
+                "Transform capacity exhausted, submit an inference job instead"
+            )
+
+        try:
+            future = self._executor.submit(_timed_transform, adapter, coords)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        try:
+            return await asyncio.wait_for(
+                asyncio.wrap_future(future), self._timeout_seconds
+            )
+        except TimeoutError:
+            raise TransformTimeoutError(
+                f"Transform did not finish within {self._timeout_seconds:g}s, "
+                "submit an inference job instead"
+            ) from None
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_transform_service_instance: TransformService | None = None
+
+
+def get_transform_service() -> TransformService:
+    global _transform_service_instance
+
+    if _transform_service_instance is None:
+        _transform_service_instance = TransformService(
+            max_workers=settings.transform_max_workers,
+            max_pending=settings.transform_max_pending,
+            timeout_seconds=settings.transform_timeout_seconds,
+        )
+
+    return _transform_service_instance
+
+
+def shutdown_transform_service() -> None:
+    global _transform_service_instance
+
+    if _transform_service_instance is not None:
+        _transform_service_instance.shutdown()
+        _transform_service_instance = None
@@ -1,9 +1,11 @@
+from collections.abc import Iterator
 from typing import Callable, Protocol
 
 import numpy as np
 from numpy.typing import NDArray
 
-from src.core.exceptions import ModelNotTrainedError
+from src.core.exceptions import ModelNotTrainedError, TrainingError
+from src.glimps.incremental import MAX_STATISTICS_BYTES, RegressionStatistics
 
 
 class GlimpsModelProtocol(Protocol):
@@ -26,11 +28,22 @@ class GlimpsModelProtocol(Protocol):
 
 ProgressCallback = Callable[[float, str], None]
 
+FIT_STAGES = ("shave", "project", "refine", "regress")
+
 
 class GlimpsAdapter:
     def __init__(self, model: GlimpsModelProtocol | None = None):
         self._model = model
         self._is_fitted = False
+        self._n_training_frames = 0
+        self._xy_statistics: RegressionStatistics | None = None
+        self._yx_statistics: RegressionStatistics | None = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop("_xy_statistics", None)
+        state.pop("_yx_statistics", None)
+        return state
 
     @classmethod
     def create_default(cls) -> "GlimpsAdapter":
@@ -64,12 +77,146 @@ class GlimpsAdapter:
 
         self._model.fit(cg_coords, atomistic_coords)
         self._is_fitted = True
+        self._n_training_frames = 0
+        self._xy_statistics = None
+        self._yx_statistics = None
+
+        if self.supports_partial_fit:
+            self._accumulate(cg_coords, atomistic_coords)
 
         if progress_callback:
             progress_callback(100.0, "Training complete")
 
         return self
 
+    def fit_stages(
+        self,
+        cg_coords: NDArray[np.float64],
+        atomistic_coords: NDArray[np.float64],
+        resume_after: str | None = None,
+    ) -> Iterator[str]:
+        from mdplus import utils
+        from mdplus.multiscale import ENM, PCA, LinearRegression, Shave, Triangulate
+
+        if self._model is None:
+            raise ValueError("No model provided")
+
+        model = self._model
+        x = utils.check_dimensions(cg_coords, ensure_traj=True)
+        y = utils.check_dimensions(atomistic_coords, ensure_traj=True)
+        if len(x) != len(y):
+            raise ValueError("CG and atomistic coordinates must be matched frames")
+
+        done = FIT_STAGES.index(resume_after) + 1 if resume_after else 0
+        if done == len(FIT_STAGES):
+            return
+
+        model.upscaling = x.shape[1] < y.shape[1]
+
+        if done < 1:
+            if model.shave:
+                shaver = Shave()
+                if model.upscaling:
+                    shaver.fit(y)
+                    model.y_shaver = shaver
+                else:
+                    shaver.fit(x)
+                    model.x_shaver = shaver
+            yield "shave"
+
+        if model.x_shaver is not None:
+            x = model.x_shaver.transform(x)
+        if model.y_shaver is not None:
+            y = model.y_shaver.transform(y)
+
+        if done < 2:
+            if model.use_pca:
+                model.n_components = min(len(x), x.shape[1] * 3, y.shape[1] * 3)
+                if model.n_components < 2:
+                    raise TrainingError("Insufficient samples for fitting")
+                model.pca_x = PCA(n_components=model.n_components)
+                model.pca_y = PCA(n_components=model.n_components)
+                model.pca_x.fit(x)
+                model.pca_y.fit(y)
+            else:
+                model.x_fitter = utils.Procrustes()
+                model.y_fitter = utils.Procrustes()
+                model.x_fitter.fit(x)
+                model.y_fitter.fit(y)
+            yield "project"
+
+        if done < 3:
+            if model.refine:
+                model.x_refiner = ENM()
+                model.x_refiner.fit(x)
+                model.y_refiner = ENM()
+                model.y_refiner.fit(y)
+            yield "refine"
+
+        if model.use_pca:
+            x_scores = model.pca_x.transform(x)
+            y_scores = model.pca_y.transform(y)
+        elif model.triangulate:
+            x_scores = model.x_fitter.transform(x)
+            y_scores = model.y_fitter.transform(y)
+        else:
+            x_scores = model.x_fitter.transform(x).reshape((len(x), -1))
+            y_scores = model.y_fitter.transform(y).reshape((len(y), -1))
+
+        if model.triangulate:
+            model.xy_triangulator = Triangulate()
+            model.xy_triangulator.fit(x_scores, y_scores)
+            model.yx_triangulator = Triangulate()
+            model.yx_triangulator.fit(y_scores, x_scores)
+        else:
+            model.xy_regressor = LinearRegression().fit(x_scores, y_scores)
+            model.yx_regressor = LinearRegression().fit(y_scores, x_scores)
+        model.trained = True
+
+        self._is_fitted = True
+        self._n_training_frames = 0
+        self._xy_statistics = None
+        self._yx_statistics = None
+
+        if self.supports_partial_fit:
+            self._accumulate(cg_coords, atomistic_coords)
+        yield "regress"
+
+    def partial_fit(
+        self,
+        cg_coords: NDArray[np.float64],
+        atomistic_coords: NDArray[np.float64],
+        progress_callback: ProgressCallback | None = None,
+        base_cg_coords: NDArray[np.float64] | None = None,
+        base_atomistic_coords: NDArray[np.float64] | None = None,
+    ) -> "GlimpsAdapter":
+        if not self._is_fitted:
+            raise ModelNotTrainedError("Model not fitted")
+
+        if not self.supports_partial_fit:
+            raise TrainingError(
+                "Model configuration does not support incremental updates"
+            )
+
+        if progress_callback:
+            progress_callback(0.0, "Starting incremental update...")
+
+        if self.xy_statistics is None:
+            if base_cg_coords is None or base_atomistic_coords is None:
+                raise TrainingError(
+                    "Original training data is required to seed incremental statistics"
+                )
+            self._n_training_frames = 0
+            self._accumulate(base_cg_coords, base_atomistic_coords)
+
+        self._accumulate(cg_coords, atomistic_coords, update_refiners=True)
+        self._solve_regressors()
+
+        if progress_callback:
+            progress_callback(100.0, "Incremental update complete")
+
+        return self
+
     def transform(
         self,
         cg_coords: NDArray[np.float64],
@@ -77,6 +224,11 @@ class GlimpsAdapter:
         if not self._is_fitted:
             raise ModelNotTrainedError("Model not fitted")
 
+        if getattr(self._model, "use_pca", False) and self._is_single_frame(cg_coords):
+            frames = np.asarray(cg_coords).reshape((1, -1, 3))
+            result = self._model.transform(np.concatenate([frames, frames]))[:1]
+            return result[0] if np.ndim(cg_coords) == 2 else result
+
         return self._model.transform(cg_coords)
 
     def inverse_transform(
@@ -91,3 +243,109 @@ class GlimpsAdapter:
     @property
     def is_fitted(self) -> bool:
         return self._is_fitted
+
+    @property
+    def supports_partial_fit(self) -> bool:
+        if getattr(self._model, "xy_regressor", None) is None:
+            return False
+        if getattr(self._model, "triangulate", False):
+            return False
+
+        n_x, n_y = self._score_dimensions()
+        return RegressionStatistics.estimate_bytes(n_x, n_y) <= MAX_STATISTICS_BYTES
+
+    @property
+    def n_training_frames(self) -> int:
+        return getattr(self, "_n_training_frames", 0)
+
+    @property
+    def xy_statistics(self) -> RegressionStatistics | None:
+        return getattr(self, "_xy_statistics", None)
+
+    @property
+    def yx_statistics(self) -> RegressionStatistics | None:
+        return getattr(self, "_yx_statistics", None)
+
+    def restore_statistics(
+        self,
+        xy_statistics: RegressionStatistics | None,
+        yx_statistics: RegressionStatistics | None,
+    ) -> None:
+        self._xy_statistics = xy_statistics
+        self._yx_statistics = yx_statistics
+
+    @staticmethod
+    def _is_single_frame(coords: NDArray[np.float64]) -> bool:
+        return np.ndim(coords) == 2 or (np.ndim(coords) == 3 and len(coords) == 1)
+
+    def _score_dimensions(self) -> tuple[int, int]:
+        model = self._model
+        if model.use_pca:
+            return int(model.pca_x.n_components), int(model.pca_y.n_components)
+        return 3 * len(model.x_fitter.mean), 3 * len(model.y_fitter.mean)
+
+    def _accumulate(
+        self,
+        cg_coords: NDArray[np.float64],
+        atomistic_coords: NDArray[np.float64],
+        update_refiners: bool = False,
+    ) -> None:
+        from mdplus import utils
+
+        model = self._model
+        x = utils.check_dimensions(cg_coords, ensure_traj=True)
+        y = utils.check_dimensions(atomistic_coords, ensure_traj=True)
+        if len(x) != len(y):
+            raise ValueError("CG and atomistic coordinates must be matched frames")
+        if len(x) == 0:
+            raise ValueError("No frames provided")
+
+        if model.x_shaver is not None:
+            x = model.x_shaver.transform(x)
+        if model.y_shaver is not None:
+            y = model.y_shaver.transform(y)
+
+        if model.use_pca:
+            x_scores = model.pca_x.transform(x).reshape((len(x), -1))
+            y_scores = model.pca_y.transform(y).reshape((len(y), -1))
+        else:
+            x_scores = model.x_fitter.transform(x).reshape((len(x), -1))
+            y_scores = model.y_fitter.transform(y).reshape((len(y), -1))
+
+        n_x, n_y = x_scores.shape[1], y_scores.shape[1]
+        if self.xy_statistics is None:
+            self._xy_statistics = RegressionStatistics(n_x, n_y)
+            if RegressionStatistics.estimate_bytes(n_y, n_x) <= MAX_STATISTICS_BYTES:
+                self._yx_statistics = RegressionStatistics(n_y, n_x)
+            else:
+                self._yx_statistics = None
+
+        if update_refiners:
+            self._update_refiner(model.x_refiner, x)
+            self._update_refiner(model.y_refiner, y)
+
+        self._xy_statistics.update(x_scores, y_scores)
+        if self.yx_statistics is not None:
+            self._yx_statistics.update(y_scores, x_scores)
+        self._n_training_frames = self.n_training_frames + len(x)
+
+    def _update_refiner(self, refiner, coords: NDArray[np.float32]) -> None:
+        if refiner is None or self.n_training_frames == 0:
+            return
+
+        from mdplus import utils
+
+        distances = utils.compute_distances(coords, refiner.restraints)
+        n_old = self.n_training_frames
+        d_ref = (refiner.d_ref * n_old + distances.sum(axis=0)) / (n_old + len(coords))
+        refiner.d_ref = d_ref.astype(np.float32)
+
+    def _solve_regressors(self) -> None:
+        coef, intercept = self._xy_statistics.solve()
+        self._model.xy_regressor.coef_ = coef
+        self._model.xy_regressor.intercept_ = intercept
+
+        if self.yx_statistics is not None:
+            coef, intercept = self._yx_statistics.solve()
+            self._model.yx_regressor.coef_ = coef
+            self._model.yx_regressor.intercept_ = intercept
@@ -0,0 +1,167 @@
+import os
+import resource
+import statistics
+import sys
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, contextmanager
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.glimps.model_serializer import ModelSerializer
+
+DEFAULT_BATCH_SIZES = (1, 8, 32, 128)
+DEFAULT_THREAD_COUNTS = (1, 2, 4)
+DEFAULT_REPEATS = 3
+DEFAULT_CONCURRENCY_LEVELS = (1, 2, 4, 8)
+
+ThreadLimits = Callable[[int], AbstractContextManager[int]]
+
+
+@contextmanager
+def process_thread_limits(threads: int) -> Iterator[int]:
+    from threadpoolctl import threadpool_limits
+
+    with threadpool_limits(limits=threads):
+        yield threads
+
+
+def resident_memory_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return peak_resident_memory_bytes()
+
+
+def peak_resident_memory_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def available_thread_counts(thread_counts: list[int] | tuple[int, ...]) -> list[int]:
+    cpu_count = os.cpu_count() or 1
+    return sorted({min(max(1, t), cpu_count) for t in thread_counts})
+
+
+def make_batch(cg_coords: NDArray[np.floating], batch_size: int) -> NDArray[np.float32]:
+    indices = np.arange(batch_size) % len(cg_coords)
+    return np.ascontiguousarray(cg_coords[indices], dtype=np.float32)
+
+
+def benchmark_model(
+    model_bytes: bytes,
+    cg_coords: NDArray[np.floating],
+    batch_sizes: list[int] | tuple[int, ...] = DEFAULT_BATCH_SIZES,
+    thread_counts: list[int] | tuple[int, ...] = DEFAULT_THREAD_COUNTS,
+    repeats: int = DEFAULT_REPEATS,
+    thread_limits: ThreadLimits | None = None,
+) -> dict[str, Any]:
+    limit_threads = thread_limits or process_thread_limits
+
+    if len(cg_coords) == 0:
+        raise ValueError("No frames provided for benchmarking")
+
+    memory_before = resident_memory_bytes()
+    start_time = time.perf_counter()
+    adapter = ModelSerializer.deserialize(model_bytes)
+    load_seconds = time.perf_counter() - start_time
+    model_resident_bytes = max(0, resident_memory_bytes() - memory_before)
+
+    adapter.transform(make_batch(cg_coords, 1))
+
+    results = []
+    for requested in available_thread_counts(thread_counts):
+        with limit_threads(requested) as threads:
+            for batch_size in sorted(set(batch_sizes)):
+                batch = make_batch(cg_coords, batch_size)
+                timings = []
+                for _ in range(max(1, repeats)):
+                    start_time = time.perf_counter()
+                    adapter.transform(batch)
+                    timings.append(time.perf_counter() - start_time)
+
+                latency = statistics.median(timings)
+                results.append(
+                    {
+                        "threads": threads,
+                        "batch_size": batch_size,
+                        "latency_seconds": latency,
+                        "seconds_per_frame": latency / batch_size,
+                        "frames_per_second": batch_size / latency if latency else None,
+                    }
+                )
+
+    best = max(results, key=lambda r: r["frames_per_second"] or 0.0)
+
+    return {
+        "benchmarked_at": datetime.utcnow().isoformat(),
+        "cpu_count": os.cpu_count(),
+        "repeats": max(1, repeats),
+        "artifact_bytes": len(model_bytes),
+        "load_seconds": load_seconds,
+        "model_resident_bytes": model_resident_bytes,
+        "peak_resident_bytes": peak_resident_memory_bytes(),
+        "results": results,
+        "best": best,
+    }
+
+
+def benchmark_concurrency(
+    model_bytes: bytes,
+    cg_coords: NDArray[np.floating],
+    concurrency_levels: list[int] | tuple[int, ...] = DEFAULT_CONCURRENCY_LEVELS,
+    thread_counts: list[int] | tuple[int, ...] = DEFAULT_THREAD_COUNTS,
+    batch_size: int = 32,
+    batches_per_job: int = 4,
+    thread_limits: ThreadLimits | None = None,
+) -> dict[str, Any]:
+    limit_threads = thread_limits or process_thread_limits
+
+    if len(cg_coords) == 0:
+        raise ValueError("No frames provided for benchmarking")
+
+    adapter = ModelSerializer.deserialize(model_bytes)
+    batch = make_batch(cg_coords, batch_size)
+    adapter.transform(batch[:1])
+
+    def run_job() -> None:
+        for _ in range(max(1, batches_per_job)):
+            adapter.transform(batch)
+
+    results = []
+    for concurrency in sorted({max(1, c) for c in concurrency_levels}):
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for requested in available_thread_counts(thread_counts):
+                with limit_threads(requested) as threads:
+                    start_time = time.perf_counter()
+                    jobs = [executor.submit(run_job) for _ in range(concurrency)]
+                    for job in jobs:
+                        job.result()
+                    elapsed = time.perf_counter() - start_time
+
+                frames = concurrency * max(1, batches_per_job) * batch_size
+                results.append(
+                    {
+                        "concurrency": concurrency,
+                        "threads": threads,
+                        "total_threads": concurrency * threads,
+                        "elapsed_seconds": elapsed,
+                        "frames_per_second": frames / elapsed if elapsed else None,
+                    }
+                )
+
+    best = max(results, key=lambda r: r["frames_per_second"] or 0.0)
+
+    return {
+        "benchmarked_at": datetime.utcnow().isoformat(),
+        "cpu_count": os.cpu_count(),
+        "batch_size": batch_size,
+        "batches_per_job": max(1, batches_per_job),
+        "results": results,
+        "best": best,
+    }
@@ -0,0 +1,72 @@
+import math
+from dataclasses import dataclass, field
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.glimps.memory import inference_memory_bytes, training_memory_bytes
+
+TRAINING_COST = "training"
+INFERENCE_COST = "inference"
+
+PRIOR_OVERHEAD_SECONDS = 5.0
+PRIOR_SECONDS_PER_FRAME_ATOM = {TRAINING_COST: 5e-6, INFERENCE_COST: 1e-4}
+PRIOR_REFINE_SECONDS_PER_ATOM_PAIR = 1e-7
+RIDGE_PENALTY = 1e-3
+
+
+@dataclass
+class CostFeatures:
+    n_frames: int
+    n_cg_atoms: int
+    n_atoms: int
+    options: dict[str, bool] = field(default_factory=dict)
+
+    def vector(self) -> list[float]:
+        return [
+            1.0,
+            math.log(max(self.n_frames, 1)),
+            math.log(max(self.n_cg_atoms, 1)),
+            math.log(max(self.n_atoms, 1)),
+            float(self.options.get("refine", True)),
+            float(self.options.get("pca", False)),
+            float(self.options.get("shave", True)),
+            float(self.options.get("triangulate", False)),
+        ]
+
+    def memory_bytes(self, kind: str) -> int:
+        estimate = (
+            training_memory_bytes if kind == TRAINING_COST else inference_memory_bytes
+        )
+        return estimate(self.n_frames, self.n_cg_atoms, self.n_atoms, self.options)
+
+
+def prior_runtime_seconds(kind: str, features: CostFeatures) -> float:
+    seconds = (
+        PRIOR_OVERHEAD_SECONDS
+        + PRIOR_SECONDS_PER_FRAME_ATOM[kind]
+        * max(features.n_frames, 1)
+        * features.n_atoms
+    )
+    if kind == TRAINING_COST and features.options.get("refine", True):
+        seconds += PRIOR_REFINE_SECONDS_PER_ATOM_PAIR * features.n_atoms**2
+    return seconds
+
+
+class RuntimeModel:
+    def __init__(self, coefficients: NDArray[np.float64], n_samples: int):
+        self.coefficients = coefficients
+        self.n_samples = n_samples
+
+    @classmethod
+    def fit(cls, samples: list[tuple[CostFeatures, float]]) -> "RuntimeModel":
+        x = np.array([features.vector() for features, _ in samples])
+        y = np.log([max(seconds, 1e-3) for _, seconds in samples])
+
+        penalty = RIDGE_PENALTY * np.eye(x.shape[1])
+        penalty[0, 0] = 0.0
+        coefficients = np.linalg.solve(x.T @ x + penalty, x.T @ y)
+        return cls(coefficients, len(samples))
+
+    def predict(self, features: CostFeatures) -> float:
+        return float(np.exp(np.dot(self.coefficients, features.vector())))
@@ -0,0 +1,55 @@
+import numpy as np
+from numpy.typing import NDArray
+
+MAX_STATISTICS_BYTES = 512 * 1024 * 1024
+
+
+class RegressionStatistics:
+    def __init__(self, n_x_features: int, n_y_features: int):
+        self.n_samples = 0
+        self.sum_x = np.zeros(n_x_features, dtype=np.float64)
+        self.sum_y = np.zeros(n_y_features, dtype=np.float64)
+        self.xtx = np.zeros((n_x_features, n_x_features), dtype=np.float64)
+        self.xty = np.zeros((n_x_features, n_y_features), dtype=np.float64)
+
+    @staticmethod
+    def estimate_bytes(n_x_features: int, n_y_features: int) -> int:
+        return 8 * n_x_features * (n_x_features + n_y_features + 1) + 8 * n_y_features
+
+    @property
+    def n_x_features(self) -> int:
+        return int(self.sum_x.shape[0])
+
+    @property
+    def n_y_features(self) -> int:
+        return int(self.sum_y.shape[0])
+
+    def update(self, x: NDArray[np.floating], y: NDArray[np.floating]) -> None:
+        x = np.asarray(x, dtype=np.float64).reshape((len(x), -1))
+        y = np.asarray(y, dtype=np.float64).reshape((len(y), -1))
+        if len(x) != len(y):
+            raise ValueError("x and y must be matched samples")
+        if x.shape[1] != self.n_x_features or y.shape[1] != self.n_y_features:
+            raise ValueError(
+                f"Expected {self.n_x_features} x and {self.n_y_features} y features, "
+                f"got {x.shape[1]} and {y.shape[1]}"
+            )
+
+        self.n_samples += len(x)
+        self.sum_x += x.sum(axis=0)
+        self.sum_y += y.sum(axis=0)
+        self.xtx += x.T @ x
+        self.xty += x.T @ y
+
+    def solve(self) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        if self.n_samples == 0:
+            raise ValueError("No samples accumulated")
+
+        mean_x = self.sum_x / self.n_samples
+        mean_y = self.sum_y / self.n_samples
+        cov_xx = self.xtx - self.n_samples * np.outer(mean_x, mean_x)
+        cov_xy = self.xty - self.n_samples * np.outer(mean_x, mean_y)
+
+        coef, *_ = np.linalg.lstsq(cov_xx, cov_xy, rcond=None)
+        intercept = mean_y - mean_x @ coef
+        return coef.T, intercept
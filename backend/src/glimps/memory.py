@@ -0,0 +1,40 @@
+BYTES_PER_VALUE = 8
+TRAINING_COPIES = 4
+INFERENCE_COPIES = 2
+ENM_MATRICES = 3
+
+
+def model_memory_bytes(
+    n_cg_atoms: int, n_atoms: int, options: dict[str, bool] | None = None
+) -> int:
+    options = options or {}
+    total = BYTES_PER_VALUE * 9 * n_cg_atoms * n_atoms
+    if options.get("refine", True):
+        total += BYTES_PER_VALUE * ENM_MATRICES * (n_cg_atoms**2 + n_atoms**2)
+    if options.get("pca", False):
+        total += BYTES_PER_VALUE * 9 * (n_cg_atoms**2 + n_atoms**2)
+    return total
+
+
+def frames_memory_bytes(n_frames: int, n_cg_atoms: int, n_atoms: int) -> int:
+    return BYTES_PER_VALUE * 3 * max(n_frames, 1) * (n_cg_atoms + n_atoms)
+
+
+def training_memory_bytes(
+    n_frames: int,
+    n_cg_atoms: int,
+    n_atoms: int,
+    options: dict[str, bool] | None = None,
+) -> int:
+    frames = frames_memory_bytes(n_frames, n_cg_atoms, n_atoms)
+    return model_memory_bytes(n_cg_atoms, n_atoms, options) + TRAINING_COPIES * frames
+
+
+def inference_memory_bytes(
+    n_frames: int,
+    n_cg_atoms: int,
+    n_atoms: int,
+    options: dict[str, bool] | None = None,
+) -> int:
+    frames = frames_memory_bytes(n_frames, n_cg_atoms, n_atoms)
+    return model_memory_bytes(n_cg_atoms, n_atoms, options) + INFERENCE_COPIES * frames
@@ -0,0 +1,225 @@
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+DEFAULT_CLASH_DISTANCE = 0.2
+MAX_PER_FRAME_VALUES = 1000
+
+_HALF_SHELL_OFFSETS = np.array(
+    [(0, 0, 0)]
+    + [
+        (dx, dy, dz)
+        for dx in (-1, 0, 1)
+        for dy in (-1, 0, 1)
+        for dz in (-1, 0, 1)
+        if (dx, dy, dz) > (0, 0, 0)
+    ],
+    dtype=np.int64,
+)
+
+
+def bond_length_deviations(
+    coords: NDArray[np.floating],
+    bonds: NDArray[np.integer],
+    reference_lengths: NDArray[np.floating],
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    delta = coords[:, bonds[:, 0]] - coords[:, bonds[:, 1]]
+    lengths = np.sqrt(np.einsum("fbk,fbk->fb", delta, delta))
+    deviation = lengths - reference_lengths
+    rms = np.sqrt(np.mean(deviation * deviation, axis=1))
+    max_abs = np.abs(deviation).max(axis=1)
+    return rms, max_abs
+
+
+def excluded_pair_keys(bonds: NDArray[np.integer], n_atoms: int) -> NDArray[np.int64]:
+    from scipy.sparse import coo_matrix
+
+    if len(bonds) == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    rows = np.concatenate([bonds[:, 0], bonds[:, 1]])
+    cols = np.concatenate([bonds[:, 1], bonds[:, 0]])
+    adjacency = coo_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(n_atoms, n_atoms)
+    ).tocsr()
+    reachable = (adjacency + adjacency @ adjacency).tocoo()
+
+    i, j = reachable.row.astype(np.int64), reachable.col.astype(np.int64)
+    upper = i < j
+    return np.unique(i[upper] * n_atoms + j[upper])
+
+
+def count_clashes(
+    frame: NDArray[np.floating],
+    cutoff: float,
+    excluded_keys: NDArray[np.int64] | None = None,
+) -> int:
+    n_atoms = len(frame)
+    cells = np.floor((frame - frame.min(axis=0)) / cutoff).astype(np.int64)
+    dims = cells.max(axis=0) + 1
+    cell_keys = (cells[:, 0] * dims[1] + cells[:, 1]) * dims[2] + cells[:, 2]
+
+    order = np.argsort(cell_keys, kind="stable")
+    sorted_keys = cell_keys[order]
+
+    n_clashes = 0
+    cutoff_sq = cutoff * cutoff
+    atom_idx = np.arange(n_atoms)
+    for offset in _HALF_SHELL_OFFSETS:
+        neighbor_cells = cells + offset
+        valid = np.all((neighbor_cells >= 0) & (neighbor_cells < dims), axis=1)
+        if not valid.any():
+            continue
+
+        neighbor_keys = (
+            neighbor_cells[valid, 0] * dims[1] + neighbor_cells[valid, 1]
+        ) * dims[2] + neighbor_cells[valid, 2]
+        starts = np.searchsorted(sorted_keys, neighbor_keys, side="left")
+        ends = np.searchsorted(sorted_keys, neighbor_keys, side="right")
+        counts = ends - starts
+        total = int(counts.sum())
+        if total == 0:
+            continue
+
+        first = np.repeat(atom_idx[valid], counts)
+        run_starts = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        second = order[run_starts + np.arange(total)]
+
+        if not offset.any():
+            keep = first < second
+            first, second = first[keep], second[keep]
+
+        delta = frame[first] - frame[second]
+        close = np.einsum("pk,pk->p", delta, delta) < cutoff_sq
+        if not close.any():
+            continue
+
+        lo = np.minimum(first[close], second[close]).astype(np.int64)
+        hi = np.maximum(first[close], second[close]).astype(np.int64)
+        if excluded_keys is not None and len(excluded_keys):
+            keys = lo * n_atoms + hi
+            positions = np.searchsorted(excluded_keys, keys)
+            positions = np.minimum(positions, len(excluded_keys) - 1)
+            n_clashes += int(np.count_nonzero(excluded_keys[positions] != keys))
+        else:
+            n_clashes += len(lo)
+
+    return n_clashes
+
+
+class BackmappingQualityMetrics:
+    def __init__(
+        self,
+        n_atoms: int,
+        bonds: NDArray[np.integer] | None = None,
+        reference_lengths: NDArray[np.floating] | None = None,
+        reference_coords: NDArray[np.floating] | None = None,
+        clash_distance: float = DEFAULT_CLASH_DISTANCE,
+    ):
+        self.n_atoms = n_atoms
+        self.clash_distance = clash_distance
+        self._bonds = None
+        self._reference_lengths = None
+        self._excluded_keys = None
+        if bonds is not None and len(bonds) and reference_lengths is not None:
+            self._bonds = np.asarray(bonds, dtype=np.int64)
+            self._reference_lengths = np.asarray(reference_lengths, dtype=np.float64)
+            self._excluded_keys = excluded_pair_keys(self._bonds, n_atoms)
+        self._reference = reference_coords
+
+        self._bond_rms: list[NDArray[np.float64]] = []
+        self._bond_max: list[NDArray[np.float64]] = []
+        self._clashes: list[NDArray[np.int64]] = []
+        self._rmsd: list[NDArray[np.float64]] = []
+
+    @classmethod
+    def from_template(
+        cls,
+        topology: Any,
+        template_coords: NDArray[np.floating],
+        reference_coords: NDArray[np.floating] | None = None,
+        clash_distance: float = DEFAULT_CLASH_DISTANCE,
+    ) -> "BackmappingQualityMetrics":
+        bonds = np.array(
+            [[bond[0].index, bond[1].index] for bond in topology.bonds],
+            dtype=np.int64,
+        ).reshape((-1, 2))
+        reference_lengths = None
+        if len(bonds):
+            delta = template_coords[bonds[:, 0]] - template_coords[bonds[:, 1]]
+            reference_lengths = np.sqrt((delta * delta).sum(axis=1))
+
+        return cls(
+            n_atoms=topology.n_atoms,
+            bonds=bonds,
+            reference_lengths=reference_lengths,
+            reference_coords=reference_coords,
+            clash_distance=clash_distance,
+        )
+
+    @property
+    def has_topology(self) -> bool:
+        return self._bonds is not None
+
+    def update(self, coords: NDArray[np.floating], frame_offset: int) -> None:
+        coords = np.asarray(coords, dtype=np.float32)
+        if coords.ndim == 2:
+            coords = coords[np.newaxis]
+        if coords.shape[1] != self.n_atoms:
+            raise ValueError(
+                f"Expected {self.n_atoms} atoms for quality metrics, got {coords.shape[1]}"
+            )
+
+        if self.has_topology:
+            rms, max_abs = bond_length_deviations(
+                coords, self._bonds, self._reference_lengths
+            )
+            self._bond_rms.append(rms)
+            self._bond_max.append(max_abs)
+            self._clashes.append(
+                np.array(
+                    [
+                        count_clashes(frame, self.clash_distance, self._excluded_keys)
+                        for frame in coords
+                    ],
+                    dtype=np.int64,
+                )
+            )
+
+        if self._reference is not None:
+            from mdplus.utils import rmsd
+
+            if len(self._reference) == 1:
+                self._rmsd.append(np.atleast_1d(rmsd(coords, self._reference[0])))
+            else:
+                reference = self._reference[frame_offset : frame_offset + len(coords)]
+                self._rmsd.append(
+                    np.array(
+                        [
+                            float(rmsd(x, ref))
+                            for x, ref in zip(coords, reference, strict=True)
+                        ]
+                    )
+                )
+
+    def summary(self) -> dict[str, Any]:
+        result: dict[str, Any] = {"clash_distance_nm": self.clash_distance}
+        series = {
+            "bond_length_rms_deviation_nm": self._bond_rms,
+            "bond_length_max_deviation_nm": self._bond_max,
+            "clash_count": self._clashes,
+            "rmsd_to_reference_nm": self._rmsd,
+        }
+        for name, chunks in series.items():
+            if not chunks:
+                continue
+            values = np.concatenate(chunks)
+            result[name] = {
+                "mean": float(values.mean()),
+                "max": float(values.max()),
+                "p95": float(np.percentile(values, 95)),
+            }
+            if len(values) <= MAX_PER_FRAME_VALUES:
+                result[name]["per_frame"] = values.tolist()
+        return result
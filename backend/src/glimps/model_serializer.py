@@ -13,6 +13,26 @@ class ModelSerializer:
     def deserialize(data: bytes) -> GlimpsAdapter:
         return pickle.loads(data)
 
+    @staticmethod
+    def serialize_checkpoint(adapter: GlimpsAdapter, stage: str) -> bytes:
+        return pickle.dumps({"stage": stage, "adapter": adapter})
+
+    @staticmethod
+    def deserialize_checkpoint(data: bytes) -> tuple[GlimpsAdapter, str]:
+        checkpoint = pickle.loads(data)
+        return checkpoint["adapter"], checkpoint["stage"]
+
+    @staticmethod
+    def serialize_statistics(adapter: GlimpsAdapter) -> bytes | None:
+        if adapter.xy_statistics is None:
+            return None
+        return pickle.dumps({"xy": adapter.xy_statistics, "yx": adapter.yx_statistics})
+
+    @staticmethod
+    def restore_statistics(adapter: GlimpsAdapter, data: bytes) -> None:
+        statistics = pickle.loads(data)
+        adapter.restore_statistics(statistics["xy"], statistics["yx"])
+
     @staticmethod
     def save(adapter: GlimpsAdapter, file_path: Path) -> None:
         data = ModelSerializer.serialize(adapter)
@@ -0,0 +1,107 @@
+import tempfile
+from pathlib import Path
+
+import mdtraj as md
+import numpy as np
+from mdtraj.formats import PDBTrajectoryFile
+from mdtraj.utils import in_units_of
+
+
+def parse_template(pdb_bytes: bytes) -> md.Trajectory | None:
+    try:
+        with tempfile.NamedTemporaryFile(suffix=".pdb", delete=False) as f:
+            f.write(pdb_bytes)
+            temp_path = Path(f.name)
+
+        try:
+            return md.load(str(temp_path))
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    except Exception:
+        return None
+
+
+def create_pdb_from_template(
+    template: md.Trajectory | None, coords: np.ndarray, n_atoms: int
+) -> str:
+    if template is not None:
+        try:
+            new_traj = md.Trajectory(
+                xyz=coords.astype(np.float32),
+                topology=template.topology,
+            )
+
+            with tempfile.NamedTemporaryFile(suffix=".pdb", delete=False) as f:
+                output_path = Path(f.name)
+
+            try:
+                new_traj.save_pdb(str(output_path))
+                return output_path.read_text()
+            finally:
+                output_path.unlink(missing_ok=True)
+
+        except Exception:
+            pass
+
+    return coordinates_to_pdb(coords, n_atoms)
+
+
+class StreamingPdbWriter:
+    def __init__(self, template: md.Trajectory | None, n_frames: int):
+        self._template = template
+        self._n_frames = n_frames
+        self._first_frame: np.ndarray | None = None
+        self._file: PDBTrajectoryFile | None = None
+        self._path: Path | None = None
+
+    def write(self, coords: np.ndarray, start: int) -> None:
+        if self._first_frame is None:
+            self._first_frame = np.array(coords[:1])
+            if self._template is not None and self._template.n_atoms == coords.shape[1]:
+                with tempfile.NamedTemporaryFile(suffix=".pdb", delete=False) as f:
+                    self._path = Path(f.name)
+                self._file = PDBTrajectoryFile(
+                    str(self._path), "w", force_overwrite=True
+                )
+
+        if self._file is None:
+            return
+
+        try:
+            for offset, frame in enumerate(coords.astype(np.float32)):
+                self._file.write(
+                    in_units_of(frame, "nanometers", self._file.distance_unit),
+                    self._template.topology,
+                    modelIndex=start + offset if self._n_frames > 1 else None,
+                )
+        except Exception:
+            self.discard()
+
+    def render(self) -> str:
+        if self._file is None:
+            return coordinates_to_pdb(self._first_frame, self._first_frame.shape[1])
+
+        self._file.close()
+        try:
+            return self._path.read_text()
+        finally:
+            self._path.unlink(missing_ok=True)
+            self._file = self._path = None
+
+    def discard(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._path.unlink(missing_ok=True)
+        self._file = self._path = None
+
+
+def coordinates_to_pdb(coords: np.ndarray, n_atoms: int) -> str:
+    lines = []
+    for i in range(n_atoms):
+        x, y, z = coords[0][i] * 10
+        lines.append(
+            f"ATOM  {i + 1:5d}  CA  ALA A{i + 1:4d}    {x:8.3f}{y:8.3f}{z:8.3f}  1.00  0.00           C"
+        )
+    lines.append("END")
+    return "\n".join(lines)
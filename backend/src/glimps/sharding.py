@@ -0,0 +1,34 @@
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+
+def shard_frame_ranges(
+    n_frames: int, shard_frames: int, max_shards: int
+) -> list[tuple[int, int]]:
+    if shard_frames <= 0 or n_frames <= shard_frames:
+        return [(0, n_frames)]
+
+    n_shards = min(max(1, max_shards), -(-n_frames // shard_frames))
+    base, extra = divmod(n_frames, n_shards)
+
+    ranges = []
+    start = 0
+    for index in range(n_shards):
+        stop = start + base + (1 if index < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+
+    return ranges
+
+
+def shard_output_path(output_file_path: str, index: int) -> str:
+    output_dir = output_file_path.rsplit("/", 1)[0]
+    return f"{output_dir}/shards/{index:04d}.npy"
+
+
+def open_output_memmap(path: str | Path, n_frames: int, like: NDArray) -> np.memmap:
+    return np.lib.format.open_memmap(
+        path, mode="w+", dtype=like.dtype, shape=(n_frames, *like.shape[1:])
+    )
@@ -0,0 +1,103 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+Chunk = NDArray[np.floating]
+
+
+@dataclass
+class PipelineTimings:
+    read_seconds: float = 0.0
+    compute_seconds: float = 0.0
+    write_seconds: float = 0.0
+    wall_seconds: float = 0.0
+    n_chunks: int = 0
+
+    @property
+    def serial_seconds(self) -> float:
+        return self.read_seconds + self.compute_seconds + self.write_seconds
+
+    @property
+    def overlap_efficiency(self) -> float:
+        bound = max(self.read_seconds, self.compute_seconds, self.write_seconds)
+        if self.serial_seconds <= bound:
+            return 1.0
+        saved = (self.serial_seconds - self.wall_seconds) / (
+            self.serial_seconds - bound
+        )
+        return min(max(saved, 0.0), 1.0)
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "read_seconds": self.read_seconds,
+            "compute_seconds": self.compute_seconds,
+            "write_seconds": self.write_seconds,
+            "wall_seconds": self.wall_seconds,
+            "n_chunks": self.n_chunks,
+            "overlap_efficiency": self.overlap_efficiency,
+        }
+
+
+async def _timed(call: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    def run() -> tuple[Any, float]:
+        start = time.perf_counter()
+        result = call(*args)
+        return result, time.perf_counter() - start
+
+    return await asyncio.to_thread(run)
+
+
+async def run_chunk_pipeline(
+    ranges: Sequence[tuple[int, int]],
+    read: Callable[[int, int], Chunk],
+    compute: Callable[[Chunk, int], Chunk],
+    write: Callable[[Chunk, int], None],
+    depth: int = 2,
+    on_chunk: Callable[[int], Awaitable[None]] | None = None,
+) -> PipelineTimings:
+    timings = PipelineTimings(n_chunks=len(ranges))
+    read_queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, depth))
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, depth))
+
+    async def reader() -> None:
+        for start, stop in ranges:
+            chunk, seconds = await _timed(read, start, stop)
+            timings.read_seconds += seconds
+            await read_queue.put((start, chunk))
+        await read_queue.put(None)
+
+    async def computer() -> None:
+        while (item := await read_queue.get()) is not None:
+            start, chunk = item
+            result, seconds = await _timed(compute, chunk, start)
+            timings.compute_seconds += seconds
+            await write_queue.put((start, result))
+        await write_queue.put(None)
+
+    async def writer() -> None:
+        n_done = 0
+        while (item := await write_queue.get()) is not None:
+            start, result = item
+            _, seconds = await _timed(write, result, start)
+            timings.write_seconds += seconds
+            n_done += len(result)
+            if on_chunk is not None:
+                await on_chunk(n_done)
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(stage()) for stage in (reader, computer, writer)]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    timings.wall_seconds = time.perf_counter() - start
+    return timings
@@ -0,0 +1,143 @@
+import itertools
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.glimps.adapter import GlimpsAdapter
+from src.glimps.model_serializer import ModelSerializer
+
+GLIMPS_OPTION_NAMES = ("pca", "refine", "shave", "triangulate")
+SHARED_ARRAY_NAMES = ("cg_train", "atomistic_train", "cg_holdout", "atomistic_holdout")
+
+_shared_data: dict[str, NDArray[np.float32]] = {}
+_shared_data_dir: str | None = None
+
+
+@dataclass
+class SweepResult:
+    options: dict[str, bool]
+    rmsd_mean: float | None = None
+    rmsd_max: float | None = None
+    fit_seconds: float | None = None
+    inference_seconds_per_frame: float | None = None
+    artifact_path: str | None = None
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def expand_option_grid(grid: dict[str, list[bool]]) -> list[dict[str, bool]]:
+    values = [sorted(set(grid[name])) for name in GLIMPS_OPTION_NAMES]
+    combinations = []
+    seen = set()
+    for combination in itertools.product(*values):
+        options = dict(zip(GLIMPS_OPTION_NAMES, combination, strict=True))
+        if options["triangulate"]:
+            options["pca"] = False
+            options["shave"] = False
+        key = tuple(options[name] for name in GLIMPS_OPTION_NAMES)
+        if key not in seen:
+            seen.add(key)
+            combinations.append(options)
+    return combinations
+
+
+def split_holdout(
+    n_frames: int, holdout_fraction: float, seed: int = 0
+) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+    n_holdout = max(2, int(round(n_frames * holdout_fraction)))
+    if n_frames - n_holdout < 2:
+        raise ValueError(
+            f"A sweep needs at least {n_holdout + 2} frames, got {n_frames}"
+        )
+
+    order = np.random.default_rng(seed).permutation(n_frames)
+    return np.sort(order[n_holdout:]), np.sort(order[:n_holdout])
+
+
+def write_shared_dataset(
+    data_dir: Path,
+    cg_coords: NDArray[np.floating],
+    atomistic_coords: NDArray[np.floating],
+    train_idx: NDArray[np.intp],
+    holdout_idx: NDArray[np.intp],
+) -> None:
+    arrays = {
+        "cg_train": cg_coords[train_idx],
+        "atomistic_train": atomistic_coords[train_idx],
+        "cg_holdout": cg_coords[holdout_idx],
+        "atomistic_holdout": atomistic_coords[holdout_idx],
+    }
+    for name, array in arrays.items():
+        np.save(data_dir / f"{name}.npy", np.ascontiguousarray(array, dtype=np.float32))
+
+
+def init_sweep_worker(data_dir: str) -> None:
+    global _shared_data_dir
+
+    _shared_data.clear()
+    for name in SHARED_ARRAY_NAMES:
+        _shared_data[name] = np.load(Path(data_dir) / f"{name}.npy", mmap_mode="r")
+    _shared_data_dir = data_dir
+
+
+def evaluate_options(
+    options: dict[str, bool],
+    artifact_dir: str,
+    data_dir: str | None = None,
+    threads: int | None = None,
+) -> SweepResult:
+    from mdplus.utils import rmsd
+    from threadpoolctl import threadpool_limits
+
+    result = SweepResult(options=options)
+    try:
+        with threadpool_limits(limits=threads):
+            if data_dir is not None and _shared_data_dir != data_dir:
+                init_sweep_worker(data_dir)
+
+            adapter = GlimpsAdapter.create_with_options(**options)
+
+            start_time = time.perf_counter()
+            adapter.fit(_shared_data["cg_train"], _shared_data["atomistic_train"])
+            result.fit_seconds = time.perf_counter() - start_time
+
+            cg_holdout = _shared_data["cg_holdout"]
+            reference = _shared_data["atomistic_holdout"]
+
+            start_time = time.perf_counter()
+            predicted = adapter.transform(np.asarray(cg_holdout))
+            result.inference_seconds_per_frame = (
+                time.perf_counter() - start_time
+            ) / len(cg_holdout)
+
+            frame_rmsd = np.array(
+                [float(rmsd(predicted[i], reference[i])) for i in range(len(reference))]
+            )
+            result.rmsd_mean = float(frame_rmsd.mean())
+            result.rmsd_max = float(frame_rmsd.max())
+
+            label = "_".join(
+                f"{name}{int(options[name])}" for name in GLIMPS_OPTION_NAMES
+            )
+            artifact_path = Path(artifact_dir) / f"{label}.pkl"
+            ModelSerializer.save(adapter, artifact_path)
+            result.artifact_path = str(artifact_path)
+    except Exception as e:
+        result.error = str(e)
+
+    return result
+
+
+def select_best(results: list[SweepResult]) -> SweepResult | None:
+    scored = [r for r in results if r.error is None and r.rmsd_mean is not None]
+    if not scored:
+        return None
+    return min(
+        scored, key=lambda r: (r.rmsd_mean, r.inference_seconds_per_frame or 0.0)
+    )
@@ -0,0 +1,166 @@
+import hashlib
+import json
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.infrastructure.cache.redis_client import get_redis
+from src.infrastructure.database.models.molecule import Molecule
+from src.infrastructure.storage.file_storage import FileStorage
+
+KEY_PREFIX = "inference_cache"
+LOOKUP_ERRORS = (RedisError, SQLAlchemyError, OSError, ValueError)
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_array(array: NDArray) -> str:
+    array = np.ascontiguousarray(array)
+    digest = hashlib.sha256(f"{array.dtype.str}{array.shape}".encode())
+    digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+def hash_options(options: dict[str, Any]) -> str:
+    return hash_bytes(json.dumps(options, sort_keys=True, default=str).encode())
+
+
+def inference_cache_options(
+    template_path: str | None, reference_path: str | None
+) -> dict[str, Any]:
+    return {"template_path": template_path, "reference_path": reference_path}
+
+
+class InferenceCache:
+    def __init__(self, redis: Redis, ttl_seconds: int):
+        self._redis = redis
+        self._ttl_seconds = ttl_seconds
+
+    @staticmethod
+    def _content_key(path: str) -> str:
+        return f"{KEY_PREFIX}:content:{path}"
+
+    @staticmethod
+    def _model_key(model_id: str) -> str:
+        return f"{KEY_PREFIX}:model:{model_id}"
+
+    @staticmethod
+    def _entry_key(
+        project_id: str, model_hash: str, input_hash: str, options: dict[str, Any]
+    ) -> str:
+        return (
+            f"{KEY_PREFIX}:entry:{project_id}:{model_hash}:{input_hash}:"
+            f"{hash_options(options)}"
+        )
+
+    async def get_content_hash(self, path: str) -> str | None:
+        value = await self._redis.get(self._content_key(path))
+        return value.decode() if isinstance(value, bytes) else value
+
+    async def set_content_hash(self, path: str, digest: str) -> None:
+        await self._redis.set(self._content_key(path), digest, ex=self._ttl_seconds)
+
+    async def get(
+        self,
+        project_id: str,
+        model_hash: str,
+        input_hash: str,
+        options: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        value = await self._redis.get(
+            self._entry_key(project_id, model_hash, input_hash, options)
+        )
+        return json.loads(value) if value else None
+
+    async def lookup_paths(
+        self,
+        project_id: str,
+        model_path: str,
+        input_path: str,
+        options: dict[str, Any],
+    ) -> dict[str, Any] | None:
+        model_hash = await self.get_content_hash(model_path)
+        input_hash = await self.get_content_hash(input_path)
+        if not model_hash or not input_hash:
+            return None
+        return await self.get(project_id, model_hash, input_hash, options)
+
+    async def set(
+        self,
+        project_id: str,
+        model_id: str,
+        model_hash: str,
+        input_hash: str,
+        options: dict[str, Any],
+        result: dict[str, Any],
+    ) -> None:
+        key = self._entry_key(project_id, model_hash, input_hash, options)
+        model_key = self._model_key(model_id)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.set(key, json.dumps(result), ex=self._ttl_seconds)
+            pipe.sadd(model_key, key)
+            pipe.expire(model_key, self._ttl_seconds)
+            await pipe.execute()
+
+    async def discard(
+        self,
+        project_id: str,
+        model_hash: str,
+        input_hash: str,
+        options: dict[str, Any],
+    ) -> None:
+        await self._redis.delete(
+            self._entry_key(project_id, model_hash, input_hash, options)
+        )
+
+    async def invalidate_model(self, model_id: str) -> int:
+        model_key = self._model_key(model_id)
+        keys = await self._redis.smembers(model_key)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            if keys:
+                pipe.delete(*keys)
+            pipe.delete(model_key)
+            await pipe.execute()
+        return len(keys)
+
+
+async def is_result_available(
+    session: AsyncSession, storage: FileStorage, result: dict[str, Any]
+) -> bool:
+    molecule_id = result.get("molecule_id")
+    output_path = result.get("output_path")
+    if not molecule_id or not output_path:
+        return False
+
+    stmt = select(Molecule.id).where(Molecule.id == molecule_id)
+    molecule_result = await session.execute(stmt)
+    if molecule_result.scalar_one_or_none() is None:
+        return False
+
+    return await storage.exists(output_path)
+
+
+def get_inference_cache() -> InferenceCache | None:
+    if not settings.inference_cache_enabled:
+        return None
+    return InferenceCache(get_redis(), settings.inference_cache_ttl_seconds)
+
+
+async def invalidate_inference_cache(model_id: str) -> int:
+    cache = get_inference_cache()
+    if cache is None:
+        return 0
+
+    try:
+        return await cache.invalidate_model(model_id)
+    except RedisError:
+        return 0
@@ -0,0 +1,52 @@
+from redis.asyncio import Redis
+
+from src.config import settings
+from src.infrastructure.cache.redis_client import get_redis
+
+KEY_PREFIX = "inference_shards"
+
+
+class InferenceShardTracker:
+    def __init__(self, job_id: str, n_shards: int, redis: Redis | None = None):
+        self.job_id = job_id
+        self.n_shards = n_shards
+        self._redis = redis
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = get_redis()
+        return self._redis
+
+    def _key(self, name: str) -> str:
+        return f"{KEY_PREFIX}:{self.job_id}:{name}"
+
+    async def report(self, shard_index: int, frames_done: int) -> int:
+        key = self._key("frames")
+        await self.redis.hset(key, str(shard_index), frames_done)
+        await self.redis.expire(key, settings.job_progress_ttl_seconds)
+        return sum(int(value) for value in await self.redis.hvals(key))
+
+    async def mark_done(self, shard_index: int) -> bool:
+        done_key = self._key("done")
+        if not await self.redis.sadd(done_key, str(shard_index)):
+            return False
+        await self.redis.expire(done_key, settings.job_progress_ttl_seconds)
+
+        count_key = self._key("count")
+        count = await self.redis.incr(count_key)
+        await self.redis.expire(count_key, settings.job_progress_ttl_seconds)
+        return count == self.n_shards
+
+    async def fail(self) -> None:
+        await self.redis.set(
+            self._key("failed"), "1", ex=settings.job_progress_ttl_seconds
+        )
+
+    async def has_failed(self) -> bool:
+        return bool(await self.redis.exists(self._key("failed")))
+
+    async def clear(self) -> None:
+        await self.redis.delete(
+            *(self._key(name) for name in ("frames", "done", "count", "failed"))
+        )
@@ -0,0 +1,142 @@
+import asyncio
+import contextlib
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+from src.core.exceptions import JobSubmissionInProgressError
+from src.infrastructure.cache.inference_cache import hash_options
+from src.infrastructure.cache.redis_client import get_redis
+from src.infrastructure.database.models.job import JobType
+
+DEDUP_PREFIX = "job_dedup"
+IDEMPOTENCY_PREFIX = "job_idempotency"
+PENDING = "pending"
+
+_REPLACE_IF_EQUAL = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('set', KEYS[1], ARGV[2], 'EX', ARGV[3])
+end
+return false
+"""
+
+_DELETE_IF_EQUAL = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def submission_fingerprint(
+    job_type: JobType, model_id: str, params: dict[str, Any]
+) -> str:
+    return hash_options({"job_type": job_type.value, "model_id": model_id, **params})
+
+
+def _decode(value: Any) -> str | None:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+class JobSubmission:
+    def __init__(
+        self,
+        user_id: str,
+        fingerprint: str,
+        idempotency_key: str | None = None,
+        redis: Redis | None = None,
+    ):
+        self.dedup_key = f"{DEDUP_PREFIX}:{fingerprint}"
+        self.idempotency_key = (
+            f"{IDEMPOTENCY_PREFIX}:{user_id}:{idempotency_key}"
+            if idempotency_key
+            else None
+        )
+        self._redis = redis
+        self._owned: list[str] = []
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = get_redis()
+        return self._redis
+
+    async def claim(self, is_active: Callable[[str], Awaitable[bool]]) -> str | None:
+        try:
+            return await self._claim(is_active)
+        except RedisError:
+            return None
+
+    async def bind(self, job_id: str) -> None:
+        ttl = {
+            self.dedup_key: settings.job_dedup_ttl_seconds,
+            self.idempotency_key: settings.job_idempotency_ttl_seconds,
+        }
+        with contextlib.suppress(RedisError):
+            for key in self._owned:
+                await self.redis.set(key, job_id, ex=ttl[key])
+
+    async def release(self) -> None:
+        owned, self._owned = self._owned, []
+        with contextlib.suppress(RedisError):
+            for key in owned:
+                await self.redis.eval(_DELETE_IF_EQUAL, 1, key, PENDING)
+
+    async def _claim(self, is_active: Callable[[str], Awaitable[bool]]) -> str | None:
+        deadline = time.monotonic() + settings.job_submission_wait_seconds
+
+        while True:
+            if self.idempotency_key and self.idempotency_key not in self._owned:
+                existing = await self._get_or_claim(self.idempotency_key)
+                if existing == PENDING:
+                    await self._wait(deadline)
+                    continue
+                if existing is not None:
+                    return existing
+
+            existing = await self._get_or_claim(self.dedup_key)
+            if existing is None:
+                return None
+            if existing == PENDING:
+                await self._wait(deadline)
+                continue
+
+            if await is_active(existing):
+                await self.bind(existing)
+                return existing
+
+            replaced = await self.redis.eval(
+                _REPLACE_IF_EQUAL,
+                1,
+                self.dedup_key,
+                existing,
+                PENDING,
+                settings.job_submission_claim_seconds,
+            )
+            if replaced:
+                self._owned.append(self.dedup_key)
+                return None
+
+    async def _get_or_claim(self, key: str) -> str | None:
+        claimed = await self.redis.set(
+            key, PENDING, nx=True, ex=settings.job_submission_claim_seconds
+        )
+        if claimed:
+            self._owned.append(key)
+            return None
+
+        existing = _decode(await self.redis.get(key))
+        if existing is None:
+            return await self._get_or_claim(key)
+        return existing
+
+    async def _wait(self, deadline: float) -> None:
+        if time.monotonic() >= deadline:
+            raise JobSubmissionInProgressError(
+                "An identical job submission is still in progress, retry shortly"
+            )
+        await asyncio.sleep(0.1)
@@ -0,0 +1,30 @@
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+
+KEY_PREFIX = "job_deferrals"
+
+
+def deferrals_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:{job_id}"
+
+
+async def read_deferrals(redis: Redis, job_id: str) -> dict[str, int]:
+    try:
+        values = await redis.hgetall(deferrals_key(job_id))
+    except RedisError:
+        return {}
+
+    return {
+        (reason.decode() if isinstance(reason, bytes) else reason): int(count)
+        for reason, count in values.items()
+    }
+
+
+async def record_deferral(redis: Redis, job_id: str, reason: str) -> None:
+    try:
+        await redis.hincrby(deferrals_key(job_id), reason, 1)
+        await redis.expire(deferrals_key(job_id), settings.job_progress_ttl_seconds)
+    except RedisError:
+        pass
@@ -0,0 +1,161 @@
+import asyncio
+import contextlib
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+from src.infrastructure.cache.redis_client import get_redis
+
+CHANNEL = "job_events"
+STREAM_PREFIX = "job_events:user"
+LISTEN_ERRORS = (RedisError, OSError, ValueError)
+
+
+def event_stream_key(user_id: str) -> str:
+    return f"{STREAM_PREFIX}:{user_id}"
+
+
+def parse_event_id(event_id: str) -> tuple[int, int]:
+    milliseconds, _, sequence = event_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+async def publish_job_event(redis: Redis, user_id: str, event: dict[str, Any]) -> str:
+    event_id = _decode(
+        await redis.xadd(
+            event_stream_key(user_id),
+            {"data": json.dumps(event)},
+            maxlen=settings.job_events_stream_length,
+            approximate=True,
+        )
+    )
+    await redis.publish(
+        CHANNEL, json.dumps({**event, "id": event_id, "user_id": user_id})
+    )
+    return event_id
+
+
+async def read_events_since(
+    redis: Redis, user_id: str, last_event_id: str
+) -> list[dict[str, Any]]:
+    entries = await redis.xrange(event_stream_key(user_id), min=f"({last_event_id}")
+    events = []
+    for entry_id, fields in entries:
+        data = fields.get(b"data", fields.get("data"))
+        events.append({**json.loads(data), "id": _decode(entry_id), "user_id": user_id})
+    return events
+
+
+class JobEventBroker:
+    def __init__(self, redis: Redis | None = None, queue_size: int = 1000):
+        self._redis = redis
+        self._queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = {}
+        self._listener: asyncio.Task | None = None
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = get_redis()
+        return self._redis
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(user_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[user_id]
+
+    def dispatch(self, event: dict[str, Any]) -> None:
+        for queue in list(self._subscribers.get(event.get("user_id"), ())):
+            with contextlib.suppress(asyncio.QueueFull):
+                queue.put_nowait(event)
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while self._subscribers:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.dispatch(json.loads(message["data"]))
+                        if not self._subscribers:
+                            return
+            except LISTEN_ERRORS:
+                await asyncio.sleep(1.0)
+
+
+async def stream_job_events(
+    broker: JobEventBroker,
+    user_id: str,
+    project_id: str | None = None,
+    last_event_id: str | None = None,
+    heartbeat_seconds: float | None = None,
+) -> AsyncIterator[dict[str, Any] | None]:
+    heartbeat_seconds = heartbeat_seconds or settings.job_events_heartbeat_seconds
+    queue = broker.subscribe(user_id)
+    try:
+        last_seen = parse_event_id(last_event_id) if last_event_id else (0, 0)
+        if last_event_id:
+            for event in await read_events_since(broker.redis, user_id, last_event_id):
+                if project_id is None or event.get("project_id") == project_id:
+                    yield event
+                last_seen = parse_event_id(event["id"])
+
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+            except TimeoutError:
+                yield None
+                continue
+
+            if parse_event_id(event["id"]) <= last_seen:
+                continue
+            last_seen = parse_event_id(event["id"])
+            if project_id is None or event.get("project_id") == project_id:
+                yield event
+    finally:
+        broker.unsubscribe(user_id, queue)
+
+
+_broker_instance: JobEventBroker | None = None
+
+
+def get_job_event_broker() -> JobEventBroker:
+    global _broker_instance
+
+    if _broker_instance is None:
+        _broker_instance = JobEventBroker()
+
+    return _broker_instance
+
+
+async def close_job_event_broker() -> None:
+    global _broker_instance
+
+    if _broker_instance is not None:
+        await _broker_instance.close()
+        _broker_instance = None
@@ -0,0 +1,84 @@
+import asyncio
+import contextlib
+import json
+import time
+from collections.abc import Iterator
+from contextvars import ContextVar
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+from src.infrastructure.queue.worker_registry import worker_id
+
+HEARTBEATS_KEY = "job_heartbeats"
+
+_tracked_jobs: dict[str, int] = {}
+_task_jobs: ContextVar[set[str] | None] = ContextVar("heartbeat_jobs", default=None)
+
+
+def tracked_jobs() -> set[str]:
+    return set(_tracked_jobs)
+
+
+@contextlib.contextmanager
+def task_heartbeats() -> Iterator[set[str]]:
+    job_ids: set[str] = set()
+    token = _task_jobs.set(job_ids)
+    try:
+        yield job_ids
+    finally:
+        _task_jobs.reset(token)
+        for job_id in job_ids:
+            holders = _tracked_jobs.get(job_id)
+            if holders is None:
+                continue
+            if holders > 1:
+                _tracked_jobs[job_id] = holders - 1
+            else:
+                del _tracked_jobs[job_id]
+
+
+async def start_heartbeat(redis: Redis, job_id: str) -> None:
+    task_jobs = _task_jobs.get()
+    if task_jobs is None or job_id not in task_jobs:
+        _tracked_jobs[job_id] = _tracked_jobs.get(job_id, 0) + 1
+        if task_jobs is not None:
+            task_jobs.add(job_id)
+    await beat(redis, [job_id])
+
+
+async def stop_heartbeat(redis: Redis, job_id: str) -> None:
+    _tracked_jobs.pop(job_id, None)
+    with contextlib.suppress(RedisError):
+        await redis.hdel(HEARTBEATS_KEY, job_id)
+
+
+async def beat(redis: Redis, job_ids: list[str]) -> None:
+    if not job_ids:
+        return
+
+    heartbeat = json.dumps({"worker_id": worker_id(), "at": time.time()})
+    with contextlib.suppress(RedisError):
+        await redis.hset(HEARTBEATS_KEY, mapping=dict.fromkeys(job_ids, heartbeat))
+
+
+async def read_heartbeats(
+    redis: Redis, job_ids: list[str]
+) -> dict[str, dict[str, Any]]:
+    if not job_ids:
+        return {}
+
+    values = await redis.hmget(HEARTBEATS_KEY, job_ids)
+    return {
+        job_id: json.loads(value)
+        for job_id, value in zip(job_ids, values, strict=True)
+        if value is not None
+    }
+
+
+async def run_heartbeats(redis: Redis) -> None:
+    while True:
+        await beat(redis, sorted(_tracked_jobs))
+        await asyncio.sleep(settings.job_heartbeat_interval_seconds)
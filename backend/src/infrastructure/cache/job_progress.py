@@ -0,0 +1,262 @@
+import contextlib
+import json
+import time
+from datetime import datetime
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.core.exceptions import JobCancelledError, NotFoundError
+from src.infrastructure.cache.job_events import publish_job_event
+from src.infrastructure.cache.job_heartbeat import start_heartbeat, stop_heartbeat
+from src.infrastructure.cache.redis_client import get_redis
+from src.infrastructure.database.models.job import Job, JobStatus
+from src.infrastructure.database.session import async_session_maker
+from src.infrastructure.queue.fair_scheduler import FairScheduler
+
+KEY_PREFIX = "job_progress"
+CANCEL_KEY_PREFIX = "job_cancel"
+LIVE_STATUSES = (JobStatus.PENDING, JobStatus.QUEUED, JobStatus.RUNNING)
+
+
+def progress_key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:{job_id}"
+
+
+def cancel_key(job_id: str) -> str:
+    return f"{CANCEL_KEY_PREFIX}:{job_id}"
+
+
+class JobProgressReporter:
+    def __init__(
+        self,
+        job_id: str,
+        flush_interval_seconds: float | None = None,
+        redis: Redis | None = None,
+    ):
+        self.job_id = job_id
+        self.flush_interval_seconds = (
+            settings.job_progress_flush_seconds
+            if flush_interval_seconds is None
+            else flush_interval_seconds
+        )
+        self._redis = redis
+        self._pending: dict[str, Any] = {}
+        self._last_flush = 0.0
+        self.percent = 0.0
+        self.message: str | None = None
+        self.user_id: str | None = None
+        self.project_id: str | None = None
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = get_redis()
+        return self._redis
+
+    async def start(self, message: str, percent: float = 0.0) -> None:
+        await self._transition(
+            JobStatus.RUNNING,
+            started_at=datetime.utcnow(),
+            progress_percent=percent,
+            progress_message=message,
+        )
+        await start_heartbeat(self.redis, self.job_id)
+
+    async def attach(self, message: str) -> None:
+        await self._transition(
+            JobStatus.RUNNING,
+            started_at=func.coalesce(Job.started_at, datetime.utcnow()),
+            progress_message=message,
+        )
+        await start_heartbeat(self.redis, self.job_id)
+
+    async def update(self, percent: float, message: str) -> None:
+        await self.check_cancelled()
+
+        self.percent = percent
+        self.message = message
+        self._pending.update(progress_percent=percent, progress_message=message)
+        await self._publish(JobStatus.RUNNING)
+
+        if time.monotonic() - self._last_flush >= self.flush_interval_seconds:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+
+        values, self._pending = self._pending, {}
+        async with async_session_maker() as session:
+            stmt = (
+                update(Job)
+                .where(Job.id == self.job_id, Job.status != JobStatus.CANCELLED)
+                .values(**values)
+            )
+            await session.execute(stmt)
+            await session.commit()
+        self._last_flush = time.monotonic()
+
+    async def complete(
+        self,
+        message: str,
+        output_params: dict[str, Any] | None = None,
+        session: AsyncSession | None = None,
+    ) -> None:
+        values: dict[str, Any] = {
+            "completed_at": datetime.utcnow(),
+            "progress_percent": 100.0,
+            "progress_message": message,
+        }
+        if output_params is not None:
+            values["output_params"] = output_params
+        await self._transition(JobStatus.COMPLETED, session=session, **values)
+
+    async def fail(self, error: str) -> None:
+        await self._transition(
+            JobStatus.FAILED,
+            completed_at=datetime.utcnow(),
+            error_message=error,
+        )
+
+    async def check_cancelled(self) -> None:
+        try:
+            cancelled = await self.redis.exists(cancel_key(self.job_id))
+        except RedisError:
+            return
+
+        if cancelled:
+            await stop_heartbeat(self.redis, self.job_id)
+            raise JobCancelledError(f"Job {self.job_id} was cancelled")
+
+    async def _transition(
+        self,
+        status: JobStatus,
+        session: AsyncSession | None = None,
+        **values: Any,
+    ) -> None:
+        values = {**self._pending, **values, "status": status}
+        self._pending = {}
+        if "progress_percent" in values:
+            self.percent = values["progress_percent"]
+        if "progress_message" in values:
+            self.message = values["progress_message"]
+
+        stmt = (
+            update(Job)
+            .where(Job.id == self.job_id, Job.status != JobStatus.CANCELLED)
+            .values(**values)
+            .returning(Job.user_id, Job.project_id)
+        )
+        if session is not None:
+            result = await session.execute(stmt)
+            owner = result.first() if result is not None else None
+        else:
+            async with async_session_maker() as own_session:
+                result = await own_session.execute(stmt)
+                owner = result.first() if result is not None else None
+                await own_session.commit()
+        self._last_flush = time.monotonic()
+
+        if result is not None and owner is None:
+            await stop_heartbeat(self.redis, self.job_id)
+            if await self._current_status(session) != JobStatus.CANCELLED:
+                raise NotFoundError(f"Job {self.job_id} not found")
+            if status == JobStatus.FAILED:
+                return
+            raise JobCancelledError(f"Job {self.job_id} was cancelled")
+        if owner is not None:
+            self.user_id, self.project_id = owner
+        if status in (JobStatus.COMPLETED, JobStatus.FAILED):
+            await stop_heartbeat(self.redis, self.job_id)
+            await FairScheduler(self.redis).release(self.job_id)
+
+        await self._publish(status, error_message=values.get("error_message"))
+
+    async def _current_status(self, session: AsyncSession | None) -> JobStatus | None:
+        stmt = select(Job.status).where(Job.id == self.job_id)
+        if session is not None:
+            return (await session.execute(stmt)).scalar_one_or_none()
+        async with async_session_maker() as own_session:
+            return (await own_session.execute(stmt)).scalar_one_or_none()
+
+    async def _publish(self, status: JobStatus, **extra: Any) -> None:
+        state = {
+            "status": status.value,
+            "progress_percent": self.percent,
+            "progress_message": self.message,
+            "updated_at": datetime.utcnow().isoformat(),
+            **{key: value for key, value in extra.items() if value is not None},
+        }
+        with contextlib.suppress(RedisError):
+            await self.redis.set(
+                progress_key(self.job_id),
+                json.dumps(state),
+                ex=settings.job_progress_ttl_seconds,
+            )
+            if self.user_id is not None:
+                await publish_job_event(
+                    self.redis,
+                    self.user_id,
+                    {
+                        "type": "job",
+                        "job_id": self.job_id,
+                        "project_id": self.project_id,
+                        **state,
+                    },
+                )
+
+
+async def request_job_cancel(job: Job) -> None:
+    reporter = JobProgressReporter(job.id)
+    reporter.user_id = job.user_id
+    reporter.project_id = job.project_id
+    reporter.percent = job.progress_percent
+    reporter.message = job.progress_message
+
+    with contextlib.suppress(RedisError):
+        await reporter.redis.set(
+            cancel_key(job.id), "1", ex=settings.job_progress_ttl_seconds
+        )
+
+    await reporter._publish(JobStatus.CANCELLED)
+
+
+async def read_job_progress(job_ids: list[str]) -> dict[str, dict[str, Any]]:
+    if not job_ids:
+        return {}
+
+    try:
+        values = await get_redis().mget([progress_key(job_id) for job_id in job_ids])
+    except RedisError:
+        return {}
+
+    return {
+        job_id: json.loads(value)
+        for job_id, value in zip(job_ids, values, strict=True)
+        if value is not None
+    }
+
+
+async def read_live_progress(jobs: list[Job]) -> dict[str, dict[str, Any]]:
+    live_jobs = [job for job in jobs if job.status in LIVE_STATUSES]
+    progress = await read_job_progress([job.id for job in live_jobs])
+
+    updates = {}
+    for job in live_jobs:
+        state = progress.get(job.id)
+        if not state:
+            continue
+
+        updates[job.id] = {
+            "progress_percent": state.get("progress_percent", job.progress_percent),
+            "progress_message": state.get("progress_message", job.progress_message),
+        }
+        if state.get("status") == JobStatus.RUNNING.value:
+            updates[job.id]["status"] = JobStatus.RUNNING
+
+    return updates
@@ -0,0 +1,41 @@
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+from src.infrastructure.database.models.job import JobType
+
+CALIBRATION_KEY = "memory_calibration"
+MIN_FACTOR = 0.1
+MAX_FACTOR = 10.0
+
+
+def _clamp(factor: float) -> float:
+    return min(max(factor, MIN_FACTOR), MAX_FACTOR)
+
+
+async def calibration_factor(redis: Redis, job_type: JobType) -> float:
+    try:
+        value = await redis.hget(CALIBRATION_KEY, job_type.value)
+    except RedisError:
+        return 1.0
+
+    return _clamp(float(value)) if value is not None else 1.0
+
+
+async def record_memory_usage(
+    redis: Redis, job_type: JobType, estimate_bytes: int, used_bytes: int
+) -> float | None:
+    if estimate_bytes <= 0 or used_bytes <= 0:
+        return None
+
+    weight = settings.job_memory_calibration_weight
+    factor = _clamp(
+        (1 - weight) * await calibration_factor(redis, job_type)
+        + weight * used_bytes / estimate_bytes
+    )
+    try:
+        await redis.hset(CALIBRATION_KEY, job_type.value, factor)
+    except RedisError:
+        return None
+
+    return factor
@@ -0,0 +1,93 @@
+import contextlib
+import json
+import time
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+from src.infrastructure.queue.worker_registry import worker_id
+
+KEY_PREFIX = "model_affinity"
+WORKERS_KEY = f"{KEY_PREFIX}:workers"
+
+HITS = "hits"
+MISSES = "misses"
+DEFERRALS = "deferrals"
+
+
+def model_key(model_path: str, version: int | None = None) -> str:
+    return model_path if version is None else f"{model_path}@{version}"
+
+
+def _stats_key(queue_name: str) -> str:
+    return f"{KEY_PREFIX}:stats:{queue_name.rsplit(':', 1)[-1]}"
+
+
+async def advertise(
+    redis: Redis, queue_name: str, models: list[str], free_slots: int
+) -> None:
+    report = {
+        "worker_id": worker_id(),
+        "queue_name": queue_name,
+        "models": models,
+        "free_slots": free_slots,
+        "at": time.time(),
+    }
+    with contextlib.suppress(RedisError):
+        await redis.hset(WORKERS_KEY, worker_id(), json.dumps(report))
+
+
+async def withdraw(redis: Redis) -> None:
+    with contextlib.suppress(RedisError):
+        await redis.hdel(WORKERS_KEY, worker_id())
+
+
+async def find_holders(redis: Redis, queue_name: str, key: str) -> list[dict[str, Any]]:
+    stale_before = time.time() - settings.cache_affinity_ttl_seconds
+    holders = []
+    stale = []
+    try:
+        for worker, value in (await redis.hgetall(WORKERS_KEY)).items():
+            report = json.loads(value)
+            if report["at"] < stale_before:
+                stale.append(worker)
+            elif (
+                report["worker_id"] != worker_id()
+                and report["queue_name"] == queue_name
+                and key in report["models"]
+            ):
+                holders.append(report)
+
+        if stale:
+            await redis.hdel(WORKERS_KEY, *stale)
+    except (RedisError, KeyError, ValueError):
+        return []
+
+    return holders
+
+
+async def record_routing(redis: Redis, queue_name: str, outcome: str) -> None:
+    with contextlib.suppress(RedisError):
+        await redis.hincrby(_stats_key(queue_name), outcome, 1)
+
+
+async def routing_stats(redis: Redis, queue_name: str) -> dict[str, Any]:
+    try:
+        values = await redis.hgetall(_stats_key(queue_name))
+    except RedisError:
+        values = {}
+
+    counts = {
+        (name.decode() if isinstance(name, bytes) else name): int(value)
+        for name, value in values.items()
+    }
+    hits = counts.get(HITS, 0)
+    misses = counts.get(MISSES, 0)
+    return {
+        "model_cache_hits": hits,
+        "model_cache_misses": misses,
+        "affinity_deferrals": counts.get(DEFERRALS, 0),
+        "model_cache_hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+    }
@@ -0,0 +1,128 @@
+import asyncio
+from collections import OrderedDict
+from typing import Any
+
+import mdtraj as md
+
+from src.config import settings
+from src.glimps.adapter import GlimpsAdapter
+from src.glimps.model_serializer import ModelSerializer
+from src.glimps.pdb import parse_template
+from src.infrastructure.cache.inference_cache import hash_bytes
+from src.infrastructure.cache.model_affinity import model_key
+from src.infrastructure.storage.file_storage import FileStorage, get_file_storage
+
+
+class ModelCache:
+    def __init__(self, storage: FileStorage, max_entries: int):
+        self._storage = storage
+        self._max_entries = max(1, max_entries)
+        self._entries: OrderedDict[str, Any] = OrderedDict()
+        self._versions: dict[str, int | None] = {}
+        self._hashes: dict[str, str] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._lock_users: dict[str, int] = {}
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_adapter(
+        self, model_path: str, version: int | None = None
+    ) -> GlimpsAdapter:
+        return await self._get(
+            f"model:{model_path}", model_path, self._load_adapter, version
+        )
+
+    async def get_template(self, template_path: str) -> md.Trajectory | None:
+        return await self._get(
+            f"template:{template_path}", template_path, self._load_template
+        )
+
+    def is_warm(self, model_path: str, version: int | None = None) -> bool:
+        return self._is_current(f"model:{model_path}", version)
+
+    def holds_model(self, model_path: str) -> bool:
+        return f"model:{model_path}" in self._entries
+
+    def model_hash(self, model_path: str) -> str | None:
+        return self._hashes.get(model_path)
+
+    def cached_models(self) -> list[str]:
+        return [
+            model_key(key.removeprefix("model:"), self._versions.get(key))
+            for key in self._entries
+            if key.startswith("model:")
+        ]
+
+    def evict(self, path: str) -> None:
+        for key in (f"model:{path}", f"template:{path}"):
+            self._entries.pop(key, None)
+            self._versions.pop(key, None)
+        self._hashes.pop(path, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._versions.clear()
+        self._hashes.clear()
+
+    def _is_current(self, key: str, version: int | None) -> bool:
+        return key in self._entries and self._versions.get(key) == version
+
+    async def _get(
+        self, key: str, path: str, loader, version: int | None = None
+    ) -> Any:
+        if self._is_current(key, version):
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] = self._lock_users.get(key, 0) + 1
+        try:
+            async with lock:
+                if not self._is_current(key, version):
+                    self._entries[key] = await loader(path)
+                    self._versions[key] = version
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self._max_entries:
+                        evicted, _ = self._entries.popitem(last=False)
+                        self._versions.pop(evicted, None)
+                        self._hashes.pop(evicted.split(":", 1)[1], None)
+                else:
+                    self._entries.move_to_end(key)
+                value = self._entries[key]
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+        return value
+
+    async def _load_adapter(self, model_path: str) -> GlimpsAdapter:
+        model_bytes = await self._storage.load_bytes(model_path)
+        self._hashes[model_path] = hash_bytes(model_bytes)
+        return await asyncio.to_thread(ModelSerializer.deserialize, model_bytes)
+
+    async def _load_template(self, template_path: str) -> md.Trajectory | None:
+        try:
+            pdb_bytes = await self._storage.load_bytes(template_path)
+        except Exception:
+            return None
+        return await asyncio.to_thread(parse_template, pdb_bytes)
+
+
+_model_cache_instance: ModelCache | None = None
+
+
+def get_model_cache() -> ModelCache:
+    global _model_cache_instance
+
+    if _model_cache_instance is None:
+        _model_cache_instance = ModelCache(
+            get_file_storage(), settings.transform_model_cache_size
+        )
+
+    return _model_cache_instance
@@ -0,0 +1,22 @@
+from redis.asyncio import Redis
+
+from src.config import settings
+
+_redis_instance: Redis | None = None
+
+
+def get_redis() -> Redis:
+    global _redis_instance
+
+    if _redis_instance is None:
+        _redis_instance = Redis.from_url(str(settings.redis_url))
+
+    return _redis_instance
+
+
+async def close_redis() -> None:
+    global _redis_instance
+
+    if _redis_instance is not None:
+        await _redis_instance.aclose()
+        _redis_instance = None
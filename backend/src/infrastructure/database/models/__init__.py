@@ -2,8 +2,24 @@ from src.infrastructure.database.models.user import User
 from src.infrastructure.database.models.project import Project
 from src.infrastructure.database.models.molecule import Molecule, MoleculeType, FileFormat
 from src.infrastructure.database.models.glimps_model import GlimpsModel
+from src.infrastructure.database.models.model_version import GlimpsModelVersion
 from src.infrastructure.database.models.job import Job, JobType, JobStatus
 from src.infrastructure.database.models.collaboration import (
     ProjectCollaborator,
     CollaboratorRole,
 )
+
+__all__ = [
+    "CollaboratorRole",
+    "FileFormat",
+    "GlimpsModel",
+    "GlimpsModelVersion",
+    "Job",
+    "JobStatus",
+    "JobType",
+    "Molecule",
+    "MoleculeType",
+    "Project",
+    "ProjectCollaborator",
+    "User",
+]
@@ -2,7 +2,7 @@ from datetime import datetime
 from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from sqlalchemy import Boolean, DateTime, Float, ForeignKey, String, Text
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -10,6 +10,7 @@ from src.infrastructure.database.session import Base
 
 if TYPE_CHECKING:
     from src.infrastructure.database.models.job import Job
+    from src.infrastructure.database.models.model_version import GlimpsModelVersion
     from src.infrastructure.database.models.molecule import Molecule
     from src.infrastructure.database.models.project import Project
 
@@ -31,6 +32,7 @@ class GlimpsModel(Base):
     )
     is_trained: Mapped[bool] = mapped_column(Boolean, default=False)
     model_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    version: Mapped[int] = mapped_column(Integer, default=0)
     training_config: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     training_metrics: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     cg_molecule_id: Mapped[str | None] = mapped_column(
@@ -60,3 +62,8 @@ class GlimpsModel(Base):
         foreign_keys=[atomistic_molecule_id]
     )
     jobs: Mapped[list["Job"]] = relationship(back_populates="model")
+    versions: Mapped[list["GlimpsModelVersion"]] = relationship(
+        back_populates="model",
+        cascade="all, delete-orphan",
+        order_by="GlimpsModelVersion.version",
+    )
@@ -19,6 +19,9 @@ class JobType(enum.Enum):
     TRAINING = "training"
     INFERENCE = "inference"
     FILE_PROCESSING = "file_processing"
+    SWEEP = "sweep"
+    BENCHMARK = "benchmark"
+    BATCH_INFERENCE = "batch_inference"
 
 
 class JobStatus(enum.Enum):
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import TYPE_CHECKING
+from uuid import uuid4
+
+from sqlalchemy import DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.infrastructure.database.session import Base
+
+if TYPE_CHECKING:
+    from src.infrastructure.database.models.glimps_model import GlimpsModel
+
+
+class GlimpsModelVersion(Base):
+    __tablename__ = "glimps_model_versions"
+    __table_args__ = (UniqueConstraint("model_id", "version", name="uq_model_version"),)
+
+    id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        primary_key=True,
+        default=lambda: str(uuid4()),
+    )
+    model_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("glimps_models.id"),
+        index=True,
+    )
+    version: Mapped[int] = mapped_column(Integer)
+    model_path: Mapped[str] = mapped_column(String(500))
+    update_mode: Mapped[str] = mapped_column(String(20), default="full")
+    training_config: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    training_metrics: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    training_pairs: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    n_training_frames: Mapped[int] = mapped_column(Integer, default=0)
+    job_id: Mapped[str | None] = mapped_column(
+        UUID(as_uuid=False),
+        ForeignKey("jobs.id"),
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    model: Mapped["GlimpsModel"] = relationship(back_populates="versions")
@@ -0,0 +1,46 @@
+from arq import create_pool
+from arq.connections import ArqRedis, RedisSettings
+
+from src.config import settings
+
+
+def parse_redis_url(url: str) -> RedisSettings:
+    from urllib.parse import urlparse
+
+    parsed = urlparse(str(url))
+    return RedisSettings(
+        host=parsed.hostname or "localhost",
+        port=parsed.port or 6379,
+        database=int(parsed.path.lstrip("/") or 0),
+        max_connections=settings.queue_max_connections,
+    )
+
+
+redis_settings = parse_redis_url(str(settings.redis_url))
+
+_arq_pool_instance: ArqRedis | None = None
+
+
+async def get_arq_pool() -> ArqRedis:
+    global _arq_pool_instance
+
+    if _arq_pool_instance is None:
+        _arq_pool_instance = await create_pool(redis_settings)
+
+    return _arq_pool_instance
+
+
+async def close_arq_pool() -> None:
+    global _arq_pool_instance
+
+    if _arq_pool_instance is not None:
+        await _arq_pool_instance.aclose()
+        _arq_pool_instance = None
+
+
+async def check_arq_pool() -> bool:
+    try:
+        pool = await get_arq_pool()
+        return bool(await pool.ping())
+    except Exception:
+        return False
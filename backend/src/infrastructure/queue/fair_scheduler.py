@@ -0,0 +1,365 @@
+import contextlib
+import json
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from arq.connections import ArqRedis
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+from src.infrastructure.cache.redis_client import get_redis
+from src.infrastructure.database.models.job import Job
+from src.infrastructure.queue.queues import (
+    BULK,
+    INTERACTIVE,
+    PRIORITY_CLASSES,
+    priority_for_job_type,
+    queue_for_job_type,
+    queue_limits,
+)
+
+KEY_PREFIX = "fair"
+PAYLOADS_KEY = f"{KEY_PREFIX}:payloads"
+DISPATCHED_KEY = f"{KEY_PREFIX}:dispatched"
+LOCK_MILLISECONDS = 5000
+
+_RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class QueuedCall:
+    function: str
+    args: list[Any] = field(default_factory=list)
+    job_id: str | None = None
+
+
+def _decode(value: Any) -> Any:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _key(queue_name: str, *parts: str) -> str:
+    return ":".join((KEY_PREFIX, queue_name.rsplit(":", 1)[-1], *parts))
+
+
+def class_weight(priority: str) -> float:
+    return {
+        INTERACTIVE: settings.fair_interactive_weight,
+        BULK: settings.fair_bulk_weight,
+    }[priority]
+
+
+def user_weight(user_id: str) -> float:
+    return settings.fair_user_weights.get(user_id, 1.0)
+
+
+class FairScheduler:
+    def __init__(self, redis: Redis | None = None):
+        self._redis = redis
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            self._redis = get_redis()
+        return self._redis
+
+    async def submit(
+        self,
+        pool: ArqRedis,
+        job: Job,
+        function: str,
+        *args: Any,
+        priority: str | None = None,
+    ) -> None:
+        await self.submit_calls(pool, job, [QueuedCall(function, list(args))], priority)
+
+    async def submit_calls(
+        self,
+        pool: ArqRedis,
+        job: Job,
+        calls: list[QueuedCall],
+        priority: str | None = None,
+    ) -> None:
+        queue_name = queue_for_job_type(job.job_type)
+        if not settings.fair_scheduling_enabled:
+            await self._enqueue(pool, job.id, queue_name, calls)
+            return
+
+        priority = priority or priority_for_job_type(job.job_type)
+        payload = {
+            "queue_name": queue_name,
+            "priority": priority,
+            "user_id": job.user_id,
+            "project_id": job.project_id,
+            "calls": [asdict(call) for call in calls],
+        }
+
+        try:
+            await self._catch_up(queue_name, priority, job.user_id)
+            await self.redis.hset(PAYLOADS_KEY, job.id, json.dumps(payload))
+            await self.redis.rpush(
+                _key(queue_name, "backlog", priority, job.user_id), job.id
+            )
+            await self.redis.sadd(_key(queue_name, "tenants", priority), job.user_id)
+        except RedisError:
+            await self._enqueue(pool, job.id, queue_name, calls)
+            return
+
+        await self.dispatch(pool, queue_name)
+
+    async def dispatch(self, pool: ArqRedis, queue_name: str) -> int:
+        token = uuid.uuid4().hex
+        lock_key = _key(queue_name, "lock")
+        try:
+            if not await self.redis.set(lock_key, token, nx=True, px=LOCK_MILLISECONDS):
+                return 0
+        except RedisError:
+            return 0
+
+        dispatched = 0
+        try:
+            slots = queue_limits()[queue_name]["dispatch_slots"]
+            while await self._in_flight(queue_name, "total") < slots:
+                head = await self._peek_next(queue_name)
+                if head is None:
+                    break
+
+                priority, user_id, job_id = head
+                raw = await self.redis.hget(PAYLOADS_KEY, job_id)
+                if raw is None:
+                    await self._unlink(queue_name, priority, user_id, job_id)
+                    continue
+                payload = json.loads(raw)
+
+                await self._enqueue(
+                    pool,
+                    job_id,
+                    queue_name,
+                    [QueuedCall(**call) for call in payload["calls"]],
+                )
+                await self._mark_dispatched(job_id, payload)
+                dispatched += 1
+        except RedisError:
+            pass
+        finally:
+            with contextlib.suppress(RedisError):
+                await self.redis.eval(_RELEASE_LOCK, 1, lock_key, token)
+
+        return dispatched
+
+    async def release(self, job_id: str) -> None:
+        try:
+            raw = await self.redis.hget(DISPATCHED_KEY, job_id)
+            if raw is None or not await self.redis.hdel(DISPATCHED_KEY, job_id):
+                return
+
+            owner = json.loads(raw)
+            counters = _key(owner["queue_name"], "in_flight")
+            for name in (
+                "total",
+                f"user:{owner['user_id']}",
+                f"project:{owner['project_id']}",
+            ):
+                await self.redis.hincrby(counters, name, -1)
+        except RedisError:
+            pass
+
+    async def remove(self, job_id: str) -> bool:
+        try:
+            raw = await self.redis.hget(PAYLOADS_KEY, job_id)
+            if raw is None:
+                return False
+
+            payload = json.loads(raw)
+            await self.redis.hdel(PAYLOADS_KEY, job_id)
+            backlog = _key(
+                payload["queue_name"],
+                "backlog",
+                payload["priority"],
+                payload["user_id"],
+            )
+            await self.redis.lrem(backlog, 0, job_id)
+            if not await self.redis.llen(backlog):
+                await self.redis.srem(
+                    _key(payload["queue_name"], "tenants", payload["priority"]),
+                    payload["user_id"],
+                )
+            return True
+        except RedisError:
+            return False
+
+    async def queue_stats(self, queue_name: str) -> dict[str, int]:
+        try:
+            waiting = 0
+            for priority in PRIORITY_CLASSES:
+                for user_id in await self.redis.smembers(
+                    _key(queue_name, "tenants", priority)
+                ):
+                    waiting += await self.redis.llen(
+                        _key(queue_name, "backlog", priority, _decode(user_id))
+                    )
+            in_flight = await self._in_flight(queue_name, "total")
+        except RedisError:
+            return {"waiting": 0, "in_flight": 0}
+
+        return {"waiting": waiting, "in_flight": in_flight}
+
+    async def _enqueue(
+        self, pool: ArqRedis, job_id: str, queue_name: str, calls: list[QueuedCall]
+    ) -> None:
+        for call in calls:
+            await pool.enqueue_job(
+                call.function,
+                *call.args,
+                _job_id=call.job_id or job_id,
+                _queue_name=queue_name,
+            )
+
+    async def _mark_dispatched(self, job_id: str, payload: dict[str, Any]) -> None:
+        queue_name = payload["queue_name"]
+        priority = payload["priority"]
+        user_id = payload["user_id"]
+
+        await self._unlink(queue_name, priority, user_id, job_id)
+        await self.redis.hdel(PAYLOADS_KEY, job_id)
+        await self.redis.hset(
+            DISPATCHED_KEY,
+            job_id,
+            json.dumps(
+                {
+                    "queue_name": queue_name,
+                    "user_id": user_id,
+                    "project_id": payload["project_id"],
+                }
+            ),
+        )
+
+        counters = _key(queue_name, "in_flight")
+        for name in ("total", f"user:{user_id}", f"project:{payload['project_id']}"):
+            await self.redis.hincrby(counters, name, 1)
+
+        clock_key = _key(queue_name, "clock")
+        await self._advance(
+            _key(queue_name, "pass", priority),
+            user_id,
+            1.0 / user_weight(user_id),
+            clock_key,
+            priority,
+        )
+        await self._advance(
+            _key(queue_name, "class_pass"),
+            priority,
+            1.0 / class_weight(priority),
+            clock_key,
+            "class",
+        )
+
+    async def _advance(
+        self, passes_key: str, member: str, stride: float, clock_key: str, clock: str
+    ) -> None:
+        current = float(await self.redis.hget(passes_key, member) or 0.0)
+        await self.redis.hset(clock_key, clock, current)
+        await self.redis.hset(passes_key, member, current + stride)
+
+    async def _peek_next(self, queue_name: str) -> tuple[str, str, str] | None:
+        candidates = []
+        class_passes = await self._passes(_key(queue_name, "class_pass"))
+        for priority in PRIORITY_CLASSES:
+            tenant = await self._next_tenant(queue_name, priority)
+            if tenant is not None:
+                candidates.append(
+                    (
+                        class_passes.get(priority, 0.0),
+                        PRIORITY_CLASSES.index(priority),
+                        priority,
+                        tenant,
+                    )
+                )
+
+        if not candidates:
+            return None
+
+        *_, priority, user_id = min(candidates)
+        backlog = _key(queue_name, "backlog", priority, user_id)
+        return priority, user_id, _decode(await self.redis.lindex(backlog, 0))
+
+    async def _unlink(
+        self, queue_name: str, priority: str, user_id: str, job_id: str
+    ) -> None:
+        backlog = _key(queue_name, "backlog", priority, user_id)
+        await self.redis.lrem(backlog, 1, job_id)
+        if not await self.redis.llen(backlog):
+            await self.redis.srem(_key(queue_name, "tenants", priority), user_id)
+
+    async def _next_tenant(self, queue_name: str, priority: str) -> str | None:
+        passes = await self._passes(_key(queue_name, "pass", priority))
+        eligible = []
+        for member in await self.redis.smembers(_key(queue_name, "tenants", priority)):
+            user_id = _decode(member)
+            in_flight = await self._in_flight(queue_name, f"user:{user_id}")
+            if in_flight >= settings.fair_user_max_in_flight:
+                continue
+
+            head = _decode(
+                await self.redis.lindex(
+                    _key(queue_name, "backlog", priority, user_id), 0
+                )
+            )
+            if head is None:
+                await self.redis.srem(_key(queue_name, "tenants", priority), user_id)
+                continue
+
+            raw = await self.redis.hget(PAYLOADS_KEY, head)
+            if raw is not None:
+                project_id = json.loads(raw)["project_id"]
+                if await self._in_flight(queue_name, f"project:{project_id}") >= (
+                    settings.fair_project_max_in_flight
+                ):
+                    continue
+
+            eligible.append((passes.get(user_id, 0.0), in_flight, user_id))
+
+        return min(eligible)[-1] if eligible else None
+
+    async def _catch_up(self, queue_name: str, priority: str, user_id: str) -> None:
+        tenants_key = _key(queue_name, "tenants", priority)
+        clock = await self._passes(_key(queue_name, "clock"))
+
+        if not await self.redis.sismember(tenants_key, user_id):
+            await self._catch_up_member(
+                _key(queue_name, "pass", priority), user_id, clock.get(priority, 0.0)
+            )
+        if not await self.redis.scard(tenants_key):
+            await self._catch_up_member(
+                _key(queue_name, "class_pass"), priority, clock.get("class", 0.0)
+            )
+
+    async def _catch_up_member(self, passes_key: str, member: str, now: float) -> None:
+        if float(await self.redis.hget(passes_key, member) or 0.0) < now:
+            await self.redis.hset(passes_key, member, now)
+
+    async def _passes(self, key: str) -> dict[str, float]:
+        values = await self.redis.hgetall(key)
+        return {_decode(name): float(value) for name, value in values.items()}
+
+    async def _in_flight(self, queue_name: str, name: str) -> int:
+        value = await self.redis.hget(_key(queue_name, "in_flight"), name)
+        return max(int(value or 0), 0)
+
+
+_scheduler_instance: FairScheduler | None = None
+
+
+def get_fair_scheduler() -> FairScheduler:
+    global _scheduler_instance
+
+    if _scheduler_instance is None:
+        _scheduler_instance = FairScheduler()
+
+    return _scheduler_instance
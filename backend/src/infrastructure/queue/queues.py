@@ -0,0 +1,86 @@
+import os
+import time
+from typing import Any
+
+from arq.connections import ArqRedis
+
+from src.config import settings
+from src.infrastructure.database.models.job import JobType
+
+TRAINING_QUEUE = "arq:queue:training"
+INFERENCE_QUEUE = "arq:queue:inference"
+
+JOB_TYPE_QUEUES = {
+    JobType.TRAINING: TRAINING_QUEUE,
+    JobType.SWEEP: TRAINING_QUEUE,
+    JobType.BENCHMARK: TRAINING_QUEUE,
+    JobType.INFERENCE: INFERENCE_QUEUE,
+    JobType.BATCH_INFERENCE: INFERENCE_QUEUE,
+    JobType.FILE_PROCESSING: INFERENCE_QUEUE,
+}
+
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+PRIORITY_CLASSES = (INTERACTIVE, BULK)
+
+JOB_TYPE_PRIORITIES = {
+    JobType.TRAINING: INTERACTIVE,
+    JobType.SWEEP: BULK,
+    JobType.BENCHMARK: BULK,
+    JobType.INFERENCE: INTERACTIVE,
+    JobType.BATCH_INFERENCE: BULK,
+    JobType.FILE_PROCESSING: BULK,
+}
+
+
+def queue_for_job_type(job_type: JobType) -> str:
+    return JOB_TYPE_QUEUES[job_type]
+
+
+def priority_for_job_type(job_type: JobType) -> str:
+    return JOB_TYPE_PRIORITIES[job_type]
+
+
+def queue_limits() -> dict[str, dict[str, int]]:
+    return {
+        TRAINING_QUEUE: {
+            "max_jobs": settings.training_worker_max_jobs,
+            "job_timeout": settings.training_worker_job_timeout,
+            "dispatch_slots": settings.training_dispatch_slots,
+            "thread_budget": settings.training_worker_thread_budget
+            or os.cpu_count()
+            or 1,
+        },
+        INFERENCE_QUEUE: {
+            "max_jobs": settings.inference_worker_max_jobs,
+            "job_timeout": settings.inference_worker_job_timeout,
+            "dispatch_slots": settings.inference_dispatch_slots,
+            "thread_budget": settings.inference_worker_thread_budget
+            or os.cpu_count()
+            or 1,
+        },
+    }
+
+
+async def get_queue_stats(pool: ArqRedis) -> list[dict[str, Any]]:
+    now_ms = time.time() * 1000
+    stats = []
+    for queue_name, limits in queue_limits().items():
+        depth = await pool.zcard(queue_name)
+        oldest = await pool.zrange(queue_name, 0, 0, withscores=True)
+        oldest_wait_seconds = 0.0
+        if oldest:
+            oldest_wait_seconds = max(0.0, (now_ms - oldest[0][1]) / 1000)
+
+        stats.append(
+            {
+                "name": queue_name.rsplit(":", 1)[-1],
+                "queue_name": queue_name,
+                "depth": depth,
+                "oldest_wait_seconds": oldest_wait_seconds,
+                **limits,
+            }
+        )
+
+    return stats
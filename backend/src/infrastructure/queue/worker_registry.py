@@ -0,0 +1,64 @@
+import contextlib
+import json
+import os
+import socket
+from datetime import datetime
+from typing import Any
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+
+KEY_PREFIX = "worker"
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def worker_key(worker: str) -> str:
+    return f"{KEY_PREFIX}:{worker}"
+
+
+async def register_worker(
+    redis: Redis,
+    queue_name: str,
+    startup_timings: dict[str, float],
+    failed_steps: list[str] | None = None,
+) -> None:
+    worker = worker_id()
+    report = {
+        "worker_id": worker,
+        "queue_name": queue_name,
+        "hostname": socket.gethostname(),
+        "pid": os.getpid(),
+        "started_at": datetime.utcnow().isoformat(),
+        "startup_seconds": sum(startup_timings.values()),
+        "startup_timings": startup_timings,
+        "failed_startup_steps": failed_steps or [],
+    }
+    with contextlib.suppress(RedisError):
+        await redis.set(
+            worker_key(worker),
+            json.dumps(report),
+            ex=settings.worker_report_ttl_seconds,
+        )
+
+
+async def unregister_worker(redis: Redis) -> None:
+    with contextlib.suppress(RedisError):
+        await redis.delete(worker_key(worker_id()))
+
+
+async def list_workers(redis: Redis) -> list[dict[str, Any]]:
+    workers = []
+    try:
+        async for key in redis.scan_iter(match=f"{KEY_PREFIX}:*"):
+            value = await redis.get(key)
+            if value is not None:
+                workers.append(json.loads(value))
+    except RedisError:
+        return []
+
+    return sorted(workers, key=lambda worker: worker["started_at"])
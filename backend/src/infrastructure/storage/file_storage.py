@@ -1,10 +1,17 @@
+import contextlib
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
 
 import numpy as np
+from botocore.exceptions import BotoCoreError, ClientError
 from numpy.typing import NDArray
 
 from src.config import settings
+from src.core.exceptions import StorageError
+
+COPY_CHUNK_BYTES = 8 * 1024 * 1024
+STORAGE_ERRORS = (OSError, StorageError, BotoCoreError, ClientError)
 
 
 class FileStorage(ABC):
@@ -21,7 +28,7 @@ class FileStorage(ABC):
         pass
 
     @abstractmethod
-    async def load_numpy(self, path: str) -> NDArray:
+    async def load_numpy(self, path: str, mmap_mode: str | None = None) -> NDArray:
         pass
 
     @abstractmethod
@@ -32,6 +39,21 @@ class FileStorage(ABC):
     async def exists(self, path: str) -> bool:
         pass
 
+    @abstractmethod
+    def size(self, path: str) -> int:
+        pass
+
+    @abstractmethod
+    def download_to(
+        self, path: str, destination: Path, cancelled: threading.Event | None = None
+    ) -> None:
+        pass
+
+
+def _check_cancelled(cancelled: threading.Event | None) -> None:
+    if cancelled is not None and cancelled.is_set():
+        raise StorageError("Download cancelled")
+
 
 class LocalFileStorage(FileStorage):
     def __init__(self, base_path: str):
@@ -55,11 +77,11 @@ class LocalFileStorage(FileStorage):
         file_path = self._resolve_path(path)
         np.save(file_path, data)
 
-    async def load_numpy(self, path: str) -> NDArray:
+    async def load_numpy(self, path: str, mmap_mode: str | None = None) -> NDArray:
         file_path = self._resolve_path(path)
         if not file_path.suffix:
             file_path = file_path.with_suffix(".npy")
-        return np.load(file_path)
+        return np.load(file_path, mmap_mode=mmap_mode)
 
     async def delete(self, path: str) -> None:
         file_path = self._resolve_path(path)
@@ -70,6 +92,20 @@ class LocalFileStorage(FileStorage):
         file_path = self._resolve_path(path)
         return file_path.exists()
 
+    def size(self, path: str) -> int:
+        return self._resolve_path(path).stat().st_size
+
+    def download_to(
+        self, path: str, destination: Path, cancelled: threading.Event | None = None
+    ) -> None:
+        with (
+            self._resolve_path(path).open("rb") as source,
+            destination.open("wb") as target,
+        ):
+            while chunk := source.read(COPY_CHUNK_BYTES):
+                _check_cancelled(cancelled)
+                target.write(chunk)
+
 
 class S3FileStorage(FileStorage):
     def __init__(self, bucket: str, region: str | None = None):
@@ -93,7 +129,7 @@ class S3FileStorage(FileStorage):
         buffer.seek(0)
         self._client.put_object(Bucket=self._bucket, Key=path, Body=buffer.getvalue())
 
-    async def load_numpy(self, path: str) -> NDArray:
+    async def load_numpy(self, path: str, mmap_mode: str | None = None) -> NDArray:
         import io
 
         response = self._client.get_object(Bucket=self._bucket, Key=path)
@@ -110,6 +146,26 @@ class S3FileStorage(FileStorage):
         except Exception:
             return False
 
+    def size(self, path: str) -> int:
+        response = self._client.head_object(Bucket=self._bucket, Key=path)
+        return response["ContentLength"]
+
+    def download_to(
+        self, path: str, destination: Path, cancelled: threading.Event | None = None
+    ) -> None:
+        self._client.download_file(
+            self._bucket,
+            path,
+            str(destination),
+            Callback=lambda _: _check_cancelled(cancelled),
+        )
+
+
+async def discard_files(storage: FileStorage, paths: list[str]) -> None:
+    for path in paths:
+        with contextlib.suppress(*STORAGE_ERRORS):
+            await storage.delete(path)
+
 
 _storage_instance: FileStorage | None = None
 
@@ -127,3 +183,8 @@ def get_file_storage() -> FileStorage:
             _storage_instance = LocalFileStorage(settings.storage_path)
 
     return _storage_instance
+
+
+def use_file_storage(storage: FileStorage) -> None:
+    global _storage_instance
+    _storage_instance = storage
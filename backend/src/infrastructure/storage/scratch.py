@@ -0,0 +1,153 @@
+import asyncio
+import contextlib
+import hashlib
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from src.infrastructure.storage.file_storage import STORAGE_ERRORS, FileStorage
+
+
+class ScratchStorage(FileStorage):
+    def __init__(
+        self, storage: FileStorage, root: str | Path, max_bytes: int, concurrency: int
+    ):
+        self._storage = storage
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._files: dict[str, int] = {}
+        self._owners: dict[str, set[str]] = {}
+        self._downloads: dict[str, asyncio.Task] = {}
+        self._cancelled: dict[str, threading.Event] = {}
+        self._reserved = 0
+
+    @property
+    def used_bytes(self) -> int:
+        return sum(self._files.values()) + self._reserved
+
+    def local_path(self, path: str) -> Path:
+        digest = hashlib.sha256(path.encode()).hexdigest()[:32]
+        return self._root / f"{digest}{Path(path).suffix}"
+
+    def owners(self) -> set[str]:
+        return {owner for owners in self._owners.values() for owner in owners}
+
+    def prefetch(self, owner: str, paths: list[str]) -> None:
+        for path in paths:
+            self._owners.setdefault(path, set()).add(owner)
+            if path in self._files or path in self._downloads:
+                continue
+            self._downloads[path] = asyncio.create_task(self._download(path))
+
+    async def release(self, owner: str) -> None:
+        for path in [path for path, owners in self._owners.items() if owner in owners]:
+            owners = self._owners[path]
+            owners.discard(owner)
+            if owners:
+                continue
+
+            del self._owners[path]
+            await self._cancel(path)
+            self._evict(path)
+
+    async def clear(self) -> None:
+        for path in list(self._downloads):
+            await self._cancel(path)
+        self._owners.clear()
+        self._files.clear()
+        shutil.rmtree(self._root, ignore_errors=True)
+
+    async def _cancel(self, path: str) -> None:
+        event = self._cancelled.get(path)
+        if event is not None:
+            event.set()
+
+        download = self._downloads.get(path)
+        if download is not None:
+            download.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await download
+
+    def _evict(self, path: str) -> None:
+        if self._files.pop(path, None) is not None:
+            self.local_path(path).unlink(missing_ok=True)
+
+    def _fits(self, size: int) -> bool:
+        return self.used_bytes + size <= self._max_bytes
+
+    async def _download(self, path: str) -> None:
+        partial = self.local_path(path).with_suffix(".part")
+        event = threading.Event()
+        self._cancelled[path] = event
+        reserved = 0
+        try:
+            async with self._semaphore:
+                if not self._owners.get(path):
+                    return
+
+                size = await asyncio.to_thread(self._storage.size, path)
+                if not self._fits(size):
+                    return
+
+                reserved = size
+                self._reserved += reserved
+                await asyncio.to_thread(self._storage.download_to, path, partial, event)
+                if self._owners.get(path):
+                    partial.replace(self.local_path(path))
+                    self._files[path] = size
+        except STORAGE_ERRORS:
+            pass
+        finally:
+            event.set()
+            partial.unlink(missing_ok=True)
+            self._reserved -= reserved
+            self._cancelled.pop(path, None)
+            self._downloads.pop(path, None)
+
+    async def _is_local(self, path: str) -> bool:
+        download = self._downloads.get(path)
+        if download is not None:
+            try:
+                await asyncio.shield(download)
+            except asyncio.CancelledError:
+                if not download.cancelled():
+                    raise
+        return path in self._files
+
+    async def save_bytes(self, path: str, data: bytes) -> None:
+        self._evict(path)
+        await self._storage.save_bytes(path, data)
+
+    async def load_bytes(self, path: str) -> bytes:
+        if await self._is_local(path):
+            return self.local_path(path).read_bytes()
+        return await self._storage.load_bytes(path)
+
+    async def save_numpy(self, path: str, data: NDArray) -> None:
+        self._evict(path)
+        await self._storage.save_numpy(path, data)
+
+    async def load_numpy(self, path: str, mmap_mode: str | None = None) -> NDArray:
+        if await self._is_local(path):
+            return np.load(self.local_path(path), mmap_mode=mmap_mode)
+        return await self._storage.load_numpy(path, mmap_mode=mmap_mode)
+
+    async def delete(self, path: str) -> None:
+        self._evict(path)
+        await self._storage.delete(path)
+
+    async def exists(self, path: str) -> bool:
+        return path in self._files or await self._storage.exists(path)
+
+    def size(self, path: str) -> int:
+        return self._files.get(path) or self._storage.size(path)
+
+    def download_to(
+        self, path: str, destination: Path, cancelled: threading.Event | None = None
+    ) -> None:
+        self._storage.download_to(path, destination, cancelled)
@@ -1,17 +1,31 @@
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api.v1.router import api_router
+from src.api.websocket import router as websocket_router
 from src.config import settings
+from src.domain.services.transform_service import shutdown_transform_service
+from src.infrastructure.cache.job_events import close_job_event_broker
+from src.infrastructure.cache.redis_client import close_redis
 from src.infrastructure.database.session import engine
+from src.infrastructure.queue.arq_pool import (
+    check_arq_pool,
+    close_arq_pool,
+    get_arq_pool,
+)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    await get_arq_pool()
     yield
+    await close_job_event_broker()
+    await close_arq_pool()
+    shutdown_transform_service()
+    await close_redis()
     await engine.dispose()
 
 
@@ -34,6 +48,7 @@ def create_app() -> FastAPI:
     )
 
     app.include_router(api_router, prefix="/api/v1")
+    app.include_router(websocket_router, prefix="/ws")
 
     return app
 
@@ -42,5 +57,9 @@ app = create_app()
 
 
 @app.get("/health")
-async def health_check() -> dict[str, str]:
-    return {"status": "healthy"}
+async def health_check(response: Response) -> dict[str, str]:
+    if not await check_arq_pool():
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return {"status": "unhealthy", "redis": "unavailable"}
+
+    return {"status": "healthy", "redis": "ok"}
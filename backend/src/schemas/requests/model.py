@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PositiveInt
 
 
 class CreateModelRequest(BaseModel):
@@ -30,3 +30,87 @@ class TrainModelRequest(BaseModel):
     cg_molecule_id: str
     atomistic_molecule_id: str
     glimps_options: GlimpsOptionsRequest = Field(default_factory=GlimpsOptionsRequest)
+
+
+class SweepModelRequest(BaseModel):
+    cg_molecule_id: str
+    atomistic_molecule_id: str
+    pca: list[bool] = Field(default=[False, True], min_length=1)
+    refine: list[bool] = Field(default=[False, True], min_length=1)
+    shave: list[bool] = Field(default=[False, True], min_length=1)
+    triangulate: list[bool] = Field(default=[False], min_length=1)
+    holdout_fraction: float = Field(
+        default=0.2,
+        gt=0.0,
+        lt=1.0,
+        description="Fraction of frames held out for scoring each combination",
+    )
+
+
+class PipelineRequest(BaseModel):
+    cg_molecule_id: str
+    atomistic_molecule_id: str
+    glimps_options: GlimpsOptionsRequest = Field(default_factory=GlimpsOptionsRequest)
+    inference_molecule_ids: list[str] | None = Field(
+        default=None,
+        min_length=1,
+        description="CG molecules to backmap with the trained model",
+    )
+    infer_all_coarse_grained: bool = Field(
+        default=False,
+        description="Backmap every CG molecule with coordinates in the project",
+    )
+
+
+class BenchmarkModelRequest(BaseModel):
+    input_molecule_id: str | None = Field(
+        default=None,
+        description="CG molecule used as benchmark input, defaults to the training CG molecule",
+    )
+    batch_sizes: list[PositiveInt] = Field(default=[1, 8, 32, 128], min_length=1)
+    thread_counts: list[PositiveInt] = Field(default=[1, 2, 4], min_length=1)
+
+
+class BatchInferenceRequest(BaseModel):
+    molecule_ids: list[str] | None = Field(
+        default=None,
+        min_length=1,
+        description="CG molecules in the model's project to backmap",
+    )
+    all_coarse_grained: bool = Field(
+        default=False,
+        description="Backmap every CG molecule with coordinates in the project",
+    )
+
+
+class TransformRequest(BaseModel):
+    molecule_id: str | None = Field(
+        default=None,
+        description="CG molecule in the model's project to transform",
+    )
+    coordinates: list[list[list[float]]] | list[list[float]] | None = Field(
+        default=None,
+        description="CG coordinates in nm, shaped (n_frames, n_atoms, 3) or (n_atoms, 3)",
+    )
+    output_format: str = Field(default="coordinates", pattern="^(coordinates|pdb)$")
+
+
+class EstimateRequest(BaseModel):
+    job_type: str = Field(
+        default="training",
+        pattern="^(training|inference|batch_inference)$",
+    )
+    cg_molecule_id: str | None = Field(
+        default=None,
+        description="Training CG molecule, defaults to the model's training CG molecule",
+    )
+    atomistic_molecule_id: str | None = Field(
+        default=None,
+        description="Training atomistic molecule, defaults to the model's atomistic molecule",
+    )
+    molecule_ids: list[str] | None = Field(
+        default=None,
+        min_length=1,
+        description="CG molecules to backmap for inference estimates",
+    )
+    glimps_options: GlimpsOptionsRequest = Field(default_factory=GlimpsOptionsRequest)
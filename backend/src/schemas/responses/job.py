@@ -1,9 +1,11 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
 
 from src.infrastructure.database.models.job import JobStatus, JobType
 
+ACTIVE_STATUSES = (JobStatus.PENDING, JobStatus.QUEUED, JobStatus.RUNNING)
+
 
 class JobResponse(BaseModel):
     id: str
@@ -23,7 +25,70 @@ class JobResponse(BaseModel):
     class Config:
         from_attributes = True
 
+    @property
+    def _estimate(self) -> dict:
+        return (self.input_params or {}).get("estimate") or {}
+
+    @computed_field
+    @property
+    def estimated_runtime_seconds(self) -> float | None:
+        return self._estimate.get("runtime_seconds")
+
+    @computed_field
+    @property
+    def estimated_memory_bytes(self) -> int | None:
+        return self._estimate.get("memory_bytes")
+
+    @computed_field
+    @property
+    def timeout_seconds(self) -> int | None:
+        return self._estimate.get("timeout_seconds")
+
+    @computed_field
+    @property
+    def estimated_completion_at(self) -> datetime | None:
+        runtime = self.estimated_runtime_seconds
+        if runtime is None or self.status not in ACTIVE_STATUSES:
+            return None
+        return (self.started_at or self.created_at) + timedelta(seconds=runtime)
+
 
 class JobListResponse(BaseModel):
     jobs: list[JobResponse]
     total: int
+
+
+class QueueStatsResponse(BaseModel):
+    name: str
+    queue_name: str
+    depth: int
+    oldest_wait_seconds: float
+    max_jobs: int
+    job_timeout: int
+    dispatch_slots: int
+    thread_budget: int
+    waiting: int = 0
+    in_flight: int = 0
+    model_cache_hits: int = 0
+    model_cache_misses: int = 0
+    model_cache_hit_rate: float = 0.0
+    affinity_deferrals: int = 0
+
+
+class QueueStatsListResponse(BaseModel):
+    queues: list[QueueStatsResponse]
+
+
+class WorkerResponse(BaseModel):
+    worker_id: str
+    queue_name: str
+    hostname: str
+    pid: int
+    started_at: datetime
+    startup_seconds: float
+    startup_timings: dict[str, float]
+    failed_startup_steps: list[str] = []
+
+
+class WorkerListResponse(BaseModel):
+    workers: list[WorkerResponse]
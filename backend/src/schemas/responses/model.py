@@ -9,6 +9,7 @@ class ModelResponse(BaseModel):
     description: str | None
     project_id: str
     is_trained: bool
+    version: int
     training_config: dict | None
     training_metrics: dict | None
     cg_molecule_id: str | None
@@ -22,6 +23,27 @@ class ModelResponse(BaseModel):
         from_attributes = True
 
 
+class ModelVersionResponse(BaseModel):
+    id: str
+    model_id: str
+    version: int
+    update_mode: str
+    training_config: dict | None
+    training_metrics: dict | None
+    training_pairs: list | None
+    n_training_frames: int
+    job_id: str | None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class ModelVersionListResponse(BaseModel):
+    versions: list[ModelVersionResponse]
+    total: int
+
+
 class ModelListResponse(BaseModel):
     models: list[ModelResponse]
     total: int
@@ -31,3 +53,34 @@ class TrainingJobResponse(BaseModel):
     job_id: str
     model_id: str
     status: str
+
+
+class PipelineJobResponse(BaseModel):
+    model_id: str
+    training_job_id: str
+    inference_job_id: str
+    status: str
+
+
+class TransformResponse(BaseModel):
+    model_id: str
+    version: int
+    n_frames: int
+    n_atoms: int
+    coordinates: list | None = None
+    pdb: str | None = None
+    transform_seconds: float
+    model_cache_hit: bool
+
+
+class CostEstimateResponse(BaseModel):
+    model_id: str
+    job_type: str
+    runtime_seconds: float
+    memory_bytes: int
+    timeout_seconds: int
+    queue_name: str
+    priority: str
+    source: str
+    n_samples: int
+    stage_seconds: dict[str, float]
@@ -0,0 +1,83 @@
+import asyncio
+from datetime import UTC, datetime
+from functools import wraps
+from typing import Any
+
+from src.config import settings
+from src.infrastructure.cache.model_affinity import (
+    DEFERRALS,
+    HITS,
+    MISSES,
+    advertise,
+    find_holders,
+    model_key,
+    record_routing,
+)
+from src.infrastructure.cache.model_cache import get_model_cache
+from src.infrastructure.queue.queues import queue_limits
+from src.workers.memory import job_input_params
+from src.workers.retry import Deferred, deferral_count
+from src.workers.threads import Task
+
+AFFINITY_DEFERRAL = "affinity"
+
+
+async def advertise_cached_models(ctx: dict[str, Any], queue_name: str) -> None:
+    budget = ctx.get("thread_budget")
+    running = budget.running if budget is not None else 0
+    await advertise(
+        ctx["redis"],
+        queue_name,
+        get_model_cache().cached_models(),
+        queue_limits()[queue_name]["max_jobs"] - running,
+    )
+
+
+async def run_advertisements(ctx: dict[str, Any], queue_name: str) -> None:
+    while True:
+        await advertise_cached_models(ctx, queue_name)
+        await asyncio.sleep(settings.cache_affinity_advertise_seconds)
+
+
+def _waited_seconds(ctx: dict[str, Any]) -> float:
+    enqueue_time = ctx.get("enqueue_time")
+    if enqueue_time is None:
+        return 0.0
+    return (datetime.now(UTC) - enqueue_time).total_seconds()
+
+
+async def should_defer(ctx: dict[str, Any], queue_name: str, key: str) -> bool:
+    if deferral_count(ctx, AFFINITY_DEFERRAL) >= settings.cache_affinity_max_deferrals:
+        return False
+    if _waited_seconds(ctx) >= settings.cache_affinity_wait_seconds:
+        return False
+
+    holders = await find_holders(ctx["redis"], queue_name, key)
+    return any(holder["free_slots"] > 0 for holder in holders)
+
+
+def with_cache_affinity(task: Task, queue_name: str) -> Task:
+    @wraps(task)
+    async def run(ctx: dict[str, Any], job_id: str, *args: Any, **kwargs: Any) -> Any:
+        params = await job_input_params(job_id)
+        ctx = {**ctx, "job_params": params}
+
+        model_path = params.get("model_path")
+        if not settings.cache_affinity_enabled or not model_path:
+            return await task(ctx, job_id, *args, **kwargs)
+
+        version = params.get("version")
+        if get_model_cache().is_warm(model_path, version):
+            await record_routing(ctx["redis"], queue_name, HITS)
+        elif await should_defer(ctx, queue_name, model_key(model_path, version)):
+            await record_routing(ctx["redis"], queue_name, DEFERRALS)
+            raise Deferred(AFFINITY_DEFERRAL, settings.cache_affinity_retry_seconds)
+        else:
+            await record_routing(ctx["redis"], queue_name, MISSES)
+
+        try:
+            return await task(ctx, job_id, *args, **kwargs)
+        finally:
+            await advertise_cached_models(ctx, queue_name)
+
+    return run
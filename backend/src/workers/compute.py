@@ -0,0 +1,37 @@
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+
+def terminate_executor(executor: ProcessPoolExecutor) -> None:
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+
+
+class ComputePool:
+    def __init__(self, executor_factory: Callable[[], ProcessPoolExecutor]):
+        self._executor_factory = executor_factory
+        self.executor = executor_factory()
+        self._users = 0
+
+    @contextmanager
+    def acquire(self) -> Iterator[ProcessPoolExecutor]:
+        self._users += 1
+        try:
+            yield self.executor
+        finally:
+            self._users -= 1
+
+    def reset(self) -> bool:
+        if self._users > 1:
+            return False
+
+        terminate_executor(self.executor)
+        self.executor = self._executor_factory()
+        return True
+
+    def shutdown(self) -> None:
+        terminate_executor(self.executor)
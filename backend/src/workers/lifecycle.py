@@ -0,0 +1,166 @@
+import asyncio
+import contextlib
+import importlib
+import logging
+import multiprocessing
+import os
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+from sqlalchemy import text
+
+from src.config import settings
+from src.infrastructure.cache.job_heartbeat import run_heartbeats
+from src.infrastructure.cache.model_affinity import withdraw
+from src.infrastructure.cache.redis_client import close_redis, get_redis
+from src.infrastructure.database.session import engine
+from src.infrastructure.queue.queues import (
+    INFERENCE_QUEUE,
+    TRAINING_QUEUE,
+    queue_limits,
+)
+from src.infrastructure.queue.worker_registry import register_worker, unregister_worker
+from src.infrastructure.storage.file_storage import get_file_storage
+from src.workers.affinity import run_advertisements
+from src.workers.compute import ComputePool
+from src.workers.memory import MemoryBudget, worker_memory_bytes
+from src.workers.prefetch import run_prefetcher, start_prefetcher
+from src.workers.threads import ThreadBudget
+
+PRELOAD_MODULES = (
+    "scipy.optimize",
+    "sklearn.linear_model",
+    "mdtraj",
+    "mdplus.multiscale",
+    "src.glimps.pdb",
+    "src.glimps.sweep",
+)
+COMPUTE_PRELOAD_MODULES = ("numpy", "mdplus.multiscale", "src.glimps.sweep")
+BACKGROUND_TASKS = ("heartbeat_task", "advertisement_task", "prefetch_task")
+
+logger = logging.getLogger(__name__)
+
+
+def preload_libraries() -> None:
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+
+
+def warm_blas() -> None:
+    matrix = np.random.default_rng(0).random((256, 256))
+    np.linalg.svd(matrix @ matrix.T)
+
+
+def compute_workers() -> int:
+    return settings.sweep_max_workers or os.cpu_count() or 1
+
+
+def new_compute_executor() -> ProcessPoolExecutor:
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(list(COMPUTE_PRELOAD_MODULES))
+    return ProcessPoolExecutor(max_workers=compute_workers(), mp_context=context)
+
+
+def start_compute_executor() -> ComputePool:
+    pool = ComputePool(new_compute_executor)
+    max_workers = compute_workers()
+    for future in [pool.executor.submit(os.getpid) for _ in range(max_workers)]:
+        future.result()
+    return pool
+
+
+async def _warm_storage() -> None:
+    await get_file_storage().exists(".warm-start")
+
+
+async def _warm_database() -> None:
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def _warm_redis() -> None:
+    await get_redis().ping()
+
+
+async def _timed(
+    timings: dict[str, float],
+    failed: list[str],
+    name: str,
+    step: Callable[[], Awaitable[Any]],
+) -> Any:
+    start = time.perf_counter()
+    try:
+        result = await step()
+    except Exception:
+        logger.exception("Warm start step %s failed", name)
+        failed.append(name)
+        return None
+
+    timings[name] = round(time.perf_counter() - start, 3)
+    return result
+
+
+async def warm_start(
+    ctx: dict[str, Any], queue_name: str, compute_executor: bool = False
+) -> None:
+    timings: dict[str, float] = {}
+    failed: list[str] = []
+    if settings.worker_prefetch_enabled and settings.storage_backend == "s3":
+        ctx["prefetcher"] = start_prefetcher(ctx["redis"], queue_name)
+    ctx["thread_budget"] = ThreadBudget(queue_limits()[queue_name]["thread_budget"])
+    ctx["memory_budget"] = MemoryBudget(worker_memory_bytes(queue_name))
+
+    if settings.worker_warm_start:
+        await _timed(
+            timings, failed, "imports", lambda: asyncio.to_thread(preload_libraries)
+        )
+        await _timed(timings, failed, "blas", lambda: asyncio.to_thread(warm_blas))
+        await _timed(timings, failed, "storage", _warm_storage)
+        await _timed(timings, failed, "database", _warm_database)
+        await _timed(timings, failed, "redis", _warm_redis)
+
+        if compute_executor:
+            ctx["compute_executor"] = await _timed(
+                timings,
+                failed,
+                "compute_executor",
+                lambda: asyncio.to_thread(start_compute_executor),
+            )
+
+    ctx["startup_timings"] = timings
+    await register_worker(ctx["redis"], queue_name, timings, failed)
+    ctx["heartbeat_task"] = asyncio.create_task(run_heartbeats(ctx["redis"]))
+    if "prefetcher" in ctx:
+        ctx["prefetch_task"] = asyncio.create_task(run_prefetcher(ctx["prefetcher"]))
+
+
+async def training_worker_startup(ctx: dict[str, Any]) -> None:
+    await warm_start(ctx, TRAINING_QUEUE, compute_executor=True)
+
+
+async def inference_worker_startup(ctx: dict[str, Any]) -> None:
+    await warm_start(ctx, INFERENCE_QUEUE)
+    ctx["advertisement_task"] = asyncio.create_task(
+        run_advertisements(ctx, INFERENCE_QUEUE)
+    )
+
+
+async def worker_shutdown(ctx: dict[str, Any]) -> None:
+    for name in BACKGROUND_TASKS:
+        background_task = ctx.pop(name, None)
+        if background_task is not None:
+            background_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await background_task
+
+    executor = ctx.pop("compute_executor", None)
+    if executor is not None:
+        executor.shutdown()
+
+    await withdraw(ctx["redis"])
+    await unregister_worker(ctx["redis"])
+    await close_redis()
+    await engine.dispose()
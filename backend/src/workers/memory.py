@@ -0,0 +1,231 @@
+import asyncio
+import contextlib
+import os
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import wraps
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.config import settings
+from src.infrastructure.cache.memory_calibration import (
+    calibration_factor,
+    record_memory_usage,
+)
+from src.infrastructure.database.models.job import JobType
+from src.infrastructure.database.session import async_session_maker
+from src.infrastructure.queue.queues import TRAINING_QUEUE
+from src.workers.retry import Deferred, deferral_count
+from src.workers.threads import Task
+
+MEMORY_DEFERRAL = "memory"
+
+CGROUP_MEMORY_LIMITS = (
+    "/sys/fs/cgroup/memory.max",
+    "/sys/fs/cgroup/memory/memory.limit_in_bytes",
+)
+
+
+def physical_memory_bytes() -> int:
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+def container_memory_bytes() -> int:
+    physical = physical_memory_bytes()
+    for path in CGROUP_MEMORY_LIMITS:
+        try:
+            value = Path(path).read_text().strip()
+        except OSError:
+            continue
+        if value.isdigit() and int(value) < physical:
+            return int(value)
+    return physical
+
+
+def worker_memory_bytes(queue_name: str) -> int:
+    configured = (
+        settings.training_worker_memory_bytes
+        if queue_name == TRAINING_QUEUE
+        else settings.inference_worker_memory_bytes
+    )
+    return configured or int(container_memory_bytes() * settings.worker_memory_fraction)
+
+
+def _resident_bytes(pid: int | str) -> int:
+    with open(f"/proc/{pid}/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _child_pids(pid: int | str) -> list[str]:
+    children = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        children.extend((task / "children").read_text().split())
+    return children
+
+
+def process_tree_resident_bytes() -> int:
+    from src.glimps.benchmark import resident_memory_bytes
+
+    try:
+        total = 0
+        pending: list[int | str] = [os.getpid()]
+        while pending:
+            pid = pending.pop()
+            try:
+                total += _resident_bytes(pid)
+                pending.extend(_child_pids(pid))
+            except (OSError, ValueError):
+                if pid == os.getpid():
+                    raise
+        return total
+    except (OSError, ValueError):
+        return resident_memory_bytes()
+
+
+class MemoryBudget:
+    def __init__(self, total_bytes: int):
+        self.total_bytes = max(0, total_bytes)
+        self._reserved: dict[str, int] = {}
+        self._shared: set[str] = set()
+
+    @property
+    def reserved_bytes(self) -> int:
+        return sum(self._reserved.values())
+
+    @property
+    def available_bytes(self) -> int:
+        return self.total_bytes - self.reserved_bytes
+
+    def fits(self, size_bytes: int) -> bool:
+        return not self._reserved or size_bytes <= self.available_bytes
+
+    @asynccontextmanager
+    async def reserve(
+        self, key: str, size_bytes: int, force: bool = False
+    ) -> AsyncIterator[None]:
+        if not force and not self.fits(size_bytes):
+            raise Deferred(MEMORY_DEFERRAL, settings.job_memory_retry_seconds)
+
+        if self._reserved:
+            self._shared.update(self._reserved)
+            self._shared.add(key)
+        self._reserved[key] = size_bytes
+        try:
+            yield
+        finally:
+            self._reserved.pop(key, None)
+            self._shared.discard(key)
+
+    def is_shared(self, key: str) -> bool:
+        return key in self._shared
+
+
+class PeakMemorySampler:
+    def __init__(self, interval_seconds: float | None = None):
+        self.interval_seconds = (
+            settings.job_memory_sample_seconds
+            if interval_seconds is None
+            else interval_seconds
+        )
+        self.baseline_bytes = 0
+        self.peak_bytes = 0
+        self._task: asyncio.Task | None = None
+
+    def sample(self) -> None:
+        self.peak_bytes = max(self.peak_bytes, process_tree_resident_bytes())
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            self.sample()
+
+    async def __aenter__(self) -> "PeakMemorySampler":
+        self.baseline_bytes = self.peak_bytes = process_tree_resident_bytes()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        if self._task is not None:
+            self._task.cancel()
+        self.sample()
+
+    @property
+    def job_peak_bytes(self) -> int:
+        return max(0, self.peak_bytes - self.baseline_bytes)
+
+
+async def job_input_params(job_id: str) -> dict[str, Any]:
+    from sqlalchemy import select
+
+    from src.infrastructure.database.models.job import Job
+
+    try:
+        async with async_session_maker() as session:
+            result = await session.execute(
+                select(Job.input_params).where(Job.id == job_id)
+            )
+            return result.scalar_one_or_none() or {}
+    except SQLAlchemyError:
+        return {}
+
+
+async def record_job_memory(job_id: str, usage: dict[str, Any]) -> None:
+    from src.infrastructure.database.models.job import Job
+
+    async with async_session_maker() as session:
+        job = await session.get(Job, job_id)
+        if job is None:
+            return
+        job.output_params = {**(job.output_params or {}), "memory": usage}
+        await session.commit()
+
+
+def with_memory_admission(task: Task, job_type: JobType) -> Task:
+    @wraps(task)
+    async def run(ctx: dict[str, Any], job_id: str, *args: Any, **kwargs: Any) -> Any:
+        params = ctx.get("job_params")
+        if params is None:
+            params = await job_input_params(job_id)
+            ctx = {**ctx, "job_params": params}
+
+        budget: MemoryBudget | None = ctx.get("memory_budget")
+        if budget is None:
+            return await task(ctx, job_id, *args, **kwargs)
+
+        estimate = int(params.get("memory_estimate_bytes") or 0)
+        factor = await calibration_factor(ctx["redis"], job_type)
+        reserved = int(estimate * factor) + settings.job_memory_overhead_bytes
+
+        force = (
+            deferral_count(ctx, MEMORY_DEFERRAL) >= settings.job_memory_max_deferrals
+        )
+        async with (
+            budget.reserve(ctx["job_id"], reserved, force),
+            PeakMemorySampler() as sampler,
+        ):
+            result = await task(ctx, job_id, *args, **kwargs)
+            ran_alone = not budget.is_shared(ctx["job_id"])
+
+        if ctx["job_id"] == job_id and (result or {}).get("status") == "success":
+            usage = {
+                "memory_estimate_bytes": estimate,
+                "reserved_bytes": reserved,
+                "peak_rss_bytes": sampler.peak_bytes,
+                "ran_alone": ran_alone,
+                "job_peak_bytes": sampler.job_peak_bytes if ran_alone else None,
+                "calibration_factor": (
+                    await record_memory_usage(
+                        ctx["redis"], job_type, estimate, sampler.job_peak_bytes
+                    )
+                    if ran_alone
+                    else None
+                ),
+            }
+            with contextlib.suppress(SQLAlchemyError):
+                await record_job_memory(job_id, usage)
+
+        return result
+
+    return run
@@ -0,0 +1,197 @@
+import asyncio
+import contextlib
+import inspect
+import os
+import tempfile
+from functools import wraps
+from pathlib import Path
+from typing import Any
+
+from arq import Retry
+from arq.constants import in_progress_key_prefix, job_key_prefix
+from arq.jobs import DeserializationError, JobDef, deserialize_job
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.config import settings
+from src.infrastructure.cache.job_progress import cancel_key
+from src.infrastructure.cache.model_cache import get_model_cache
+from src.infrastructure.queue.queues import queue_limits
+from src.infrastructure.queue.worker_registry import worker_id
+from src.infrastructure.storage.file_storage import (
+    STORAGE_ERRORS,
+    get_file_storage,
+    use_file_storage,
+)
+from src.infrastructure.storage.scratch import ScratchStorage
+from src.workers.threads import Task
+
+INPUT_ARGUMENTS = (
+    "model_path",
+    "input_file_path",
+    "cg_file_path",
+    "atomistic_file_path",
+    "reference_file_path",
+    "atomistic_pdb_path",
+    "base_file_paths",
+    "inputs",
+    "plan",
+)
+INPUT_FIELDS = (
+    "model_path",
+    "input_file_path",
+    "atomistic_file_path",
+    "reference_file_path",
+    "coordinates_path",
+)
+
+_task_signatures: dict[str, inspect.Signature] = {}
+
+
+def _collect_paths(value: Any, paths: list[str]) -> None:
+    if isinstance(value, str):
+        if value not in paths:
+            paths.append(value)
+    elif isinstance(value, dict):
+        for field in INPUT_FIELDS:
+            if value.get(field):
+                _collect_paths(value[field], paths)
+    elif isinstance(value, list | tuple):
+        for item in value:
+            _collect_paths(item, paths)
+
+
+def job_inputs(job: JobDef) -> tuple[str | None, list[str]]:
+    signature = _task_signatures.get(job.function)
+    if signature is None:
+        return None, []
+
+    try:
+        arguments = signature.bind(None, *job.args, **job.kwargs).arguments
+    except TypeError:
+        return None, []
+
+    paths: list[str] = []
+    for name in INPUT_ARGUMENTS:
+        if arguments.get(name):
+            _collect_paths(arguments[name], paths)
+    return arguments.get("job_id"), paths
+
+
+async def upcoming_jobs(
+    redis: Redis, queue_name: str, limit: int
+) -> list[tuple[str, JobDef]]:
+    if limit <= 0:
+        return []
+
+    jobs = []
+    for raw_id in await redis.zrange(queue_name, 0, limit - 1):
+        job_id = raw_id.decode() if isinstance(raw_id, bytes) else raw_id
+        if await redis.exists(in_progress_key_prefix + job_id):
+            continue
+        payload = await redis.get(job_key_prefix + job_id)
+        if payload is not None:
+            jobs.append((job_id, deserialize_job(payload)))
+    return jobs
+
+
+class Prefetcher:
+    def __init__(self, redis: Redis, queue_name: str, storage: ScratchStorage):
+        self.storage = storage
+        self.running: set[str] = set()
+        self._redis = redis
+        self._queue_name = queue_name
+        self._jobs: dict[str, str | None] = {}
+
+    async def poll(self) -> None:
+        free_slots = queue_limits()[self._queue_name]["max_jobs"] - len(self.running)
+        lookahead = min(settings.worker_prefetch_lookahead, free_slots)
+
+        for arq_job_id, job in await upcoming_jobs(
+            self._redis, self._queue_name, lookahead
+        ):
+            if arq_job_id in self._jobs or arq_job_id in self.running:
+                continue
+
+            job_id, paths = job_inputs(job)
+            cache = get_model_cache()
+            paths = [path for path in paths if not cache.holds_model(path)]
+            if paths and not await self._cancelled(job_id):
+                self._jobs[arq_job_id] = job_id
+                self.storage.prefetch(arq_job_id, paths)
+
+        for arq_job_id, job_id in list(self._jobs.items()):
+            if arq_job_id not in self.running and not await self._waiting(
+                arq_job_id, job_id
+            ):
+                await self.release(arq_job_id)
+
+    async def release(self, arq_job_id: str) -> None:
+        self._jobs.pop(arq_job_id, None)
+        await self.storage.release(arq_job_id)
+
+    async def _cancelled(self, job_id: str | None) -> bool:
+        return job_id is not None and bool(await self._redis.exists(cancel_key(job_id)))
+
+    async def _waiting(self, arq_job_id: str, job_id: str | None) -> bool:
+        try:
+            if await self._redis.zscore(self._queue_name, arq_job_id) is None:
+                return False
+            if await self._redis.exists(in_progress_key_prefix + arq_job_id):
+                return False
+            return not await self._cancelled(job_id)
+        except RedisError:
+            return True
+
+
+def scratch_root() -> Path:
+    root = settings.worker_scratch_path or os.path.join(
+        tempfile.gettempdir(), "mdplus-scratch"
+    )
+    return Path(root) / worker_id().replace(":", "-")
+
+
+def start_prefetcher(redis: Redis, queue_name: str) -> Prefetcher:
+    storage = ScratchStorage(
+        get_file_storage(),
+        scratch_root(),
+        settings.worker_scratch_bytes,
+        settings.worker_prefetch_concurrency,
+    )
+    use_file_storage(storage)
+    return Prefetcher(redis, queue_name, storage)
+
+
+async def run_prefetcher(prefetcher: Prefetcher) -> None:
+    try:
+        while True:
+            with contextlib.suppress(RedisError, DeserializationError, *STORAGE_ERRORS):
+                await prefetcher.poll()
+            await asyncio.sleep(settings.worker_prefetch_interval_seconds)
+    finally:
+        await prefetcher.storage.clear()
+
+
+def with_prefetched_inputs(task: Task) -> Task:
+    _task_signatures[task.__name__] = inspect.signature(task)
+
+    @wraps(task)
+    async def run(ctx: dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+        prefetcher: Prefetcher | None = ctx.get("prefetcher")
+        if prefetcher is None:
+            return await task(ctx, *args, **kwargs)
+
+        arq_job_id = ctx["job_id"]
+        prefetcher.running.add(arq_job_id)
+        requeued = False
+        try:
+            return await task(ctx, *args, **kwargs)
+        except Retry:
+            requeued = True
+            raise
+        finally:
+            prefetcher.running.discard(arq_job_id)
+            if not requeued:
+                await prefetcher.release(arq_job_id)
+
+    return run
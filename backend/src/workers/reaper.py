@@ -0,0 +1,141 @@
+import time
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from functools import wraps
+from typing import Any
+
+from arq.connections import ArqRedis
+from arq.constants import in_progress_key_prefix, job_key_prefix
+from arq.cron import CronJob, cron
+
+from src.config import settings
+from src.infrastructure.cache.job_heartbeat import (
+    read_heartbeats,
+    stop_heartbeat,
+    task_heartbeats,
+)
+from src.infrastructure.cache.job_progress import JobProgressReporter
+from src.infrastructure.database.session import async_session_maker
+from src.infrastructure.queue.queues import (
+    INFERENCE_QUEUE,
+    JOB_TYPE_QUEUES,
+    TRAINING_QUEUE,
+)
+from src.workers.threads import Task
+
+REQUEUE_KEY_PREFIX = "job_requeues"
+
+
+def requeue_key(job_id: str) -> str:
+    return f"{REQUEUE_KEY_PREFIX}:{job_id}"
+
+
+def _timestamp(value: datetime) -> float:
+    return value.replace(tzinfo=UTC).timestamp()
+
+
+async def reap_stale_jobs(redis: ArqRedis, queue_name: str) -> dict[str, list[str]]:
+    from sqlalchemy import select, update
+
+    from src.infrastructure.database.models.job import Job, JobStatus
+
+    job_types = [
+        job_type for job_type, queue in JOB_TYPE_QUEUES.items() if queue == queue_name
+    ]
+    async with async_session_maker() as session:
+        result = await session.execute(
+            select(Job).where(
+                Job.status == JobStatus.RUNNING, Job.job_type.in_(job_types)
+            )
+        )
+        jobs = list(result.scalars().all())
+
+    reaped: dict[str, list[str]] = {"requeued": [], "failed": []}
+    if not jobs:
+        return reaped
+
+    heartbeats = await read_heartbeats(redis, [job.id for job in jobs])
+    now = time.time()
+
+    for job in jobs:
+        params = job.input_params or {}
+        if params.get("pipeline_job_id"):
+            continue
+
+        heartbeat = heartbeats.get(job.id)
+        last_seen = (
+            heartbeat["at"]
+            if heartbeat
+            else _timestamp(job.started_at or job.created_at)
+        )
+        if now - last_seen < settings.job_heartbeat_timeout_seconds:
+            continue
+
+        worker = heartbeat["worker_id"] if heartbeat else "unknown"
+        job_ids = [job.id]
+        if params.get("pipeline_inference_job_id"):
+            job_ids.append(params["pipeline_inference_job_id"])
+
+        if await _requeue(redis, job.id, queue_name):
+            async with async_session_maker() as session:
+                await session.execute(
+                    update(Job)
+                    .where(Job.id.in_(job_ids), Job.status == JobStatus.RUNNING)
+                    .values(
+                        status=JobStatus.QUEUED,
+                        progress_message=(
+                            f"Requeued after worker {worker} stopped responding"
+                        ),
+                    )
+                )
+                await session.commit()
+            reaped["requeued"].append(job.id)
+        else:
+            for job_id in job_ids:
+                await JobProgressReporter(job_id, redis=redis).fail(
+                    f"Worker {worker} stopped responding "
+                    f"{now - last_seen:.0f}s ago and the job could not be retried"
+                )
+            reaped["failed"].append(job.id)
+
+        for job_id in job_ids:
+            await stop_heartbeat(redis, job_id)
+
+    return reaped
+
+
+async def _requeue(redis: ArqRedis, job_id: str, queue_name: str) -> bool:
+    if not await redis.exists(job_key_prefix + job_id):
+        return False
+
+    requeues = await redis.incr(requeue_key(job_id))
+    await redis.expire(requeue_key(job_id), settings.job_progress_ttl_seconds)
+    if requeues > settings.job_reaper_max_requeues:
+        return False
+
+    await redis.delete(in_progress_key_prefix + job_id)
+    await redis.zadd(queue_name, {job_id: time.time() * 1000}, nx=True)
+    return True
+
+
+def with_heartbeat_release(task: Task) -> Task:
+    @wraps(task)
+    async def run(ctx: dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+        with task_heartbeats():
+            return await task(ctx, *args, **kwargs)
+
+    return run
+
+
+async def reap_training_queue(ctx: dict[str, Any]) -> dict[str, list[str]]:
+    return await reap_stale_jobs(ctx["redis"], TRAINING_QUEUE)
+
+
+async def reap_inference_queue(ctx: dict[str, Any]) -> dict[str, list[str]]:
+    return await reap_stale_jobs(ctx["redis"], INFERENCE_QUEUE)
+
+
+def reaper_cron(
+    reap: Callable[[dict[str, Any]], Awaitable[dict[str, list[str]]]],
+) -> CronJob:
+    return cron(reap, second={30}, run_at_startup=True)
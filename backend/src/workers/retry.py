@@ -0,0 +1,59 @@
+from functools import wraps
+from typing import Any
+
+from arq import Retry
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from src.config import settings
+from src.infrastructure.cache.job_deferrals import read_deferrals, record_deferral
+from src.workers.threads import Task
+
+TRANSIENT_ERRORS = (
+    ConnectionError,
+    TimeoutError,
+    RedisConnectionError,
+    RedisTimeoutError,
+    InterfaceError,
+    OperationalError,
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    return isinstance(error, TRANSIENT_ERRORS)
+
+
+def retry_delay(job_try: int) -> float:
+    return min(
+        settings.training_retry_backoff_seconds * 2 ** (job_try - 1),
+        settings.training_retry_max_backoff_seconds,
+    )
+
+
+class Deferred(Retry):
+    def __init__(self, reason: str, defer: float):
+        super().__init__(defer=defer)
+        self.reason = reason
+
+
+def deferral_count(ctx: dict[str, Any], reason: str) -> int:
+    return (ctx.get("job_deferrals") or {}).get(reason, 0)
+
+
+def with_deferral_accounting(task: Task) -> Task:
+    @wraps(task)
+    async def run(ctx: dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+        deferrals = await read_deferrals(ctx["redis"], ctx["job_id"])
+        job_try = max(1, ctx.get("job_try", 1) - sum(deferrals.values()))
+        try:
+            return await task(
+                {**ctx, "job_try": job_try, "job_deferrals": deferrals},
+                *args,
+                **kwargs,
+            )
+        except Deferred as e:
+            await record_deferral(ctx["redis"], ctx["job_id"], e.reason)
+            raise
+
+    return run
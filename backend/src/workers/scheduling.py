@@ -0,0 +1,24 @@
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from arq.cron import CronJob, cron
+
+from src.config import settings
+from src.infrastructure.queue.fair_scheduler import get_fair_scheduler
+from src.infrastructure.queue.queues import INFERENCE_QUEUE, TRAINING_QUEUE
+
+
+async def dispatch_training_queue(ctx: dict[str, Any]) -> None:
+    await get_fair_scheduler().dispatch(ctx["redis"], TRAINING_QUEUE)
+
+
+async def dispatch_inference_queue(ctx: dict[str, Any]) -> None:
+    await get_fair_scheduler().dispatch(ctx["redis"], INFERENCE_QUEUE)
+
+
+def dispatch_cron(dispatch: Callable[[dict[str, Any]], Awaitable[None]]) -> CronJob:
+    return cron(
+        dispatch,
+        second=set(range(0, 60, settings.fair_dispatch_interval_seconds)),
+        run_at_startup=True,
+    )
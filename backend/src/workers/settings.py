@@ -1,27 +1,108 @@
-from arq.connections import RedisSettings
-
 from src.config import settings
-from src.workers.tasks.inference_task import run_inference
-from src.workers.tasks.training_task import train_glimps_model
+from src.infrastructure.database.models.job import JobType
+from src.infrastructure.queue.arq_pool import parse_redis_url
+from src.infrastructure.queue.queues import INFERENCE_QUEUE, TRAINING_QUEUE
+from src.workers.affinity import with_cache_affinity
+from src.workers.lifecycle import (
+    inference_worker_startup,
+    training_worker_startup,
+    worker_shutdown,
+)
+from src.workers.memory import with_memory_admission
+from src.workers.prefetch import with_prefetched_inputs
+from src.workers.reaper import (
+    reap_inference_queue,
+    reap_training_queue,
+    reaper_cron,
+    with_heartbeat_release,
+)
+from src.workers.retry import with_deferral_accounting
+from src.workers.scheduling import (
+    dispatch_cron,
+    dispatch_inference_queue,
+    dispatch_training_queue,
+)
+from src.workers.tasks.benchmark_task import benchmark_glimps_model
+from src.workers.tasks.inference_task import (
+    assemble_inference_shards,
+    run_batch_inference,
+    run_inference,
+    run_inference_shard,
+)
+from src.workers.tasks.pipeline_task import train_and_backmap
+from src.workers.tasks.sweep_task import sweep_glimps_options
+from src.workers.tasks.training_task import retrain_glimps_model, train_glimps_model
+from src.workers.threads import Task, with_thread_budget
+from src.workers.timeouts import with_job_timeout
+
+
+def _admitted(task: Task, job_type: JobType) -> Task:
+    return with_memory_admission(
+        with_job_timeout(
+            with_thread_budget(with_heartbeat_release(task), job_type), job_type
+        ),
+        job_type,
+    )
 
 
-def parse_redis_url(url: str) -> RedisSettings:
-    from urllib.parse import urlparse
+def _budgeted(task: Task, job_type: JobType) -> Task:
+    return with_prefetched_inputs(with_deferral_accounting(_admitted(task, job_type)))
 
-    parsed = urlparse(str(url))
-    return RedisSettings(
-        host=parsed.hostname or "localhost",
-        port=parsed.port or 6379,
-        database=int(parsed.path.lstrip("/") or 0),
+
+def _model_affine(task: Task, job_type: JobType) -> Task:
+    return with_prefetched_inputs(
+        with_deferral_accounting(
+            with_cache_affinity(_admitted(task, job_type), INFERENCE_QUEUE)
+        )
     )
 
 
-class WorkerSettings:
+class TrainingWorkerSettings:
+    functions = [
+        _budgeted(train_glimps_model, JobType.TRAINING),
+        _budgeted(retrain_glimps_model, JobType.TRAINING),
+        _budgeted(sweep_glimps_options, JobType.SWEEP),
+        _budgeted(benchmark_glimps_model, JobType.BENCHMARK),
+        _budgeted(train_and_backmap, JobType.TRAINING),
+    ]
+    cron_jobs = [
+        dispatch_cron(dispatch_training_queue),
+        reaper_cron(reap_training_queue),
+    ]
+    on_startup = training_worker_startup
+    on_shutdown = worker_shutdown
+    after_job_end = dispatch_training_queue
+
+    queue_name = TRAINING_QUEUE
+    redis_settings = parse_redis_url(str(settings.redis_url))
+    max_jobs = settings.training_worker_max_jobs
+    job_timeout = settings.training_worker_job_timeout
+    max_tries = settings.training_max_tries + settings.job_memory_max_deferrals
+    allow_abort_jobs = True
+
+
+class InferenceWorkerSettings:
     functions = [
-        train_glimps_model,
-        run_inference,
+        _model_affine(run_inference, JobType.INFERENCE),
+        _model_affine(run_inference_shard, JobType.INFERENCE),
+        with_deferral_accounting(
+            _admitted(assemble_inference_shards, JobType.INFERENCE)
+        ),
+        _model_affine(run_batch_inference, JobType.BATCH_INFERENCE),
+    ]
+    cron_jobs = [
+        dispatch_cron(dispatch_inference_queue),
+        reaper_cron(reap_inference_queue),
     ]
+    on_startup = inference_worker_startup
+    on_shutdown = worker_shutdown
+    after_job_end = dispatch_inference_queue
 
+    queue_name = INFERENCE_QUEUE
     redis_settings = parse_redis_url(str(settings.redis_url))
-    max_jobs = 10
-    job_timeout = 3600
+    max_jobs = settings.inference_worker_max_jobs
+    job_timeout = settings.inference_worker_job_timeout
+    max_tries = (
+        settings.cache_affinity_max_deferrals + settings.job_memory_max_deferrals + 2
+    )
+    allow_abort_jobs = True
@@ -0,0 +1,98 @@
+import asyncio
+from typing import Any
+
+from src.core.exceptions import JobCancelledError
+from src.glimps.benchmark import benchmark_model
+from src.infrastructure.cache.job_progress import JobProgressReporter
+from src.infrastructure.database.session import async_session_maker
+from src.infrastructure.storage.file_storage import discard_files, get_file_storage
+from src.workers.threads import job_thread_limits
+
+
+async def benchmark_glimps_model(
+    ctx: dict[str, Any],
+    job_id: str,
+    model_id: str,
+    model_path: str,
+    cg_file_path: str,
+    batch_sizes: list[int],
+    thread_counts: list[int],
+) -> dict[str, Any]:
+    from sqlalchemy import select, update
+
+    from src.infrastructure.database.models.glimps_model import GlimpsModel
+    from src.infrastructure.database.models.model_version import GlimpsModelVersion
+
+    storage = get_file_storage()
+
+    progress = JobProgressReporter(job_id)
+    outputs: list[str] = []
+
+    try:
+        await progress.start("Loading model...")
+
+        model_bytes = await storage.load_bytes(model_path)
+        cg_data = await storage.load_numpy(cg_file_path)
+
+        await progress.update(10.0, "Benchmarking model...")
+
+        profile = await asyncio.to_thread(
+            benchmark_model,
+            model_bytes,
+            cg_data,
+            batch_sizes,
+            thread_counts,
+            thread_limits=job_thread_limits(ctx),
+        )
+        profile["model_path"] = model_path
+
+        async with async_session_maker() as session:
+            model_stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+            model_result = await session.execute(model_stmt)
+            model = model_result.scalar_one()
+
+            if model.model_path == model_path:
+                stmt = (
+                    update(GlimpsModel)
+                    .where(GlimpsModel.id == model_id)
+                    .values(
+                        training_metrics={
+                            **(model.training_metrics or {}),
+                            "benchmark": profile,
+                        },
+                    )
+                )
+                await session.execute(stmt)
+
+            version_stmt = select(GlimpsModelVersion).where(
+                GlimpsModelVersion.model_id == model_id,
+                GlimpsModelVersion.model_path == model_path,
+            )
+            version_result = await session.execute(version_stmt)
+            version = version_result.scalar_one_or_none()
+            if version:
+                version.training_metrics = {
+                    **(version.training_metrics or {}),
+                    "benchmark": profile,
+                }
+
+            await progress.complete(
+                "Benchmark complete",
+                output_params=profile,
+                session=session,
+            )
+            await session.commit()
+
+        return {"status": "success", "best": profile["best"]}
+
+    except (JobCancelledError, asyncio.CancelledError) as e:
+        await discard_files(storage, outputs)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+
+        return {"status": "cancelled"}
+
+    except Exception as e:
+        await progress.fail(str(e))
+
+        raise
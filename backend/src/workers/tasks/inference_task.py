@@ -1,17 +1,41 @@
+import asyncio
+import contextlib
 import tempfile
-from datetime import datetime
+import time
 from pathlib import Path
 from typing import Any
 from uuid import uuid4
 
 import mdtraj as md
 import numpy as np
-
-from src.glimps.model_serializer import ModelSerializer
-from src.infrastructure.database.models.job import JobStatus
-from src.infrastructure.database.models.molecule import FileFormat, Molecule, MoleculeType
+from redis.exceptions import RedisError
+
+from src.config import settings
+from src.core.exceptions import InferenceError, JobCancelledError
+from src.glimps.adapter import GlimpsAdapter
+from src.glimps.metrics import BackmappingQualityMetrics
+from src.glimps.pdb import StreamingPdbWriter, create_pdb_from_template, parse_template
+from src.glimps.sharding import open_output_memmap
+from src.glimps.streaming import run_chunk_pipeline
+from src.infrastructure.cache.inference_cache import (
+    LOOKUP_ERRORS,
+    InferenceCache,
+    get_inference_cache,
+    hash_array,
+    inference_cache_options,
+    is_result_available,
+)
+from src.infrastructure.cache.inference_shards import InferenceShardTracker
+from src.infrastructure.cache.job_progress import JobProgressReporter
+from src.infrastructure.cache.model_cache import get_model_cache
+from src.infrastructure.database.models.molecule import (
+    FileFormat,
+    Molecule,
+    MoleculeType,
+)
 from src.infrastructure.database.session import async_session_maker
-from src.infrastructure.storage.file_storage import get_file_storage
+from src.infrastructure.queue.queues import INFERENCE_QUEUE
+from src.infrastructure.storage.file_storage import discard_files, get_file_storage
 
 
 async def run_inference(
@@ -23,179 +47,719 @@ async def run_inference(
     input_molecule_id: str,
     project_id: str,
     atomistic_file_path: str | None = None,
+    reference_file_path: str | None = None,
+    model_id: str | None = None,
 ) -> dict[str, Any]:
-    from sqlalchemy import select, update
-
-    from src.infrastructure.database.models.job import Job
-
     storage = get_file_storage()
 
-    async with async_session_maker() as session:
-        stmt = update(Job).where(Job.id == job_id).values(
-            status=JobStatus.RUNNING,
-            started_at=datetime.utcnow(),
-            progress_percent=0.0,
-            progress_message="Loading model...",
-        )
-        await session.execute(stmt)
-        await session.commit()
+    progress = JobProgressReporter(job_id)
+    outputs: list[str] = []
 
     try:
-        model_bytes = await storage.load_bytes(model_path)
-        adapter = ModelSerializer.deserialize(model_bytes)
-
-        async with async_session_maker() as session:
-            stmt = update(Job).where(Job.id == job_id).values(
-                progress_percent=20.0,
-                progress_message="Loading input coordinates...",
+        await progress.start("Loading model...")
+
+        model_cache = get_model_cache()
+        adapter = await model_cache.get_adapter(model_path, _model_version(ctx))
+
+        await progress.update(20.0, "Loading input coordinates...")
+
+        cg_coords = await storage.load_numpy(input_file_path, mmap_mode="r")
+        if cg_coords.size == 0:
+            raise InferenceError("Input coordinates contain no frames")
+
+        cache = get_inference_cache()
+        cache_options = inference_cache_options(atomistic_file_path, reference_file_path)
+        model_hash = input_hash = None
+        if cache is not None:
+            model_hash = model_cache.model_hash(model_path)
+            input_hash = await _input_content_hash(cache, input_file_path, cg_coords)
+            cached = await _lookup_cached_result(
+                cache,
+                storage,
+                project_id,
+                model_path,
+                input_file_path,
+                model_hash,
+                input_hash,
+                cache_options,
             )
-            await session.execute(stmt)
-            await session.commit()
+            if cached is not None:
+                output_params = {**cached, "cache_hit": True}
+                await progress.complete(
+                    "Inference complete (cached result)",
+                    output_params=output_params,
+                )
 
-        cg_coords = await storage.load_numpy(input_file_path)
+                return {"status": "success", **output_params}
 
-        async with async_session_maker() as session:
-            stmt = update(Job).where(Job.id == job_id).values(
-                progress_percent=40.0,
-                progress_message="Running inference...",
-            )
-            await session.execute(stmt)
-            await session.commit()
+        template = await _load_template(storage, atomistic_file_path)
+        reference_coords = None
+        if reference_file_path:
+            reference_coords = await storage.load_numpy(reference_file_path)
 
-        atomistic_coords = adapter.transform(cg_coords)
+        await progress.update(40.0, "Running inference...")
 
-        async with async_session_maker() as session:
-            stmt = update(Job).where(Job.id == job_id).values(
-                progress_percent=80.0,
-                progress_message="Saving results...",
-            )
-            await session.execute(stmt)
-            await session.commit()
+        if cg_coords.ndim == 2:
+            cg_coords = cg_coords[np.newaxis]
 
-        await storage.save_numpy(output_file_path, atomistic_coords)
+        chunk_frames = max(1, settings.inference_chunk_frames)
+        n_input_frames = len(cg_coords)
+        pdb_writer = StreamingPdbWriter(template, n_input_frames)
+        quality_metrics = None
+        metrics_seconds = 0.0
+        atomistic_coords = None
 
-        n_frames = int(atomistic_coords.shape[0])
-        n_atoms = int(atomistic_coords.shape[1])
+        def read(start: int, stop: int) -> np.ndarray:
+            return np.array(cg_coords[start:stop])
 
-        async with async_session_maker() as session:
-            stmt = update(Job).where(Job.id == job_id).values(
-                progress_percent=90.0,
-                progress_message="Creating backmapped molecule...",
-            )
-            await session.execute(stmt)
-            await session.commit()
+        def compute(chunk: np.ndarray, start: int) -> np.ndarray:
+            nonlocal quality_metrics, metrics_seconds
+            result = adapter.transform(chunk)
 
-        molecule_id = str(uuid4())
+            metrics_start = time.perf_counter()
+            if quality_metrics is None:
+                quality_metrics = _create_quality_metrics(
+                    template, reference_coords, result.shape[1], n_input_frames
+                )
+            quality_metrics.update(result, start)
+            metrics_seconds += time.perf_counter() - metrics_start
+            return result
+
+        def write(result: np.ndarray, start: int) -> None:
+            nonlocal atomistic_coords
+            if atomistic_coords is None:
+                atomistic_coords = open_output_memmap(
+                    Path(work_dir) / "output.npy", n_input_frames, result
+                )
+            atomistic_coords[start : start + len(result)] = result
+            pdb_writer.write(result, start)
+
+        async def report(n_done: int) -> None:
+            if n_done < n_input_frames:
+                await progress.update(
+                    40.0 + 40.0 * n_done / n_input_frames,
+                    f"Running inference ({n_done}/{n_input_frames} frames)...",
+                )
 
-        async with async_session_maker() as session:
-            input_stmt = select(Molecule).where(Molecule.id == input_molecule_id)
-            input_result = await session.execute(input_stmt)
-            input_molecule = input_result.scalar_one_or_none()
-            input_name = input_molecule.name if input_molecule else "CG structure"
+        with tempfile.TemporaryDirectory(prefix="glimps_inference_") as work_dir:
+            try:
+                timings = await run_chunk_pipeline(
+                    [
+                        (start, min(start + chunk_frames, n_input_frames))
+                        for start in range(0, n_input_frames, chunk_frames)
+                    ],
+                    read,
+                    compute,
+                    write,
+                    depth=settings.inference_pipeline_depth,
+                    on_chunk=report,
+                )
+                atomistic_coords.flush()
 
-        pdb_content = await _create_pdb_from_template(
-            storage, atomistic_file_path, atomistic_coords, n_atoms
-        )
+                metrics_summary = quality_metrics.summary()
+                metrics_summary["transform_seconds"] = (
+                    timings.compute_seconds - metrics_seconds
+                )
+                metrics_summary["metrics_seconds"] = metrics_seconds
 
-        file_path = f"molecules/{project_id}/{molecule_id}/structure.pdb"
-        await storage.save_bytes(file_path, pdb_content.encode("utf-8"))
+                await progress.update(80.0, "Saving results...")
+
+                save_start = time.perf_counter()
+                outputs.append(output_file_path)
+                await storage.save_numpy(output_file_path, atomistic_coords)
+
+                n_frames = int(atomistic_coords.shape[0])
+                n_atoms = int(atomistic_coords.shape[1])
+
+                await progress.update(90.0, "Creating backmapped molecule...")
+
+                molecule = await _write_backmapped_molecule(
+                    storage,
+                    job_id,
+                    project_id,
+                    input_molecule_id,
+                    template,
+                    atomistic_coords,
+                    outputs,
+                    pdb_content=await asyncio.to_thread(pdb_writer.render),
+                )
+                pipeline_summary = {
+                    **timings.summary(),
+                    "save_seconds": time.perf_counter() - save_start,
+                }
+            finally:
+                pdb_writer.discard()
+                del atomistic_coords
 
-        coords_path = f"molecules/{project_id}/{molecule_id}/coordinates.npy"
-        await storage.save_numpy(coords_path, atomistic_coords)
+        output_params = {
+            "output_path": output_file_path,
+            "n_frames": n_frames,
+            "n_atoms": n_atoms,
+            "molecule_id": molecule.id,
+            "quality_metrics": metrics_summary,
+            "pipeline": pipeline_summary,
+        }
 
         async with async_session_maker() as session:
-            molecule = Molecule(
-                id=molecule_id,
-                name=f"Backmapped {input_name}",
-                description=f"Backmapped structure from inference job {job_id[:8]}",
-                project_id=project_id,
-                molecule_type=MoleculeType.BACKMAPPED,
-                file_format=FileFormat.PDB,
-                file_path=file_path,
-                coordinates_path=coords_path,
-                n_atoms=n_atoms,
-                n_frames=n_frames,
-                source_molecule_id=input_molecule_id,
-            )
             session.add(molecule)
-            await session.commit()
 
-        async with async_session_maker() as session:
-            stmt = update(Job).where(Job.id == job_id).values(
-                status=JobStatus.COMPLETED,
-                completed_at=datetime.utcnow(),
-                progress_percent=100.0,
-                progress_message="Inference complete",
-                output_params={
-                    "output_path": output_file_path,
-                    "n_frames": n_frames,
-                    "n_atoms": n_atoms,
-                    "molecule_id": molecule_id,
-                },
+            await progress.complete(
+                "Inference complete",
+                output_params={**output_params, "cache_hit": False},
+                session=session,
             )
-            await session.execute(stmt)
             await session.commit()
 
+        if cache is not None and model_id and model_hash and input_hash:
+            with contextlib.suppress(RedisError):
+                await cache.set(
+                    project_id,
+                    model_id,
+                    model_hash,
+                    input_hash,
+                    cache_options,
+                    output_params,
+                )
+
         return {
             "status": "success",
             "output_path": output_file_path,
             "n_frames": n_frames,
             "n_atoms": n_atoms,
-            "molecule_id": molecule_id,
+            "molecule_id": molecule.id,
         }
 
+    except (JobCancelledError, asyncio.CancelledError) as e:
+        await discard_files(storage, outputs)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+
+        return {"status": "cancelled"}
+
+    except Exception as e:
+        await progress.fail(str(e))
+
+        raise
+
+
+async def run_inference_shard(
+    ctx: dict[str, Any],
+    job_id: str,
+    shard_index: int,
+    plan: dict[str, Any],
+) -> dict[str, Any]:
+    storage = get_file_storage()
+    shards = plan["shards"]
+    shard = shards[shard_index]
+    n_frames = plan["n_frames"]
+
+    progress = JobProgressReporter(job_id)
+    tracker = InferenceShardTracker(job_id, len(shards))
+    outputs: list[str] = []
+
+    try:
+        if await tracker.has_failed():
+            return {"status": "aborted", "shard": shard_index}
+
+        await progress.attach(f"Running inference across {len(shards)} shards...")
+
+        adapter = await get_model_cache().get_adapter(
+            plan["model_path"], _model_version(ctx)
+        )
+        cg_coords = await storage.load_numpy(plan["input_file_path"], mmap_mode="r")
+        if cg_coords.ndim == 2:
+            cg_coords = cg_coords[np.newaxis]
+
+        chunk_frames = max(1, settings.inference_chunk_frames)
+        start, stop = shard["start"], shard["stop"]
+        chunks = []
+
+        for chunk_start in range(start, stop, chunk_frames):
+            if await tracker.has_failed():
+                return {"status": "aborted", "shard": shard_index}
+
+            chunk_stop = min(chunk_start + chunk_frames, stop)
+            chunks.append(
+                await asyncio.to_thread(
+                    adapter.transform, np.asarray(cg_coords[chunk_start:chunk_stop])
+                )
+            )
+
+            frames_done = await tracker.report(shard_index, chunk_stop - start)
+            await progress.update(
+                80.0 * frames_done / n_frames,
+                f"Running inference ({frames_done}/{n_frames} frames, "
+                f"{len(shards)} shards)...",
+            )
+
+        outputs.append(shard["output_path"])
+        await storage.save_numpy(shard["output_path"], np.concatenate(chunks))
+
+        if await tracker.has_failed():
+            await discard_files(storage, outputs)
+            return {"status": "aborted", "shard": shard_index}
+
+        await progress.flush()
+
+        if await tracker.mark_done(shard_index):
+            await ctx["redis"].enqueue_job(
+                "assemble_inference_shards",
+                job_id,
+                plan,
+                _job_id=f"{job_id}:assemble",
+                _queue_name=INFERENCE_QUEUE,
+            )
+
+        return {"status": "success", "shard": shard_index}
+
+    except (JobCancelledError, asyncio.CancelledError) as e:
+        await discard_files(storage, outputs)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+
+        return {"status": "cancelled", "shard": shard_index}
+
     except Exception as e:
+        await tracker.fail()
+        await discard_files(storage, [shard["output_path"] for shard in shards])
+        await progress.fail(f"Shard {shard_index + 1}/{len(shards)} failed: {e}")
+
+        raise
+
+
+async def assemble_inference_shards(
+    ctx: dict[str, Any],
+    job_id: str,
+    plan: dict[str, Any],
+) -> dict[str, Any]:
+    storage = get_file_storage()
+    shards = plan["shards"]
+    shard_paths = [shard["output_path"] for shard in shards]
+    n_frames = plan["n_frames"]
+    output_file_path = plan["output_file_path"]
+
+    progress = JobProgressReporter(job_id)
+    tracker = InferenceShardTracker(job_id, len(shards))
+    outputs: list[str] = []
+
+    try:
+        await progress.attach("Assembling shard outputs...")
+        await progress.update(80.0, "Assembling shard outputs...")
+
+        template = await _load_template(storage, plan["atomistic_file_path"])
+        reference_coords = None
+        if plan["reference_file_path"]:
+            reference_coords = await storage.load_numpy(plan["reference_file_path"])
+
+        chunk_frames = max(1, settings.inference_chunk_frames)
+        quality_metrics = None
+        metrics_seconds = 0.0
+
+        pdb_writer = StreamingPdbWriter(template, n_frames)
+
+        with tempfile.TemporaryDirectory(prefix="glimps_assemble_") as work_dir:
+            atomistic_coords = None
+            try:
+                for shard, shard_path in zip(shards, shard_paths, strict=True):
+                    shard_coords = await storage.load_numpy(shard_path, mmap_mode="r")
+                    if atomistic_coords is None:
+                        atomistic_coords = open_output_memmap(
+                            Path(work_dir) / "output.npy", n_frames, shard_coords
+                        )
+                        quality_metrics = _create_quality_metrics(
+                            template, reference_coords, shard_coords.shape[1], n_frames
+                        )
+
+                    metrics_seconds += await asyncio.to_thread(
+                        _assemble_shard,
+                        shard_coords,
+                        shard["start"],
+                        atomistic_coords,
+                        quality_metrics,
+                        pdb_writer,
+                        chunk_frames,
+                    )
+
+                await asyncio.to_thread(atomistic_coords.flush)
+
+                metrics_summary = quality_metrics.summary()
+                metrics_summary["metrics_seconds"] = metrics_seconds
+
+                await progress.update(85.0, "Saving results...")
+
+                outputs.append(output_file_path)
+                await storage.save_numpy(output_file_path, atomistic_coords)
+
+                n_atoms = int(atomistic_coords.shape[1])
+
+                await progress.update(90.0, "Creating backmapped molecule...")
+
+                molecule = await _write_backmapped_molecule(
+                    storage,
+                    job_id,
+                    plan["project_id"],
+                    plan["input_molecule_id"],
+                    template,
+                    atomistic_coords,
+                    outputs,
+                    pdb_content=await asyncio.to_thread(pdb_writer.render),
+                )
+            finally:
+                pdb_writer.discard()
+                del atomistic_coords
+
+        output_params = {
+            "output_path": output_file_path,
+            "n_frames": n_frames,
+            "n_atoms": n_atoms,
+            "molecule_id": molecule.id,
+            "quality_metrics": metrics_summary,
+            "n_shards": len(shards),
+        }
+
         async with async_session_maker() as session:
-            stmt = update(Job).where(Job.id == job_id).values(
-                status=JobStatus.FAILED,
-                completed_at=datetime.utcnow(),
-                error_message=str(e),
+            session.add(molecule)
+
+            await progress.complete(
+                "Inference complete",
+                output_params={**output_params, "cache_hit": False},
+                session=session,
             )
-            await session.execute(stmt)
             await session.commit()
 
+        await discard_files(storage, shard_paths)
+        await tracker.clear()
+
+        return {"status": "success", **output_params}
+
+    except (JobCancelledError, asyncio.CancelledError) as e:
+        await discard_files(storage, outputs + shard_paths)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+
+        return {"status": "cancelled"}
+
+    except Exception as e:
+        await progress.fail(str(e))
+
         raise
 
 
-async def _create_pdb_from_template(
-    storage, atomistic_file_path: str | None, coords: np.ndarray, n_atoms: int
-) -> str:
-    if atomistic_file_path:
-        try:
-            pdb_bytes = await storage.load_bytes(atomistic_file_path)
+async def run_batch_inference(
+    ctx: dict[str, Any],
+    job_id: str,
+    model_path: str,
+    inputs: list[dict[str, str]],
+    project_id: str,
+    atomistic_file_path: str | None = None,
+) -> dict[str, Any]:
+    return await backmap_batch(
+        job_id,
+        inputs,
+        project_id,
+        atomistic_file_path,
+        model_path=model_path,
+        version=_model_version(ctx),
+    )
+
+
+async def backmap_batch(
+    job_id: str,
+    inputs: list[dict[str, str]],
+    project_id: str,
+    atomistic_file_path: str | None = None,
+    model_path: str | None = None,
+    version: int | None = None,
+    adapter: GlimpsAdapter | None = None,
+    preloaded: dict[str, np.ndarray] | None = None,
+) -> dict[str, Any]:
+    storage = get_file_storage()
+    preloaded = preloaded or {}
+
+    progress = JobProgressReporter(job_id)
+    outputs: list[str] = []
+    pending_load = None
+
+    async def load_input(path: str) -> np.ndarray:
+        if path in preloaded:
+            return preloaded[path]
+        return await storage.load_numpy(path)
 
-            with tempfile.NamedTemporaryFile(suffix=".pdb", delete=False) as f:
-                f.write(pdb_bytes)
-                temp_path = Path(f.name)
+    try:
+        await progress.start("Loading model..." if adapter is None else "Backmapping...")
+
+        if adapter is None:
+            adapter = await get_model_cache().get_adapter(model_path, version)
+        template = await _load_template(storage, atomistic_file_path)
+        chunk_frames = max(1, settings.inference_chunk_frames)
+
+        molecules = []
+        results = []
+        pending_load = asyncio.create_task(load_input(inputs[0]["coordinates_path"]))
+
+        for index, item in enumerate(inputs):
+            await progress.update(
+                90.0 * index / len(inputs),
+                f"Backmapping {item['name']} ({index + 1}/{len(inputs)})...",
+            )
+
+            load, pending_load = pending_load, None
+            if index + 1 < len(inputs):
+                pending_load = asyncio.create_task(
+                    load_input(inputs[index + 1]["coordinates_path"])
+                )
 
             try:
-                template_traj = md.load(str(temp_path))
-                new_traj = md.Trajectory(
-                    xyz=coords.astype(np.float32),
-                    topology=template_traj.topology,
+                cg_coords = await load
+                atomistic_coords, metrics_summary = await asyncio.to_thread(
+                    _transform_with_metrics, adapter, cg_coords, template, chunk_frames
+                )
+                molecule = await _write_backmapped_molecule(
+                    storage,
+                    job_id,
+                    project_id,
+                    item["molecule_id"],
+                    template,
+                    atomistic_coords,
+                    outputs,
+                    input_name=item["name"],
+                )
+            except (JobCancelledError, asyncio.CancelledError):
+                raise
+            except Exception as e:
+                results.append(
+                    {
+                        "input_molecule_id": item["molecule_id"],
+                        "status": "failed",
+                        "error": str(e),
+                    }
                 )
+                continue
+
+            molecules.append(molecule)
+            results.append(
+                {
+                    "input_molecule_id": item["molecule_id"],
+                    "status": "completed",
+                    "molecule_id": molecule.id,
+                    "n_frames": molecule.n_frames,
+                    "n_atoms": molecule.n_atoms,
+                    "quality_metrics": metrics_summary,
+                }
+            )
 
-                output_path = temp_path.with_suffix(".output.pdb")
-                new_traj.save_pdb(str(output_path))
+        n_succeeded = len(molecules)
+        if n_succeeded == 0:
+            errors = "; ".join(result["error"] for result in results)
+            raise InferenceError(f"No input could be backmapped: {errors}")
 
-                pdb_content = output_path.read_text()
-                output_path.unlink(missing_ok=True)
-                return pdb_content
-            finally:
-                temp_path.unlink(missing_ok=True)
+        await progress.update(95.0, "Saving backmapped molecules...")
 
-        except Exception:
-            pass
+        output_params = {
+            "results": results,
+            "n_inputs": len(inputs),
+            "n_succeeded": n_succeeded,
+            "n_failed": len(inputs) - n_succeeded,
+        }
+
+        async with async_session_maker() as session:
+            session.add_all(molecules)
+
+            await progress.complete(
+                f"Backmapped {n_succeeded}/{len(inputs)} molecules",
+                output_params=output_params,
+                session=session,
+            )
+            await session.commit()
+
+        return {"status": "success", "n_succeeded": n_succeeded}
+
+    except (JobCancelledError, asyncio.CancelledError) as e:
+        await discard_files(storage, outputs)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+
+        return {"status": "cancelled"}
+
+    except Exception as e:
+        await discard_files(storage, outputs)
+        await progress.fail(str(e))
+
+        raise
+
+    finally:
+        if pending_load is not None and not pending_load.done():
+            pending_load.cancel()
+
+
+def _model_version(ctx: dict[str, Any]) -> int | None:
+    return (ctx.get("job_params") or {}).get("version")
+
+
+def _assemble_shard(
+    shard_coords: np.ndarray,
+    shard_start: int,
+    atomistic_coords: np.ndarray,
+    quality_metrics: BackmappingQualityMetrics,
+    pdb_writer: StreamingPdbWriter,
+    chunk_frames: int,
+) -> float:
+    metrics_seconds = 0.0
+    for offset in range(0, len(shard_coords), chunk_frames):
+        chunk = np.asarray(shard_coords[offset : offset + chunk_frames])
+        start = shard_start + offset
+        atomistic_coords[start : start + len(chunk)] = chunk
+        pdb_writer.write(chunk, start)
+
+        metrics_start = time.perf_counter()
+        quality_metrics.update(chunk, start)
+        metrics_seconds += time.perf_counter() - metrics_start
+
+    return metrics_seconds
+
+
+def _transform_with_metrics(
+    adapter: GlimpsAdapter,
+    cg_coords: np.ndarray,
+    template: md.Trajectory | None,
+    chunk_frames: int,
+) -> tuple[np.ndarray, dict[str, Any]]:
+    if cg_coords.ndim == 2:
+        cg_coords = cg_coords[np.newaxis]
+
+    chunks = []
+    quality_metrics = None
+    for start in range(0, len(cg_coords), chunk_frames):
+        chunk = adapter.transform(cg_coords[start : start + chunk_frames])
+        if quality_metrics is None:
+            quality_metrics = _create_quality_metrics(
+                template, None, chunk.shape[1], len(cg_coords)
+            )
+        quality_metrics.update(chunk, start)
+        chunks.append(chunk)
+
+    atomistic_coords = np.concatenate(chunks) if len(chunks) > 1 else chunks[0]
+    return atomistic_coords, quality_metrics.summary()
+
+
+async def _write_backmapped_molecule(
+    storage,
+    job_id: str,
+    project_id: str,
+    input_molecule_id: str,
+    template: md.Trajectory | None,
+    atomistic_coords: np.ndarray,
+    outputs: list[str],
+    input_name: str | None = None,
+    pdb_content: str | None = None,
+) -> Molecule:
+    from sqlalchemy import select
+
+    molecule_id = str(uuid4())
+    n_frames = int(atomistic_coords.shape[0])
+    n_atoms = int(atomistic_coords.shape[1])
+
+    if input_name is None:
+        async with async_session_maker() as session:
+            input_stmt = select(Molecule).where(Molecule.id == input_molecule_id)
+            input_result = await session.execute(input_stmt)
+            input_molecule = input_result.scalar_one_or_none()
+            input_name = input_molecule.name if input_molecule else "CG structure"
+
+    if pdb_content is None:
+        pdb_content = await asyncio.to_thread(
+            create_pdb_from_template, template, atomistic_coords, n_atoms
+        )
+
+    file_path = f"molecules/{project_id}/{molecule_id}/structure.pdb"
+    outputs.append(file_path)
+    await storage.save_bytes(file_path, pdb_content.encode("utf-8"))
+
+    coords_path = f"molecules/{project_id}/{molecule_id}/coordinates.npy"
+    outputs.append(coords_path)
+    await storage.save_numpy(coords_path, atomistic_coords)
+
+    return Molecule(
+        id=molecule_id,
+        name=f"Backmapped {input_name}",
+        description=f"Backmapped structure from inference job {job_id[:8]}",
+        project_id=project_id,
+        molecule_type=MoleculeType.BACKMAPPED,
+        file_format=FileFormat.PDB,
+        file_path=file_path,
+        coordinates_path=coords_path,
+        n_atoms=n_atoms,
+        n_frames=n_frames,
+        source_molecule_id=input_molecule_id,
+    )
+
+
+async def _lookup_cached_result(
+    cache: InferenceCache,
+    storage,
+    project_id: str,
+    model_path: str,
+    input_file_path: str,
+    model_hash: str,
+    input_hash: str,
+    cache_options: dict[str, Any],
+) -> dict[str, Any] | None:
+    try:
+        await cache.set_content_hash(model_path, model_hash)
+        await cache.set_content_hash(input_file_path, input_hash)
 
-    return _coordinates_to_pdb(coords, n_atoms)
+        cached = await cache.get(project_id, model_hash, input_hash, cache_options)
+        if cached is None:
+            return None
 
+        async with async_session_maker() as session:
+            if await is_result_available(session, storage, cached):
+                return cached
+
+        await cache.discard(project_id, model_hash, input_hash, cache_options)
+    except LOOKUP_ERRORS:
+        pass
+
+    return None
 
-def _coordinates_to_pdb(coords: np.ndarray, n_atoms: int) -> str:
-    lines = []
-    for i in range(n_atoms):
-        x, y, z = coords[0][i] * 10
-        lines.append(
-            f"ATOM  {i+1:5d}  CA  ALA A{i+1:4d}    {x:8.3f}{y:8.3f}{z:8.3f}  1.00  0.00           C"
+
+async def _input_content_hash(
+    cache: InferenceCache, input_file_path: str, cg_coords: np.ndarray
+) -> str:
+    try:
+        digest = await cache.get_content_hash(input_file_path)
+    except RedisError:
+        digest = None
+    return digest or await asyncio.to_thread(hash_array, cg_coords)
+
+
+async def _load_template(storage, atomistic_file_path: str | None) -> md.Trajectory | None:
+    if not atomistic_file_path:
+        return None
+
+    try:
+        pdb_bytes = await storage.load_bytes(atomistic_file_path)
+    except Exception:
+        return None
+
+    return parse_template(pdb_bytes)
+
+
+def _create_quality_metrics(
+    template: md.Trajectory | None,
+    reference_coords: np.ndarray | None,
+    n_atoms: int,
+    n_frames: int,
+) -> BackmappingQualityMetrics:
+    if reference_coords is not None:
+        if reference_coords.ndim == 2:
+            reference_coords = reference_coords[np.newaxis]
+        if reference_coords.shape[1] != n_atoms or len(reference_coords) not in (1, n_frames):
+            reference_coords = None
+
+    if template is not None and template.n_atoms == n_atoms:
+        return BackmappingQualityMetrics.from_template(
+            template.topology, template.xyz[0], reference_coords=reference_coords
         )
-    lines.append("END")
-    return "\n".join(lines)
+
+    return BackmappingQualityMetrics(n_atoms, reference_coords=reference_coords)
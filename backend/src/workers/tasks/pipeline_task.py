@@ -0,0 +1,75 @@
+import asyncio
+from typing import Any
+
+from src.core.exceptions import JobCancelledError
+from src.infrastructure.cache.job_progress import JobProgressReporter
+from src.infrastructure.storage.file_storage import discard_files, get_file_storage
+from src.workers.tasks.inference_task import backmap_batch
+from src.workers.tasks.training_task import fit_and_save_model
+
+
+async def train_and_backmap(
+    ctx: dict[str, Any],
+    job_id: str,
+    inference_job_id: str,
+    cg_file_path: str,
+    atomistic_file_path: str,
+    model_id: str,
+    glimps_options: dict[str, bool] | None,
+    inputs: list[dict[str, str]],
+    project_id: str,
+    atomistic_pdb_path: str | None = None,
+) -> dict[str, Any]:
+    storage = get_file_storage()
+
+    progress = JobProgressReporter(job_id)
+    outputs: list[str] = []
+
+    try:
+        await progress.start("Loading training data...")
+
+        cg_data = await storage.load_numpy(cg_file_path)
+        atomistic_data = await storage.load_numpy(atomistic_file_path)
+
+        adapter, model_path = await fit_and_save_model(
+            progress,
+            storage,
+            job_id,
+            model_id,
+            cg_data,
+            atomistic_data,
+            glimps_options,
+            False,
+            outputs,
+        )
+
+    except (JobCancelledError, asyncio.CancelledError) as e:
+        await discard_files(storage, outputs)
+        await JobProgressReporter(inference_job_id).fail("Training stage was cancelled")
+        if isinstance(e, asyncio.CancelledError):
+            raise
+
+        return {"status": "cancelled"}
+
+    except Exception as e:
+        await progress.fail(str(e))
+        await JobProgressReporter(inference_job_id).fail(f"Training stage failed: {e}")
+
+        raise
+
+    del atomistic_data
+
+    inference_result = await backmap_batch(
+        inference_job_id,
+        inputs,
+        project_id,
+        atomistic_pdb_path,
+        adapter=adapter,
+        preloaded={cg_file_path: cg_data},
+    )
+
+    return {
+        "status": "success",
+        "model_path": model_path,
+        "inference": inference_result,
+    }
@@ -0,0 +1,232 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from src.config import settings
+from src.core.exceptions import JobCancelledError, TrainingError
+from src.glimps.sweep import (
+    evaluate_options,
+    expand_option_grid,
+    select_best,
+    split_holdout,
+    write_shared_dataset,
+)
+from src.infrastructure.cache.inference_cache import invalidate_inference_cache
+from src.infrastructure.cache.job_progress import JobProgressReporter
+from src.infrastructure.database.session import async_session_maker
+from src.infrastructure.storage.file_storage import discard_files, get_file_storage
+from src.workers.compute import ComputePool, terminate_executor
+from src.workers.tasks.training_task import allocate_model_version, is_latest_version
+
+
+async def sweep_glimps_options(
+    ctx: dict[str, Any],
+    job_id: str,
+    model_id: str,
+    cg_file_path: str,
+    atomistic_file_path: str,
+    option_grid: dict[str, list[bool]],
+    holdout_fraction: float,
+    training_pairs: list[dict[str, str]],
+) -> dict[str, Any]:
+    from sqlalchemy import update
+
+    from src.infrastructure.database.models.glimps_model import GlimpsModel
+    from src.infrastructure.database.models.model_version import GlimpsModelVersion
+
+    storage = get_file_storage()
+
+    progress = JobProgressReporter(job_id)
+    outputs: list[str] = []
+
+    try:
+        await progress.start("Loading training data...")
+
+        cg_data = await storage.load_numpy(cg_file_path)
+        atomistic_data = await storage.load_numpy(atomistic_file_path)
+        if len(cg_data) != len(atomistic_data):
+            raise TrainingError("CG and atomistic molecules must have matching frames")
+
+        cg_shape = list(cg_data.shape)
+        atomistic_shape = list(atomistic_data.shape)
+
+        combinations = expand_option_grid(option_grid)
+        train_idx, holdout_idx = split_holdout(len(cg_data), holdout_fraction)
+        max_workers = min(
+            len(combinations), settings.sweep_max_workers or os.cpu_count() or 1
+        )
+        process_threads = (
+            max(1, ctx["threads"] // max_workers) if "threads" in ctx else None
+        )
+
+        await progress.update(
+            5.0,
+            f"Evaluating {len(combinations)} combinations on {max_workers} worker(s)...",
+        )
+
+        start_time = time.time()
+
+        with tempfile.TemporaryDirectory(prefix="glimps_sweep_") as work_dir:
+            data_dir = Path(work_dir) / "data"
+            artifact_dir = Path(work_dir) / "artifacts"
+            data_dir.mkdir()
+            artifact_dir.mkdir()
+            write_shared_dataset(
+                data_dir, cg_data, atomistic_data, train_idx, holdout_idx
+            )
+            del cg_data, atomistic_data
+
+            loop = asyncio.get_running_loop()
+            shared_pool: ComputePool | None = ctx.get("compute_executor")
+            with (
+                shared_pool.acquire()
+                if shared_pool is not None
+                else nullcontext(
+                    ProcessPoolExecutor(
+                        max_workers=max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                )
+            ) as executor:
+                futures = [
+                    loop.run_in_executor(
+                        executor,
+                        evaluate_options,
+                        options,
+                        str(artifact_dir),
+                        str(data_dir),
+                        process_threads,
+                    )
+                    for options in combinations
+                ]
+
+                results = []
+                try:
+                    for future in asyncio.as_completed(futures):
+                        results.append(await future)
+
+                        await progress.update(
+                            5.0 + 85.0 * len(results) / len(futures),
+                            f"Evaluated {len(results)}/{len(futures)} combinations",
+                        )
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    if shared_pool is None:
+                        terminate_executor(executor)
+                    else:
+                        shared_pool.reset()
+                    raise
+                finally:
+                    if shared_pool is None:
+                        executor.shutdown(wait=False, cancel_futures=True)
+
+            best = select_best(results)
+            if best is None:
+                errors = "; ".join(r.error for r in results if r.error)
+                raise TrainingError(f"No option combination could be trained: {errors}")
+
+            model_bytes = Path(best.artifact_path).read_bytes()
+
+        sweep_duration = time.time() - start_time
+
+        await progress.update(90.0, "Promoting best model...")
+
+        version = await allocate_model_version(model_id)
+
+        model_path = f"models/{model_id}/v{version}/model.pkl"
+        outputs.append(model_path)
+        await storage.save_bytes(model_path, model_bytes)
+
+        ranked = sorted(
+            (r.to_dict() for r in results),
+            key=lambda r: (r["rmsd_mean"] is None, r["rmsd_mean"] or 0.0),
+        )
+        for result in ranked:
+            result.pop("artifact_path")
+
+        best_result = best.to_dict()
+        training_metrics = {
+            "cg_shape": cg_shape,
+            "atomistic_shape": atomistic_shape,
+            "n_training_frames": len(train_idx),
+            "n_holdout_frames": len(holdout_idx),
+            "holdout_rmsd_mean": best_result["rmsd_mean"],
+            "holdout_rmsd_max": best_result["rmsd_max"],
+            "inference_seconds_per_frame": best_result["inference_seconds_per_frame"],
+            "update_mode": "sweep",
+        }
+
+        async with async_session_maker() as session:
+            stmt = (
+                update(GlimpsModel)
+                .where(GlimpsModel.id == model_id, is_latest_version(model_id, version))
+                .values(
+                    is_trained=True,
+                    model_path=model_path,
+                    training_config=best.options,
+                    trained_at=datetime.utcnow(),
+                    training_duration_seconds=best_result["fit_seconds"],
+                    training_metrics={**training_metrics, "sweep": ranked},
+                )
+            )
+            await session.execute(stmt)
+
+            session.add(
+                GlimpsModelVersion(
+                    model_id=model_id,
+                    version=version,
+                    model_path=model_path,
+                    update_mode="sweep",
+                    training_config=best.options,
+                    training_metrics={
+                        **training_metrics,
+                        "training_duration_seconds": best_result["fit_seconds"],
+                    },
+                    training_pairs=training_pairs,
+                    n_training_frames=len(train_idx),
+                    job_id=job_id,
+                )
+            )
+
+            await progress.complete(
+                "Sweep complete",
+                output_params={
+                    "model_path": model_path,
+                    "version": version,
+                    "best_options": best.options,
+                    "results": ranked,
+                    "n_workers": max_workers,
+                    "sweep_duration_seconds": sweep_duration,
+                },
+                session=session,
+            )
+            await session.commit()
+
+        await invalidate_inference_cache(model_id)
+
+        return {
+            "status": "success",
+            "model_path": model_path,
+            "version": version,
+            "best_options": best.options,
+        }
+
+    except (JobCancelledError, asyncio.CancelledError) as e:
+        await discard_files(storage, outputs)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+
+        return {"status": "cancelled"}
+
+    except Exception as e:
+        await progress.fail(str(e))
+
+        raise
@@ -1,14 +1,81 @@
+import asyncio
+import contextlib
 import time
 from datetime import datetime
 from typing import Any
 
 import numpy as np
+from arq import Retry
 
-from src.glimps.adapter import GlimpsAdapter
+from src.config import settings
+from src.core.exceptions import (
+    JobCancelledError,
+    TrainingError,
+    TrainingInterruptedError,
+)
+from src.glimps.adapter import FIT_STAGES, GlimpsAdapter
+from src.glimps.benchmark import ThreadLimits, benchmark_model
 from src.glimps.model_serializer import ModelSerializer
-from src.infrastructure.database.models.job import JobStatus
+from src.infrastructure.cache.inference_cache import invalidate_inference_cache
+from src.infrastructure.cache.job_heartbeat import stop_heartbeat
+from src.infrastructure.cache.job_progress import JobProgressReporter
 from src.infrastructure.database.session import async_session_maker
-from src.infrastructure.storage.file_storage import get_file_storage
+from src.infrastructure.storage.file_storage import discard_files, get_file_storage
+from src.workers.retry import is_transient_error, retry_delay
+from src.workers.threads import job_thread_limits
+
+
+def checkpoint_path_for(job_id: str) -> str:
+    return f"checkpoints/{job_id}/training.pkl"
+
+
+def statistics_path_for(model_path: str) -> str:
+    return f"{model_path.removesuffix('.pkl')}.statistics.pkl"
+
+
+async def save_model(
+    storage, adapter: GlimpsAdapter, model_path: str, outputs: list[str]
+) -> bytes:
+    model_bytes = ModelSerializer.serialize(adapter)
+    outputs.append(model_path)
+    await storage.save_bytes(model_path, model_bytes)
+
+    statistics_bytes = ModelSerializer.serialize_statistics(adapter)
+    if statistics_bytes is not None:
+        statistics_path = statistics_path_for(model_path)
+        outputs.append(statistics_path)
+        await storage.save_bytes(statistics_path, statistics_bytes)
+
+    return model_bytes
+
+
+async def allocate_model_version(model_id: str) -> int:
+    from sqlalchemy import func, update
+
+    from src.infrastructure.database.models.glimps_model import GlimpsModel
+
+    async with async_session_maker() as session:
+        result = await session.execute(
+            update(GlimpsModel)
+            .where(GlimpsModel.id == model_id)
+            .values(version=func.coalesce(GlimpsModel.version, 0) + 1)
+            .returning(GlimpsModel.version)
+        )
+        version = result.scalar_one()
+        await session.commit()
+
+    return version
+
+
+def is_latest_version(model_id: str, version: int):
+    from sqlalchemy import exists
+
+    from src.infrastructure.database.models.model_version import GlimpsModelVersion
+
+    return ~exists().where(
+        GlimpsModelVersion.model_id == model_id,
+        GlimpsModelVersion.version > version,
+    )
 
 
 async def train_glimps_model(
@@ -18,39 +85,134 @@ async def train_glimps_model(
     atomistic_file_path: str,
     model_id: str,
     glimps_options: dict[str, bool] | None = None,
+    run_benchmark: bool = False,
 ) -> dict[str, Any]:
-    from sqlalchemy import select, update
-
-    from src.infrastructure.database.models.glimps_model import GlimpsModel
-    from src.infrastructure.database.models.job import Job
-
     storage = get_file_storage()
 
-    async with async_session_maker() as session:
-        stmt = update(Job).where(Job.id == job_id).values(
-            status=JobStatus.RUNNING,
-            started_at=datetime.utcnow(),
-            progress_percent=0.0,
-            progress_message="Loading training data...",
-        )
-        await session.execute(stmt)
-        await session.commit()
+    progress = JobProgressReporter(job_id)
+    outputs: list[str] = []
+    job_try = ctx.get("job_try", 1)
+    checkpoint_path = checkpoint_path_for(job_id)
+    deadline = (
+        time.monotonic()
+        + ctx.get("job_timeout", settings.training_worker_job_timeout)
+        - settings.training_timeout_margin_seconds
+    )
 
     try:
+        await progress.start(
+            "Loading training data..."
+            if job_try == 1
+            else f"Resuming training (attempt {job_try})..."
+        )
+
         cg_data = await storage.load_numpy(cg_file_path)
         atomistic_data = await storage.load_numpy(atomistic_file_path)
 
-        async with async_session_maker() as session:
-            stmt = update(Job).where(Job.id == job_id).values(
-                progress_percent=10.0,
-                progress_message="Training GLIMPS model...",
-            )
-            await session.execute(stmt)
-            await session.commit()
+        _, model_path = await fit_and_save_model(
+            progress,
+            storage,
+            job_id,
+            model_id,
+            cg_data,
+            atomistic_data,
+            glimps_options,
+            run_benchmark,
+            outputs,
+            checkpoint_path=checkpoint_path,
+            deadline=deadline,
+            thread_limits=job_thread_limits(ctx),
+        )
 
-        start_time = time.time()
+        await discard_files(storage, [checkpoint_path])
+
+        return {"status": "success", "model_path": model_path}
+
+    except (JobCancelledError, asyncio.CancelledError) as e:
+        await discard_files(storage, outputs)
+        if isinstance(e, asyncio.CancelledError):
+            if await _cancel_requested(progress):
+                await discard_files(storage, [checkpoint_path])
+            raise
+
+        await discard_files(storage, [checkpoint_path])
+        return {"status": "cancelled"}
+
+    except Exception as e:
+        interrupted = isinstance(e, TrainingInterruptedError)
+        if (interrupted or is_transient_error(e)) and (
+            job_try < settings.training_max_tries
+        ):
+            await discard_files(storage, outputs)
+            delay = 0.0 if interrupted else retry_delay(job_try)
+            await _report_retry(progress, e, job_try, delay)
+            await stop_heartbeat(progress.redis, job_id)
+            raise Retry(defer=delay) from e
+
+        await discard_files(storage, [checkpoint_path])
+        await progress.fail(str(e))
+
+        raise
+
+
+async def _cancel_requested(progress: JobProgressReporter) -> bool:
+    try:
+        await progress.check_cancelled()
+    except JobCancelledError:
+        return True
+    return False
+
+
+async def _report_retry(
+    progress: JobProgressReporter, error: Exception, job_try: int, delay: float
+) -> None:
+    if isinstance(error, TrainingInterruptedError):
+        message = f"{error}, continuing in a new attempt"
+    else:
+        message = (
+            f"Attempt {job_try} failed ({error.__class__.__name__}), "
+            f"retrying from the last checkpoint in {delay:.0f}s"
+        )
 
-        options = glimps_options or {}
+    try:
+        await progress.update(progress.percent, message)
+        await progress.flush()
+    except Exception:
+        pass
+
+
+async def fit_and_save_model(
+    progress: JobProgressReporter,
+    storage,
+    job_id: str,
+    model_id: str,
+    cg_data: np.ndarray,
+    atomistic_data: np.ndarray,
+    glimps_options: dict[str, bool] | None,
+    run_benchmark: bool,
+    outputs: list[str],
+    checkpoint_path: str | None = None,
+    deadline: float | None = None,
+    thread_limits: ThreadLimits | None = None,
+) -> tuple[GlimpsAdapter, str]:
+    from sqlalchemy import select, update
+
+    from src.infrastructure.database.models.glimps_model import GlimpsModel
+    from src.infrastructure.database.models.model_version import GlimpsModelVersion
+
+    await progress.update(10.0, "Training GLIMPS model...")
+
+    start_time = time.time()
+
+    options = glimps_options or {}
+    adapter, stage = None, None
+    if checkpoint_path is not None and await storage.exists(checkpoint_path):
+        adapter, stage = ModelSerializer.deserialize_checkpoint(
+            await storage.load_bytes(checkpoint_path)
+        )
+        await progress.update(10.0, f"Resuming training after {stage} stage...")
+
+    if adapter is None:
         adapter = GlimpsAdapter.create_with_options(
             pca=options.get("pca", False),
             refine=options.get("refine", True),
@@ -58,57 +220,276 @@ async def train_glimps_model(
             triangulate=options.get("triangulate", False),
         )
 
-        def progress_callback(percent: float, message: str) -> None:
-            pass
+    stages = adapter.fit_stages(cg_data, atomistic_data, resume_after=stage)
+    stage_seconds: dict[str, float] = {}
+    while True:
+        stage_start = time.monotonic()
+        stage = await asyncio.to_thread(next, stages, None)
+        if stage is None:
+            break
+        stage_seconds[stage] = time.monotonic() - stage_start
+        longest_stage = max(stage_seconds.values())
 
-        adapter.fit(cg_data, atomistic_data, progress_callback)
+        if checkpoint_path is not None:
+            await storage.save_bytes(
+                checkpoint_path, ModelSerializer.serialize_checkpoint(adapter, stage)
+            )
 
-        training_duration = time.time() - start_time
+        await progress.update(
+            10.0 + 70.0 * (FIT_STAGES.index(stage) + 1) / len(FIT_STAGES),
+            f"Completed {stage} stage",
+        )
 
-        async with async_session_maker() as session:
-            stmt = update(Job).where(Job.id == job_id).values(
-                progress_percent=80.0,
-                progress_message="Saving trained model...",
+        if (
+            deadline is not None
+            and stage != FIT_STAGES[-1]
+            and time.monotonic() + longest_stage > deadline
+        ):
+            raise TrainingInterruptedError(
+                f"Training checkpointed after {stage} stage before the job timeout"
             )
-            await session.execute(stmt)
-            await session.commit()
 
-        model_bytes = ModelSerializer.serialize(adapter)
-        model_path = f"models/{model_id}/model.pkl"
-        await storage.save_bytes(model_path, model_bytes)
+    training_duration = time.time() - start_time
 
-        async with async_session_maker() as session:
-            stmt = update(GlimpsModel).where(GlimpsModel.id == model_id).values(
-                is_trained=True,
+    await progress.update(80.0, "Saving trained model...")
+
+    model_path = f"models/{model_id}/model.pkl"
+    model_bytes = await save_model(storage, adapter, model_path, outputs)
+
+    training_metrics = {
+        "cg_shape": list(cg_data.shape),
+        "atomistic_shape": list(atomistic_data.shape),
+        "n_training_frames": adapter.n_training_frames or int(cg_data.shape[0]),
+        "supports_incremental": adapter.supports_partial_fit,
+        "stage_seconds": stage_seconds,
+    }
+
+    if run_benchmark:
+        await progress.update(85.0, "Benchmarking model...")
+
+        training_metrics["benchmark"] = {
+            **await asyncio.to_thread(
+                benchmark_model, model_bytes, cg_data, thread_limits=thread_limits
+            ),
+            "model_path": model_path,
+        }
+
+    async with async_session_maker() as session:
+        model_stmt = select(GlimpsModel).where(GlimpsModel.id == model_id)
+        model_result = await session.execute(model_stmt)
+        model = model_result.scalar_one()
+
+        stmt = update(GlimpsModel).where(GlimpsModel.id == model_id).values(
+            is_trained=True,
+            model_path=model_path,
+            version=1,
+            trained_at=datetime.utcnow(),
+            training_duration_seconds=training_duration,
+            training_metrics=training_metrics,
+        )
+        await session.execute(stmt)
+
+        session.add(
+            GlimpsModelVersion(
+                model_id=model_id,
+                version=1,
                 model_path=model_path,
-                trained_at=datetime.utcnow(),
-                training_duration_seconds=training_duration,
+                update_mode="full",
+                training_config=options,
                 training_metrics={
-                    "cg_shape": list(cg_data.shape),
-                    "atomistic_shape": list(atomistic_data.shape),
+                    **training_metrics,
+                    "training_duration_seconds": training_duration,
                 },
+                training_pairs=[
+                    {
+                        "cg_molecule_id": model.cg_molecule_id,
+                        "atomistic_molecule_id": model.atomistic_molecule_id,
+                    }
+                ],
+                n_training_frames=training_metrics["n_training_frames"],
+                job_id=job_id,
             )
-            await session.execute(stmt)
+        )
+
+        await progress.complete("Training complete", session=session)
+        await session.commit()
+
+    return adapter, model_path
+
+
+async def retrain_glimps_model(
+    ctx: dict[str, Any],
+    job_id: str,
+    model_id: str,
+    model_path: str,
+    cg_file_path: str,
+    atomistic_file_path: str,
+    base_file_paths: list[list[str]],
+    training_pairs: list[dict[str, str]],
+    glimps_options: dict[str, bool] | None = None,
+) -> dict[str, Any]:
+    from sqlalchemy import update
+
+    from src.infrastructure.database.models.glimps_model import GlimpsModel
+    from src.infrastructure.database.models.model_version import GlimpsModelVersion
+
+    storage = get_file_storage()
+
+    progress = JobProgressReporter(job_id)
+    outputs: list[str] = []
+
+    try:
+        await progress.start("Loading model...")
 
-            stmt = update(Job).where(Job.id == job_id).values(
-                status=JobStatus.COMPLETED,
-                completed_at=datetime.utcnow(),
-                progress_percent=100.0,
-                progress_message="Training complete",
+        model_bytes = await storage.load_bytes(model_path)
+        adapter = ModelSerializer.deserialize(model_bytes)
+        statistics_path = statistics_path_for(model_path)
+        if adapter.supports_partial_fit and await storage.exists(statistics_path):
+            ModelSerializer.restore_statistics(
+                adapter, await storage.load_bytes(statistics_path)
             )
-            await session.execute(stmt)
-            await session.commit()
 
-        return {"status": "success", "model_path": model_path}
+        cg_data = await storage.load_numpy(cg_file_path)
+        atomistic_data = await storage.load_numpy(atomistic_file_path)
+
+        await progress.update(10.0, "Updating GLIMPS model...")
+
+        start_time = time.time()
+        limit_threads = job_thread_limits(ctx)
+        fit_threads = (
+            limit_threads(ctx["threads"])
+            if limit_threads is not None and "threads" in ctx
+            else contextlib.nullcontext()
+        )
+
+        if adapter.supports_partial_fit:
+            update_mode = "incremental"
+            base_cg, base_atomistic = None, None
+            if adapter.xy_statistics is None:
+                base_cg, base_atomistic = await _load_training_pairs(
+                    storage, base_file_paths
+                )
+            with fit_threads:
+                await asyncio.to_thread(
+                    adapter.partial_fit,
+                    cg_data,
+                    atomistic_data,
+                    base_cg_coords=base_cg,
+                    base_atomistic_coords=base_atomistic,
+                )
+            n_training_frames = adapter.n_training_frames
+        else:
+            update_mode = "full"
+            base_cg, base_atomistic = await _load_training_pairs(
+                storage, base_file_paths
+            )
+            options = glimps_options or {}
+            adapter = GlimpsAdapter.create_with_options(
+                pca=options.get("pca", False),
+                refine=options.get("refine", True),
+                shave=options.get("shave", True),
+                triangulate=options.get("triangulate", False),
+            )
+            with fit_threads:
+                await asyncio.to_thread(
+                    adapter.fit,
+                    np.concatenate([base_cg, cg_data]),
+                    np.concatenate([base_atomistic, atomistic_data]),
+                )
+            n_training_frames = int(base_cg.shape[0] + cg_data.shape[0])
+
+        training_duration = time.time() - start_time
+
+        await progress.update(80.0, "Saving model version...")
+
+        version = await allocate_model_version(model_id)
+
+        new_model_path = f"models/{model_id}/v{version}/model.pkl"
+        await save_model(storage, adapter, new_model_path, outputs)
+
+        training_metrics = {
+            "cg_shape": list(cg_data.shape),
+            "atomistic_shape": list(atomistic_data.shape),
+            "n_training_frames": n_training_frames,
+            "supports_incremental": adapter.supports_partial_fit,
+            "update_mode": update_mode,
+        }
 
-    except Exception as e:
         async with async_session_maker() as session:
-            stmt = update(Job).where(Job.id == job_id).values(
-                status=JobStatus.FAILED,
-                completed_at=datetime.utcnow(),
-                error_message=str(e),
+            stmt = (
+                update(GlimpsModel)
+                .where(GlimpsModel.id == model_id, is_latest_version(model_id, version))
+                .values(
+                    model_path=new_model_path,
+                    trained_at=datetime.utcnow(),
+                    training_duration_seconds=training_duration,
+                    training_metrics=training_metrics,
+                )
             )
             await session.execute(stmt)
+
+            session.add(
+                GlimpsModelVersion(
+                    model_id=model_id,
+                    version=version,
+                    model_path=new_model_path,
+                    update_mode=update_mode,
+                    training_config=glimps_options,
+                    training_metrics={
+                        **training_metrics,
+                        "training_duration_seconds": training_duration,
+                    },
+                    training_pairs=training_pairs,
+                    n_training_frames=n_training_frames,
+                    job_id=job_id,
+                )
+            )
+
+            await progress.complete(
+                f"Model updated to version {version}",
+                output_params={
+                    "model_path": new_model_path,
+                    "version": version,
+                    "update_mode": update_mode,
+                    "n_training_frames": n_training_frames,
+                },
+                session=session,
+            )
             await session.commit()
 
+        await invalidate_inference_cache(model_id)
+
+        return {
+            "status": "success",
+            "model_path": new_model_path,
+            "version": version,
+            "update_mode": update_mode,
+        }
+
+    except (JobCancelledError, asyncio.CancelledError) as e:
+        await discard_files(storage, outputs)
+        if isinstance(e, asyncio.CancelledError):
+            raise
+
+        return {"status": "cancelled"}
+
+    except Exception as e:
+        await discard_files(storage, outputs)
+        await progress.fail(str(e))
+
         raise
+
+
+async def _load_training_pairs(
+    storage, file_paths: list[list[str]]
+) -> tuple[np.ndarray, np.ndarray]:
+    if not file_paths:
+        raise TrainingError("No stored training data available for this model")
+
+    cg_arrays = []
+    atomistic_arrays = []
+    for cg_path, atomistic_path in file_paths:
+        cg_arrays.append(await storage.load_numpy(cg_path))
+        atomistic_arrays.append(await storage.load_numpy(atomistic_path))
+
+    return np.concatenate(cg_arrays), np.concatenate(atomistic_arrays)
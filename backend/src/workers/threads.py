@@ -0,0 +1,101 @@
+import threading
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from functools import partial, wraps
+from typing import Any
+
+from src.config import settings
+from src.infrastructure.database.models.job import JobType
+
+Task = Callable[..., Awaitable[Any]]
+
+
+class ThreadBudget:
+    def __init__(self, total_threads: int, max_threads: dict[str, int] | None = None):
+        self.total_threads = max(1, total_threads)
+        self.max_threads = (
+            settings.job_max_threads if max_threads is None else max_threads
+        )
+        self._running: dict[str, JobType] = {}
+        self._pinned: dict[str, int] = {}
+        self._original_limits = None
+        self._lock = threading.RLock()
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    def threads_for(self, job_type: JobType) -> int:
+        share = max(1, self.total_threads // max(1, self.running))
+        cap = self.max_threads.get(job_type.value)
+        return max(1, min(share, cap)) if cap else share
+
+    @property
+    def limit(self) -> int:
+        return min(
+            (
+                self._pinned.get(job_id) or self.threads_for(job_type)
+                for job_id, job_type in self._running.items()
+            ),
+            default=self.total_threads,
+        )
+
+    @contextmanager
+    def job(self, job_id: str, job_type: JobType) -> Iterator[int]:
+        with self._lock:
+            self._running[job_id] = job_type
+            self._apply()
+        try:
+            yield self.threads_for(job_type)
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+                self._apply()
+
+    @contextmanager
+    def pin(self, job_id: str, threads: int) -> Iterator[int]:
+        with self._lock:
+            self._pinned[job_id] = min(max(1, threads), self.total_threads)
+            self._apply()
+            applied = self.limit
+        try:
+            yield applied
+        finally:
+            with self._lock:
+                self._pinned.pop(job_id, None)
+                self._apply()
+
+    def _apply(self) -> None:
+        from threadpoolctl import threadpool_limits
+
+        if not self._running:
+            if self._original_limits is not None:
+                self._original_limits.restore_original_limits()
+                self._original_limits = None
+            return
+
+        limits = threadpool_limits(limits=self.limit)
+        if self._original_limits is None:
+            self._original_limits = limits
+
+
+def job_thread_limits(
+    ctx: dict[str, Any],
+) -> Callable[[int], AbstractContextManager[int]] | None:
+    budget: ThreadBudget | None = ctx.get("thread_budget")
+    if budget is None:
+        return None
+    return partial(budget.pin, ctx["job_id"])
+
+
+def with_thread_budget(task: Task, job_type: JobType) -> Task:
+    @wraps(task)
+    async def run(ctx: dict[str, Any], *args: Any, **kwargs: Any) -> Any:
+        budget: ThreadBudget | None = ctx.get("thread_budget")
+        if budget is None:
+            return await task(ctx, *args, **kwargs)
+
+        with budget.job(ctx["job_id"], job_type) as threads:
+            return await task({**ctx, "threads": threads}, *args, **kwargs)
+
+    return run
@@ -0,0 +1,43 @@
+import asyncio
+from functools import wraps
+from typing import Any
+
+from src.config import settings
+from src.infrastructure.cache.job_progress import JobProgressReporter
+from src.infrastructure.database.models.job import JobType
+from src.infrastructure.queue.queues import queue_for_job_type, queue_limits
+from src.workers.threads import Task
+
+
+def job_timeout_seconds(ctx: dict[str, Any]) -> int | None:
+    estimate = (ctx.get("job_params") or {}).get("estimate") or {}
+    timeout = estimate.get("timeout_seconds")
+    return int(timeout) if timeout else None
+
+
+def worker_timeout_seconds(job_type: JobType) -> int:
+    job_timeout = queue_limits()[queue_for_job_type(job_type)]["job_timeout"]
+    return max(1, job_timeout - settings.cost_timeout_grace_seconds)
+
+
+def with_job_timeout(task: Task, job_type: JobType) -> Task:
+    @wraps(task)
+    async def run(ctx: dict[str, Any], job_id: str, *args: Any, **kwargs: Any) -> Any:
+        timeout = job_timeout_seconds(ctx)
+        if timeout is None:
+            return await task(ctx, job_id, *args, **kwargs)
+
+        timeout = min(timeout, worker_timeout_seconds(job_type))
+
+        try:
+            async with asyncio.timeout(timeout):
+                return await task(
+                    {**ctx, "job_timeout": timeout}, job_id, *args, **kwargs
+                )
+        except TimeoutError:
+            await JobProgressReporter(job_id, redis=ctx["redis"]).fail(
+                f"Job exceeded its estimated timeout of {timeout}s"
+            )
+            raise
+
+    return run
@@ -0,0 +1,101 @@
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.config import settings
+from src.domain.services import cost_service
+from src.domain.services.cost_service import CostEstimate, CostModelService
+from src.glimps.cost_model import TRAINING_COST, CostFeatures, RuntimeModel
+from src.infrastructure.database.models.job import JobType
+from src.infrastructure.queue.queues import BULK, INTERACTIVE
+
+
+def _estimate(job_type: JobType, runtime_seconds: float) -> CostEstimate:
+    return CostEstimate(
+        job_type=job_type,
+        runtime_seconds=runtime_seconds,
+        memory_estimate_bytes=0,
+        memory_bytes=0,
+        source="default",
+        n_samples=0,
+    )
+
+
+class TestCostEstimate:
+    def test_timeout_scales_with_runtime_within_queue_limit(self, monkeypatch):
+        monkeypatch.setattr(settings, "cost_timeout_multiplier", 4.0)
+        monkeypatch.setattr(settings, "cost_timeout_min_seconds", 60)
+
+        assert _estimate(JobType.TRAINING, 1.0).timeout_seconds == 60
+        assert _estimate(JobType.TRAINING, 100.0).timeout_seconds == 400
+        assert (
+            _estimate(JobType.TRAINING, 10**9).timeout_seconds
+            == settings.training_worker_job_timeout
+        )
+
+    def test_long_jobs_are_routed_to_bulk(self, monkeypatch):
+        monkeypatch.setattr(settings, "cost_bulk_runtime_seconds", 600.0)
+
+        assert _estimate(JobType.TRAINING, 60.0).priority == INTERACTIVE
+        assert _estimate(JobType.TRAINING, 3600.0).priority == BULK
+
+
+class _Session:
+    rolled_back = False
+
+    async def execute(self, stmt):
+        raise OperationalError(str(stmt), {}, Exception("connection lost"))
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+class TestCostModelService:
+    @pytest.fixture
+    def service(self, monkeypatch):
+        async def calibration_factor(redis, job_type):
+            return 2.0
+
+        monkeypatch.setattr(cost_service, "calibration_factor", calibration_factor)
+        monkeypatch.setattr(cost_service, "get_redis", lambda: None)
+
+        service = CostModelService(refresh_seconds=3600)
+        service._fitted_at = time.monotonic()
+        return service
+
+    async def test_falls_back_to_prior_without_history(self, service):
+        features = [CostFeatures(100, 50, 500)]
+
+        estimate = await service.estimate(None, JobType.TRAINING, features)
+
+        assert estimate.source == "default"
+        assert estimate.runtime_seconds > 0
+        assert estimate.memory_bytes == 2 * estimate.memory_estimate_bytes
+
+    async def test_uses_fitted_model_and_splits_parallel_work(self, service):
+        samples = [
+            (CostFeatures(n_frames, 50, 500), float(n_frames))
+            for n_frames in (10, 100, 1000)
+        ]
+        service._models[TRAINING_COST] = RuntimeModel.fit(samples)
+        features = [CostFeatures(100, 50, 500)] * 4
+
+        serial = await service.estimate(None, JobType.SWEEP, features)
+        parallel = await service.estimate(None, JobType.SWEEP, features, parallel=2)
+
+        assert serial.source == "history"
+        assert serial.runtime_seconds == pytest.approx(400, rel=0.05)
+        assert parallel.runtime_seconds == pytest.approx(serial.runtime_seconds / 2)
+        assert parallel.memory_estimate_bytes == 2 * serial.memory_estimate_bytes
+
+    async def test_rolls_back_the_session_when_history_fails(self, service):
+        service._fitted_at = None
+        session = _Session()
+
+        estimate = await service.estimate(
+            session, JobType.TRAINING, [CostFeatures(100, 50, 500)]
+        )
+
+        assert estimate.source == "default"
+        assert session.rolled_back
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from src.core.exceptions import TransformCapacityError, TransformTimeoutError
+from src.domain.services.transform_service import TransformService
+
+
+class _BlockingAdapter:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def transform(self, coords):
+        self.release.wait(5)
+        return coords * 2
+
+
+class _DoublingAdapter:
+    def transform(self, coords):
+        return coords * 2
+
+
+class TestTransformService:
+    async def test_returns_transformed_coordinates(self):
+        service = TransformService(max_workers=1, max_pending=1, timeout_seconds=5)
+        coords = np.ones((1, 4, 3), dtype=np.float32)
+
+        result, seconds = await service.transform(_DoublingAdapter(), coords)
+
+        np.testing.assert_allclose(result, coords * 2)
+        assert seconds >= 0
+        service.shutdown()
+
+    async def test_times_out_and_holds_slot_until_work_finishes(self):
+        service = TransformService(max_workers=1, max_pending=1, timeout_seconds=0.05)
+        adapter = _BlockingAdapter()
+        coords = np.ones((1, 4, 3), dtype=np.float32)
+
+        with pytest.raises(TransformTimeoutError):
+            await service.transform(adapter, coords)
+        with pytest.raises(TransformCapacityError):
+            await service.transform(_DoublingAdapter(), coords)
+
+        adapter.release.set()
+        for _ in range(100):
+            await asyncio.sleep(0.01)
+            try:
+                await service.transform(_DoublingAdapter(), coords)
+                break
+            except TransformCapacityError:
+                continue
+        else:
+            pytest.fail("Slot was not released after the timed-out transform finished")
+        service.shutdown()
@@ -1,8 +1,15 @@
+import os
+
 import numpy as np
 import pytest
 
 from src.core.exceptions import ModelNotTrainedError
-from src.glimps.adapter import GlimpsAdapter
+from src.glimps.adapter import FIT_STAGES, GlimpsAdapter
+from src.glimps.model_serializer import ModelSerializer
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FGTRAJ = os.path.join(TESTS_DIR, "examples", "test.npy")
+CGTRAJ = os.path.join(TESTS_DIR, "examples", "test_ca.npy")
 
 
 class MockGlimpsModel:
@@ -97,3 +104,49 @@ class TestGlimpsAdapter:
 
         with pytest.raises(ValueError, match="No model provided"):
             adapter.fit(np.random.randn(5, 50, 3), np.random.randn(5, 150, 3))
+
+
+class TestFitStages:
+    @pytest.mark.parametrize("pca", [False, True])
+    def test_staged_fit_matches_full_fit(self, pca):
+        cg_traj, fg_traj = np.load(CGTRAJ), np.load(FGTRAJ)
+        reference = GlimpsAdapter.create_with_options(pca=pca)
+        reference.fit(cg_traj, fg_traj)
+
+        adapter = GlimpsAdapter.create_with_options(pca=pca)
+        stages = list(adapter.fit_stages(cg_traj, fg_traj))
+
+        assert stages == list(FIT_STAGES)
+        assert adapter.is_fitted
+        np.testing.assert_allclose(
+            adapter.transform(cg_traj[:3]), reference.transform(cg_traj[:3]), atol=1e-3
+        )
+
+    def test_resumes_from_checkpoint(self):
+        cg_traj, fg_traj = np.load(CGTRAJ), np.load(FGTRAJ)
+        reference = GlimpsAdapter.create_with_options()
+        reference.fit(cg_traj, fg_traj)
+
+        adapter = GlimpsAdapter.create_with_options()
+        stages = adapter.fit_stages(cg_traj, fg_traj)
+        next(stages)
+        checkpoint = ModelSerializer.serialize_checkpoint(adapter, next(stages))
+
+        resumed, stage = ModelSerializer.deserialize_checkpoint(checkpoint)
+        remaining = list(resumed.fit_stages(cg_traj, fg_traj, resume_after=stage))
+
+        assert stage == "project"
+        assert remaining == ["refine", "regress"]
+        np.testing.assert_allclose(
+            resumed.transform(cg_traj[:3]), reference.transform(cg_traj[:3]), atol=1e-3
+        )
+
+    def test_completed_checkpoint_has_no_remaining_stages(self):
+        adapter = GlimpsAdapter.create_with_options()
+
+        assert (
+            list(
+                adapter.fit_stages(np.zeros((2, 3, 3)), np.zeros((2, 6, 3)), "regress")
+            )
+            == []
+        )
@@ -0,0 +1,94 @@
+import os
+from contextlib import contextmanager
+
+import numpy as np
+import pytest
+
+from src.glimps.adapter import GlimpsAdapter
+from src.glimps.benchmark import (
+    available_thread_counts,
+    benchmark_concurrency,
+    benchmark_model,
+    make_batch,
+)
+from src.glimps.model_serializer import ModelSerializer
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FGTRAJ = os.path.join(TESTS_DIR, "examples", "test.npy")
+CGTRAJ = os.path.join(TESTS_DIR, "examples", "test_ca.npy")
+
+
+@pytest.fixture(scope="module")
+def cg_traj():
+    return np.load(CGTRAJ)
+
+
+@pytest.fixture(scope="module")
+def model_bytes(cg_traj):
+    adapter = GlimpsAdapter.create_with_options(refine=False)
+    adapter.fit(cg_traj, np.load(FGTRAJ))
+    return ModelSerializer.serialize(adapter)
+
+
+class TestBenchmark:
+    def test_make_batch_cycles_frames(self, cg_traj):
+        batch = make_batch(cg_traj, 25)
+
+        assert batch.shape == (25, *cg_traj.shape[1:])
+        np.testing.assert_allclose(batch[len(cg_traj)], cg_traj[0])
+
+    def test_thread_counts_are_capped_to_cpu_count(self):
+        counts = available_thread_counts([0, 1, 10_000])
+
+        assert counts[0] == 1
+        assert counts[-1] == (os.cpu_count() or 1)
+
+    def test_profile_covers_every_configuration(self, cg_traj, model_bytes):
+        profile = benchmark_model(
+            model_bytes, cg_traj, batch_sizes=[1, 4], thread_counts=[1], repeats=1
+        )
+
+        assert [(r["threads"], r["batch_size"]) for r in profile["results"]] == [
+            (1, 1),
+            (1, 4),
+        ]
+        assert profile["artifact_bytes"] == len(model_bytes)
+        assert profile["load_seconds"] > 0
+        assert profile["peak_resident_bytes"] > 0
+        assert profile["best"]["frames_per_second"] > 0
+
+    def test_profile_uses_supplied_thread_limits(self, cg_traj, model_bytes):
+        requested = []
+
+        @contextmanager
+        def thread_limits(threads):
+            requested.append(threads)
+            yield 1
+
+        profile = benchmark_model(
+            model_bytes,
+            cg_traj,
+            batch_sizes=[1],
+            thread_counts=[1, 2],
+            repeats=1,
+            thread_limits=thread_limits,
+        )
+
+        assert requested == available_thread_counts([1, 2])
+        assert {r["threads"] for r in profile["results"]} == {1}
+
+    def test_concurrency_profile_covers_every_combination(self, cg_traj, model_bytes):
+        profile = benchmark_concurrency(
+            model_bytes,
+            cg_traj,
+            concurrency_levels=[2, 1],
+            thread_counts=[1],
+            batch_size=4,
+            batches_per_job=1,
+        )
+
+        assert [(r["concurrency"], r["total_threads"]) for r in profile["results"]] == [
+            (1, 1),
+            (2, 2),
+        ]
+        assert profile["best"]["frames_per_second"] > 0
@@ -0,0 +1,48 @@
+import pytest
+
+from src.glimps.cost_model import (
+    INFERENCE_COST,
+    TRAINING_COST,
+    CostFeatures,
+    RuntimeModel,
+    prior_runtime_seconds,
+)
+
+
+class TestRuntimeModel:
+    def test_fit_recovers_power_law_scaling(self):
+        samples = [
+            (
+                CostFeatures(n_frames, 50, n_atoms, {"refine": refine}),
+                0.01 * n_frames * n_atoms**1.5 * (3.0 if refine else 1.0),
+            )
+            for n_frames in (10, 100, 1000)
+            for n_atoms in (100, 400, 1600)
+            for refine in (False, True)
+        ]
+
+        model = RuntimeModel.fit(samples)
+        expected = 0.01 * 500 * 800**1.5 * 3.0
+
+        assert model.n_samples == len(samples)
+        assert model.predict(CostFeatures(500, 50, 800, {"refine": True})) == (
+            pytest.approx(expected, rel=0.05)
+        )
+
+    def test_prior_grows_with_system_size(self):
+        small = CostFeatures(10, 50, 500)
+        large = CostFeatures(1000, 50, 5000)
+
+        assert prior_runtime_seconds(TRAINING_COST, large) > prior_runtime_seconds(
+            TRAINING_COST, small
+        )
+        assert prior_runtime_seconds(INFERENCE_COST, large) > prior_runtime_seconds(
+            INFERENCE_COST, small
+        )
+
+    def test_memory_uses_job_kind(self):
+        features = CostFeatures(100, 50, 500)
+
+        assert features.memory_bytes(TRAINING_COST) > features.memory_bytes(
+            INFERENCE_COST
+        )
@@ -0,0 +1,115 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.core.exceptions import TrainingError
+from src.glimps.adapter import GlimpsAdapter
+from src.glimps.incremental import RegressionStatistics
+from src.glimps.model_serializer import ModelSerializer
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FGTRAJ = os.path.join(TESTS_DIR, "examples", "test.npy")
+CGTRAJ = os.path.join(TESTS_DIR, "examples", "test_ca.npy")
+
+
+@pytest.fixture(scope="module")
+def cg_traj():
+    return np.load(CGTRAJ)
+
+
+@pytest.fixture(scope="module")
+def fg_traj():
+    return np.load(FGTRAJ)
+
+
+class TestRegressionStatistics:
+    def test_batched_updates_match_least_squares(self):
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=(40, 6))
+        y = x @ rng.normal(size=(6, 4)) + rng.normal(size=4)
+
+        stats = RegressionStatistics(6, 4)
+        stats.update(x[:25], y[:25])
+        stats.update(x[25:], y[25:])
+        coef, intercept = stats.solve()
+
+        reference = LinearRegression().fit(x, y)
+        np.testing.assert_allclose(coef, reference.coef_, atol=1e-8)
+        np.testing.assert_allclose(intercept, reference.intercept_, atol=1e-8)
+
+    def test_underdetermined_matches_minimum_norm_solution(self):
+        rng = np.random.default_rng(1)
+        x = rng.normal(size=(5, 12))
+        y = rng.normal(size=(5, 3))
+
+        stats = RegressionStatistics(12, 3)
+        stats.update(x, y)
+        coef, intercept = stats.solve()
+
+        reference = LinearRegression().fit(x, y)
+        np.testing.assert_allclose(
+            x @ coef.T + intercept, reference.predict(x), atol=1e-8
+        )
+
+    def test_rejects_mismatched_features(self):
+        stats = RegressionStatistics(3, 2)
+
+        with pytest.raises(ValueError):
+            stats.update(np.zeros((4, 2)), np.zeros((4, 2)))
+
+
+class TestPartialFit:
+    def test_partial_fit_matches_full_regression(self, cg_traj, fg_traj):
+        adapter = GlimpsAdapter.create_with_options(refine=False)
+        adapter.fit(cg_traj[:6], fg_traj[:6])
+        adapter.partial_fit(cg_traj[6:], fg_traj[6:])
+
+        model = adapter._model
+        x = model.x_fitter.transform(cg_traj).reshape((len(cg_traj), -1))
+        y = model.y_fitter.transform(model.y_shaver.transform(fg_traj))
+        reference = LinearRegression().fit(x, y.reshape((len(fg_traj), -1)))
+
+        assert adapter.n_training_frames == len(cg_traj)
+        np.testing.assert_allclose(
+            model.xy_regressor.predict(x), reference.predict(x), atol=1e-4
+        )
+
+    def test_partial_fit_seeds_statistics_from_base_data(self, cg_traj, fg_traj):
+        fitted = GlimpsAdapter.create_with_options(refine=False)
+        fitted.fit(cg_traj[:6], fg_traj[:6])
+        adapter = ModelSerializer.deserialize(ModelSerializer.serialize(fitted))
+
+        assert adapter.xy_statistics is None
+        with pytest.raises(TrainingError):
+            adapter.partial_fit(cg_traj[6:], fg_traj[6:])
+
+        adapter.partial_fit(
+            cg_traj[6:],
+            fg_traj[6:],
+            base_cg_coords=cg_traj[:6],
+            base_atomistic_coords=fg_traj[:6],
+        )
+        assert adapter.n_training_frames == len(cg_traj)
+
+    def test_statistics_are_stored_apart_from_the_model(self, cg_traj, fg_traj):
+        fitted = GlimpsAdapter.create_with_options(refine=False)
+        fitted.fit(cg_traj[:6], fg_traj[:6])
+        adapter = ModelSerializer.deserialize(ModelSerializer.serialize(fitted))
+
+        ModelSerializer.restore_statistics(
+            adapter, ModelSerializer.serialize_statistics(fitted)
+        )
+        adapter.partial_fit(cg_traj[6:], fg_traj[6:])
+
+        assert adapter.n_training_frames == len(cg_traj)
+        assert adapter.xy_statistics.n_samples == len(cg_traj)
+
+    def test_triangulate_does_not_support_partial_fit(self, cg_traj, fg_traj):
+        adapter = GlimpsAdapter.create_with_options(triangulate=True)
+        adapter.fit(cg_traj[:6], fg_traj[:6])
+
+        assert not adapter.supports_partial_fit
+        with pytest.raises(TrainingError):
+            adapter.partial_fit(cg_traj[6:], fg_traj[6:])
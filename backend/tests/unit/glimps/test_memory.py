@@ -0,0 +1,22 @@
+from src.glimps.memory import (
+    inference_memory_bytes,
+    model_memory_bytes,
+    training_memory_bytes,
+)
+
+
+class TestMemoryEstimates:
+    def test_training_scales_with_frames_and_atoms(self):
+        small = training_memory_bytes(100, 50, 500)
+
+        assert training_memory_bytes(200, 50, 500) > small
+        assert training_memory_bytes(100, 50, 1000) > small
+        assert training_memory_bytes(100, 50, 500) > inference_memory_bytes(
+            100, 50, 500
+        )
+
+    def test_refinement_dominates_for_large_systems(self):
+        without_refine = model_memory_bytes(1000, 10000, {"refine": False})
+        with_refine = model_memory_bytes(1000, 10000, {"refine": True})
+
+        assert with_refine > 2 * without_refine
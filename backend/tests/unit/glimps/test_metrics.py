@@ -0,0 +1,62 @@
+import numpy as np
+from scipy.spatial.distance import pdist, squareform
+
+from src.glimps.metrics import (
+    BackmappingQualityMetrics,
+    bond_length_deviations,
+    count_clashes,
+    excluded_pair_keys,
+)
+
+
+def _brute_force_clashes(frame, cutoff, excluded):
+    n_atoms = len(frame)
+    distances = squareform(pdist(frame))
+    i, j = np.triu_indices(n_atoms, 1)
+    close = distances[i, j] < cutoff
+    keys = i[close] * n_atoms + j[close]
+    return int(np.count_nonzero(~np.isin(keys, excluded)))
+
+
+class TestQualityMetrics:
+    def test_bond_length_deviation_is_zero_for_reference(self):
+        coords = np.array([[[0.0, 0.0, 0.0], [0.1, 0.0, 0.0], [0.1, 0.15, 0.0]]])
+        bonds = np.array([[0, 1], [1, 2]])
+
+        rms, max_abs = bond_length_deviations(coords, bonds, np.array([0.1, 0.15]))
+
+        np.testing.assert_allclose(rms, [0.0], atol=1e-12)
+        np.testing.assert_allclose(max_abs, [0.0], atol=1e-12)
+
+    def test_excluded_pairs_cover_bonds_and_angles(self):
+        keys = excluded_pair_keys(np.array([[0, 1], [1, 2], [2, 3]]), 4)
+
+        assert set(keys.tolist()) == {
+            0 * 4 + 1,
+            1 * 4 + 2,
+            2 * 4 + 3,
+            0 * 4 + 2,
+            1 * 4 + 3,
+        }
+
+    def test_cell_list_matches_brute_force(self):
+        rng = np.random.default_rng(0)
+        frame = rng.uniform(0.0, 1.5, size=(400, 3)).astype(np.float32)
+        bonds = np.array([[i, i + 1] for i in range(399)])
+        excluded = excluded_pair_keys(bonds, 400)
+
+        assert count_clashes(frame, 0.2, excluded) == _brute_force_clashes(
+            frame, 0.2, excluded
+        )
+
+    def test_summary_reports_rmsd_to_reference(self):
+        rng = np.random.default_rng(1)
+        reference = rng.normal(size=(1, 20, 3)).astype(np.float32)
+        metrics = BackmappingQualityMetrics(20, reference_coords=reference)
+
+        metrics.update(np.repeat(reference, 3, axis=0), 0)
+        summary = metrics.summary()
+
+        assert summary["rmsd_to_reference_nm"]["max"] < 1e-4
+        assert len(summary["rmsd_to_reference_nm"]["per_frame"]) == 3
+        assert "clash_count" not in summary
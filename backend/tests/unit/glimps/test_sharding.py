@@ -0,0 +1,43 @@
+from itertools import pairwise
+
+import numpy as np
+
+from src.glimps.sharding import open_output_memmap, shard_frame_ranges
+
+
+class TestShardFrameRanges:
+    def test_small_trajectory_is_not_sharded(self):
+        assert shard_frame_ranges(100, 1000, 8) == [(0, 100)]
+
+    def test_ranges_cover_all_frames_without_overlap(self):
+        ranges = shard_frame_ranges(10007, 1000, 16)
+
+        assert len(ranges) == 11
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == 10007
+        assert all(a[1] == b[0] for a, b in pairwise(ranges))
+
+    def test_shard_count_is_capped(self):
+        ranges = shard_frame_ranges(100000, 1000, 4)
+
+        assert len(ranges) == 4
+        assert [stop - start for start, stop in ranges] == [25000] * 4
+
+    def test_disabled_when_shard_frames_is_zero(self):
+        assert shard_frame_ranges(100000, 0, 4) == [(0, 100000)]
+
+
+class TestOpenOutputMemmap:
+    def test_assembles_shards_in_place(self, tmp_path):
+        shards = [np.full((3, 5, 3), i, dtype=np.float32) for i in range(3)]
+
+        output = open_output_memmap(tmp_path / "output.npy", 9, shards[0])
+        for index, shard in enumerate(shards):
+            output[index * 3 : (index + 1) * 3] = shard
+        output.flush()
+        del output
+
+        assembled = np.load(tmp_path / "output.npy")
+        assert assembled.shape == (9, 5, 3)
+        assert assembled.dtype == np.float32
+        np.testing.assert_array_equal(assembled, np.concatenate(shards))
@@ -0,0 +1,95 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from src.glimps.pdb import StreamingPdbWriter, create_pdb_from_template, parse_template
+from src.glimps.streaming import run_chunk_pipeline
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FGTRAJ = os.path.join(TESTS_DIR, "examples", "test.npy")
+TEMPLATE = os.path.join(TESTS_DIR, "examples", "b2ar_prepared.pdb")
+
+
+def _without_remarks(pdb: str) -> list[str]:
+    return [line for line in pdb.splitlines() if not line.startswith("REMARK")]
+
+
+class TestChunkPipeline:
+    async def test_overlaps_stages_and_keeps_order(self):
+        source = np.arange(40, dtype=np.float32).reshape(8, 5)
+        output = np.zeros_like(source)
+
+        def read(start, stop):
+            time.sleep(0.05)
+            return source[start:stop]
+
+        def compute(chunk, start):
+            time.sleep(0.05)
+            return chunk * 2
+
+        def write(chunk, start):
+            time.sleep(0.05)
+            output[start : start + len(chunk)] = chunk
+
+        progress = []
+
+        async def on_chunk(n_done):
+            progress.append(n_done)
+
+        ranges = [(start, start + 2) for start in range(0, 8, 2)]
+        timings = await run_chunk_pipeline(
+            ranges, read, compute, write, on_chunk=on_chunk
+        )
+
+        np.testing.assert_array_equal(output, source * 2)
+        assert progress == [2, 4, 6, 8]
+        assert timings.n_chunks == 4
+        assert timings.wall_seconds < 0.8 * timings.serial_seconds
+        assert timings.summary()["overlap_efficiency"] > 0.3
+
+    async def test_stage_failure_stops_pipeline(self):
+        written = []
+
+        def compute(chunk, start):
+            if start == 2:
+                raise ValueError("bad chunk")
+            return chunk
+
+        with pytest.raises(ValueError, match="bad chunk"):
+            await run_chunk_pipeline(
+                [(start, start + 1) for start in range(10)],
+                lambda start, stop: np.zeros((1, 3)),
+                compute,
+                lambda chunk, start: written.append(start),
+            )
+
+        assert written == [0, 1]
+
+
+class TestStreamingPdbWriter:
+    def test_matches_full_trajectory_pdb(self):
+        coords = np.load(FGTRAJ)[:5]
+        with open(TEMPLATE, "rb") as template_file:
+            template = parse_template(template_file.read()).atom_slice(
+                range(coords.shape[1])
+            )
+
+        writer = StreamingPdbWriter(template, len(coords))
+        writer.write(coords[:2], 0)
+        writer.write(coords[2:], 2)
+
+        assert _without_remarks(writer.render()) == _without_remarks(
+            create_pdb_from_template(template, coords, coords.shape[1])
+        )
+
+    def test_falls_back_to_ca_trace_without_matching_template(self):
+        coords = np.load(FGTRAJ)[:3]
+
+        writer = StreamingPdbWriter(None, len(coords))
+        writer.write(coords, 0)
+
+        assert writer.render() == create_pdb_from_template(
+            None, coords, coords.shape[1]
+        )
@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from src.glimps.sweep import (
+    SweepResult,
+    expand_option_grid,
+    select_best,
+    split_holdout,
+)
+
+
+class TestExpandOptionGrid:
+    def test_expands_cartesian_product(self):
+        combinations = expand_option_grid(
+            {
+                "pca": [False, True],
+                "refine": [True],
+                "shave": [False, True],
+                "triangulate": [False],
+            }
+        )
+
+        assert len(combinations) == 4
+        assert {
+            "pca": True,
+            "refine": True,
+            "shave": False,
+            "triangulate": False,
+        } in combinations
+
+    def test_triangulate_combinations_are_deduplicated(self):
+        combinations = expand_option_grid(
+            {
+                "pca": [False, True],
+                "refine": [False],
+                "shave": [False, True],
+                "triangulate": [True],
+            }
+        )
+
+        assert combinations == [
+            {"pca": False, "refine": False, "shave": False, "triangulate": True}
+        ]
+
+
+class TestSplitHoldout:
+    def test_split_is_disjoint_and_complete(self):
+        train_idx, holdout_idx = split_holdout(20, 0.25)
+
+        assert len(holdout_idx) == 5
+        assert set(train_idx).isdisjoint(holdout_idx)
+        assert sorted(np.concatenate([train_idx, holdout_idx])) == list(range(20))
+
+    def test_split_is_deterministic(self):
+        first = split_holdout(30, 0.2, seed=3)
+        second = split_holdout(30, 0.2, seed=3)
+
+        np.testing.assert_array_equal(first[1], second[1])
+
+    def test_too_few_frames_raises(self):
+        with pytest.raises(ValueError):
+            split_holdout(3, 0.2)
+
+
+class TestSelectBest:
+    def test_selects_lowest_rmsd_and_skips_failures(self):
+        results = [
+            SweepResult(
+                options={"pca": False}, rmsd_mean=0.3, inference_seconds_per_frame=0.1
+            ),
+            SweepResult(
+                options={"pca": True}, rmsd_mean=0.1, inference_seconds_per_frame=0.2
+            ),
+            SweepResult(options={"shave": True}, error="singular matrix"),
+        ]
+
+        assert select_best(results).options == {"pca": True}
+
+    def test_returns_none_when_all_failed(self):
+        assert select_best([SweepResult(options={}, error="failed")]) is None
@@ -0,0 +1,270 @@
+from types import SimpleNamespace
+
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.config import settings
+from src.infrastructure.database.models.job import JobType
+from src.infrastructure.queue.fair_scheduler import FairScheduler, QueuedCall, _key
+from src.infrastructure.queue.queues import INFERENCE_QUEUE
+
+
+class _FairRedis:
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+        self.sets = {}
+        self.hashes = {}
+
+    async def set(self, key, value, nx=False, px=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def eval(self, script, numkeys, key, token):
+        if self.values.get(key) == token:
+            del self.values[key]
+            return 1
+        return 0
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    async def lindex(self, key, index):
+        items = self.lists.get(key, [])
+        return items[index] if items else None
+
+    async def lrem(self, key, count, value):
+        self.lists[key] = [item for item in self.lists.get(key, []) if item != value]
+
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    async def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+
+    async def srem(self, key, member):
+        self.sets.get(key, set()).discard(member)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def sismember(self, key, member):
+        return member in self.sets.get(key, set())
+
+    async def scard(self, key):
+        return len(self.sets.get(key, set()))
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = str(value)
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hdel(self, key, field):
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hincrby(self, key, field, amount):
+        values = self.hashes.setdefault(key, {})
+        values[field] = str(int(values.get(field, 0)) + amount)
+
+    async def hincrbyfloat(self, key, field, amount):
+        values = self.hashes.setdefault(key, {})
+        values[field] = str(float(values.get(field, 0)) + amount)
+
+
+class _RecordingPool:
+    def __init__(self):
+        self.enqueued = []
+
+    async def enqueue_job(self, function, *args, _job_id=None, _queue_name=None):
+        self.enqueued.append(_job_id)
+
+
+def _job(job_id, user_id, job_type=JobType.INFERENCE, project_id="project-1"):
+    return SimpleNamespace(
+        id=job_id, user_id=user_id, project_id=project_id, job_type=job_type
+    )
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "fair_scheduling_enabled", True)
+    monkeypatch.setattr(settings, "inference_dispatch_slots", 1)
+    monkeypatch.setattr(settings, "fair_user_max_in_flight", 4)
+    monkeypatch.setattr(settings, "fair_project_max_in_flight", 8)
+    monkeypatch.setattr(settings, "fair_user_weights", {})
+    return settings
+
+
+class TestFairScheduler:
+    async def test_alternates_between_users(self, limits):
+        scheduler = FairScheduler(_FairRedis())
+        pool = _RecordingPool()
+
+        for index in range(3):
+            await scheduler.submit(pool, _job(f"big-{index}", "big"), "run_inference")
+        await scheduler.submit(pool, _job("small-0", "small"), "run_inference")
+
+        for index in range(3):
+            await scheduler.release(pool.enqueued[index])
+            await scheduler.dispatch(pool, INFERENCE_QUEUE)
+
+        assert pool.enqueued == ["big-0", "small-0", "big-1", "big-2"]
+
+    async def test_interactive_jobs_overtake_bulk_backlog(self, limits):
+        scheduler = FairScheduler(_FairRedis())
+        pool = _RecordingPool()
+
+        for index in range(3):
+            await scheduler.submit(
+                pool, _job(f"batch-{index}", "a", JobType.BATCH_INFERENCE), "batch"
+            )
+        await scheduler.submit(pool, _job("single", "b"), "run_inference")
+
+        await scheduler.release("batch-0")
+        await scheduler.dispatch(pool, INFERENCE_QUEUE)
+
+        assert pool.enqueued == ["batch-0", "single"]
+
+    async def test_user_cap_leaves_slots_for_others(self, limits, monkeypatch):
+        monkeypatch.setattr(settings, "inference_dispatch_slots", 3)
+        monkeypatch.setattr(settings, "fair_user_max_in_flight", 1)
+        scheduler = FairScheduler(_FairRedis())
+        pool = _RecordingPool()
+
+        await scheduler.submit(pool, _job("a-0", "a"), "run_inference")
+        await scheduler.submit(pool, _job("a-1", "a"), "run_inference")
+        await scheduler.submit(pool, _job("b-0", "b"), "run_inference")
+
+        assert pool.enqueued == ["a-0", "b-0"]
+        assert (await scheduler.queue_stats(INFERENCE_QUEUE)) == {
+            "waiting": 1,
+            "in_flight": 2,
+        }
+
+    async def test_removed_jobs_are_never_dispatched(self, limits):
+        scheduler = FairScheduler(_FairRedis())
+        pool = _RecordingPool()
+
+        await scheduler.submit(pool, _job("first", "a"), "run_inference")
+        await scheduler.submit(pool, _job("second", "a"), "run_inference")
+
+        assert await scheduler.remove("second")
+        await scheduler.release("first")
+        await scheduler.dispatch(pool, INFERENCE_QUEUE)
+
+        assert pool.enqueued == ["first"]
+
+    async def test_release_is_idempotent(self, limits):
+        scheduler = FairScheduler(_FairRedis())
+        pool = _RecordingPool()
+
+        await scheduler.submit_calls(
+            pool,
+            _job("job-1", "a"),
+            [
+                QueuedCall("run_inference_shard", ["job-1", index], f"job-1:{index}")
+                for index in range(2)
+            ],
+        )
+        await scheduler.release("job-1")
+        await scheduler.release("job-1")
+
+        assert pool.enqueued == ["job-1:0", "job-1:1"]
+        assert (await scheduler.queue_stats(INFERENCE_QUEUE))["in_flight"] == 0
+
+    async def test_enqueues_directly_when_redis_is_unavailable(self, limits):
+        class _BrokenRedis:
+            def __getattr__(self, name):
+                async def fail(*args, **kwargs):
+                    raise RedisConnectionError("redis down")
+
+                return fail
+
+        pool = _RecordingPool()
+        await FairScheduler(_BrokenRedis()).submit(pool, _job("job-1", "a"), "f")
+
+        assert pool.enqueued == ["job-1"]
+
+    async def test_weighted_users_get_proportional_turns(self, limits, monkeypatch):
+        monkeypatch.setattr(settings, "fair_user_weights", {"heavy": 2.0})
+        scheduler = FairScheduler(_FairRedis())
+        pool = _RecordingPool()
+
+        await scheduler.submit(pool, _job("light-0", "light"), "run_inference")
+        for index in range(4):
+            await scheduler.submit(pool, _job(f"heavy-{index}", "heavy"), "f")
+        await scheduler.submit(pool, _job("light-1", "light"), "run_inference")
+
+        for index in range(5):
+            await scheduler.release(pool.enqueued[index])
+            await scheduler.dispatch(pool, INFERENCE_QUEUE)
+
+        assert pool.enqueued == [
+            "light-0",
+            "heavy-0",
+            "heavy-1",
+            "heavy-2",
+            "light-1",
+            "heavy-3",
+        ]
+
+    async def test_dispatch_is_skipped_while_another_holds_the_lock(self, limits):
+        redis = _FairRedis()
+        scheduler = FairScheduler(redis)
+        pool = _RecordingPool()
+        lock_key = _key(INFERENCE_QUEUE, "lock")
+
+        redis.values[lock_key] = "other-dispatcher"
+        await scheduler.submit(pool, _job("job-1", "a"), "run_inference")
+
+        assert pool.enqueued == []
+        assert redis.values[lock_key] == "other-dispatcher"
+
+        del redis.values[lock_key]
+        assert await scheduler.dispatch(pool, INFERENCE_QUEUE) == 1
+        assert pool.enqueued == ["job-1"]
+        assert lock_key not in redis.values
+
+    async def test_failed_enqueue_keeps_the_job_in_the_backlog(self, limits):
+        class _FlakyPool(_RecordingPool):
+            fail = True
+
+            async def enqueue_job(self, function, *args, **kwargs):
+                if self.fail:
+                    raise RedisConnectionError("redis down")
+                await super().enqueue_job(function, *args, **kwargs)
+
+        scheduler = FairScheduler(_FairRedis())
+        pool = _FlakyPool()
+
+        await scheduler.submit(pool, _job("job-1", "a"), "run_inference")
+
+        assert pool.enqueued == []
+        assert (await scheduler.queue_stats(INFERENCE_QUEUE))["waiting"] == 1
+
+        pool.fail = False
+        assert await scheduler.dispatch(pool, INFERENCE_QUEUE) == 1
+        assert pool.enqueued == ["job-1"]
+        assert await scheduler.queue_stats(INFERENCE_QUEUE) == {
+            "waiting": 0,
+            "in_flight": 1,
+        }
+
+    async def test_enqueues_directly_when_fair_scheduling_is_disabled(
+        self, limits, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "fair_scheduling_enabled", False)
+        redis = _FairRedis()
+        pool = _RecordingPool()
+
+        for index in range(2):
+            await FairScheduler(redis).submit(pool, _job(f"job-{index}", "a"), "f")
+
+        assert pool.enqueued == ["job-0", "job-1"]
+        assert redis.hashes == {}
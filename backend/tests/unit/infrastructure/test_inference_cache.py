@@ -0,0 +1,177 @@
+import numpy as np
+from redis.exceptions import RedisError
+
+from src.infrastructure.cache import inference_cache
+from src.infrastructure.cache.inference_cache import (
+    InferenceCache,
+    hash_array,
+    hash_options,
+    inference_cache_options,
+    invalidate_inference_cache,
+    is_result_available,
+)
+
+
+class TestInferenceCacheKeys:
+    def test_array_hash_depends_on_content_shape_and_dtype(self):
+        coords = np.arange(24, dtype=np.float32).reshape((2, 4, 3))
+
+        assert hash_array(coords) == hash_array(coords.copy())
+        assert hash_array(coords) != hash_array(coords.reshape((1, 8, 3)))
+        assert hash_array(coords) != hash_array(coords.astype(np.float64))
+
+        changed = coords.copy()
+        changed[1, 3, 2] += 1e-3
+        assert hash_array(coords) != hash_array(changed)
+
+    def test_array_hash_ignores_memory_layout(self):
+        coords = np.arange(24, dtype=np.float32).reshape((4, 6))
+
+        assert hash_array(coords.T) == hash_array(np.ascontiguousarray(coords.T))
+
+    def test_options_hash_is_order_independent(self):
+        assert hash_options({"a": 1, "b": None}) == hash_options({"b": None, "a": 1})
+
+    def test_entry_key_is_scoped_to_project_and_options(self):
+        options = inference_cache_options("template.pdb", None)
+        key = InferenceCache._entry_key("project", "model", "input", options)
+
+        assert key != InferenceCache._entry_key("other", "model", "input", options)
+        assert key != InferenceCache._entry_key(
+            "project", "model", "input", inference_cache_options("template.pdb", "ref")
+        )
+
+
+class _Pipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+
+        return queue
+
+    async def execute(self):
+        for name, args, kwargs in self._calls:
+            await getattr(self._redis, name)(*args, **kwargs)
+
+
+class _CacheRedis:
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value.encode() if isinstance(value, str) else value
+        self.expiry[key] = ex
+
+    async def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+
+    async def expire(self, key, seconds):
+        self.expiry[key] = seconds
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key, None)
+            self.sets.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _FailingRedis:
+    async def smembers(self, key):
+        raise RedisError("connection lost")
+
+
+class _Result:
+    def __init__(self, value):
+        self._value = value
+
+    def scalar_one_or_none(self):
+        return self._value
+
+
+class _Session:
+    def __init__(self, molecule_id):
+        self._molecule_id = molecule_id
+
+    async def execute(self, stmt):
+        return _Result(self._molecule_id)
+
+
+class _Storage:
+    def __init__(self, paths):
+        self._paths = paths
+
+    async def exists(self, path):
+        return path in self._paths
+
+
+class TestInferenceCacheStore:
+    async def test_looks_up_results_by_content_hash(self):
+        cache = InferenceCache(_CacheRedis(), ttl_seconds=60)
+        options = inference_cache_options(None, None)
+        result = {"molecule_id": "m", "output_path": "out.pdb"}
+
+        await cache.set_content_hash("models/a.pkl", "model-hash")
+        assert await cache.lookup_paths("p", "models/a.pkl", "in.npy", options) is None
+
+        await cache.set_content_hash("in.npy", "input-hash")
+        await cache.set("p", "model-1", "model-hash", "input-hash", options, result)
+
+        assert await cache.get_content_hash("in.npy") == "input-hash"
+        assert (
+            await cache.lookup_paths("p", "models/a.pkl", "in.npy", options) == result
+        )
+        assert await cache.get("other", "model-hash", "input-hash", options) is None
+
+    async def test_invalidates_every_entry_of_a_model(self):
+        redis = _CacheRedis()
+        cache = InferenceCache(redis, ttl_seconds=60)
+        options = inference_cache_options(None, None)
+        for input_hash in ("a", "b"):
+            await cache.set("p", "model-1", "hash", input_hash, options, {"n": 1})
+        await cache.set("p", "model-2", "other", "a", options, {"n": 2})
+
+        assert await cache.invalidate_model("model-1") == 2
+        assert await cache.get("p", "hash", "a", options) is None
+        assert await cache.get("p", "other", "a", options) == {"n": 2}
+        assert await cache.invalidate_model("model-1") == 0
+
+    async def test_invalidation_tolerates_redis_errors(self, monkeypatch):
+        monkeypatch.setattr(
+            inference_cache,
+            "get_inference_cache",
+            lambda: InferenceCache(_FailingRedis(), ttl_seconds=60),
+        )
+
+        assert await invalidate_inference_cache("model-1") == 0
+
+    async def test_result_needs_molecule_and_output_file(self):
+        result = {"molecule_id": "m", "output_path": "out.pdb"}
+
+        assert await is_result_available(_Session("m"), _Storage({"out.pdb"}), result)
+        assert not await is_result_available(
+            _Session(None), _Storage({"out.pdb"}), result
+        )
+        assert not await is_result_available(_Session("m"), _Storage(set()), result)
+        assert not await is_result_available(
+            _Session("m"), _Storage({"out.pdb"}), {"molecule_id": "m"}
+        )
@@ -0,0 +1,67 @@
+from src.infrastructure.cache.inference_shards import InferenceShardTracker
+
+
+class _ShardRedis:
+    def __init__(self):
+        self.hashes = {}
+        self.sets = {}
+        self.values = {}
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = str(value)
+
+    async def hvals(self, key):
+        return list(self.hashes.get(key, {}).values())
+
+    async def sadd(self, key, member):
+        members = self.sets.setdefault(key, set())
+        if member in members:
+            return 0
+        members.add(member)
+        return 1
+
+    async def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.sets.pop(key, None)
+            self.values.pop(key, None)
+
+
+class TestInferenceShardTracker:
+    async def test_report_sums_frames_across_shards(self):
+        tracker = InferenceShardTracker("job-1", 3, redis=_ShardRedis())
+
+        await tracker.report(0, 100)
+        await tracker.report(1, 50)
+
+        assert await tracker.report(0, 200) == 250
+
+    async def test_only_last_distinct_shard_triggers_fan_in(self):
+        tracker = InferenceShardTracker("job-1", 2, redis=_ShardRedis())
+
+        assert await tracker.mark_done(0) is False
+        assert await tracker.mark_done(0) is False
+        assert await tracker.mark_done(1) is True
+
+    async def test_failure_is_visible_to_other_shards_until_cleared(self):
+        redis = _ShardRedis()
+        tracker = InferenceShardTracker("job-1", 2, redis=redis)
+
+        await tracker.fail()
+        assert await InferenceShardTracker("job-1", 2, redis=redis).has_failed()
+
+        await tracker.clear()
+        assert not await tracker.has_failed()
@@ -0,0 +1,121 @@
+import pytest
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.config import settings
+from src.core.exceptions import JobSubmissionInProgressError
+from src.infrastructure.cache.job_dedup import (
+    PENDING,
+    JobSubmission,
+    submission_fingerprint,
+)
+from src.infrastructure.database.models.job import JobType
+
+
+class _DedupRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def eval(self, script, numkeys, key, expected, *replacement):
+        if self.values.get(key) != expected:
+            return None
+        if replacement:
+            self.values[key] = replacement[0]
+        else:
+            del self.values[key]
+        return True
+
+
+def _active(*job_ids):
+    async def is_active(job_id):
+        return job_id in job_ids
+
+    return is_active
+
+
+def _submission(redis, idempotency_key=None, params=None):
+    fingerprint = submission_fingerprint(
+        JobType.INFERENCE, "model-1", params or {"input_molecule_id": "mol-1"}
+    )
+    return JobSubmission("user-1", fingerprint, idempotency_key, redis=redis)
+
+
+class TestJobSubmission:
+    def test_fingerprint_ignores_param_order(self):
+        first = submission_fingerprint(JobType.INFERENCE, "m", {"a": 1, "b": 2})
+        second = submission_fingerprint(JobType.INFERENCE, "m", {"b": 2, "a": 1})
+
+        assert first == second
+        assert first != submission_fingerprint(JobType.TRAINING, "m", {"a": 1, "b": 2})
+
+    async def test_returns_active_duplicate(self):
+        redis = _DedupRedis()
+        first = _submission(redis)
+        assert await first.claim(_active()) is None
+        await first.bind("job-1")
+
+        assert await _submission(redis).claim(_active("job-1")) == "job-1"
+
+    async def test_replaces_finished_duplicate(self):
+        redis = _DedupRedis()
+        first = _submission(redis)
+        await first.claim(_active())
+        await first.bind("job-1")
+
+        second = _submission(redis)
+        assert await second.claim(_active()) is None
+        await second.bind("job-2")
+
+        assert redis.values[second.dedup_key] == "job-2"
+
+    async def test_idempotency_key_replays_finished_job(self):
+        redis = _DedupRedis()
+        first = _submission(redis, idempotency_key="abc")
+        await first.claim(_active())
+        await first.bind("job-1")
+
+        replay = _submission(redis, idempotency_key="abc", params={"other": True})
+        assert await replay.claim(_active()) == "job-1"
+
+    async def test_conflicts_while_identical_submission_is_pending(self, monkeypatch):
+        monkeypatch.setattr(settings, "job_submission_wait_seconds", 0.0)
+        redis = _DedupRedis()
+        first = _submission(redis)
+        await first.claim(_active())
+
+        assert redis.values[first.dedup_key] == PENDING
+        with pytest.raises(JobSubmissionInProgressError):
+            await _submission(redis).claim(_active())
+
+    async def test_fails_open_without_redis(self):
+        class _BrokenRedis:
+            async def set(self, *args, **kwargs):
+                raise RedisConnectionError("redis down")
+
+        assert await _submission(_BrokenRedis()).claim(_active()) is None
+
+    async def test_release_frees_an_unbound_claim(self):
+        redis = _DedupRedis()
+        first = _submission(redis, idempotency_key="abc")
+        await first.claim(_active())
+        await first.release()
+
+        assert redis.values == {}
+        assert await _submission(redis, idempotency_key="abc").claim(_active()) is None
+
+    async def test_release_keeps_bound_claims(self):
+        redis = _DedupRedis()
+        first = _submission(redis)
+        await first.claim(_active())
+        await first.bind("job-1")
+        await first.release()
+
+        assert redis.values[first.dedup_key] == "job-1"
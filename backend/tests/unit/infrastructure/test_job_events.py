@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+from src.infrastructure.cache.job_events import (
+    JobEventBroker,
+    parse_event_id,
+    stream_job_events,
+)
+
+
+class _StreamRedis:
+    def __init__(self, entries):
+        self.entries = entries
+        self.ranges = []
+
+    async def xrange(self, key, min="-", max="+"):
+        self.ranges.append((key, min))
+        return self.entries
+
+
+class _IdleBroker(JobEventBroker):
+    def subscribe(self, user_id):
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+
+def _entry(event_id, **event):
+    return (event_id.encode(), {b"data": json.dumps(event).encode()})
+
+
+class TestParseEventId:
+    def test_orders_by_time_then_sequence(self):
+        assert parse_event_id("1700-1") > parse_event_id("1700-0")
+        assert parse_event_id("1701-0") > parse_event_id("1700-9")
+        assert parse_event_id("1700") == (1700, 0)
+
+
+class TestJobEventBroker:
+    def test_dispatches_only_to_owning_user(self):
+        broker = _IdleBroker(redis=_StreamRedis([]))
+        own = broker.subscribe("user-1")
+        other = broker.subscribe("user-2")
+
+        broker.dispatch({"id": "1-0", "user_id": "user-1", "job_id": "job-1"})
+
+        assert own.qsize() == 1
+        assert other.qsize() == 0
+
+    def test_unsubscribe_drops_empty_users(self):
+        broker = _IdleBroker(redis=_StreamRedis([]))
+        queue = broker.subscribe("user-1")
+
+        broker.unsubscribe("user-1", queue)
+
+        assert broker._subscribers == {}
+
+
+class TestStreamJobEvents:
+    async def test_replays_then_skips_duplicate_live_events(self):
+        redis = _StreamRedis(
+            [
+                _entry("2-0", job_id="job-1", project_id="p1", status="running"),
+                _entry("3-0", job_id="job-2", project_id="p2", status="running"),
+            ]
+        )
+        broker = _IdleBroker(redis=redis)
+        events = stream_job_events(
+            broker,
+            "user-1",
+            project_id="p1",
+            last_event_id="1-0",
+            heartbeat_seconds=0.01,
+        )
+
+        replayed = await anext(events)
+        broker.dispatch({"id": "3-0", "user_id": "user-1", "project_id": "p1"})
+        broker.dispatch({"id": "4-0", "user_id": "user-1", "project_id": "p1"})
+        live = await anext(events)
+        await events.aclose()
+
+        assert redis.ranges == [("job_events:user:user-1", "(1-0")]
+        assert replayed["id"] == "2-0"
+        assert live["id"] == "4-0"
+        assert broker._subscribers == {}
+
+    async def test_yields_heartbeat_when_idle(self):
+        broker = _IdleBroker(redis=_StreamRedis([]))
+        events = stream_job_events(broker, "user-1", heartbeat_seconds=0.01)
+
+        assert await anext(events) is None
+        await events.aclose()
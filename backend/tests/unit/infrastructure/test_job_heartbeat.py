@@ -0,0 +1,91 @@
+import json
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.infrastructure.cache.job_heartbeat import (
+    HEARTBEATS_KEY,
+    beat,
+    read_heartbeats,
+    start_heartbeat,
+    stop_heartbeat,
+    task_heartbeats,
+    tracked_jobs,
+)
+from src.infrastructure.queue.worker_registry import worker_id
+
+
+class _HeartbeatRedis:
+    def __init__(self):
+        self.hashes = {}
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def hmget(self, key, fields):
+        values = self.hashes.get(key, {})
+        return [values.get(field) for field in fields]
+
+    async def hdel(self, key, field):
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+
+class TestJobHeartbeat:
+    async def test_running_jobs_are_tracked_until_stopped(self):
+        redis = _HeartbeatRedis()
+
+        await start_heartbeat(redis, "job-1")
+        assert "job-1" in tracked_jobs()
+        assert (await read_heartbeats(redis, ["job-1"]))["job-1"][
+            "worker_id"
+        ] == worker_id()
+
+        await stop_heartbeat(redis, "job-1")
+        assert "job-1" not in tracked_jobs()
+        assert await read_heartbeats(redis, ["job-1"]) == {}
+
+    async def test_beat_refreshes_every_job(self):
+        redis = _HeartbeatRedis()
+        redis.hashes[HEARTBEATS_KEY] = {
+            "job-1": json.dumps({"worker_id": "old", "at": 0.0})
+        }
+
+        await beat(redis, ["job-1", "job-2"])
+        heartbeats = await read_heartbeats(redis, ["job-1", "job-2", "job-3"])
+
+        assert set(heartbeats) == {"job-1", "job-2"}
+        assert all(heartbeat["at"] > 0 for heartbeat in heartbeats.values())
+
+    async def test_task_scope_releases_jobs_it_started(self):
+        redis = _HeartbeatRedis()
+
+        with task_heartbeats():
+            await start_heartbeat(redis, "job-1")
+            await start_heartbeat(redis, "job-1")
+            assert "job-1" in tracked_jobs()
+
+        assert "job-1" not in tracked_jobs()
+        assert "job-1" in await read_heartbeats(redis, ["job-1"])
+
+    async def test_job_stays_tracked_while_another_task_holds_it(self):
+        redis = _HeartbeatRedis()
+
+        with task_heartbeats():
+            await start_heartbeat(redis, "job-1")
+            with task_heartbeats():
+                await start_heartbeat(redis, "job-1")
+            assert "job-1" in tracked_jobs()
+
+        assert "job-1" not in tracked_jobs()
+
+    async def test_fails_open_without_redis(self):
+        class _BrokenRedis:
+            def __getattr__(self, name):
+                async def fail(*args, **kwargs):
+                    raise RedisConnectionError("redis down")
+
+                return fail
+
+        await start_heartbeat(_BrokenRedis(), "job-1")
+        await stop_heartbeat(_BrokenRedis(), "job-1")
+
+        assert "job-1" not in tracked_jobs()
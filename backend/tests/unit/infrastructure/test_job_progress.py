@@ -0,0 +1,171 @@
+import json
+
+import pytest
+
+from src.core.exceptions import JobCancelledError, NotFoundError
+from src.infrastructure.cache import job_progress
+from src.infrastructure.cache.job_progress import (
+    JobProgressReporter,
+    cancel_key,
+    progress_key,
+)
+from src.infrastructure.database.models.job import JobStatus
+
+
+class _RecordingRedis:
+    def __init__(self):
+        self.values = {}
+        self.writes = 0
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+        self.writes += 1
+
+    async def mget(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def hget(self, key, field):
+        return None
+
+    async def hset(self, key, mapping):
+        pass
+
+    async def hdel(self, key, field):
+        return 0
+
+
+class _RecordingSession:
+    def __init__(self, statements):
+        self._statements = statements
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, stmt):
+        self._statements.append(stmt.compile().params)
+
+    async def commit(self):
+        pass
+
+
+class _NoRowsResult:
+    def __init__(self, status):
+        self._status = status
+
+    def first(self):
+        return None
+
+    def scalar_one_or_none(self):
+        return self._status
+
+
+class _CancelledSession(_RecordingSession):
+    status = JobStatus.CANCELLED
+
+    async def execute(self, stmt):
+        await super().execute(stmt)
+        return _NoRowsResult(self.status)
+
+
+class _MissingSession(_CancelledSession):
+    status = None
+
+
+@pytest.fixture
+def statements(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(
+        job_progress, "async_session_maker", lambda: _RecordingSession(recorded)
+    )
+    return recorded
+
+
+class TestJobProgressReporter:
+    async def test_coalesces_progress_between_transitions(self, statements):
+        redis = _RecordingRedis()
+        reporter = JobProgressReporter("job-1", flush_interval_seconds=60, redis=redis)
+
+        await reporter.start("Loading...")
+        for percent in (10.0, 20.0, 30.0):
+            await reporter.update(percent, f"Step {percent}")
+        await reporter.complete("Done", output_params={"n_frames": 3})
+
+        assert len(statements) == 2
+        assert statements[0]["status"] == JobStatus.RUNNING
+        assert statements[1]["status"] == JobStatus.COMPLETED
+        assert statements[1]["progress_percent"] == 100.0
+        assert redis.writes == 5
+
+        state = json.loads(redis.values[progress_key("job-1")])
+        assert state["status"] == "completed"
+        assert state["progress_message"] == "Done"
+
+    async def test_flushes_pending_progress_after_interval(self, statements):
+        reporter = JobProgressReporter(
+            "job-2", flush_interval_seconds=0, redis=_RecordingRedis()
+        )
+
+        await reporter.start("Loading...")
+        await reporter.update(50.0, "Halfway")
+
+        assert len(statements) == 2
+        assert statements[-1]["progress_percent"] == 50.0
+        assert "status" not in statements[-1]
+
+    async def test_fail_records_error_in_redis(self, statements):
+        redis = _RecordingRedis()
+        reporter = JobProgressReporter("job-3", redis=redis)
+
+        await reporter.fail("boom")
+
+        assert statements[-1]["status"] == JobStatus.FAILED
+        assert (
+            json.loads(redis.values[progress_key("job-3")])["error_message"] == "boom"
+        )
+
+    async def test_update_raises_once_cancel_is_requested(self, statements):
+        redis = _RecordingRedis()
+        reporter = JobProgressReporter("job-4", flush_interval_seconds=0, redis=redis)
+
+        await reporter.start("Loading...")
+        redis.values[cancel_key("job-4")] = "1"
+
+        with pytest.raises(JobCancelledError):
+            await reporter.update(50.0, "Halfway")
+
+        assert len(statements) == 1
+
+    async def test_complete_does_not_overwrite_cancelled_job(self, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(
+            job_progress, "async_session_maker", lambda: _CancelledSession(recorded)
+        )
+        redis = _RecordingRedis()
+        reporter = JobProgressReporter("job-5", redis=redis)
+
+        with pytest.raises(JobCancelledError):
+            await reporter.complete("Done")
+        await reporter.fail("late failure")
+
+        assert progress_key("job-5") not in redis.values
+
+    async def test_transition_raises_when_job_row_is_missing(self, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(
+            job_progress, "async_session_maker", lambda: _MissingSession(recorded)
+        )
+        redis = _RecordingRedis()
+        reporter = JobProgressReporter("job-6", redis=redis)
+
+        with pytest.raises(NotFoundError):
+            await reporter.start("Loading...")
+        with pytest.raises(NotFoundError):
+            await reporter.fail("late failure")
+
+        assert progress_key("job-6") not in redis.values
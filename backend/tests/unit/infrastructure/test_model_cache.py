@@ -0,0 +1,80 @@
+import asyncio
+import os
+
+import numpy as np
+
+from src.glimps.adapter import GlimpsAdapter
+from src.glimps.model_serializer import ModelSerializer
+from src.infrastructure.cache.model_cache import ModelCache
+from src.infrastructure.storage.file_storage import LocalFileStorage
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+FGTRAJ = os.path.join(TESTS_DIR, "examples", "test.npy")
+CGTRAJ = os.path.join(TESTS_DIR, "examples", "test_ca.npy")
+
+
+class TestModelCache:
+    async def test_keeps_adapters_warm_and_evicts_least_recent(self, tmp_path):
+        storage = LocalFileStorage(str(tmp_path))
+        adapter = GlimpsAdapter.create_with_options(refine=False)
+        adapter.fit(np.load(CGTRAJ), np.load(FGTRAJ))
+        model_bytes = ModelSerializer.serialize(adapter)
+        for name in ("a", "b", "c"):
+            await storage.save_bytes(f"models/{name}.pkl", model_bytes)
+
+        cache = ModelCache(storage, max_entries=2)
+        first = await cache.get_adapter("models/a.pkl")
+
+        assert cache.is_warm("models/a.pkl")
+        assert await cache.get_adapter("models/a.pkl") is first
+
+        await cache.get_adapter("models/b.pkl")
+        await cache.get_adapter("models/a.pkl")
+        await cache.get_adapter("models/c.pkl")
+
+        assert cache.is_warm("models/a.pkl")
+        assert not cache.is_warm("models/b.pkl")
+        assert len(cache) == 2
+
+    async def test_reloads_when_model_version_changes(self, tmp_path):
+        storage = LocalFileStorage(str(tmp_path))
+        adapter = GlimpsAdapter.create_with_options(refine=False)
+        adapter.fit(np.load(CGTRAJ), np.load(FGTRAJ))
+        await storage.save_bytes("models/a.pkl", ModelSerializer.serialize(adapter))
+
+        cache = ModelCache(storage, max_entries=2)
+        first = await cache.get_adapter("models/a.pkl", 1)
+
+        assert cache.is_warm("models/a.pkl", 1)
+        assert not cache.is_warm("models/a.pkl", 2)
+        assert cache.model_hash("models/a.pkl")
+        assert await cache.get_adapter("models/a.pkl", 2) is not first
+        assert cache.cached_models() == ["models/a.pkl@2"]
+
+    async def test_missing_template_is_cached_as_none(self, tmp_path):
+        cache = ModelCache(LocalFileStorage(str(tmp_path)), max_entries=2)
+
+        assert await cache.get_template("molecules/missing.pdb") is None
+
+    async def test_concurrent_callers_share_one_load(self, tmp_path):
+        loads = []
+
+        class CountingCache(ModelCache):
+            async def _load_adapter(self, model_path):
+                loads.append(model_path)
+                await asyncio.sleep(0.01)
+                return object()
+
+        cache = CountingCache(LocalFileStorage(str(tmp_path)), max_entries=1)
+        first = await asyncio.gather(
+            *(cache.get_adapter("models/a.pkl", 1) for _ in range(3))
+        )
+        await cache.get_adapter("models/b.pkl", 1)
+        second = await asyncio.gather(
+            *(cache.get_adapter("models/a.pkl", 1) for _ in range(3))
+        )
+
+        assert loads == ["models/a.pkl", "models/b.pkl", "models/a.pkl"]
+        assert len({id(adapter) for adapter in first}) == 1
+        assert len({id(adapter) for adapter in second}) == 1
+        assert cache._locks == {}
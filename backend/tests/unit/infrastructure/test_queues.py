@@ -0,0 +1,100 @@
+import json
+import time
+
+from src.infrastructure.database.models.job import JobType
+from src.infrastructure.queue.queues import (
+    INFERENCE_QUEUE,
+    TRAINING_QUEUE,
+    get_queue_stats,
+    queue_for_job_type,
+)
+from src.infrastructure.queue.worker_registry import (
+    list_workers,
+    register_worker,
+    unregister_worker,
+    worker_id,
+    worker_key,
+)
+
+
+class _QueueRedis:
+    def __init__(self, queues):
+        self.queues = queues
+
+    async def zcard(self, key):
+        return len(self.queues.get(key, []))
+
+    async def zrange(self, key, start, end, withscores=False):
+        return sorted(self.queues.get(key, []), key=lambda entry: entry[1])[: end + 1]
+
+
+class _RegistryRedis:
+    def __init__(self):
+        self.values = {}
+
+    async def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def scan_iter(self, match=None):
+        for key in list(self.values):
+            if key.startswith(match.rstrip("*")):
+                yield key
+
+
+class TestQueueRouting:
+    def test_long_running_jobs_use_training_queue(self):
+        assert queue_for_job_type(JobType.TRAINING) == TRAINING_QUEUE
+        assert queue_for_job_type(JobType.SWEEP) == TRAINING_QUEUE
+        assert queue_for_job_type(JobType.BENCHMARK) == TRAINING_QUEUE
+
+    def test_inference_uses_its_own_queue(self):
+        assert queue_for_job_type(JobType.INFERENCE) == INFERENCE_QUEUE
+
+    def test_every_job_type_is_routed(self):
+        for job_type in JobType:
+            assert queue_for_job_type(job_type) in (TRAINING_QUEUE, INFERENCE_QUEUE)
+
+
+class TestQueueStats:
+    async def test_reports_depth_and_oldest_wait(self):
+        now_ms = time.time() * 1000
+        redis = _QueueRedis(
+            {
+                TRAINING_QUEUE: [(b"job-1", now_ms - 30000), (b"job-2", now_ms - 5000)],
+            }
+        )
+
+        stats = {queue["name"]: queue for queue in await get_queue_stats(redis)}
+
+        assert stats["training"]["depth"] == 2
+        assert 29 < stats["training"]["oldest_wait_seconds"] < 60
+        assert stats["inference"]["depth"] == 0
+        assert stats["inference"]["oldest_wait_seconds"] == 0.0
+
+
+class TestWorkerRegistry:
+    async def test_registers_startup_breakdown(self):
+        redis = _RegistryRedis()
+
+        await register_worker(redis, TRAINING_QUEUE, {"imports": 1.5, "database": 0.25})
+
+        report = json.loads(redis.values[worker_key(worker_id())])
+        assert report["queue_name"] == TRAINING_QUEUE
+        assert report["startup_seconds"] == 1.75
+        assert [worker["worker_id"] for worker in await list_workers(redis)] == [
+            worker_id()
+        ]
+
+    async def test_unregister_removes_worker(self):
+        redis = _RegistryRedis()
+        await register_worker(redis, INFERENCE_QUEUE, {})
+
+        await unregister_worker(redis)
+
+        assert await list_workers(redis) == []
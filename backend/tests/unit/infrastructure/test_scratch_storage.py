@@ -0,0 +1,80 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.core.exceptions import StorageError
+from src.infrastructure.storage.file_storage import LocalFileStorage
+from src.infrastructure.storage.scratch import ScratchStorage
+
+
+class _SlowStorage(LocalFileStorage):
+    def __init__(self, base_path):
+        super().__init__(base_path)
+        self.started = asyncio.Event()
+        self.loop = None
+
+    def download_to(self, path, destination, cancelled=None):
+        self.loop.call_soon_threadsafe(self.started.set)
+        cancelled.wait(5)
+        raise StorageError("Download cancelled")
+
+
+async def _settle(scratch):
+    while scratch._downloads:
+        await asyncio.sleep(0.01)
+
+
+class TestScratchStorage:
+    @pytest.fixture
+    async def source(self, tmp_path):
+        storage = LocalFileStorage(str(tmp_path / "remote"))
+        await storage.save_numpy("inputs/a.npy", np.arange(12.0).reshape(3, 4))
+        await storage.save_bytes("models/a.pkl", b"model")
+        return storage
+
+    async def test_serves_prefetched_files_until_released(self, source, tmp_path):
+        scratch = ScratchStorage(source, tmp_path / "scratch", 1024**2, 2)
+        scratch.prefetch("job-1", ["inputs/a.npy", "models/a.pkl"])
+        scratch.prefetch("job-2", ["models/a.pkl"])
+        await _settle(scratch)
+        await source.delete("inputs/a.npy")
+        await source.delete("models/a.pkl")
+
+        coords = await scratch.load_numpy("inputs/a.npy", mmap_mode="r")
+        assert isinstance(coords, np.memmap)
+        assert coords[2, 3] == 11.0
+        assert await scratch.load_bytes("models/a.pkl") == b"model"
+
+        await scratch.release("job-1")
+
+        assert not scratch.local_path("inputs/a.npy").exists()
+        assert await scratch.load_bytes("models/a.pkl") == b"model"
+        assert scratch.owners() == {"job-2"}
+
+        await scratch.release("job-2")
+
+        assert scratch.used_bytes == 0
+        assert list((tmp_path / "scratch").iterdir()) == []
+
+    async def test_skips_files_over_the_size_cap(self, source, tmp_path):
+        scratch = ScratchStorage(source, tmp_path / "scratch", 16, 2)
+        scratch.prefetch("job-1", ["inputs/a.npy", "models/a.pkl"])
+        await _settle(scratch)
+
+        assert not scratch.local_path("inputs/a.npy").exists()
+        assert scratch.local_path("models/a.pkl").exists()
+        assert (await scratch.load_numpy("inputs/a.npy")).shape == (3, 4)
+
+    async def test_release_cancels_running_download(self, tmp_path):
+        source = _SlowStorage(str(tmp_path / "remote"))
+        source.loop = asyncio.get_running_loop()
+        await source.save_bytes("models/a.pkl", b"model")
+        scratch = ScratchStorage(source, tmp_path / "scratch", 1024**2, 1)
+
+        scratch.prefetch("job-1", ["models/a.pkl"])
+        await asyncio.wait_for(source.started.wait(), 5)
+        await asyncio.wait_for(scratch.release("job-1"), 5)
+
+        assert scratch.used_bytes == 0
+        assert list((tmp_path / "scratch").iterdir()) == []
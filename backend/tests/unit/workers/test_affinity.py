@@ -0,0 +1,154 @@
+import json
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from src.config import settings
+from src.infrastructure.cache import model_affinity
+from src.infrastructure.cache.model_affinity import (
+    WORKERS_KEY,
+    advertise,
+    find_holders,
+    routing_stats,
+)
+from src.infrastructure.database.models.job import JobType
+from src.infrastructure.queue.queues import INFERENCE_QUEUE, queue_limits
+from src.workers import affinity
+from src.workers.affinity import (
+    AFFINITY_DEFERRAL,
+    advertise_cached_models,
+    with_cache_affinity,
+)
+from src.workers.retry import Deferred
+from src.workers.threads import ThreadBudget
+
+
+class _AffinityRedis:
+    def __init__(self):
+        self.hashes = {}
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    async def hincrby(self, key, field, amount):
+        values = self.hashes.setdefault(key, {})
+        values[field] = int(values.get(field, 0)) + amount
+
+
+class _WarmCache:
+    def __init__(self, warm):
+        self.warm = warm
+
+    def is_warm(self, model_path, version=None):
+        return self.warm
+
+    def cached_models(self):
+        return []
+
+
+async def _advertise_holder(redis, monkeypatch, free_slots):
+    monkeypatch.setattr(model_affinity, "worker_id", lambda: "other:1")
+    await advertise(redis, INFERENCE_QUEUE, ["models/a.pkl@3"], free_slots)
+    monkeypatch.setattr(model_affinity, "worker_id", lambda: "self:1")
+
+
+class TestModelAffinity:
+    async def test_finds_live_holders_and_drops_stale_workers(self, monkeypatch):
+        redis = _AffinityRedis()
+        await _advertise_holder(redis, monkeypatch, 2)
+        redis.hashes[WORKERS_KEY]["gone:1"] = (
+            '{"worker_id": "gone:1", "queue_name": "arq:queue:inference", '
+            f'"models": ["models/a.pkl@3"], "free_slots": 1, "at": {time.time() - 60}}}'
+        )
+
+        holders = await find_holders(redis, INFERENCE_QUEUE, "models/a.pkl@3")
+
+        assert [holder["worker_id"] for holder in holders] == ["other:1"]
+        assert "gone:1" not in redis.hashes[WORKERS_KEY]
+        assert await find_holders(redis, INFERENCE_QUEUE, "models/a.pkl@4") == []
+
+    async def test_advertises_free_slots_left_by_running_jobs(self, monkeypatch):
+        redis = _AffinityRedis()
+        budget = ThreadBudget(8)
+        monkeypatch.setattr(affinity, "get_model_cache", lambda: _WarmCache(True))
+        monkeypatch.setattr(model_affinity, "worker_id", lambda: "self:1")
+
+        with budget.job("job-1", JobType.INFERENCE):
+            await advertise_cached_models(
+                {"redis": redis, "thread_budget": budget}, INFERENCE_QUEUE
+            )
+
+        report = json.loads(redis.hashes[WORKERS_KEY]["self:1"])
+        max_jobs = queue_limits()[INFERENCE_QUEUE]["max_jobs"]
+        assert report["free_slots"] == max_jobs - 1
+
+
+class TestCacheAffinity:
+    @pytest.fixture
+    def redis(self, monkeypatch):
+        async def input_params(job_id):
+            return {"model_path": "models/a.pkl", "version": 3}
+
+        monkeypatch.setattr(affinity, "job_input_params", input_params)
+        monkeypatch.setattr(settings, "cache_affinity_enabled", True)
+        return _AffinityRedis()
+
+    def _ctx(self, redis, waited_seconds=0.0, deferrals=0):
+        return {
+            "redis": redis,
+            "job_deferrals": {AFFINITY_DEFERRAL: deferrals},
+            "enqueue_time": datetime.now(UTC) - timedelta(seconds=waited_seconds),
+        }
+
+    async def _run(self, ctx):
+        async def task(ctx, job_id):
+            return {"status": "success"}
+
+        return await with_cache_affinity(task, INFERENCE_QUEUE)(ctx, "job-1")
+
+    async def test_defers_to_worker_holding_the_model(self, redis, monkeypatch):
+        monkeypatch.setattr(affinity, "get_model_cache", lambda: _WarmCache(False))
+        await _advertise_holder(redis, monkeypatch, 1)
+
+        with pytest.raises(Deferred) as raised:
+            await self._run(self._ctx(redis))
+
+        assert raised.value.reason == AFFINITY_DEFERRAL
+
+        stats = await routing_stats(redis, INFERENCE_QUEUE)
+        assert stats["affinity_deferrals"] == 1
+
+    async def test_falls_back_after_waiting(self, redis, monkeypatch):
+        monkeypatch.setattr(affinity, "get_model_cache", lambda: _WarmCache(False))
+        await _advertise_holder(redis, monkeypatch, 1)
+        waited = settings.cache_affinity_wait_seconds + 1
+
+        assert await self._run(self._ctx(redis, waited)) == {"status": "success"}
+        assert await self._run(
+            self._ctx(redis, deferrals=settings.cache_affinity_max_deferrals)
+        ) == {"status": "success"}
+        assert (await routing_stats(redis, INFERENCE_QUEUE))["model_cache_misses"] == 2
+
+    async def test_runs_without_free_holder(self, redis, monkeypatch):
+        monkeypatch.setattr(affinity, "get_model_cache", lambda: _WarmCache(False))
+        await _advertise_holder(redis, monkeypatch, 0)
+
+        assert await self._run(self._ctx(redis)) == {"status": "success"}
+
+    async def test_counts_hits(self, redis, monkeypatch):
+        monkeypatch.setattr(affinity, "get_model_cache", lambda: _WarmCache(True))
+
+        await self._run(self._ctx(redis))
+        await self._run(self._ctx(redis))
+
+        stats = await routing_stats(redis, INFERENCE_QUEUE)
+        assert stats["model_cache_hits"] == 2
+        assert stats["model_cache_hit_rate"] == 1.0
@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from src.core.exceptions import InferenceError
+from src.infrastructure.storage.file_storage import LocalFileStorage
+from src.workers.tasks import inference_task
+from src.workers.tasks.inference_task import backmap_batch
+
+
+class _Reporter:
+    def __init__(self, job_id, transitions):
+        self.job_id = job_id
+        self._transitions = transitions
+
+    async def start(self, message):
+        self._transitions.append((self.job_id, "running", None))
+
+    async def update(self, percent, message):
+        pass
+
+    async def complete(self, message, output_params=None, session=None):
+        self._transitions.append((self.job_id, "completed", output_params))
+
+    async def fail(self, error):
+        self._transitions.append((self.job_id, "failed", error))
+
+
+class _Session:
+    def __init__(self, added):
+        self._added = added
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def add_all(self, molecules):
+        self._added.extend(molecules)
+
+    async def commit(self):
+        pass
+
+
+class _DoublingAdapter:
+    def transform(self, cg_coords):
+        return np.concatenate([cg_coords, cg_coords], axis=1)
+
+
+class TestBackmapBatch:
+    @pytest.fixture
+    async def storage(self, tmp_path, monkeypatch):
+        storage = LocalFileStorage(str(tmp_path / "storage"))
+        await storage.save_numpy("inputs/a.npy", np.ones((2, 3, 3)))
+        monkeypatch.setattr(inference_task, "get_file_storage", lambda: storage)
+        return storage
+
+    @pytest.fixture
+    def transitions(self, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(
+            inference_task,
+            "JobProgressReporter",
+            lambda job_id: _Reporter(job_id, recorded),
+        )
+        return recorded
+
+    @pytest.fixture
+    def added(self, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(
+            inference_task, "async_session_maker", lambda: _Session(recorded)
+        )
+        return recorded
+
+    def _inputs(self, *paths):
+        return [
+            {"molecule_id": f"mol-{index}", "name": path, "coordinates_path": path}
+            for index, path in enumerate(paths)
+        ]
+
+    async def test_reports_failed_inputs_alongside_completed_ones(
+        self, storage, transitions, added
+    ):
+        result = await backmap_batch(
+            "job-1",
+            self._inputs("inputs/a.npy", "inputs/missing.npy"),
+            "project-1",
+            adapter=_DoublingAdapter(),
+        )
+
+        assert result == {"status": "success", "n_succeeded": 1}
+        assert [molecule.source_molecule_id for molecule in added] == ["mol-0"]
+        assert added[0].n_atoms == 6
+        assert await storage.exists(added[0].coordinates_path)
+
+        job_id, status, output_params = transitions[-1]
+        assert (job_id, status) == ("job-1", "completed")
+        assert output_params["n_failed"] == 1
+        assert [item["status"] for item in output_params["results"]] == [
+            "completed",
+            "failed",
+        ]
+        assert output_params["results"][1]["input_molecule_id"] == "mol-1"
+
+    async def test_fails_job_when_no_input_can_be_backmapped(
+        self, storage, transitions, added, tmp_path
+    ):
+        with pytest.raises(InferenceError, match="No input could be backmapped"):
+            await backmap_batch(
+                "job-2",
+                self._inputs("inputs/missing.npy", "inputs/gone.npy"),
+                "project-1",
+                adapter=_DoublingAdapter(),
+            )
+
+        assert transitions[-1][:2] == ("job-2", "failed")
+        assert added == []
+        assert not (tmp_path / "storage" / "molecules").exists()
@@ -0,0 +1,49 @@
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.workers.compute import ComputePool
+
+
+def _executor():
+    return ProcessPoolExecutor(
+        max_workers=1, mp_context=multiprocessing.get_context("fork")
+    )
+
+
+def _running_process(executor):
+    executor.submit(time.sleep, 30)
+    deadline = time.monotonic() + 10
+    while not executor._processes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return next(iter(executor._processes.values()))
+
+
+class TestComputePool:
+    def test_reset_terminates_running_evaluations(self):
+        pool = ComputePool(_executor)
+        original = pool.executor
+        process = _running_process(original)
+
+        with pool.acquire():
+            assert pool.reset()
+
+        process.join(timeout=10)
+        assert not process.is_alive()
+        assert pool.executor is not original
+        assert pool.executor.submit(sum, [1, 2]).result(timeout=10) == 3
+        pool.shutdown()
+
+    def test_reset_leaves_a_pool_other_jobs_are_using(self):
+        pool = ComputePool(_executor)
+        original = pool.executor
+        process = _running_process(original)
+
+        with pool.acquire(), pool.acquire():
+            assert not pool.reset()
+
+        assert pool.executor is original
+        assert process.is_alive()
+        pool.shutdown()
+        process.join(timeout=10)
+        assert not process.is_alive()
@@ -0,0 +1,138 @@
+import numpy as np
+import pytest
+
+from src.core.exceptions import InferenceError
+from src.infrastructure.storage.file_storage import LocalFileStorage
+from src.workers.tasks import inference_task
+from src.workers.tasks.inference_task import assemble_inference_shards, run_inference
+
+
+class _Reporter:
+    def __init__(self, job_id, transitions):
+        self.job_id = job_id
+        self._transitions = transitions
+
+    async def start(self, message):
+        self._transitions.append("running")
+
+    async def update(self, percent, message):
+        pass
+
+    async def attach(self, message):
+        self._transitions.append("running")
+
+    async def complete(self, message, output_params=None, session=None):
+        self._transitions.append("completed")
+
+    async def fail(self, error):
+        self._transitions.append(error)
+
+
+class _ModelCache:
+    async def get_adapter(self, model_path, version):
+        return object()
+
+
+class _Session:
+    def __init__(self, added):
+        self._added = added
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, stmt):
+        return self
+
+    def scalar_one_or_none(self):
+        return None
+
+    def add(self, molecule):
+        self._added.append(molecule)
+
+    async def commit(self):
+        pass
+
+
+class _Tracker:
+    def __init__(self, job_id, n_shards):
+        pass
+
+    async def clear(self):
+        pass
+
+
+class TestRunInference:
+    async def test_rejects_input_without_frames(self, tmp_path, monkeypatch):
+        storage = LocalFileStorage(str(tmp_path / "storage"))
+        await storage.save_numpy("inputs/empty.npy", np.zeros((0, 3, 3)))
+        transitions = []
+        monkeypatch.setattr(inference_task, "get_file_storage", lambda: storage)
+        monkeypatch.setattr(inference_task, "get_model_cache", lambda: _ModelCache())
+        monkeypatch.setattr(
+            inference_task,
+            "JobProgressReporter",
+            lambda job_id: _Reporter(job_id, transitions),
+        )
+
+        with pytest.raises(InferenceError, match="no frames"):
+            await run_inference(
+                {},
+                "job-1",
+                "models/model.pkl",
+                "inputs/empty.npy",
+                "outputs/output.npy",
+                "mol-1",
+                "project-1",
+            )
+
+        assert transitions == ["running", "Input coordinates contain no frames"]
+        assert not await storage.exists("outputs/output.npy")
+
+
+class TestAssembleInferenceShards:
+    async def test_joins_shards_into_one_output(self, tmp_path, monkeypatch):
+        storage = LocalFileStorage(str(tmp_path / "storage"))
+        frames = np.arange(5 * 4 * 3, dtype=np.float32).reshape((5, 4, 3))
+        await storage.save_numpy("out/shards/0000.npy", frames[:3])
+        await storage.save_numpy("out/shards/0001.npy", frames[3:])
+        transitions, added = [], []
+        monkeypatch.setattr(inference_task, "get_file_storage", lambda: storage)
+        monkeypatch.setattr(inference_task, "InferenceShardTracker", _Tracker)
+        monkeypatch.setattr(
+            inference_task, "async_session_maker", lambda: _Session(added)
+        )
+        monkeypatch.setattr(
+            inference_task,
+            "JobProgressReporter",
+            lambda job_id: _Reporter(job_id, transitions),
+        )
+        monkeypatch.setattr(inference_task.settings, "inference_chunk_frames", 2)
+
+        result = await assemble_inference_shards(
+            {},
+            "job-1",
+            {
+                "shards": [
+                    {"start": 0, "stop": 3, "output_path": "out/shards/0000.npy"},
+                    {"start": 3, "stop": 5, "output_path": "out/shards/0001.npy"},
+                ],
+                "n_frames": 5,
+                "output_file_path": "out/output.npy",
+                "atomistic_file_path": None,
+                "reference_file_path": None,
+                "project_id": "project-1",
+                "input_molecule_id": "mol-1",
+            },
+        )
+
+        assert result["status"] == "success"
+        assert transitions == ["running", "completed"]
+        np.testing.assert_array_equal(
+            await storage.load_numpy("out/output.npy"), frames
+        )
+        assert added[0].n_frames == 5
+        assert await storage.exists(added[0].file_path)
+        assert not await storage.exists("out/shards/0000.npy")
@@ -0,0 +1,29 @@
+import logging
+
+from src.workers.lifecycle import _timed
+
+
+class TestTimed:
+    async def test_records_successful_steps(self):
+        timings, failed = {}, []
+
+        async def step():
+            return "ready"
+
+        assert await _timed(timings, failed, "redis", step) == "ready"
+        assert list(timings) == ["redis"]
+        assert failed == []
+
+    async def test_logs_and_records_failed_steps(self, caplog):
+        timings, failed = {}, []
+
+        async def step():
+            raise OSError("storage unreachable")
+
+        with caplog.at_level(logging.ERROR):
+            assert await _timed(timings, failed, "storage", step) is None
+
+        assert timings == {}
+        assert failed == ["storage"]
+        assert "Warm start step storage failed" in caplog.text
+        assert "storage unreachable" in caplog.text
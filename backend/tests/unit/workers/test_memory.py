@@ -0,0 +1,193 @@
+import asyncio
+
+import pytest
+from arq import Retry
+
+from src.config import settings
+from src.infrastructure.cache.job_deferrals import deferrals_key
+from src.infrastructure.cache.memory_calibration import (
+    CALIBRATION_KEY,
+    calibration_factor,
+    record_memory_usage,
+)
+from src.infrastructure.database.models.job import JobType
+from src.workers import memory
+from src.workers.memory import MemoryBudget, PeakMemorySampler, with_memory_admission
+from src.workers.retry import with_deferral_accounting
+
+
+class _CalibrationRedis:
+    def __init__(self):
+        self.hashes = {}
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = str(value)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hincrby(self, key, field, amount):
+        values = self.hashes.setdefault(key, {})
+        values[field] = str(int(values.get(field, 0)) + amount)
+
+    async def expire(self, key, seconds):
+        pass
+
+
+class TestMemoryBudget:
+    async def test_defers_until_reservation_fits(self, monkeypatch):
+        monkeypatch.setattr(settings, "job_memory_retry_seconds", 3.0)
+        budget = MemoryBudget(100)
+
+        async with budget.reserve("first", 80):
+            assert budget.available_bytes == 20
+            with pytest.raises(Retry) as deferred:
+                async with budget.reserve("second", 50):
+                    pass
+            assert deferred.value.defer_score == 3000
+            assert budget.reserved_bytes == 80
+
+        async with budget.reserve("second", 50):
+            assert budget.available_bytes == 50
+
+    async def test_forced_reservation_skips_the_fit_check(self):
+        budget = MemoryBudget(100)
+
+        async with budget.reserve("first", 80), budget.reserve("second", 50, True):
+            assert budget.available_bytes == -30
+
+    async def test_oversized_job_runs_when_idle(self):
+        budget = MemoryBudget(100)
+
+        async with budget.reserve("huge", 1000):
+            assert budget.available_bytes < 0
+
+
+class TestMemoryAdmission:
+    @pytest.fixture
+    def recorded(self, monkeypatch):
+        recorded = {}
+
+        async def input_params(job_id):
+            return {"memory_estimate_bytes": 1000}
+
+        async def record(job_id, usage):
+            recorded[job_id] = usage
+
+        monkeypatch.setattr(memory, "job_input_params", input_params)
+        monkeypatch.setattr(memory, "record_job_memory", record)
+        monkeypatch.setattr(settings, "job_memory_overhead_bytes", 10)
+        return recorded
+
+    async def test_records_peak_and_calibrates(self, recorded):
+        redis = _CalibrationRedis()
+
+        async def task(ctx, job_id):
+            await asyncio.sleep(0)
+            return {"status": "success"}
+
+        run = with_memory_admission(task, JobType.TRAINING)
+        ctx = {"job_id": "job-1", "redis": redis, "memory_budget": MemoryBudget(10**12)}
+
+        assert await run(ctx, "job-1") == {"status": "success"}
+        assert recorded["job-1"]["memory_estimate_bytes"] == 1000
+        assert recorded["job-1"]["reserved_bytes"] == 1010
+        assert recorded["job-1"]["peak_rss_bytes"] > 0
+
+    async def test_defers_then_admits_after_max_deferrals(self, recorded, monkeypatch):
+        monkeypatch.setattr(settings, "job_memory_max_deferrals", 2)
+        budget = MemoryBudget(500)
+
+        async def task(ctx, job_id):
+            return {"status": "success"}
+
+        run = with_deferral_accounting(with_memory_admission(task, JobType.TRAINING))
+        redis = _CalibrationRedis()
+        async with budget.reserve("other", 100):
+            for job_try in (1, 2):
+                ctx = {
+                    "job_id": "job-1",
+                    "job_try": job_try,
+                    "redis": redis,
+                    "memory_budget": budget,
+                }
+                with pytest.raises(Retry):
+                    await run(ctx, "job-1")
+
+            ctx = {**ctx, "job_try": 3}
+            assert await run(ctx, "job-1") == {"status": "success"}
+
+        assert redis.hashes[deferrals_key("job-1")] == {"memory": "2"}
+
+    async def test_calibrates_only_when_the_job_ran_alone(self, recorded):
+        redis = _CalibrationRedis()
+        budget = MemoryBudget(10**12)
+
+        async def task(ctx, job_id):
+            return {"status": "success"}
+
+        run = with_memory_admission(task, JobType.TRAINING)
+        ctx = {"job_id": "job-1", "redis": redis, "memory_budget": budget}
+        async with budget.reserve("other", 100):
+            await run(ctx, "job-1")
+
+        assert recorded["job-1"]["ran_alone"] is False
+        assert recorded["job-1"]["calibration_factor"] is None
+        assert CALIBRATION_KEY not in redis.hashes
+
+        await run(ctx, "job-1")
+
+        assert recorded["job-1"]["ran_alone"] is True
+        assert recorded["job-1"]["job_peak_bytes"] is not None
+
+    async def test_skips_recording_for_shards(self, recorded):
+        async def task(ctx, job_id, index):
+            return {"status": "success"}
+
+        run = with_memory_admission(task, JobType.INFERENCE)
+        ctx = {
+            "job_id": "job-1:shard:0",
+            "redis": _CalibrationRedis(),
+            "memory_budget": MemoryBudget(10**12),
+        }
+
+        await run(ctx, "job-1", 0)
+        assert recorded == {}
+
+
+class TestMemoryCalibration:
+    async def test_moves_factor_towards_observed_usage(self, monkeypatch):
+        monkeypatch.setattr(settings, "job_memory_calibration_weight", 0.5)
+        redis = _CalibrationRedis()
+
+        assert await calibration_factor(redis, JobType.TRAINING) == 1.0
+        assert await record_memory_usage(redis, JobType.TRAINING, 100, 300) == 2.0
+        assert redis.hashes[CALIBRATION_KEY]["training"] == "2.0"
+        assert await calibration_factor(redis, JobType.INFERENCE) == 1.0
+
+    async def test_sampler_tracks_growth(self):
+        async with PeakMemorySampler(interval_seconds=0.01) as sampler:
+            block = bytearray(64 * 1024 * 1024)
+            block[::4096] = b"x" * len(block[::4096])
+
+        assert sampler.job_peak_bytes > 32 * 1024 * 1024
+
+
+class TestDeferralAccounting:
+    async def test_deferrals_do_not_count_as_attempts(self):
+        redis = _CalibrationRedis()
+        redis.hashes[deferrals_key("job-1")] = {"memory": "3"}
+        seen = {}
+
+        async def task(ctx, job_id):
+            seen.update(ctx)
+
+        await with_deferral_accounting(task)(
+            {"job_id": "job-1", "job_try": 5, "redis": redis}, "job-1"
+        )
+
+        assert seen["job_try"] == 2
+        assert seen["job_deferrals"] == {"memory": 3}
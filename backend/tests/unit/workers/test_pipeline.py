@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from src.core.exceptions import JobCancelledError, TrainingError
+from src.infrastructure.storage.file_storage import LocalFileStorage
+from src.workers.tasks import pipeline_task
+from src.workers.tasks.pipeline_task import train_and_backmap
+
+
+class _Reporter:
+    def __init__(self, job_id, transitions):
+        self.job_id = job_id
+        self._transitions = transitions
+
+    async def start(self, message):
+        self._transitions.append((self.job_id, "running", message))
+
+    async def fail(self, error):
+        self._transitions.append((self.job_id, "failed", error))
+
+
+class TestTrainAndBackmap:
+    @pytest.fixture
+    async def storage(self, tmp_path, monkeypatch):
+        storage = LocalFileStorage(str(tmp_path / "storage"))
+        await storage.save_numpy("inputs/cg.npy", np.ones((2, 3, 3)))
+        await storage.save_numpy("inputs/aa.npy", np.ones((2, 6, 3)))
+        monkeypatch.setattr(pipeline_task, "get_file_storage", lambda: storage)
+        return storage
+
+    @pytest.fixture
+    def transitions(self, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(
+            pipeline_task,
+            "JobProgressReporter",
+            lambda job_id: _Reporter(job_id, recorded),
+        )
+        return recorded
+
+    def _fit_raising(self, monkeypatch, storage, error):
+        async def fit(progress, storage_, job_id, model_id, *args):
+            outputs = args[-1]
+            outputs.append("models/model-1/v1.pkl")
+            await storage.save_bytes("models/model-1/v1.pkl", b"partial")
+            raise error
+
+        monkeypatch.setattr(pipeline_task, "fit_and_save_model", fit)
+
+    async def _run(self):
+        return await train_and_backmap(
+            {},
+            "train-1",
+            "infer-1",
+            "inputs/cg.npy",
+            "inputs/aa.npy",
+            "model-1",
+            None,
+            [
+                {
+                    "molecule_id": "mol-1",
+                    "name": "a",
+                    "coordinates_path": "inputs/cg.npy",
+                }
+            ],
+            "project-1",
+        )
+
+    async def test_training_failure_fails_the_inference_job(
+        self, storage, transitions, monkeypatch
+    ):
+        self._fit_raising(monkeypatch, storage, TrainingError("diverged"))
+
+        with pytest.raises(TrainingError):
+            await self._run()
+
+        assert transitions[1:] == [
+            ("train-1", "failed", "diverged"),
+            ("infer-1", "failed", "Training stage failed: diverged"),
+        ]
+
+    async def test_cancelled_training_fails_the_inference_job(
+        self, storage, transitions, monkeypatch
+    ):
+        self._fit_raising(monkeypatch, storage, JobCancelledError("cancelled"))
+
+        assert await self._run() == {"status": "cancelled"}
+        assert transitions[1:] == [
+            ("infer-1", "failed", "Training stage was cancelled"),
+        ]
+        assert not await storage.exists("models/model-1/v1.pkl")
+
+    async def test_trained_adapter_and_inputs_are_reused_for_backmapping(
+        self, storage, transitions, monkeypatch
+    ):
+        adapter = object()
+        calls = []
+
+        async def fit(*args):
+            return adapter, "models/model-1/v1.pkl"
+
+        async def backmap(job_id, inputs, project_id, atomistic_file_path, **kwargs):
+            calls.append((job_id, kwargs))
+            return {"status": "success", "n_succeeded": 1}
+
+        monkeypatch.setattr(pipeline_task, "fit_and_save_model", fit)
+        monkeypatch.setattr(pipeline_task, "backmap_batch", backmap)
+
+        result = await self._run()
+
+        assert result["model_path"] == "models/model-1/v1.pkl"
+        assert result["inference"]["n_succeeded"] == 1
+        job_id, kwargs = calls[0]
+        assert job_id == "infer-1"
+        assert kwargs["adapter"] is adapter
+        assert kwargs["preloaded"]["inputs/cg.npy"].shape == (2, 3, 3)
@@ -0,0 +1,189 @@
+import asyncio
+
+import pytest
+from arq.constants import in_progress_key_prefix, job_key_prefix
+from arq.jobs import deserialize_job, serialize_job
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from src.config import settings
+from src.infrastructure.cache.job_progress import cancel_key
+from src.infrastructure.queue.queues import INFERENCE_QUEUE
+from src.infrastructure.storage.file_storage import LocalFileStorage
+from src.infrastructure.storage.scratch import ScratchStorage
+from src.workers import prefetch
+from src.workers.prefetch import (
+    Prefetcher,
+    job_inputs,
+    run_prefetcher,
+    with_prefetched_inputs,
+)
+
+
+async def prefetch_fixture_task(ctx, job_id, model_path, output_file_path, inputs):
+    return {"status": "success"}
+
+
+with_prefetched_inputs(prefetch_fixture_task)
+
+
+class _QueueRedis:
+    def __init__(self):
+        self.queue = {}
+        self.values = {}
+
+    def enqueue(self, arq_job_id, *args):
+        self.queue[arq_job_id] = len(self.queue)
+        self.values[job_key_prefix + arq_job_id] = serialize_job(
+            "prefetch_fixture_task", args, {}, 1, 0
+        )
+
+    async def zrange(self, key, start, stop):
+        return sorted(self.queue, key=self.queue.get)[start : stop + 1]
+
+    async def zscore(self, key, member):
+        return self.queue.get(member)
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+
+class _CountingStorage(LocalFileStorage):
+    def __init__(self, root, fail_downloads=False):
+        super().__init__(root)
+        self.fail_downloads = fail_downloads
+        self.loads = 0
+
+    async def load_bytes(self, path):
+        self.loads += 1
+        return await super().load_bytes(path)
+
+    def download_to(self, path, destination, cancelled=None):
+        if self.fail_downloads:
+            raise OSError("connection reset")
+        super().download_to(path, destination, cancelled)
+
+
+class _ColdCache:
+    def holds_model(self, model_path):
+        return False
+
+
+async def _settle(scratch):
+    while scratch._downloads:
+        await asyncio.sleep(0.01)
+
+
+class TestPrefetcher:
+    @pytest.fixture
+    async def prefetcher(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(prefetch, "get_model_cache", lambda: _ColdCache())
+        source = LocalFileStorage(str(tmp_path / "remote"))
+        for path in ("models/a.pkl", "inputs/1.npy", "inputs/2.npy"):
+            await source.save_bytes(path, b"data")
+
+        redis = _QueueRedis()
+        scratch = ScratchStorage(source, tmp_path / "scratch", 1024**2, 2)
+        return Prefetcher(redis, INFERENCE_QUEUE, scratch)
+
+    def _enqueue(self, redis, arq_job_id, input_path):
+        redis.enqueue(
+            arq_job_id,
+            f"db-{arq_job_id}",
+            "models/a.pkl",
+            "outputs/ignored.npy",
+            [{"coordinates_path": input_path, "name": "x"}],
+        )
+
+    def test_extracts_input_paths_from_job_arguments(self):
+        redis = _QueueRedis()
+        self._enqueue(redis, "job-1", "inputs/1.npy")
+        job = deserialize_job(redis.values[job_key_prefix + "job-1"])
+
+        assert job_inputs(job) == ("db-job-1", ["models/a.pkl", "inputs/1.npy"])
+
+    async def test_releases_jobs_taken_elsewhere_or_cancelled(self, prefetcher):
+        redis = prefetcher._redis
+        scratch = prefetcher.storage
+        self._enqueue(redis, "job-1", "inputs/1.npy")
+        self._enqueue(redis, "job-2", "inputs/2.npy")
+
+        await prefetcher.poll()
+        await _settle(scratch)
+
+        assert scratch.owners() == {"job-1", "job-2"}
+        assert scratch.local_path("inputs/2.npy").exists()
+
+        redis.values[in_progress_key_prefix + "job-1"] = b"1"
+        redis.values[cancel_key("db-job-2")] = b"1"
+        await prefetcher.poll()
+
+        assert scratch.owners() == set()
+        assert scratch.used_bytes == 0
+
+    async def test_running_job_keeps_files_until_it_finishes(self, prefetcher):
+        redis = prefetcher._redis
+        scratch = prefetcher.storage
+        self._enqueue(redis, "job-1", "inputs/1.npy")
+        await prefetcher.poll()
+        await _settle(scratch)
+
+        async def check(ctx, job_id, *args):
+            del redis.queue["job-1"]
+            redis.values[in_progress_key_prefix + "job-1"] = b"1"
+            await prefetcher.poll()
+            assert scratch.local_path("inputs/1.npy").exists()
+            return {"status": "success"}
+
+        task = with_prefetched_inputs(check)
+        await task({"job_id": "job-1", "prefetcher": prefetcher}, "db-job-1")
+
+        assert not scratch.local_path("inputs/1.npy").exists()
+        assert scratch.owners() == set()
+
+    async def test_loop_survives_redis_errors_and_clears_scratch(
+        self, prefetcher, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "worker_prefetch_interval_seconds", 0)
+        polls = []
+
+        async def poll():
+            polls.append(len(polls))
+            if len(polls) == 1:
+                raise RedisConnectionError("redis down")
+            raise asyncio.CancelledError
+
+        monkeypatch.setattr(prefetcher, "poll", poll)
+        prefetcher.storage.prefetch("job-1", ["models/a.pkl"])
+        await _settle(prefetcher.storage)
+
+        with pytest.raises(asyncio.CancelledError):
+            await run_prefetcher(prefetcher)
+
+        assert polls == [0, 1]
+        assert prefetcher.storage.used_bytes == 0
+
+
+class TestScratchStorage:
+    async def test_load_waits_for_a_pending_download(self, tmp_path):
+        source = _CountingStorage(str(tmp_path / "remote"))
+        await source.save_bytes("inputs/1.npy", b"data")
+        scratch = ScratchStorage(source, tmp_path / "scratch", 1024**2, 1)
+
+        scratch.prefetch("job-1", ["inputs/1.npy"])
+
+        assert await scratch.load_bytes("inputs/1.npy") == b"data"
+        assert source.loads == 0
+        assert scratch.local_path("inputs/1.npy").exists()
+
+    async def test_load_falls_back_to_storage_when_the_download_failed(self, tmp_path):
+        source = _CountingStorage(str(tmp_path / "remote"), fail_downloads=True)
+        await source.save_bytes("inputs/1.npy", b"data")
+        scratch = ScratchStorage(source, tmp_path / "scratch", 1024**2, 1)
+
+        scratch.prefetch("job-1", ["inputs/1.npy"])
+
+        assert await scratch.load_bytes("inputs/1.npy") == b"data"
+        assert source.loads == 1
@@ -0,0 +1,231 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from arq.constants import in_progress_key_prefix, job_key_prefix
+
+from src.config import settings
+from src.infrastructure.cache.job_heartbeat import (
+    HEARTBEATS_KEY,
+    start_heartbeat,
+    tracked_jobs,
+)
+from src.infrastructure.database.models.job import JobStatus
+from src.infrastructure.queue.queues import TRAINING_QUEUE
+from src.workers import reaper
+from src.workers.reaper import reap_stale_jobs, with_heartbeat_release
+
+
+class _ReaperRedis:
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.queues = {}
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+
+    async def zadd(self, key, mapping, nx=False):
+        self.queues.setdefault(key, {}).update(mapping)
+
+    async def hmget(self, key, fields):
+        values = self.hashes.get(key, {})
+        return [values.get(field) for field in fields]
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def hdel(self, key, field):
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+
+class _Scalars:
+    def __init__(self, jobs):
+        self._jobs = jobs
+
+    def all(self):
+        return self._jobs
+
+
+class _Result:
+    def __init__(self, jobs):
+        self._jobs = jobs
+
+    def scalars(self):
+        return _Scalars(self._jobs)
+
+
+class _Session:
+    def __init__(self, jobs, updates):
+        self._jobs = jobs
+        self._updates = updates
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    async def execute(self, stmt):
+        if stmt.is_select:
+            return _Result(self._jobs)
+        self._updates.append(stmt.compile().params)
+
+    async def commit(self):
+        pass
+
+
+class _Reporter:
+    def __init__(self, job_id, failures):
+        self.job_id = job_id
+        self._failures = failures
+
+    async def fail(self, error):
+        self._failures.append((self.job_id, error))
+
+
+def _job(job_id, **input_params):
+    return SimpleNamespace(
+        id=job_id,
+        input_params=input_params,
+        started_at=datetime(2020, 1, 1),
+        created_at=datetime(2020, 1, 1),
+    )
+
+
+class TestReapStaleJobs:
+    @pytest.fixture
+    def jobs(self):
+        return []
+
+    @pytest.fixture
+    def updates(self, jobs, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(
+            reaper, "async_session_maker", lambda: _Session(jobs, recorded)
+        )
+        return recorded
+
+    @pytest.fixture
+    def failures(self, monkeypatch):
+        recorded = []
+        monkeypatch.setattr(
+            reaper,
+            "JobProgressReporter",
+            lambda job_id, redis=None: _Reporter(job_id, recorded),
+        )
+        return recorded
+
+    def _queued(self, redis, job_id):
+        redis.values[job_key_prefix + job_id] = b"job"
+        redis.values[in_progress_key_prefix + job_id] = b"1"
+
+    async def test_requeues_until_the_cap_then_fails(
+        self, jobs, updates, failures, monkeypatch
+    ):
+        monkeypatch.setattr(settings, "job_reaper_max_requeues", 1)
+        redis = _ReaperRedis()
+        jobs.append(_job("job-1"))
+        self._queued(redis, "job-1")
+
+        first = await reap_stale_jobs(redis, TRAINING_QUEUE)
+
+        assert first == {"requeued": ["job-1"], "failed": []}
+        assert updates[-1]["status"] == JobStatus.QUEUED
+        assert in_progress_key_prefix + "job-1" not in redis.values
+        assert "job-1" in redis.queues[TRAINING_QUEUE]
+
+        self._queued(redis, "job-1")
+        second = await reap_stale_jobs(redis, TRAINING_QUEUE)
+
+        assert second == {"requeued": [], "failed": ["job-1"]}
+        assert [job_id for job_id, _ in failures] == ["job-1"]
+        assert "could not be retried" in failures[0][1]
+
+    async def test_fails_jobs_whose_arq_job_is_gone(self, jobs, updates, failures):
+        redis = _ReaperRedis()
+        redis.hashes[HEARTBEATS_KEY] = {
+            "job-1": json.dumps({"worker_id": "host:1", "at": 0.0})
+        }
+        jobs.append(_job("job-1"))
+
+        reaped = await reap_stale_jobs(redis, TRAINING_QUEUE)
+
+        assert reaped == {"requeued": [], "failed": ["job-1"]}
+        assert failures[0][1].startswith("Worker host:1 stopped responding")
+        assert updates == []
+        assert redis.hashes[HEARTBEATS_KEY] == {}
+
+    async def test_leaves_jobs_with_a_recent_heartbeat(self, jobs, updates, failures):
+        redis = _ReaperRedis()
+        redis.hashes[HEARTBEATS_KEY] = {
+            "job-1": json.dumps({"worker_id": "host:1", "at": time.time()})
+        }
+        jobs.append(_job("job-1"))
+
+        reaped = await reap_stale_jobs(redis, TRAINING_QUEUE)
+
+        assert reaped == {"requeued": [], "failed": []}
+        assert updates == []
+        assert failures == []
+
+    async def test_pipeline_child_follows_its_training_job(
+        self, jobs, updates, failures
+    ):
+        redis = _ReaperRedis()
+        jobs.extend(
+            [
+                _job("train-1", pipeline_inference_job_id="infer-1"),
+                _job("infer-1", pipeline_job_id="train-1"),
+            ]
+        )
+        self._queued(redis, "train-1")
+
+        reaped = await reap_stale_jobs(redis, TRAINING_QUEUE)
+
+        assert reaped == {"requeued": ["train-1"], "failed": []}
+        assert updates[-1]["id_1"] == ["train-1", "infer-1"]
+
+        del redis.values[job_key_prefix + "train-1"]
+        reaped = await reap_stale_jobs(redis, TRAINING_QUEUE)
+
+        assert reaped == {"requeued": [], "failed": ["train-1"]}
+        assert [job_id for job_id, _ in failures] == ["train-1", "infer-1"]
+
+
+class TestWithHeartbeatRelease:
+    async def test_cancelled_task_stops_beating(self):
+        redis = _ReaperRedis()
+
+        async def task(ctx, job_id):
+            await start_heartbeat(redis, job_id)
+            raise asyncio.CancelledError
+
+        with pytest.raises(asyncio.CancelledError):
+            await with_heartbeat_release(task)({}, "job-1")
+
+        assert "job-1" not in tracked_jobs()
+
+    async def test_returning_shard_stops_beating(self):
+        redis = _ReaperRedis()
+
+        async def shard(ctx, job_id, index):
+            await start_heartbeat(redis, job_id)
+            return {"status": "success", "shard": index}
+
+        await with_heartbeat_release(shard)({}, "job-1", 0)
+
+        assert "job-1" not in tracked_jobs()
@@ -0,0 +1,65 @@
+from threadpoolctl import threadpool_info
+
+from src.infrastructure.database.models.job import JobType
+from src.workers.threads import ThreadBudget, with_thread_budget
+
+
+def _blas_threads() -> list[int]:
+    return [pool["num_threads"] for pool in threadpool_info()]
+
+
+class TestThreadBudget:
+    def test_splits_budget_between_running_jobs(self):
+        budget = ThreadBudget(16, max_threads={})
+
+        with budget.job("a", JobType.TRAINING) as first:
+            assert first == 16
+            with budget.job("b", JobType.TRAINING) as second:
+                assert second == 8
+                assert budget.limit == 8
+
+        assert budget.running == 0
+        assert budget.limit == 16
+
+    def test_caps_threads_by_job_type(self):
+        budget = ThreadBudget(16, max_threads={"inference": 2})
+
+        with budget.job("a", JobType.INFERENCE) as threads:
+            assert threads == 2
+            assert budget.threads_for(JobType.TRAINING) == 16
+
+    def test_restores_original_limits_when_idle(self):
+        original = _blas_threads()
+        budget = ThreadBudget(16, max_threads={})
+
+        with (
+            budget.job("a", JobType.TRAINING),
+            budget.job("b", JobType.TRAINING),
+            budget.job("c", JobType.TRAINING),
+        ):
+            assert all(threads <= 5 for threads in _blas_threads())
+
+        assert _blas_threads() == original
+
+    def test_pinned_threads_return_to_budget_allocation(self):
+        budget = ThreadBudget(8, max_threads={})
+
+        with budget.job("a", JobType.TRAINING), budget.job("b", JobType.BENCHMARK):
+            allocated = _blas_threads()
+            with budget.pin("b", 1) as threads:
+                assert threads == 1
+                assert all(count == 1 for count in _blas_threads())
+
+            assert budget.limit == 4
+            assert _blas_threads() == allocated
+
+    async def test_task_wrapper_passes_job_threads(self):
+        async def task(ctx, value):
+            return ctx["threads"], value
+
+        wrapped = with_thread_budget(task, JobType.TRAINING)
+        budget = ThreadBudget(4, max_threads={})
+
+        assert wrapped.__name__ == "task"
+        assert await wrapped({"job_id": "a", "thread_budget": budget}, 1) == (4, 1)
+        assert budget.running == 0
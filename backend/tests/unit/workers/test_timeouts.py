@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from src.config import settings
+from src.infrastructure.database.models.job import JobType
+from src.workers import timeouts
+from src.workers.timeouts import with_job_timeout
+
+
+class _Reporter:
+    failed = {}
+
+    def __init__(self, job_id, redis=None):
+        self.job_id = job_id
+
+    async def fail(self, error):
+        self.failed[self.job_id] = error
+
+
+class TestJobTimeout:
+    async def test_runs_without_estimate(self):
+        async def task(ctx, job_id):
+            return ctx.get("job_timeout")
+
+        run = with_job_timeout(task, JobType.INFERENCE)
+
+        assert await run({"job_params": {}}, "job-1") is None
+
+    async def test_passes_timeout_and_fails_overrunning_job(self, monkeypatch):
+        monkeypatch.setattr(timeouts, "JobProgressReporter", _Reporter)
+        ctx = {"redis": None, "job_params": {"estimate": {"timeout_seconds": 1}}}
+
+        async def slow(ctx, job_id):
+            assert ctx["job_timeout"] == 1
+            await asyncio.sleep(5)
+
+        with pytest.raises(TimeoutError):
+            await with_job_timeout(slow, JobType.INFERENCE)(ctx, "job-1")
+
+        assert "timeout of 1s" in _Reporter.failed["job-1"]
+
+    async def test_deadline_stays_below_the_worker_job_timeout(self):
+        ctx = {
+            "redis": None,
+            "job_params": {
+                "estimate": {"timeout_seconds": settings.inference_worker_job_timeout}
+            },
+        }
+
+        async def task(ctx, job_id):
+            return ctx["job_timeout"]
+
+        timeout = await with_job_timeout(task, JobType.INFERENCE)(ctx, "job-1")
+
+        assert timeout < settings.inference_worker_job_timeout
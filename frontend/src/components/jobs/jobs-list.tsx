@@ -1,13 +1,13 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import Link from "next/link";
 import { Loader2, XCircle, Clock, CheckCircle, Play, AlertCircle, Download, Eye } from "lucide-react";
 import { Button } from "@/components/ui/button";
 import { Badge } from "@/components/ui/badge";
 import { Progress } from "@/components/ui/progress";
-import { getJobs, cancelJob, downloadJobResult } from "@/lib/api";
-import type { Job } from "@/types/api";
+import { getJobs, cancelJob, downloadJobResult, subscribeToJobEvents } from "@/lib/api";
+import type { Job, JobEvent } from "@/types/api";
 
 interface JobsListProps {
   projectId?: string;
@@ -31,6 +31,9 @@ const jobTypeLabels: Record<Job["job_type"], string> = {
   training: "Training",
   inference: "Inference",
   file_processing: "File Processing",
+  sweep: "Option Sweep",
+  benchmark: "Benchmark",
+  batch_inference: "Batch Inference",
 };
 
 export function JobsList({ projectId, refreshTrigger, onMoleculeCreated }: JobsListProps) {
@@ -39,12 +42,52 @@ export function JobsList({ projectId, refreshTrigger, onMoleculeCreated }: JobsL
   const [error, setError] = useState("");
   const [cancellingId, setCancellingId] = useState<string | null>(null);
   const [downloadingId, setDownloadingId] = useState<string | null>(null);
+  const [connected, setConnected] = useState(false);
+  const jobsRef = useRef<Job[]>([]);
+
+  useEffect(() => {
+    jobsRef.current = jobs;
+  }, [jobs]);
 
   useEffect(() => {
     loadJobs();
+  }, [projectId, refreshTrigger]);
+
+  useEffect(() => {
+    return subscribeToJobEvents({
+      projectId,
+      onEvent: handleEvent,
+      onStatusChange: (isConnected) => {
+        setConnected(isConnected);
+        if (isConnected) loadJobs();
+      },
+    });
+  }, [projectId]);
+
+  useEffect(() => {
+    if (connected) return;
     const interval = setInterval(loadJobs, 5000);
     return () => clearInterval(interval);
-  }, [projectId, refreshTrigger]);
+  }, [connected, projectId]);
+
+  const handleEvent = (event: JobEvent) => {
+    const known = jobsRef.current.some((job) => job.id === event.job_id);
+    setJobs((current) =>
+      current.map((job) => {
+        if (job.id !== event.job_id) return job;
+        return {
+          ...job,
+          status: event.status,
+          progress_percent: event.progress_percent,
+          progress_message: event.progress_message,
+          error_message: event.error_message ?? job.error_message,
+        };
+      }),
+    );
+    if (!known || ["completed", "failed", "cancelled"].includes(event.status)) {
+      loadJobs();
+    }
+  };
 
   const loadJobs = async () => {
     try {
@@ -201,6 +244,11 @@ export function JobsList({ projectId, refreshTrigger, onMoleculeCreated }: JobsL
                     )}
                   </div>
                 )}
+                {job.job_type === "batch_inference" && job.output_params && (
+                  <p>
+                    Backmapped {(job.output_params as { n_succeeded?: number }).n_succeeded} of {(job.output_params as { n_inputs?: number }).n_inputs} molecule(s)
+                  </p>
+                )}
                 {job.job_type === "training" && (
                   <p>Training completed successfully</p>
                 )}
@@ -11,7 +11,7 @@ const apiClient = axios.create({
   },
 });
 
-apiClient.interceptors.request.use(async (config) => {
+export const getAccessToken = async () => {
   const now = Date.now();
 
   if (!cachedToken || (tokenExpiry && now >= tokenExpiry - 30000)) {
@@ -22,8 +22,13 @@ apiClient.interceptors.request.use(async (config) => {
     }
   }
 
-  if (cachedToken) {
-    config.headers.Authorization = `Bearer ${cachedToken}`;
+  return cachedToken;
+};
+
+apiClient.interceptors.request.use(async (config) => {
+  const token = await getAccessToken();
+  if (token) {
+    config.headers.Authorization = `Bearer ${token}`;
   }
   return config;
 });
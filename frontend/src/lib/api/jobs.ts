@@ -1,5 +1,11 @@
-import apiClient from "./client";
-import type { Job, Molecule } from "@/types/api";
+import apiClient, { getAccessToken } from "./client";
+import type {
+  Job,
+  JobEvent,
+  Molecule,
+  QueueStats,
+  WorkerInfo,
+} from "@/types/api";
 
 export async function getJobs(options?: {
   projectId?: string;
@@ -25,6 +31,20 @@ export async function getJob(jobId: string) {
   return response.data;
 }
 
+export async function getQueueStats() {
+  const response = await apiClient.get<{ queues: QueueStats[] }>(
+    `/api/v1/jobs/queues`,
+  );
+  return response.data.queues;
+}
+
+export async function getWorkers() {
+  const response = await apiClient.get<{ workers: WorkerInfo[] }>(
+    `/api/v1/jobs/workers`,
+  );
+  return response.data.workers;
+}
+
 export async function cancelJob(jobId: string) {
   await apiClient.delete(`/api/v1/jobs/${jobId}`);
 }
@@ -53,3 +73,70 @@ export async function createMoleculeFromJob(jobId: string, name?: string) {
   );
   return response.data;
 }
+
+function jobEventsUrl(params: Record<string, string>) {
+  const base = new URL(
+    process.env.NEXT_PUBLIC_API_URL || window.location.origin,
+    window.location.origin,
+  );
+  base.protocol = base.protocol === "https:" ? "wss:" : "ws:";
+  base.pathname = "/ws/jobs";
+  base.search = new URLSearchParams(params).toString();
+  return base.toString();
+}
+
+export function subscribeToJobEvents(options: {
+  projectId?: string;
+  onEvent: (event: JobEvent) => void;
+  onStatusChange?: (connected: boolean) => void;
+}) {
+  let socket: WebSocket | null = null;
+  let lastEventId: string | null = null;
+  let retryDelay = 1000;
+  let retryTimer: ReturnType<typeof setTimeout> | null = null;
+  let closed = false;
+
+  const scheduleReconnect = () => {
+    if (closed) return;
+    retryTimer = setTimeout(connect, retryDelay);
+    retryDelay = Math.min(retryDelay * 2, 30000);
+  };
+
+  const connect = async () => {
+    const token = await getAccessToken();
+    if (closed) return;
+    if (!token) {
+      scheduleReconnect();
+      return;
+    }
+
+    const params: Record<string, string> = { token };
+    if (options.projectId) params.project_id = options.projectId;
+    if (lastEventId) params.last_event_id = lastEventId;
+
+    socket = new WebSocket(jobEventsUrl(params));
+    socket.onopen = () => {
+      retryDelay = 1000;
+      options.onStatusChange?.(true);
+    };
+    socket.onmessage = (message) => {
+      const event = JSON.parse(message.data) as JobEvent | { type: "ping" };
+      if (event.type !== "job") return;
+      lastEventId = event.id;
+      options.onEvent(event);
+    };
+    socket.onclose = () => {
+      socket = null;
+      options.onStatusChange?.(false);
+      scheduleReconnect();
+    };
+  };
+
+  connect();
+
+  return () => {
+    closed = true;
+    if (retryTimer) clearTimeout(retryTimer);
+    socket?.close();
+  };
+}
@@ -1,5 +1,5 @@
 import apiClient from "./client";
-import type { GlimpsModel } from "@/types/api";
+import type { CostEstimate, GlimpsModel, GlimpsModelVersion } from "@/types/api";
 
 export async function getModels(projectId: string, limit = 50, offset = 0) {
   const response = await apiClient.get<{ models: GlimpsModel[]; total: number }>(
@@ -44,6 +44,7 @@ export async function trainModel(
   cgMoleculeId: string,
   atomisticMoleculeId: string,
   glimpsOptions: GlimpsOptions = DEFAULT_GLIMPS_OPTIONS,
+  benchmark = false,
 ) {
   const formData = new FormData();
   formData.append("cg_molecule_id", cgMoleculeId);
@@ -52,6 +53,7 @@ export async function trainModel(
   formData.append("refine", String(glimpsOptions.refine));
   formData.append("shave", String(glimpsOptions.shave));
   formData.append("triangulate", String(glimpsOptions.triangulate));
+  formData.append("benchmark", String(benchmark));
 
   const response = await apiClient.post<{
     job_id: string;
@@ -63,6 +65,127 @@ export async function trainModel(
   return response.data;
 }
 
+export async function retrainModel(
+  modelId: string,
+  cgMoleculeId: string,
+  atomisticMoleculeId: string,
+) {
+  const formData = new FormData();
+  formData.append("cg_molecule_id", cgMoleculeId);
+  formData.append("atomistic_molecule_id", atomisticMoleculeId);
+
+  const response = await apiClient.post<{
+    job_id: string;
+    model_id: string;
+    status: string;
+  }>(`/api/v1/models/${modelId}/retrain`, formData, {
+    headers: { "Content-Type": "multipart/form-data" },
+  });
+  return response.data;
+}
+
+export interface SweepOptions {
+  pca: boolean[];
+  refine: boolean[];
+  shave: boolean[];
+  triangulate: boolean[];
+  holdout_fraction: number;
+}
+
+export async function sweepModelOptions(
+  modelId: string,
+  cgMoleculeId: string,
+  atomisticMoleculeId: string,
+  options?: Partial<SweepOptions>,
+) {
+  const response = await apiClient.post<{
+    job_id: string;
+    model_id: string;
+    status: string;
+  }>(`/api/v1/models/${modelId}/sweep`, {
+    cg_molecule_id: cgMoleculeId,
+    atomistic_molecule_id: atomisticMoleculeId,
+    ...options,
+  });
+  return response.data;
+}
+
+export interface BenchmarkOptions {
+  input_molecule_id: string;
+  batch_sizes: number[];
+  thread_counts: number[];
+}
+
+export async function benchmarkModel(
+  modelId: string,
+  options?: Partial<BenchmarkOptions>,
+) {
+  const response = await apiClient.post<{
+    job_id: string;
+    model_id: string;
+    status: string;
+  }>(`/api/v1/models/${modelId}/benchmark`, { ...options });
+  return response.data;
+}
+
+export interface EstimateOptions {
+  cg_molecule_id: string;
+  atomistic_molecule_id: string;
+  molecule_ids: string[];
+  glimps_options: GlimpsOptions;
+}
+
+export async function estimateJob(
+  modelId: string,
+  jobType: CostEstimate["job_type"],
+  options?: Partial<EstimateOptions>,
+) {
+  const response = await apiClient.post<CostEstimate>(
+    `/api/v1/models/${modelId}/estimate`,
+    { job_type: jobType, ...options },
+  );
+  return response.data;
+}
+
+export async function getModelVersions(modelId: string) {
+  const response = await apiClient.get<{
+    versions: GlimpsModelVersion[];
+    total: number;
+  }>(`/api/v1/models/${modelId}/versions`);
+  return response.data;
+}
+
+export async function clearInferenceCache(modelId: string) {
+  const response = await apiClient.delete<{
+    model_id: string;
+    invalidated: number;
+  }>(`/api/v1/models/${modelId}/inference-cache`);
+  return response.data;
+}
+
+export interface TransformResult {
+  model_id: string;
+  version: number;
+  n_frames: number;
+  n_atoms: number;
+  coordinates: number[][][] | null;
+  pdb: string | null;
+  transform_seconds: number;
+  model_cache_hit: boolean;
+}
+
+export async function transformCoordinates(
+  modelId: string,
+  input: { molecule_id: string } | { coordinates: number[][][] | number[][] },
+  outputFormat: "coordinates" | "pdb" = "coordinates",
+) {
+  const response = await apiClient.post<TransformResult>(
+    `/api/v1/models/${modelId}/transform`,
+    { ...input, output_format: outputFormat },
+  );
+  return response.data;
+}
+
 export async function runInference(modelId: string, inputMoleculeId: string) {
   const formData = new FormData();
   formData.append("input_molecule_id", inputMoleculeId);
@@ -77,6 +200,41 @@ export async function runInference(modelId: string, inputMoleculeId: string) {
   return response.data;
 }
 
+export interface PipelineOptions {
+  cg_molecule_id: string;
+  atomistic_molecule_id: string;
+  glimps_options?: {
+    pca?: boolean;
+    refine?: boolean;
+    shave?: boolean;
+    triangulate?: boolean;
+  };
+  inference_molecule_ids?: string[];
+  infer_all_coarse_grained?: boolean;
+}
+
+export async function trainAndInfer(modelId: string, options: PipelineOptions) {
+  const response = await apiClient.post<{
+    model_id: string;
+    training_job_id: string;
+    inference_job_id: string;
+    status: string;
+  }>(`/api/v1/models/${modelId}/pipeline`, options);
+  return response.data;
+}
+
+export async function runBatchInference(
+  modelId: string,
+  input: { molecule_ids: string[] } | { all_coarse_grained: true },
+) {
+  const response = await apiClient.post<{
+    job_id: string;
+    model_id: string;
+    status: string;
+  }>(`/api/v1/models/${modelId}/inference/batch`, input);
+  return response.data;
+}
+
 export async function deleteModel(modelId: string) {
   await apiClient.delete(`/api/v1/models/${modelId}`);
 }
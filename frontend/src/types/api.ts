@@ -41,6 +41,7 @@ export interface GlimpsModel {
   description: string | null;
   project_id: string;
   is_trained: boolean;
+  version: number;
   training_config: Record<string, unknown> | null;
   training_metrics: Record<string, unknown> | null;
   cg_molecule_id: string | null;
@@ -51,9 +52,22 @@ export interface GlimpsModel {
   updated_at: string;
 }
 
+export interface GlimpsModelVersion {
+  id: string;
+  model_id: string;
+  version: number;
+  update_mode: "full" | "incremental";
+  training_config: Record<string, unknown> | null;
+  training_metrics: Record<string, unknown> | null;
+  training_pairs: { cg_molecule_id: string; atomistic_molecule_id: string }[] | null;
+  n_training_frames: number;
+  job_id: string | null;
+  created_at: string;
+}
+
 export interface Job {
   id: string;
-  job_type: "training" | "inference" | "file_processing";
+  job_type: "training" | "inference" | "file_processing" | "sweep" | "benchmark" | "batch_inference";
   status: "pending" | "queued" | "running" | "completed" | "failed" | "cancelled";
   project_id: string;
   model_id: string | null;
@@ -65,6 +79,62 @@ export interface Job {
   started_at: string | null;
   completed_at: string | null;
   created_at: string;
+  estimated_runtime_seconds: number | null;
+  estimated_memory_bytes: number | null;
+  timeout_seconds: number | null;
+  estimated_completion_at: string | null;
+}
+
+export interface CostEstimate {
+  model_id: string;
+  job_type: "training" | "inference" | "batch_inference";
+  runtime_seconds: number;
+  memory_bytes: number;
+  timeout_seconds: number;
+  queue_name: string;
+  priority: "interactive" | "bulk";
+  source: "history" | "default";
+  n_samples: number;
+  stage_seconds: Record<string, number>;
+}
+
+export interface JobEvent {
+  type: "job";
+  id: string;
+  job_id: string;
+  project_id: string | null;
+  status: Job["status"];
+  progress_percent: number;
+  progress_message: string | null;
+  error_message?: string;
+  updated_at: string;
+}
+
+export interface QueueStats {
+  name: string;
+  queue_name: string;
+  depth: number;
+  oldest_wait_seconds: number;
+  max_jobs: number;
+  job_timeout: number;
+  dispatch_slots: number;
+  thread_budget: number;
+  waiting: number;
+  in_flight: number;
+  model_cache_hits: number;
+  model_cache_misses: number;
+  model_cache_hit_rate: number;
+  affinity_deferrals: number;
+}
+
+export interface WorkerInfo {
+  worker_id: string;
+  queue_name: string;
+  hostname: string;
+  pid: number;
+  started_at: string;
+  startup_seconds: number;
+  startup_timings: Record<string, number>;
 }
 
 export interface PaginatedResponse<T> {